@@ -165,18 +165,20 @@ class AdvancedStockAnalyzer:
     def _load_kospi_data(self):
         """KOSPI 마스터 데이터를 로드합니다."""
         try:
-            # 파일 존재 확인
-            if not os.path.exists('kospi_code.xlsx'):
-                console.print("❌ kospi_code.xlsx 파일을 찾을 수 없습니다.")
+            # 마스터 로드 (.mst 직접 파싱 + 해시 캐시 → Excel 파싱 생략)
+            from kospi_master import get_kospi_master
+            master = get_kospi_master()
+            if master.empty:
+                console.print("❌ kospi_code.mst / kospi_code.xlsx 파일을 찾을 수 없습니다.")
                 console.print("📋 복구 가이드:")
                 console.print("   1. python kospi_master_download.py 실행")
                 console.print("   2. 또는 수동으로 KOSPI 마스터 데이터 다운로드")
-                console.print("   3. 파일명을 'kospi_code.xlsx'로 저장")
+                console.print("   3. 파일명을 'kospi_code.mst'(또는 'kospi_code.xlsx')로 저장")
                 self.kospi_data = pd.DataFrame()
                 return
             
-            # 데이터 로드
-            self.kospi_data = pd.read_excel('kospi_code.xlsx')
+            # 데이터 로드 (공유 프레임의 복사본)
+            self.kospi_data = master.dataframe()
             
             # 필수 컬럼 검증
             required_columns = ['단축코드', '한글명', '시가총액']
@@ -189,7 +191,7 @@ class AdvancedStockAnalyzer:
                 return
             
             # 데이터 신선도 확인 (파일 수정일 기준)
-            file_mtime = os.path.getmtime('kospi_code.xlsx')
+            file_mtime = os.path.getmtime(master.source)
             file_age_days = (time.time() - file_mtime) / (24 * 3600)
             
             if file_age_days > 30:
@@ -203,7 +205,7 @@ class AdvancedStockAnalyzer:
             console.print("📋 복구 가이드:")
             console.print("   1. python kospi_master_download.py 실행")
             console.print("   2. 파일 권한 확인")
-            console.print("   3. Excel 파일 손상 여부 확인")
+            console.print("   3. 마스터 파일 손상 여부 확인")
             self.kospi_data = pd.DataFrame()
     
     def _load_dart_corp_mapping(self):
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목 단위 분석 레그 의존성 그래프 실행기
+
+EnhancedIntegratedAnalyzer.analyze_single_stock_enhanced의 API 레그(투자의견, 추정실적,
+재무비율 4종, 현재가, 리스크)는 서로 독립인데 하나씩 차례로 돌아 종목 지연이 레그 합이었습니다.
+여기의 실행기는 레그를 의존성 그래프로 받아
+
+- 선행 레그가 끝난 레그부터 바로 시작 (독립 레그는 동시에 진행)
+- 블로킹 API 호출은 공유 스레드 풀에서, 재시도 대기는 이벤트 루프 타이머로 (대기 중 스레드 점유 없음)
+- 실패/무자료 레그는 기본값으로 끝나고 후속 레그는 있는 결과로 계속 진행
+
+합니다. 속도 제어는 각 호출이 거치는 전역 KISGlobalRateLimiter(계정 TPS 그리드)가 담당하므로
+종목 지연은 레그 합이 아니라 가장 긴 레그 수준이 됩니다.
+
+Example:
+    legs = [
+        Leg('price', lambda: provider.get_stock_price_info('005930'), retries=2, accept=bool),
+        Leg('position', lambda price: calc_position(price), deps=('price',), blocking=False),
+    ]
+    results = run_legs(legs)   # {'price': {...}, 'position': ...}
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from graphlib import TopologicalSorter
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from mcp_kis_async import run_coroutine_sync
+
+logger = logging.getLogger(__name__)
+
+# ✅ 레그 실행 스레드 수 (프로세스 공유, 실제 호출 속도는 전역 Rate Limiter가 결정)
+DEFAULT_LEG_WORKERS = 16
+
+# ✅ 기본 재시도 간격 (초)
+DEFAULT_LEG_BACKOFF = 0.5
+
+LegCallback = Callable[[str, Any], None]
+
+
+@dataclass
+class Leg:
+    """분석 그래프의 노드 하나 (API 호출 또는 선행 결과 병합)"""
+
+    name: str
+    fn: Callable[..., Any]  # 선행 레그 결과를 deps 순서대로 인자로 받음
+    deps: Tuple[str, ...] = ()
+    retries: int = 0
+    backoff: Union[float, Callable[[int], float]] = DEFAULT_LEG_BACKOFF  # 초 또는 attempt → 초
+    accept: Optional[Callable[[Any], bool]] = None  # 결과 성공 판정 (None이면 예외만 실패)
+    retry_empty: bool = True  # accept 실패(무자료)도 재시도할지 (False면 바로 기본값)
+    default: Any = None  # 최종 실패/무자료 시 결과
+    blocking: bool = True  # True: 스레드 풀에서 실행, False: 이벤트 루프에서 바로 실행 (가벼운 병합)
+    label: str = ''  # 로그 표기 (예: '005930 재무비율')
+
+    def delay(self, attempt: int) -> float:
+        return float(self.backoff(attempt) if callable(self.backoff) else self.backoff)
+
+    @property
+    def title(self) -> str:
+        return self.label or self.name
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def shared_leg_executor() -> ThreadPoolExecutor:
+    """레그 실행용 프로세스 공유 스레드 풀 (최초 호출 시 생성)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=DEFAULT_LEG_WORKERS, thread_name_prefix='analysis-leg')
+    return _executor
+
+
+def _ordered(legs: Iterable[Leg]) -> Dict[str, Leg]:
+    """이름 → 레그 (선행 레그가 먼저 오도록 정렬, 누락/순환 의존성은 ValueError)"""
+    by_name = {leg.name: leg for leg in legs}
+    for leg in by_name.values():
+        missing = [dep for dep in leg.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"레그 '{leg.name}'의 선행 레그 없음: {missing}")
+    order = TopologicalSorter({leg.name: leg.deps for leg in by_name.values()}).static_order()  # 순환 시 CycleError
+    return {name: by_name[name] for name in order}
+
+
+async def _run_leg(leg: Leg, args: list, executor) -> Any:
+    loop = asyncio.get_running_loop()
+    for attempt in range(leg.retries + 1):
+        try:
+            if leg.blocking:
+                value = await loop.run_in_executor(executor, functools.partial(leg.fn, *args))
+            else:
+                value = leg.fn(*args)
+            if leg.accept is None or leg.accept(value):
+                return value
+            if not leg.retry_empty or attempt >= leg.retries:
+                logger.debug(f"⚠️ {leg.title} 데이터 없음")
+                return leg.default
+            logger.debug(f"🔄 {leg.title} 재시도 예약... ({attempt + 1}/{leg.retries})")
+        except Exception as e:
+            if attempt >= leg.retries:
+                logger.warning(f"❌ {leg.title} 최종 실패: {e}")
+                return leg.default
+            logger.debug(f"🔄 {leg.title} 재시도 예약... ({attempt + 1}/{leg.retries}): {e}")
+        await asyncio.sleep(leg.delay(attempt))  # 타이머 대기 (스레드는 다른 레그 처리)
+    return leg.default
+
+
+async def run_legs_async(legs: Iterable[Leg], executor: Optional[ThreadPoolExecutor] = None,
+                         on_result: Optional[LegCallback] = None) -> Dict[str, Any]:
+    """
+    레그 그래프 실행 (비동기)
+
+    Args:
+        legs: 실행할 레그 (deps는 같은 목록 안의 이름)
+        executor: 블로킹 레그용 스레드 풀 (None이면 shared_leg_executor())
+        on_result: 레그가 끝날 때마다 (이름, 결과) 콜백 - 느린 레그를 기다리지 않고 부분 결과 전달
+
+    Returns:
+        {레그 이름: 결과 (실패 시 default)}
+    """
+    ordered = _ordered(legs)
+    executor = executor or shared_leg_executor()
+    tasks: Dict[str, asyncio.Future] = {}
+
+    async def _node(leg: Leg):
+        args = [await tasks[dep] for dep in leg.deps]
+        value = await _run_leg(leg, args, executor)
+        if on_result is not None:
+            try:
+                on_result(leg.name, value)
+            except Exception as e:
+                logger.debug(f"레그 콜백 실패(무시): {leg.name}: {e}")
+        return value
+
+    for name, leg in ordered.items():
+        tasks[name] = asyncio.ensure_future(_node(leg))
+    values = await asyncio.gather(*tasks.values())
+    return dict(zip(tasks, values))
+
+
+def run_legs(legs: Iterable[Leg], executor: Optional[ThreadPoolExecutor] = None,
+             on_result: Optional[LegCallback] = None) -> Dict[str, Any]:
+    """레그 그래프 실행 (동기 래퍼, 이벤트 루프가 도는 스레드에서도 사용 가능)"""
+    return run_coroutine_sync(run_legs_async(legs, executor=executor, on_result=on_result))
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+순위 API 기반 후보 유니버스 빌더
+
+find_real_value_stocks 1단계(거래량/시가총액/PER/배당 순위 병합)를 재사용 가능한
+컴포넌트로 분리합니다.
+
+- 4개 순위 API를 스레드로 동시 조회 (전역 Rate Limiter가 TPS 보장)
+- 종목코드 키 딕셔너리로 병합 → 후보 수와 무관하게 O(1) 중복 제거
+- 후보마다 출처 태그(_sources) 기록 (예: ['volume', 'per'])
+- 순위 응답은 거래 세션(날짜)별로 캐시 → 같은 세션의 재실행은 API 호출 없음
+  (실패/빈 응답은 캐시하지 않아 다음 실행에서 재시도)
+
+Example:
+    builder = CandidateUniverseBuilder(mcp)
+    candidates = builder.build(pool_size=2000)
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 병합 우선순위 (앞 출처의 행이 대표 행이 됨)
+DEFAULT_SOURCES = ('volume', 'market_cap', 'per', 'dividend')
+
+# 순위 행의 종목코드 필드 (API마다 다름)
+CODE_FIELDS = ('mksc_shrn_iscd', 'stk_shrn_cd', 'sht_cd')
+
+# 후보 행 기본 필드 (순위 응답에 없으면 기본값)
+CANDIDATE_DEFAULTS = {'hts_kor_isnm': '', 'stck_prpr': '0', 'acml_vol': '0', 'prdy_ctrt': '0'}
+
+
+def ranking_code(row: Dict) -> Optional[str]:
+    """순위 행의 6자리 종목코드 (없거나 형식 불일치는 None)"""
+    for field in CODE_FIELDS:
+        code = str(row.get(field) or '').strip()
+        if code:
+            return code if len(code) == 6 else None
+    return None
+
+
+def merge_rankings(rankings: Sequence[Tuple[str, Optional[List[Dict]]]],
+                   pool_size: Optional[int] = None) -> List[Dict]:
+    """
+    순위 응답 병합 (종목코드 키 인덱스, 출처 순서 유지)
+
+    기존 1단계와 같이 출처 경계에서 후보 수가 pool_size 이상이면 이후 출처의
+    신규 종목은 추가하지 않습니다 (이미 있는 종목의 출처 태그는 기록).
+
+    Args:
+        rankings: [(출처, 순위 행 목록)] - 우선순위 순
+        pool_size: 목표 후보 수 (None이면 제한 없음)
+
+    Returns:
+        후보 행 목록 (mksc_shrn_iscd 정규화, _sources 태그 포함)
+    """
+    index: Dict[str, Dict] = {}
+    for source, rows in rankings:
+        accept_new = pool_size is None or len(index) < pool_size
+        for row in rows or []:
+            if not isinstance(row, dict):
+                continue
+            code = ranking_code(row)
+            if code is None:
+                continue
+            candidate = index.get(code)
+            if candidate is not None:
+                if source not in candidate['_sources']:
+                    candidate['_sources'].append(source)
+                continue
+            if not accept_new:
+                continue
+            candidate = {**CANDIDATE_DEFAULTS, **row}
+            candidate['mksc_shrn_iscd'] = code
+            candidate['_sources'] = [source]
+            index[code] = candidate
+    return list(index.values())
+
+
+class CandidateUniverseBuilder:
+    """순위 API 병합 후보 유니버스 (세션별 캐시, 스레드 세이프)"""
+
+    def __init__(self, mcp, sources: Sequence[str] = DEFAULT_SOURCES, max_workers: int = 4):
+        """
+        Args:
+            mcp: MCPKISIntegration 인스턴스 (순위 조회 메서드 제공)
+            sources: 사용할 출처 (우선순위 순)
+            max_workers: 동시 조회 스레드 수
+        """
+        self.mcp = mcp
+        self.sources = tuple(sources)
+        self.max_workers = max(1, max_workers)
+        self._lock = threading.Lock()
+        self._cache: Dict[Tuple[str, str], List[Dict]] = {}  # (세션, 출처) → 순위 행
+
+    def _fetchers(self) -> Dict[str, Callable[[], Optional[List[Dict]]]]:
+        """출처 → 순위 조회 함수"""
+        return {
+            'volume': self.mcp.get_volume_ranking,
+            'market_cap': self.mcp.get_market_cap_ranking,
+            'per': self.mcp.get_per_ranking,
+            'dividend': lambda: self.mcp.get_dividend_ranking(limit=100),
+        }
+
+    @staticmethod
+    def session_key(today: Optional[date] = None) -> str:
+        """거래 세션 키 (날짜)"""
+        return (today or date.today()).isoformat()
+
+    def _fetch(self, source: str, fetcher: Callable) -> Optional[List[Dict]]:
+        try:
+            return fetcher()
+        except Exception as e:
+            logger.warning(f"⚠️ {source} 순위 조회 실패: {e}")
+            return None
+
+    def fetch_rankings(self, today: Optional[date] = None,
+                       refresh: bool = False) -> List[Tuple[str, Optional[List[Dict]]]]:
+        """
+        출처별 순위 행 (세션 캐시 우선, 누락분만 동시 조회)
+
+        Args:
+            today: 세션 날짜 (기본: 오늘)
+            refresh: True면 캐시 무시하고 재조회
+
+        Returns:
+            [(출처, 순위 행 목록 또는 None)] - self.sources 순서
+        """
+        session = self.session_key(today)
+        fetchers = self._fetchers()
+        with self._lock:
+            # 지난 세션 캐시 정리 (refresh면 현재 세션도)
+            self._cache = {k: v for k, v in self._cache.items() if k[0] == session and not refresh}
+            cached = {s: self._cache.get((session, s)) for s in self.sources}
+        missing = [s for s in self.sources if cached[s] is None and s in fetchers]
+
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                futures = {s: executor.submit(self._fetch, s, fetchers[s]) for s in missing}
+                fetched = {s: future.result() for s, future in futures.items()}
+            with self._lock:
+                for source, rows in fetched.items():
+                    if rows:
+                        self._cache[(session, source)] = rows
+            cached.update(fetched)
+            logger.debug(f"순위 조회: {', '.join(f'{s}={len(fetched[s] or [])}' for s in missing)}")
+        else:
+            logger.debug(f"순위 세션 캐시 사용: {session}")
+
+        return [(s, cached[s]) for s in self.sources]
+
+    def build(self, pool_size: Optional[int] = None, today: Optional[date] = None,
+              refresh: bool = False) -> List[Dict]:
+        """
+        병합 후보 유니버스
+
+        Args:
+            pool_size: 목표 후보 수 (merge_rankings 참고)
+            today: 세션 날짜 (기본: 오늘)
+            refresh: 순위 재조회 여부
+
+        Returns:
+            후보 행 목록 (호출마다 새 딕셔너리, 캐시 행은 수정되지 않음)
+        """
+        rankings = self.fetch_rankings(today, refresh)
+        for source, rows in rankings:
+            if not rows:
+                logger.warning(f"⚠️ {source} 순위 조회 실패 (해당 출처 제외)")
+        candidates = merge_rankings(rankings, pool_size)
+        counts = ', '.join(f"{s} {len(rows or [])}" for s, rows in rankings)
+        logger.debug(f"✅ 후보 유니버스: {len(candidates)}개 (목표 {pool_size}, 순위 {counts})")
+        return candidates
+
+    def invalidate(self):
+        """세션 캐시 비우기"""
+        with self._lock:
+            self._cache.clear()
@@ -228,6 +228,105 @@ def smoke(
         analyzer.close()
 
 
+SCREEN_STRATEGIES = {
+    "safe": "안전 모드 (배치 처리)",
+    "fast": "빠른 모드 (병렬 처리)",
+    "sequential": "순차 모드 (안전)",
+}
+
+
+@app.command()
+def screen(
+    max_stocks: int = typer.Option(250, help="스크리닝할 시총 상위 종목 수"),
+    strategy: str = typer.Option("safe", help="API 호출 전략 (safe/fast/sequential)"),
+    score_min_pct: float = typer.Option(50.0, help="최소 점수 (퍼센트)"),
+    per_max: float = typer.Option(15.0, help="PER 상한"),
+    pbr_max: float = typer.Option(1.5, help="PBR 상한"),
+    roe_min: float = typer.Option(10.0, help="ROE 하한 (%)"),
+    cpu_workers: int = typer.Option(0, help="평가 프로세스 수(0=자동: CPU 수-1, 1=현재 프로세스)"),
+    output: str = typer.Option(None, help="결과 출력 파일 경로 (.json 또는 .csv)"),
+    top: int = typer.Option(20, help="콘솔에 표시할 상위 종목 수"),
+    refresh: bool = typer.Option(False, help="저장된 같은 날·같은 옵션 결과를 무시하고 다시 계산"),
+):
+    """유니버스 가치주 스크리닝 (Streamlit 없이 실행, 야간 배치용)"""
+    _setup_logging_if_needed()
+
+    if strategy not in SCREEN_STRATEGIES:
+        typer.echo(f"알 수 없는 전략: {strategy} (safe/fast/sequential)", err=True)
+        raise typer.Exit(code=2)
+
+    from screening_engine import ScreeningEngine, default_cpu_workers
+
+    options = {
+        "max_stocks": max_stocks,
+        "api_strategy": SCREEN_STRATEGIES[strategy],
+        "score_min_pct": score_min_pct,
+        "per_max": per_max,
+        "pbr_max": pbr_max,
+        "roe_min": roe_min,
+        "cpu_workers": cpu_workers or default_cpu_workers(),  # 프로세스 풀은 CLI에서만 명시적으로 사용
+    }
+    last_step = {}
+
+    def on_progress(stage: str, done: int, total: int):
+        # 단계별 10% 단위로만 출력
+        step = done * 10 // max(total, 1)
+        if last_step.get(stage) != step:
+            last_step[stage] = step
+            console.print(f"[dim]{stage}: {done}/{total}[/dim]")
+
+    try:
+        result = ScreeningEngine().run(options, on_progress=on_progress, refresh=refresh)
+    except Exception as e:
+        typer.echo(f"스크리닝 실패: {e}", err=True)
+        raise typer.Exit(code=1)
+
+    summary = result.summary()
+    df = result.to_dataframe()
+    if output:
+        if output.lower().endswith(".csv"):
+            df.to_csv(output, index=False, encoding="utf-8-sig")
+        else:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(serialize_for_json({"summary": summary, "results": df.to_dict("records")}),
+                          f, ensure_ascii=False, indent=2)
+        typer.echo(f"결과가 {output}에 저장되었습니다.")
+
+    console.print(
+        f"\n[bold green]스크리닝 완료: 대상 {summary['universe_size']}개 → 평가 {summary['scored']}개 "
+        f"({summary['elapsed_sec']:.1f}초)[/bold green]"
+    )
+    if summary["from_store"]:
+        console.print(f"[dim]저장된 결과 사용 ({summary['snapshot_date']}, {summary['code_version']})[/dim]")
+    elif summary["reused"]:
+        console.print(f"[dim]입력 변화 없는 {summary['reused']}개 종목은 직전 결과 재사용[/dim]")
+    if summary["errors"]:
+        console.print(f"[yellow]오류: {summary['errors']}[/yellow]")
+    if df.empty:
+        return
+
+    table = Table(title="가치주 스크리닝 결과")
+    table.add_column("순위", style="cyan", no_wrap=True)
+    table.add_column("종목코드", style="magenta")
+    table.add_column("종목명", style="green")
+    table.add_column("섹터", style="blue")
+    table.add_column("점수", justify="right", style="yellow")
+    table.add_column("등급", style="red")
+    table.add_column("추천")
+    ranked = df.sort_values("value_score", ascending=False).head(top)
+    for i, row in enumerate(ranked.itertuples(index=False), 1):
+        table.add_row(
+            str(i),
+            row.symbol,
+            row.name[:15] + "..." if len(row.name) > 15 else row.name,
+            str(row.sector or ""),
+            f"{row.value_score:.1f}",
+            str(row.grade),
+            str(row.recommendation),
+        )
+    console.print(table)
+
+
 def main():
     """CLI 메인 함수"""
     app()
@@ -11,16 +11,17 @@ DART API 기업 고유번호 조회 모듈 (개선된 버전)
 import requests
 import io
 import zipfile
-import xml.etree.ElementTree as ET
 import pandas as pd
 import json
 import os
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
-from difflib import SequenceMatcher
 import time
 
+from dart_corp_index import CORP_FIELDS, DartCorpIndex, compile_corp_codes, get_dart_corp_index, parse_corp_code_xml
+from name_index import NameIndex
+
 logger = logging.getLogger(__name__)
 
 class DARTCorpCodeManager:
@@ -29,7 +30,8 @@ class DARTCorpCodeManager:
     def __init__(self, api_key: str, cache_dir: str = "cache"):
         self.api_key = api_key
         self.cache_dir = cache_dir
-        self.cache_file = os.path.join(cache_dir, "dart_corp_codes.json")
+        self.cache_file = os.path.join(cache_dir, "dart_corp_codes.json")  # 이전 버전 JSON 캐시 (읽기 전용)
+        self.index_file = os.path.join(cache_dir, "dart", "corp_codes.bin")  # mmap 바이너리 인덱스
         self.cache_expiry_hours = 24  # 24시간 캐시 유지
         
         # 캐시 디렉토리 생성
@@ -38,26 +40,46 @@ class DARTCorpCodeManager:
         # 메모리 캐시
         self._corp_codes_df = None
         self._corp_codes_dict = None
+        self._name_index = None  # 기업명 검색 인덱스 (NameIndex)
+        self._name_index_df = None  # 인덱스를 만든 DataFrame (행 id 기준)
         self._last_update = None
     
+    def _cache_path(self) -> str:
+        """현재 캐시 파일 (바이너리 인덱스 우선, 없으면 이전 JSON)"""
+        return self.index_file if os.path.exists(self.index_file) else self.cache_file
+    
     def _is_cache_valid(self) -> bool:
         """캐시가 유효한지 확인합니다."""
-        if not os.path.exists(self.cache_file):
+        cache_path = self._cache_path()
+        if not os.path.exists(cache_path):
             return False
         
         try:
-            cache_time = datetime.fromtimestamp(os.path.getmtime(self.cache_file))
+            cache_time = datetime.fromtimestamp(os.path.getmtime(cache_path))
             return datetime.now() - cache_time < timedelta(hours=self.cache_expiry_hours)
         except Exception:
             return False
     
+    def get_index(self) -> Optional[DartCorpIndex]:
+        """mmap 바이너리 인덱스 (종목코드/고유번호 이진 탐색, 없으면 None)"""
+        return get_dart_corp_index(self.index_file)
+    
+    @staticmethod
+    def _records_to_df(records: List[Dict[str, str]]) -> pd.DataFrame:
+        df = pd.DataFrame(records, columns=list(CORP_FIELDS))
+        df['is_listed'] = df['stock_code'].astype(bool)  # 상장 여부
+        return df
+    
     def _load_from_cache(self) -> Optional[pd.DataFrame]:
         """캐시에서 데이터를 로드합니다."""
         try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            df = pd.DataFrame(cache_data['corp_codes'])
+            index = self.get_index()
+            if index is not None:
+                df = self._records_to_df(list(index.records()))
+            else:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    cache_data = json.load(f)
+                df = pd.DataFrame(cache_data['corp_codes'])
             logger.info(f"✅ 캐시에서 {len(df):,}개 기업 데이터 로드 완료")
             return df
         except Exception as e:
@@ -65,17 +87,9 @@ class DARTCorpCodeManager:
             return None
     
     def _save_to_cache(self, df: pd.DataFrame) -> None:
-        """데이터를 캐시에 저장합니다."""
+        """데이터를 캐시(바이너리 인덱스)에 저장합니다."""
         try:
-            cache_data = {
-                'corp_codes': df.to_dict('records'),
-                'last_update': datetime.now().isoformat(),
-                'total_count': len(df)
-            }
-            
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, ensure_ascii=False, indent=2)
-            
+            compile_corp_codes(df.to_dict('records'), self.index_file)
             logger.info(f"✅ {len(df):,}개 기업 데이터 캐시 저장 완료")
         except Exception as e:
             logger.error(f"❌ 캐시 저장 실패: {e}")
@@ -95,6 +109,7 @@ class DARTCorpCodeManager:
             cached_df = self._load_from_cache()
             if cached_df is not None:
                 self._corp_codes_df = cached_df
+                self._name_index = None
                 self._last_update = datetime.now()
                 return cached_df
         
@@ -118,36 +133,16 @@ class DARTCorpCodeManager:
                 xml_filename = zf.namelist()[0]
                 logger.info(f"✅ Zip 파일 수신 완료, '{xml_filename}' 압축 해제 중...")
                 
-                with zf.open(xml_filename) as f:
-                    tree = ET.parse(f)
-                    root = tree.getroot()
-
-                    corp_list = []
-                    for item in root.findall('.//list'):
-                        corp_code = item.findtext('corp_code')
-                        corp_name = item.findtext('corp_name')
-                        stock_code = item.findtext('stock_code', '').strip()
-                        modify_date = item.findtext('modify_date')
-                        
-                        # 유효한 데이터만 추가
-                        if corp_code and corp_name:
-                            corp_list.append({
-                                'corp_code': corp_code,
-                                'corp_name': corp_name,
-                                'stock_code': stock_code,
-                                'modify_date': modify_date,
-                                'is_listed': bool(stock_code)  # 상장 여부
-                            })
-                    
-                    df = pd.DataFrame(corp_list)
-                    logger.info(f"✅ 데이터 파싱 완료. 총 {len(df):,}개의 기업 정보를 변환합니다.")
-                    
-                    # 캐시에 저장
-                    self._save_to_cache(df)
-                    
-                    self._corp_codes_df = df
-                    self._last_update = datetime.now()
-                    return df
+                df = self._records_to_df(parse_corp_code_xml(zf.read(xml_filename)))
+                logger.info(f"✅ 데이터 파싱 완료. 총 {len(df):,}개의 기업 정보를 변환합니다.")
+                
+                # 캐시에 저장
+                self._save_to_cache(df)
+                
+                self._corp_codes_df = df
+                self._name_index = None
+                self._last_update = datetime.now()
+                return df
 
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ API 요청 중 오류 발생: {e}")
@@ -189,29 +184,37 @@ class DARTCorpCodeManager:
         if company_name in corp_codes_dict:
             return corp_codes_dict[company_name]
         
-        # 유사도 기반 매칭
-        best_match = None
-        best_score = 0.0
-        
-        for corp_name in corp_codes_dict.keys():
-            # 정규화된 기업명으로 비교
-            normalized_name = self._normalize_company_name(company_name)
-            normalized_corp_name = self._normalize_company_name(corp_name)
-            
-            # 유사도 계산
-            similarity = SequenceMatcher(None, normalized_name, normalized_corp_name).ratio()
-            
-            if similarity > best_score and similarity >= threshold:
-                best_score = similarity
-                best_match = corp_name
-        
-        if best_match:
+        # 유사도 기반 매칭 (2-gram 인덱스로 후보 제한)
+        matches = self.get_name_index().fuzzy(company_name, threshold=threshold)
+        if matches:
+            best_id, best_score = matches[0]
+            best_match = self._name_index.names[best_id]
             logger.info(f"🔍 '{company_name}' -> '{best_match}' (유사도: {best_score:.2f})")
-            return corp_codes_dict[best_match]
+            return corp_codes_dict.get(best_match, self._name_index.value(best_id))
         
         logger.warning(f"⚠️ '{company_name}'에 대한 매칭을 찾을 수 없습니다.")
         return None
     
+    def get_name_index(self, force_refresh: bool = False) -> NameIndex:
+        """
+        기업명 검색 인덱스 (최초 1회 구축, 새로고침 시 재구축)
+        
+        Returns:
+            NameIndex (id = 기업 고유번호 DataFrame 행 위치, 값 = corp_code)
+        """
+        if self._name_index is None or force_refresh:
+            df = self._corp_codes_df
+            if df is None or force_refresh:
+                df = self.get_dart_corp_codes(force_refresh)
+            if df is None or df.empty:
+                df = pd.DataFrame(columns=['corp_name', 'corp_code', 'stock_code'])
+            df = df.reset_index(drop=True)
+            self._name_index = NameIndex(df['corp_name'].tolist(), values=df['corp_code'].tolist(),
+                                         normalizer=self._normalize_company_name)
+            self._name_index_df = df
+            logger.debug(f"기업명 인덱스 구축: {len(df):,}개")
+        return self._name_index
+    
     def _normalize_company_name(self, name: str) -> str:
         """기업명을 정규화합니다."""
         if not name:
@@ -237,23 +240,24 @@ class DARTCorpCodeManager:
     
     def search_companies(self, keyword: str, limit: int = 10) -> List[Dict[str, str]]:
         """키워드로 기업을 검색합니다."""
-        df = self.get_dart_corp_codes()
-        if df is None:
+        index = self.get_name_index()
+        if not len(index):
             return []
         
-        # 키워드가 포함된 기업들 필터링
-        mask = df['corp_name'].str.contains(keyword, case=False, na=False)
-        results = df[mask].head(limit)
+        # 키워드가 포함된 기업들 (대소문자 무시, 2-gram 인덱스)
+        ids = index.contains(keyword, limit=limit)
+        results = self._name_index_df.iloc[ids]
         
         return results[['corp_name', 'corp_code', 'stock_code']].to_dict('records')
     
     def get_cache_info(self) -> Dict[str, Any]:
         """캐시 정보를 반환합니다."""
-        if not os.path.exists(self.cache_file):
+        cache_path = self._cache_path()
+        if not os.path.exists(cache_path):
             return {"status": "no_cache"}
         
         try:
-            cache_time = datetime.fromtimestamp(os.path.getmtime(self.cache_file))
+            cache_time = datetime.fromtimestamp(os.path.getmtime(cache_path))
             age_hours = (datetime.now() - cache_time).total_seconds() / 3600
             
             return {
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로컬 일봉 저장소 (증분 누적 + 벡터화 모멘텀)
+
+차트 API를 매번 100일씩 다시 받는 대신 stock_snapshots 옆의 daily_bars 테이블에
+일봉을 누적하고, 종목별로 마지막 저장 거래일 이후 구간만 조회합니다.
+
+- 최초 1회: 종목당 BACKFILL_DAYS(달력일) 1페이지 조회
+- 이후: 마지막 거래일~오늘 구간만 조회 (마지막 봉 포함 → 장중 봉 확정)
+- 같은 날 이미 조회한 종목은 건너뜀 → 종목당 하루 최대 1회 차트 호출
+- 조회는 MCPKISIntegration.get_chart_data_many (비동기 동시 조회, 전역 Rate Limiter)
+- 모멘텀은 DB의 종가 행렬에서 전 종목 한 번에 계산
+
+Example:
+    store = DailyBarStore(mcp)
+    store.sync(symbols)
+    momentum = store.momentum(symbols, target_lookback=60)
+"""
+
+import logging
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 최초 적재 기간 (달력일) - 차트 API 1페이지(최대 100봉)에 들어가는 범위
+BACKFILL_DAYS = 150
+
+# 모멘텀 최소 봉 수 (3개월)
+MIN_MOMENTUM_BARS = 60
+
+# 차트 응답 필드 → daily_bars 컬럼
+CHART_FIELDS = {
+    'stck_bsop_date': 'trade_date',
+    'stck_oprc': 'open_price',
+    'stck_hgpr': 'high_price',
+    'stck_lwpr': 'low_price',
+    'stck_clpr': 'close_price',
+    'acml_vol': 'volume',
+    'acml_tr_pbmn': 'trading_value',
+}
+
+BAR_COLUMNS = ['stock_code'] + list(CHART_FIELDS.values())
+
+
+def _normalize_codes(symbols: Iterable) -> List[str]:
+    """6자리 종목코드 정규화 + 순서 유지 중복 제거"""
+    codes = (str(s).strip().zfill(6) for s in symbols if s)
+    return list(dict.fromkeys(c for c in codes if c.isdigit() and len(c) == 6))
+
+
+def chart_rows_to_frame(charts: Dict[str, List[Dict]]) -> pd.DataFrame:
+    """
+    차트 API 응답 {종목코드: 행 목록} → daily_bars 형식 DataFrame
+
+    날짜가 없거나 잘못된 행은 제외하고, 같은 종목·거래일은 마지막 행을 사용합니다.
+    """
+    records = [
+        (code, *(row.get(field) for field in CHART_FIELDS))
+        for code, rows in (charts or {}).items()
+        for row in (rows or [])
+        if isinstance(row, dict)
+    ]
+    frame = pd.DataFrame(records, columns=BAR_COLUMNS)
+    if frame.empty:
+        return frame
+
+    trade_date = pd.to_datetime(frame['trade_date'], format='%Y%m%d', errors='coerce')
+    frame = frame[trade_date.notna()].copy()
+    frame['trade_date'] = trade_date[trade_date.notna()].dt.strftime('%Y-%m-%d')
+    for column in BAR_COLUMNS[2:]:
+        frame[column] = pd.to_numeric(frame[column], errors='coerce')
+    return frame.drop_duplicates(['stock_code', 'trade_date'], keep='last').reset_index(drop=True)
+
+
+def compute_momentum(closes: pd.DataFrame, symbols: Sequence[str], target_lookback: int = 60,
+                     min_bars: int = MIN_MOMENTUM_BARS) -> pd.DataFrame:
+    """
+    종목별 모멘텀 수익률 (종가 행렬 1회 구성, 종목 루프 없음)
+
+    find_real_value_stocks의 어댑티브 창 규칙과 같습니다.
+    - N ≥ target_lookback: lookback = target_lookback, 라벨 '{target/20}M'
+    - min_bars ≤ N < target_lookback: lookback = min(N-1, 60), 라벨 '3M'
+    - 수익률 = (최근 종가 / lookback번째 전 종가 - 1) × 100
+
+    Args:
+        closes: stock_code, trade_date, close_price 긴 형식 DataFrame
+        symbols: 결과에 포함할 종목 (데이터 없으면 reason 기록)
+        target_lookback: 목표 창 (봉 수)
+        min_bars: 최소 봉 수
+
+    Returns:
+        index=종목코드, columns=[bars, lookback, ret_pct, period_label, max_bonus, reason]
+        (계산 실패 종목은 ret_pct=NaN, reason에 사유)
+    """
+    symbols = list(symbols)
+    window = max(target_lookback, min_bars + 1)
+    result = pd.DataFrame(index=pd.Index(symbols, name='stock_code'))
+    result['bars'] = 0
+    result['lookback'] = 0
+    result['ret_pct'] = np.nan
+    result['period_label'] = None
+    result['max_bonus'] = 0.0
+    result['reason'] = "차트 데이터 없음"
+    if closes is None or closes.empty:
+        return result
+
+    frame = closes[closes['stock_code'].isin(symbols)].sort_values(['stock_code', 'trade_date'])
+    position = frame.groupby('stock_code').cumcount(ascending=False)  # 0 = 최근 봉
+    frame = frame.assign(position=position)[position < window]
+    matrix = frame.pivot(index='position', columns='stock_code', values='close_price').sort_index()
+    if matrix.empty:
+        return result
+
+    codes = matrix.columns
+    n = frame.groupby('stock_code').size().reindex(codes).to_numpy()
+    full = n >= target_lookback
+    enough = full | (n >= min_bars)
+    lookback = np.where(full, target_lookback, np.minimum(n - 1, 60))
+
+    values = matrix.to_numpy(dtype=np.float64)
+    cols = np.arange(len(codes))
+    price_now = values[0, cols]
+    price_past = values[np.clip(lookback - 1, 0, len(values) - 1), cols]
+    with np.errstate(invalid='ignore'):
+        past_ok = price_past > 0
+        now_ok = price_now > 0
+    ok = enough & past_ok & now_ok
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ret_pct = np.where(ok, ((price_now - price_past) / price_past) * 100.0, np.nan)
+
+    label = np.where(full, f"{int(target_lookback / 20)}M", "3M")
+    max_bonus = np.where(full, 20.0 if target_lookback >= 100 else 10.0, 10.0)
+    reason = np.select(
+        [~enough, ~past_ok, ~now_ok],
+        [np.char.add(np.char.add("데이터 부족 (", n.astype(str)), "일)"),
+         np.char.add(label, " 전 가격 없음"),
+         np.full(len(codes), "현재 가격 없음")],
+        default=''
+    )
+
+    result.loc[codes, 'bars'] = n
+    result.loc[codes, 'lookback'] = np.where(enough, lookback, 0)
+    result.loc[codes, 'ret_pct'] = ret_pct
+    result.loc[codes, 'period_label'] = np.where(ok, label, None)
+    result.loc[codes, 'max_bonus'] = np.where(ok, max_bonus, 0.0)
+    result.loc[codes, 'reason'] = np.where(ok, None, reason)
+    return result
+
+
+class DailyBarStore:
+    """daily_bars 테이블 기반 증분 일봉 저장소"""
+
+    def __init__(self, mcp=None, db=None, backfill_days: int = BACKFILL_DAYS):
+        """
+        Args:
+            mcp: MCPKISIntegration 인스턴스 (get_chart_data_many 제공, None이면 조회 없이 저장분만 사용)
+            db: DBCacheManager (기본: 전역 DB 캐시)
+            backfill_days: 최초 적재 기간 (달력일)
+        """
+        if db is None:
+            from db_cache_manager import get_db_cache
+            db = get_db_cache()
+        self.mcp = mcp
+        self.db = db
+        self.backfill_days = backfill_days
+
+    def plan_sync(self, symbols: Iterable, today: Optional[date] = None) -> Dict[int, List[str]]:
+        """
+        종목별 조회 구간 계산
+
+        Returns:
+            {조회 기간(달력일): [종목코드, ...]} - 오늘 이미 조회한 종목은 제외
+        """
+        today = today or date.today()
+        codes = _normalize_codes(symbols)
+        state = self.db.get_daily_bar_sync_state(codes)
+        plan: Dict[int, List[str]] = {}
+        for code in codes:
+            synced_date, last_trade_date = state.get(code, (None, None))
+            if synced_date == today.isoformat():
+                continue
+            if last_trade_date:
+                # 마지막 저장 봉부터 재조회 (장중에 받은 봉 확정)
+                days = (today - date.fromisoformat(last_trade_date)).days + 1
+                days = max(1, min(days, self.backfill_days))
+            else:
+                days = self.backfill_days
+            plan.setdefault(days, []).append(code)
+        return plan
+
+    def sync(self, symbols: Iterable, today: Optional[date] = None) -> Dict[str, int]:
+        """
+        누락 구간만 차트 API로 조회해 저장
+
+        Returns:
+            {'requested', 'fetched', 'failed', 'skipped', 'bars'}
+        """
+        today = today or date.today()
+        codes = _normalize_codes(symbols)
+        plan = self.plan_sync(codes, today)
+        due = sum(len(group) for group in plan.values())
+        stats = {'requested': len(codes), 'fetched': 0, 'failed': 0,
+                 'skipped': len(codes) - due, 'bars': 0}
+        if not plan or self.mcp is None:
+            return stats
+
+        for days, group in sorted(plan.items()):
+            charts = self.mcp.get_chart_data_many(group, period='D', days=days, use_pagination=False)
+            frame = chart_rows_to_frame(charts)
+            fetched = [code for code in group if charts.get(code)]
+            stats['fetched'] += len(fetched)
+            stats['failed'] += len(group) - len(fetched)
+            # 응답 받은 종목만 동기화 완료 처리 (실패 종목은 다음 호출에서 재시도)
+            stats['bars'] += self.db.save_daily_bars(frame, synced_codes=fetched, synced_date=today)
+
+        logger.info(
+            f"📈 일봉 동기화: 조회 {stats['fetched']}/{due}개, 실패 {stats['failed']}개, "
+            f"오늘 조회분 {stats['skipped']}개 건너뜀, 저장 {stats['bars']}봉"
+        )
+        return stats
+
+    def momentum(self, symbols: Iterable, target_lookback: int = 60,
+                 min_bars: int = MIN_MOMENTUM_BARS) -> pd.DataFrame:
+        """저장된 일봉으로 종목별 모멘텀 계산 (compute_momentum 참고)"""
+        codes = _normalize_codes(symbols)
+        closes = self.db.get_daily_closes(codes, max_bars=max(target_lookback, min_bars + 1))
+        return compute_momentum(closes, codes, target_lookback, min_bars)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+DART 기업 고유번호 바이너리 인덱스 (mmap + 이진 탐색)
+
+다운로드한 CORPCODE.xml을 한 번만 정렬된 고정폭 바이너리 파일로 컴파일하고,
+조회하는 프로세스는 파일을 mmap으로 열어 이진 탐색합니다.
+
+- 시작 비용 없음: JSON/XML → dict/DataFrame 재구성 없이 열자마자 조회
+- 메모리 공유: 읽기 전용 mmap이라 여러 워커가 같은 페이지 캐시 사용
+- 교체는 임시 파일 + os.replace (열려 있는 mmap은 이전 파일을 계속 사용)
+
+파일 구조 (리틀엔디안):
+    헤더    : magic(4) version(H) reserved(H) 기업 수(I) 종목 수(I) 이름 영역 크기(I)
+    기업 표 : corp_code 오름차순 [corp_code(8) stock_code(6) modify_date(8) 이름 오프셋(I) 이름 길이(H)]
+    종목 표 : stock_code 오름차순 [stock_code(6) 기업 표 위치(I)]
+    이름    : UTF-8 이름 연속 저장
+
+Example:
+    compile_corp_code_xml(xml_bytes, 'cache/dart/corp_codes.bin')
+    index = get_dart_corp_index()
+    index.corp_code_for_stock('005930')   # '00126380'
+"""
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+import threading
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 기본 인덱스 경로 (DartDataProvider 캐시 디렉토리)
+DEFAULT_INDEX_PATH = os.path.join('cache', 'dart', 'corp_codes.bin')
+
+INDEX_MAGIC = b'DCIX'
+INDEX_VERSION = 1
+
+_HEADER = struct.Struct('<4sHHIII')
+_CORP_RECORD = struct.Struct('<8s6s8sIH')  # 28바이트
+_STOCK_RECORD = struct.Struct('<6sI')  # 10바이트
+
+CORP_FIELDS = ('corp_code', 'corp_name', 'stock_code', 'modify_date')
+
+
+def parse_corp_code_xml(xml_data: bytes) -> List[Dict[str, str]]:
+    """
+    CORPCODE.xml → 기업 레코드 목록
+
+    Returns:
+        [{'corp_code', 'corp_name', 'stock_code', 'modify_date'}] (corp_code/corp_name 없는 행 제외)
+    """
+    records = []
+    for item in ET.fromstring(xml_data).iter('list'):
+        corp_code = (item.findtext('corp_code') or '').strip()
+        corp_name = (item.findtext('corp_name') or '').strip()
+        if not corp_code or not corp_name:
+            continue
+        records.append({
+            'corp_code': corp_code,
+            'corp_name': corp_name,
+            'stock_code': (item.findtext('stock_code') or '').strip(),
+            'modify_date': (item.findtext('modify_date') or '').strip(),
+        })
+    return records
+
+
+def _fixed(value: str, width: int) -> bytes:
+    return (value or '').encode('ascii', errors='ignore')[:width].ljust(width, b' ')
+
+
+def compile_corp_codes(records: Iterable[Dict[str, str]], path: str = DEFAULT_INDEX_PATH) -> int:
+    """
+    기업 레코드 → 바이너리 인덱스 파일 (원자적 교체)
+
+    같은 corp_code / stock_code가 여러 번 나오면 뒤 레코드를 사용합니다 (기존 dict 매핑과 동일).
+
+    Returns:
+        기록한 기업 수
+    """
+    by_corp: Dict[str, Dict[str, str]] = {}
+    for record in records:
+        corp_code = str(record.get('corp_code') or '').strip()
+        if corp_code:
+            by_corp[corp_code] = record
+
+    corp_codes = sorted(by_corp)
+    names = bytearray()
+    corp_table = bytearray()
+    stocks: Dict[str, int] = {}
+    for position, corp_code in enumerate(corp_codes):
+        record = by_corp[corp_code]
+        name = str(record.get('corp_name') or '').encode('utf-8')[:0xFFFF]
+        stock_code = str(record.get('stock_code') or '').strip()
+        corp_table += _CORP_RECORD.pack(_fixed(corp_code, 8), _fixed(stock_code, 6),
+                                        _fixed(str(record.get('modify_date') or ''), 8),
+                                        len(names), len(name))
+        names += name
+        if stock_code:
+            stocks[stock_code] = position
+
+    stock_table = b''.join(_STOCK_RECORD.pack(_fixed(code, 6), stocks[code]) for code in sorted(stocks))
+    header = _HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 0, len(corp_codes), len(stocks), len(names))
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header)
+        f.write(corp_table)
+        f.write(stock_table)
+        f.write(names)
+    if os.name == 'nt':
+        # Windows는 mmap으로 열린 파일을 교체할 수 없어 이 프로세스의 매핑을 먼저 해제
+        _release(path)
+    os.replace(tmp_path, path)
+    logger.info(f"✅ DART 고유번호 인덱스 컴파일: {len(corp_codes):,}개 기업, {len(stocks):,}개 종목 → {path}")
+    return len(corp_codes)
+
+
+def compile_corp_code_xml(xml_data: bytes, path: str = DEFAULT_INDEX_PATH) -> int:
+    """CORPCODE.xml 바이트 → 바이너리 인덱스 파일"""
+    return compile_corp_codes(parse_corp_code_xml(xml_data), path)
+
+
+class _KeyView:
+    """mmap 고정폭 레코드의 키 열 (bisect용 읽기 전용 시퀀스)"""
+
+    def __init__(self, buf, offset: int, stride: int, width: int, count: int):
+        self._buf = buf
+        self._offset = offset
+        self._stride = stride
+        self._width = width
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> bytes:
+        start = self._offset + i * self._stride
+        return self._buf[start:start + self._width]
+
+
+class DartCorpIndex:
+    """mmap 기반 DART 고유번호 인덱스 (읽기 전용, 스레드 세이프)"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: compile_corp_codes()로 만든 인덱스 파일
+
+        Raises:
+            ValueError: 형식/버전 불일치
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, self.corp_count, self.stock_count, names_size = _HEADER.unpack_from(self._mmap, 0)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self._mmap.close()
+            raise ValueError(f"DART 고유번호 인덱스 형식 불일치: {path}")
+
+        self._corp_offset = _HEADER.size
+        self._stock_offset = self._corp_offset + self.corp_count * _CORP_RECORD.size
+        self._names_offset = self._stock_offset + self.stock_count * _STOCK_RECORD.size
+        if self._names_offset + names_size > len(self._mmap):
+            self._mmap.close()
+            raise ValueError(f"DART 고유번호 인덱스 손상 (크기 부족): {path}")
+
+        self._corp_keys = _KeyView(self._mmap, self._corp_offset, _CORP_RECORD.size, 8, self.corp_count)
+        self._stock_keys = _KeyView(self._mmap, self._stock_offset, _STOCK_RECORD.size, 6, self.stock_count)
+
+    def __len__(self) -> int:
+        return self.corp_count
+
+    def close(self):
+        self._mmap.close()
+
+    @staticmethod
+    def _find(keys: _KeyView, key: bytes) -> Optional[int]:
+        i = bisect.bisect_left(keys, key)
+        return i if i < len(keys) and keys[i] == key else None
+
+    def _record(self, position: int) -> Dict[str, str]:
+        corp_code, stock_code, modify_date, name_offset, name_length = _CORP_RECORD.unpack_from(
+            self._mmap, self._corp_offset + position * _CORP_RECORD.size
+        )
+        start = self._names_offset + name_offset
+        return {
+            'corp_code': corp_code.decode('ascii').rstrip(),
+            'corp_name': self._mmap[start:start + name_length].decode('utf-8'),
+            'stock_code': stock_code.decode('ascii').rstrip(),
+            'modify_date': modify_date.decode('ascii').rstrip(),
+        }
+
+    def _stock_position(self, stock_code: str) -> Optional[int]:
+        i = self._find(self._stock_keys, _fixed(str(stock_code).strip(), 6))
+        if i is None:
+            return None
+        _, position = _STOCK_RECORD.unpack_from(self._mmap, self._stock_offset + i * _STOCK_RECORD.size)
+        return position
+
+    def corp_code_for_stock(self, stock_code: str) -> Optional[str]:
+        """종목코드 → 고유번호 (없으면 None)"""
+        position = self._stock_position(stock_code)
+        if position is None:
+            return None
+        start = self._corp_offset + position * _CORP_RECORD.size
+        return self._mmap[start:start + 8].decode('ascii').rstrip()
+
+    def by_stock_code(self, stock_code: str) -> Optional[Dict[str, str]]:
+        """종목코드 → 기업 레코드"""
+        position = self._stock_position(stock_code)
+        return self._record(position) if position is not None else None
+
+    def by_corp_code(self, corp_code: str) -> Optional[Dict[str, str]]:
+        """고유번호 → 기업 레코드"""
+        position = self._find(self._corp_keys, _fixed(str(corp_code).strip(), 8))
+        return self._record(position) if position is not None else None
+
+    def records(self) -> Iterator[Dict[str, str]]:
+        """전체 기업 레코드 (corp_code 오름차순)"""
+        for position in range(self.corp_count):
+            yield self._record(position)
+
+    def stock_mapping(self) -> Iterator[Tuple[str, str]]:
+        """(종목코드, 고유번호) - 종목코드 오름차순"""
+        for i in range(self.stock_count):
+            stock_code, position = _STOCK_RECORD.unpack_from(self._mmap, self._stock_offset + i * _STOCK_RECORD.size)
+            start = self._corp_offset + position * _CORP_RECORD.size
+            yield stock_code.decode('ascii').rstrip(), self._mmap[start:start + 8].decode('ascii').rstrip()
+
+
+# ============================================
+# 프로세스 전역 인스턴스 (파일 교체 시 재오픈)
+# ============================================
+_indexes: Dict[str, Tuple[Tuple, DartCorpIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def _release(path: str):
+    with _indexes_lock:
+        entry = _indexes.pop(path, None)
+    if entry is not None:
+        entry[1].close()
+
+
+def get_dart_corp_index(path: str = DEFAULT_INDEX_PATH) -> Optional[DartCorpIndex]:
+    """
+    프로세스 공유 인덱스 (파일 없거나 손상 시 None)
+
+    (수정시각, 크기)가 바뀌면 새 파일을 다시 엽니다.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (stat.st_mtime_ns, stat.st_size)
+    entry = _indexes.get(path)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    with _indexes_lock:
+        entry = _indexes.get(path)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        try:
+            index = DartCorpIndex(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"⚠️ DART 고유번호 인덱스 열기 실패: {e}")
+            return None
+        _indexes[path] = (key, index)  # 이전 인덱스는 참조가 사라지면 해제
+        return index
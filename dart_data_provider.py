@@ -15,11 +15,12 @@ import yaml
 import os
 import zipfile
 import io
-import xml.etree.ElementTree as ET
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import time
 
+from dart_corp_index import compile_corp_code_xml, get_dart_corp_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,7 +51,8 @@ class DartDataProvider:
         self.timeout = 12
         
         # 캐시
-        self.corp_code_cache = {}  # 종목코드 → 고유번호 매핑
+        self.corp_code_cache = {}  # 종목코드 → 고유번호 매핑 (이전 JSON 캐시/수동 매핑)
+        self.corp_index = None  # mmap 바이너리 인덱스 (dart_corp_index.DartCorpIndex)
         self.company_info_cache = {}  # 기업 정보
         
         # 캐시 디렉토리
@@ -73,8 +75,17 @@ class DartDataProvider:
             logger.warning(f"config.yaml 로드 실패: {e}")
             return None
     
+    @property
+    def corp_index_path(self) -> str:
+        return os.path.join(self.cache_dir, 'corp_codes.bin')
+    
     def _load_corp_code_cache(self):
-        """고유번호 캐시 파일 로드"""
+        """고유번호 인덱스 열기 (mmap, 파싱 없음) - 없으면 이전 JSON 캐시 로드"""
+        self.corp_index = get_dart_corp_index(self.corp_index_path)
+        if self.corp_index is not None:
+            logger.info(f"✅ DART 고유번호 인덱스: {self.corp_index.stock_count}개 종목")
+            return
+        
         cache_file = os.path.join(self.cache_dir, 'corp_code_mapping.json')
         
         if os.path.exists(cache_file):
@@ -110,6 +121,12 @@ class DartDataProvider:
         if stock_code in self.corp_code_cache:
             return self.corp_code_cache[stock_code]
         
+        # 바이너리 인덱스 (이진 탐색)
+        if self.corp_index is not None:
+            corp_code = self.corp_index.corp_code_for_stock(stock_code)
+            if corp_code:
+                return corp_code
+        
         # 수동 매핑 (주요 종목)
         known_mappings = {
             '005930': '00126380',  # 삼성전자
@@ -432,25 +449,13 @@ class DartDataProvider:
             zip_file = zipfile.ZipFile(io.BytesIO(response.content))
             xml_data = zip_file.read('CORPCODE.xml')
             
-            # XML 파싱
-            root = ET.fromstring(xml_data)
-            
-            mapping = {}
-            for corp in root.findall('list'):
-                corp_code = corp.find('corp_code').text
-                stock_code = corp.find('stock_code').text
-                corp_name = corp.find('corp_name').text
-                
-                # 상장사만 (종목코드 있는 경우)
-                if stock_code and stock_code.strip():
-                    mapping[stock_code] = corp_code
-                    logger.debug(f"매핑 추가: {stock_code} → {corp_code} ({corp_name})")
-            
-            self.corp_code_cache = mapping
-            self._save_corp_code_cache()
+            # 정렬된 바이너리 인덱스로 컴파일 후 mmap으로 다시 열기
+            count = compile_corp_code_xml(xml_data, self.corp_index_path)
+            self.corp_index = get_dart_corp_index(self.corp_index_path)
+            listed = self.corp_index.stock_count if self.corp_index is not None else 0
             
-            logger.info(f"✅ DART 기업 고유번호 다운로드 완료: {len(mapping)}개")
-            return True
+            logger.info(f"✅ DART 기업 고유번호 다운로드 완료: {listed}개 종목 (전체 {count}개 기업)")
+            return self.corp_index is not None
             
         except Exception as e:
             logger.error(f"기업 고유번호 다운로드 실패: {e}")
@@ -14,28 +14,110 @@ DB 기반 캐시 매니저 v1.0
 - 빠른 조회 (인덱스)
 """
 
+import os
+import json
+import numbers
 import sqlite3
 import logging
+import threading
+import time
 from pathlib import Path
-from datetime import date, datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from datetime import date, timedelta
+from typing import Dict, List, Any, Optional, Sequence, Tuple
 import pandas as pd
-import numpy as np
 from contextlib import contextmanager
 
+from sector_stats_engine import (
+    DEFAULT_METRICS, compute_sector_frame, frame_to_sector_stats, stat_columns
+)
+from percentile_index import EmpiricalDistribution, SectorPercentileIndex
+
 logger = logging.getLogger(__name__)
 
+# ✅ 커넥션 튜닝 PRAGMA (WAL 모드에서 synchronous=NORMAL은 커밋 시 fsync 생략, 내구성은 체크포인트 단위)
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",      # 약 20MB 페이지 캐시
+    "PRAGMA busy_timeout=5000",      # 다른 프로세스 쓰기 중이면 최대 5초 대기
+)
+
+# 커넥션별 SQL 문 캐시 크기 (재사용 커넥션에서 prepared statement 재활용)
+STATEMENT_CACHE_SIZE = 256
+
+# 다른 프로세스의 섹터 통계 갱신 확인 간격 (초) - 같은 프로세스 갱신은 즉시 반영
+SECTOR_STATS_RECHECK_INTERVAL = 30.0
+
+# 스냅샷 UPSERT (충돌 시 시세/밸류에이션만 갱신)
+SNAPSHOT_UPSERT_SQL = """
+    INSERT INTO stock_snapshots (
+        stock_code, snapshot_date, name, sector, sector_normalized,
+        open_price, high_price, low_price, close_price, volume,
+        market_cap, per, pbr, roe, debt_ratio,
+        dividend_yield, data_source
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(stock_code, snapshot_date) DO UPDATE SET
+        close_price = excluded.close_price,
+        per = excluded.per,
+        pbr = excluded.pbr,
+        roe = excluded.roe,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# 투자자/배당 피처 테이블 컬럼 (feature_builder가 같은 키로 딕셔너리 구성)
+INVESTOR_FEATURE_COLUMNS = (
+    'stock_code', 'as_of_date', 'days', 'foreign_net_qty', 'institution_net_qty',
+    'individual_net_qty', 'total_volume', 'flow_ratio', 'buy_day_ratio', 'investor_score',
+    'foreign_buy_streak', 'foreign_sell_streak', 'foreign_buy_days', 'foreign_sell_days',
+)
+# 외국인 추세 컬럼 (구 investor_features 테이블에는 ALTER로 추가)
+FOREIGN_TREND_COLUMNS = INVESTOR_FEATURE_COLUMNS[-4:]
+DIVIDEND_FEATURE_COLUMNS = (
+    'stock_code', 'as_of_date', 'dividend_yield', 'dividend_per_share', 'record_date', 'dividend_score',
+)
+
+# 스크리닝 결과 행 → screening_results 인덱스 컬럼 (컬럼명, 결과 행 키)
+SCREENING_RESULT_FIELDS = (
+    ('stock_name', 'name'), ('value_score', 'value_score'), ('quality_score', 'quality_score'),
+    ('mos_score', 'mos_score'), ('momentum_score', 'momentum_score'), ('grade', 'grade'),
+    ('rating', 'recommendation'), ('per', 'per'), ('pbr', 'pbr'), ('roe', 'roe'),
+    ('price', 'current_price'), ('sector', 'sector'),
+)
+SCREENING_FLAG_FIELDS = ('per_ok', 'pbr_ok', 'roe_ok', 'score_ok', 'is_value_stock')
+
+
+def _json_default(value):
+    """numpy 스칼라 등 JSON 직렬화 보조"""
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
 class DBCacheManager:
     """DB 기반 캐시 매니저 (SQLite)"""
     
-    def __init__(self, db_path: str = 'cache/stock_data.db'):
+    def __init__(self, db_path: str = 'cache/stock_data.db', sector_metrics: Optional[Sequence[str]] = None):
         """
         Args:
             db_path: DB 파일 경로
+            sector_metrics: 섹터 통계 지표 (stock_snapshots 컬럼명, 기본 per/pbr/roe)
+                예: ('per', 'pbr', 'roe', 'debt_ratio', 'dividend_yield')
         """
         self.db_path = Path(db_path)
+        self.sector_metrics: Tuple[str, ...] = tuple(sector_metrics or DEFAULT_METRICS)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         
+        # ✅ 스레드별 재사용 커넥션 (매 호출 open/close 제거)
+        self._local = threading.local()
+        self._connections: Dict[threading.Thread, Tuple[int, sqlite3.Connection]] = {}  # 스레드 → (pid, 커넥션)
+        self._connections_lock = threading.Lock()
+        
+        # ✅ 섹터/글로벌 통계 읽기 캐시 (버전 스탬프: compute_sector_stats 저장 시 증가)
+        self._sector_stats_lock = threading.Lock()
+        self._sector_stats_version = 0
+        self._sector_stats_cache: Dict[str, Dict[str, Dict]] = {}  # snapshot_date → 섹터별 통계
+        self._global_dist_cache: Dict[str, Dict[str, EmpiricalDistribution]] = {}  # snapshot_date → 지표별 분포
+        self._sector_index_cache: Dict[str, SectorPercentileIndex] = {}  # snapshot_date → 섹터별 정렬 표본
+        self._stats_latest: Dict[str, Tuple[int, float, Optional[str]]] = {}  # 테이블 → (버전, 확인 시각, 최신 날짜)
+        
         self._init_db()
         logger.info(f"✅ DBCacheManager 초기화: {self.db_path}")
     
@@ -52,7 +134,11 @@ class DBCacheManager:
         
         conn = sqlite3.connect(str(self.db_path))
         try:
+            conn.execute("PRAGMA journal_mode=WAL")  # ✅ 영구 설정 (읽기/쓰기 동시 진행)
+            self._migrate_screening_results(conn)
             conn.executescript(schema_sql)
+            self._migrate_investor_features(conn)
+            self._migrate_financial_statement_checks(conn)
             conn.commit()
             logger.info("✅ DB 스키마 적용 완료")
         except Exception as e:
@@ -61,15 +147,99 @@ class DBCacheManager:
         finally:
             conn.close()
     
+    @staticmethod
+    def _migrate_screening_results(conn: sqlite3.Connection):
+        """구 screening_results (날짜×종목 키) → screening_results_v1로 보존 후 새 스키마 생성"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(screening_results)")}
+        if columns and 'options_hash' not in columns:
+            conn.execute("ALTER TABLE screening_results RENAME TO screening_results_v1")
+            logger.info("📌 구 screening_results 테이블 → screening_results_v1")
+    
+    @staticmethod
+    def _migrate_investor_features(conn: sqlite3.Connection):
+        """구 investor_features에 외국인 추세 컬럼 추가 (기존 행은 NULL → 다음 수집에서 채움)"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(investor_features)")}
+        for column in FOREIGN_TREND_COLUMNS:
+            if columns and column not in columns:
+                conn.execute(f"ALTER TABLE investor_features ADD COLUMN {column} INTEGER")
+    
+    @staticmethod
+    def _migrate_financial_statement_checks(conn: sqlite3.Connection):
+        """구 financial_statement_checks에 미조회 종류 컬럼 추가 (기존 기록은 전체 조회 완료)"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(financial_statement_checks)")}
+        if columns and 'pending_kinds' not in columns:
+            conn.execute("ALTER TABLE financial_statement_checks ADD COLUMN pending_kinds TEXT NOT NULL DEFAULT ''")
+    
+    def _thread_connection(self) -> sqlite3.Connection:
+        """현재 스레드 전용 커넥션 (최초 1회 생성, fork 후에는 재생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        
+        conn = sqlite3.connect(str(self.db_path), cached_statements=STATEMENT_CACHE_SIZE,
+                               check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 반환
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        with self._connections_lock:
+            stale = self._prune_connections()
+            self._connections[threading.current_thread()] = (os.getpid(), conn)
+        self._close_all(stale)
+        return conn
+    
+    def _prune_connections(self) -> List[sqlite3.Connection]:
+        """
+        종료된 스레드의 커넥션을 목록에서 제거 (_connections_lock 보유 상태에서 호출)
+        
+        Streamlit 재실행/스테이지 풀마다 새 스레드가 생기므로, 새 커넥션을 등록할 때
+        죽은 스레드 몫을 정리해 파일 디스크립터가 누적되지 않게 합니다.
+        fork 이전(다른 pid)에 열린 커넥션은 부모 프로세스 소유이므로 닫지 않고 버립니다.
+        
+        Returns:
+            닫아야 할 커넥션 목록
+        """
+        pid = os.getpid()
+        stale = []
+        for thread, (owner_pid, conn) in list(self._connections.items()):
+            if owner_pid != pid:
+                del self._connections[thread]
+            elif not thread.is_alive():
+                del self._connections[thread]
+                stale.append(conn)
+        return stale
+    
+    @staticmethod
+    def _close_all(connections: Sequence[sqlite3.Connection]):
+        """커넥션 일괄 종료 (실패 무시)"""
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception as e:
+                logger.debug(f"커넥션 종료 실패(무시): {e}")
+    
     @contextmanager
     def get_connection(self):
-        """DB 커넥션 컨텍스트 매니저"""
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row  # 딕셔너리 형태로 반환
+        """
+        DB 커넥션 컨텍스트 매니저 (스레드별 커넥션 재사용)
+        
+        블록 종료 시 커넥션을 닫지 않고, 커밋되지 않은 트랜잭션만 롤백합니다.
+        """
+        conn = self._thread_connection()
         try:
             yield conn
         finally:
-            conn.close()
+            if conn.in_transaction:
+                conn.rollback()
+    
+    def close(self):
+        """모든 스레드 커넥션 종료 (fork 이전 부모 프로세스 커넥션은 버리기만 함)"""
+        pid = os.getpid()
+        with self._connections_lock:
+            connections, self._connections = self._connections, {}
+        self._close_all([conn for owner_pid, conn in connections.values() if owner_pid == pid])
+        self._local = threading.local()
     
     # ============================================
     # 스냅샷 관리
@@ -82,63 +252,183 @@ class DBCacheManager:
         Args:
             snapshots: 종목 데이터 리스트
             snapshot_date: 스냅샷 날짜 (None이면 오늘)
+        
+        Returns:
+            저장(신규 + 갱신)된 행 수
         """
         if not snapshots:
             logger.warning("⚠️ 저장할 스냅샷 없음")
             return 0
         
-        if snapshot_date is None:
-            snapshot_date = date.today()
+        result = self.bulk_upsert_snapshots(snapshots, snapshot_date=snapshot_date)
+        return result['inserted'] + result['updated']
+    
+    @staticmethod
+    def _sql_value(value: Any) -> Any:
+        """
+        SQLite 바인딩 값으로 변환 (numpy 스칼라 → 파이썬 수, 날짜 → ISO 문자열)
+        
+        Raises:
+            ValueError: 바인딩할 수 없는 값 (dict/list 등)
+        """
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        if hasattr(value, 'item') and not hasattr(value, '__len__'):
+            return value.item()  # numpy 스칼라
+        if isinstance(value, numbers.Real):
+            return float(value)  # Decimal 등
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return bytes(value)
+        raise ValueError(f"unsupported value type: {type(value).__name__}")
+    
+    @classmethod
+    def _snapshot_row(cls, snap: Dict[str, Any], default_date: str) -> Tuple:
+        """
+        스냅샷 딕셔너리 → UPSERT 파라미터 튜플 (값 변환 포함)
+        
+        Raises:
+            ValueError: 바인딩할 수 없는 값이 있는 행
+        """
+        snap_date = snap.get('snapshot_date') or default_date
+        row = (
+            str(snap.get('code')),
+            snap_date.isoformat() if isinstance(snap_date, date) else str(snap_date),
+            snap.get('name'),
+            snap.get('sector'),
+            snap.get('sector_normalized'),
+            snap.get('open_price'),
+            snap.get('high_price'),
+            snap.get('low_price'),
+            snap.get('price') or snap.get('close_price'),
+            snap.get('volume'),
+            snap.get('market_cap'),
+            snap.get('per'),
+            snap.get('pbr'),
+            snap.get('roe'),
+            snap.get('debt_ratio'),
+            snap.get('dividend_yield'),
+            snap.get('data_source', 'KIS')
+        )
+        return tuple(cls._sql_value(value) for value in row)
+    
+    def bulk_upsert_snapshots(self, snapshots: List[Dict[str, Any]], snapshot_date: date = None,
+                              chunk_size: int = 5000) -> Dict[str, Any]:
+        """
+        스냅샷 대량 UPSERT (단일 트랜잭션 + executemany)
+        
+        일별 1000+ 종목 저장이나 과거 데이터 백필(행마다 'snapshot_date' 지정 가능)용입니다.
+        묶음 저장이 실패하면 그 묶음만 행 단위로 다시 저장해 실패한 행만 거부합니다.
+        
+        Args:
+            snapshots: 종목 데이터 리스트 ('code' 필수, 'snapshot_date' 선택)
+            snapshot_date: 기본 스냅샷 날짜 (None이면 오늘)
+            chunk_size: executemany 묶음 크기
+        
+        Returns:
+            {
+                'inserted': 신규 행 수,
+                'updated': 기존 행 갱신 수 (충돌 → UPDATE),
+                'conflicts': [(종목코드, 날짜), ...] 기존 행과 충돌한 키,
+                'duplicates': [(종목코드, 날짜), ...] 입력 내 중복 키 (마지막 값 적용),
+                'rejected': [(인덱스, 사유), ...] 저장하지 않은 행
+            }
+        """
+        result = {'inserted': 0, 'updated': 0, 'conflicts': [], 'duplicates': [], 'rejected': []}
+        if not snapshots:
+            return result
+        
+        default_date = (snapshot_date or date.today()).isoformat()
+        
+        # ✅ 행 변환 + 검증 (키 기준 중복은 마지막 값만 유지, 바인딩 불가 행은 트랜잭션 전에 거부)
+        rows: Dict[Tuple[str, str], Tuple] = {}
+        indices: Dict[Tuple[str, str], int] = {}
+        for idx, snap in enumerate(snapshots):
+            if not isinstance(snap, dict) or not snap.get('code'):
+                result['rejected'].append((idx, 'missing code'))
+                continue
+            try:
+                row = self._snapshot_row(snap, default_date)
+            except ValueError as e:
+                result['rejected'].append((idx, str(e)))
+                continue
+            key = (row[0], row[1])
+            if key in rows:
+                result['duplicates'].append(key)
+            rows[key] = row
+            indices[key] = idx
         
-        saved_count = 0
+        if not rows:
+            logger.warning(f"⚠️ 유효한 스냅샷 없음 (거부 {len(result['rejected'])}개)")
+            return result
+        
+        dates = sorted({d for _, d in rows})
+        row_list = list(rows.values())
         
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            for snap in snapshots:
-                try:
-                    cursor.execute("""
-                        INSERT INTO stock_snapshots (
-                            stock_code, snapshot_date, name, sector, sector_normalized,
-                            open_price, high_price, low_price, close_price, volume,
-                            market_cap, per, pbr, roe, debt_ratio,
-                            dividend_yield, data_source
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(stock_code, snapshot_date) DO UPDATE SET
-                            close_price = excluded.close_price,
-                            per = excluded.per,
-                            pbr = excluded.pbr,
-                            roe = excluded.roe,
-                            updated_at = CURRENT_TIMESTAMP
-                    """, (
-                        snap.get('code'),
-                        snapshot_date,
-                        snap.get('name'),
-                        snap.get('sector'),
-                        snap.get('sector_normalized'),
-                        snap.get('open_price'),
-                        snap.get('high_price'),
-                        snap.get('low_price'),
-                        snap.get('price') or snap.get('close_price'),
-                        snap.get('volume'),
-                        snap.get('market_cap'),
-                        snap.get('per'),
-                        snap.get('pbr'),
-                        snap.get('roe'),
-                        snap.get('debt_ratio'),
-                        snap.get('dividend_yield'),
-                        snap.get('data_source', 'KIS')
-                    ))
-                    saved_count += 1
+            try:
+                conn.execute("BEGIN IMMEDIATE")  # ✅ 쓰기 락을 먼저 잡아 충돌 판정과 UPSERT 사이 경합 방지
                 
-                except Exception as e:
-                    logger.error(f"❌ 스냅샷 저장 실패 ({snap.get('code')}): {e}")
-                    continue
-            
-            conn.commit()
+                # ✅ 충돌 판정: 날짜별 기존 키를 한 번에 조회 (행별 SELECT 없음)
+                existing = set()
+                for i in range(0, len(dates), 500):
+                    chunk = dates[i:i + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    existing.update(conn.execute(
+                        f"SELECT stock_code, snapshot_date FROM stock_snapshots WHERE snapshot_date IN ({placeholders})",
+                        chunk
+                    ).fetchall())
+                existing = {(code, str(d)) for code, d in existing}
+                
+                for i in range(0, len(row_list), chunk_size):
+                    failed = self._upsert_snapshot_chunk(conn, row_list[i:i + chunk_size])
+                    for key, reason in failed:
+                        result['rejected'].append((indices[key], reason))
+                        del rows[key]
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"❌ 스냅샷 대량 저장 실패 (롤백): {e}")
+                result['rejected'].extend((indices[key], str(e)) for key in rows)
+                return result
+        
+        result['conflicts'] = [key for key in rows if key in existing]
+        result['updated'] = len(result['conflicts'])
+        result['inserted'] = len(rows) - result['updated']
+        
+        logger.info(
+            f"✅ 스냅샷 저장: {len(rows)}/{len(snapshots)}개 "
+            f"(신규 {result['inserted']}, 갱신 {result['updated']}, "
+            f"중복 {len(result['duplicates'])}, 거부 {len(result['rejected'])})"
+        )
+        return result
+    
+    @staticmethod
+    def _upsert_snapshot_chunk(conn: sqlite3.Connection, chunk: List[Tuple]) -> List[Tuple[Tuple[str, str], str]]:
+        """
+        묶음 UPSERT (실패 시 묶음만 되돌리고 행 단위로 재시도)
         
-        logger.info(f"✅ 스냅샷 저장: {saved_count}/{len(snapshots)}개")
-        return saved_count
+        Returns:
+            [((종목코드, 날짜), 사유), ...] 저장하지 못한 행 (나머지 행은 저장됨)
+        """
+        conn.execute("SAVEPOINT snapshot_chunk")
+        try:
+            conn.executemany(SNAPSHOT_UPSERT_SQL, chunk)
+            conn.execute("RELEASE snapshot_chunk")
+            return []
+        except (sqlite3.Error, OverflowError) as e:
+            conn.execute("ROLLBACK TO snapshot_chunk")
+            logger.warning(f"⚠️ 스냅샷 묶음 저장 실패, 행 단위 재시도: {e}")
+        
+        failed = []
+        for row in chunk:
+            try:
+                conn.execute(SNAPSHOT_UPSERT_SQL, row)  # 실패한 문장만 자동 롤백
+            except (sqlite3.Error, OverflowError) as e:
+                failed.append(((row[0], row[1]), str(e)))
+        conn.execute("RELEASE snapshot_chunk")
+        return failed
     
     def get_latest_snapshots(self, max_age_days: int = 1) -> pd.DataFrame:
         """
@@ -255,19 +545,428 @@ class DBCacheManager:
         logger.info(f"📊 증분 업데이트 대상: {len(stale_codes)}개 (전체: {len(all_codes)})")
         return list(stale_codes)
     
+    # ============================================
+    # 일봉 (daily_bars)
+    # ============================================
+    
+    def save_daily_bars(self, bars: pd.DataFrame, synced_codes: Sequence[str] = (),
+                        synced_date: date = None) -> int:
+        """
+        일봉 UPSERT + 종목별 동기화 상태 기록 (단일 트랜잭션)
+        
+        같은 거래일 봉은 마지막 조회 값으로 갱신됩니다 (장중 조회한 당일 봉 확정).
+        
+        Args:
+            bars: stock_code, trade_date, open_price, high_price, low_price,
+                  close_price, volume, trading_value 컬럼 DataFrame
+            synced_codes: 이번에 조회한 종목 (빈 응답 포함 → 같은 날 재조회 방지)
+            synced_date: 조회일 (기본: 오늘)
+        
+        Returns:
+            저장한 봉 수
+        """
+        synced_date = (synced_date or date.today()).isoformat()
+        columns = ['stock_code', 'trade_date', 'open_price', 'high_price', 'low_price',
+                   'close_price', 'volume', 'trading_value']
+        rows = []
+        if bars is not None and not bars.empty:
+            frame = bars[columns].astype(object).where(bars[columns].notna(), None)
+            rows = list(frame.itertuples(index=False, name=None))
+        
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if rows:
+                conn.executemany("""
+                    INSERT INTO daily_bars (
+                        stock_code, trade_date, open_price, high_price, low_price,
+                        close_price, volume, trading_value
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(stock_code, trade_date) DO UPDATE SET
+                        open_price = excluded.open_price,
+                        high_price = excluded.high_price,
+                        low_price = excluded.low_price,
+                        close_price = excluded.close_price,
+                        volume = excluded.volume,
+                        trading_value = excluded.trading_value,
+                        updated_at = CURRENT_TIMESTAMP
+                """, rows)
+            if synced_codes:
+                conn.executemany("""
+                    INSERT INTO daily_bar_sync (stock_code, synced_date, last_trade_date)
+                    VALUES (?, ?, (SELECT MAX(trade_date) FROM daily_bars WHERE stock_code = ?))
+                    ON CONFLICT(stock_code) DO UPDATE SET
+                        synced_date = excluded.synced_date,
+                        last_trade_date = excluded.last_trade_date
+                """, [(code, synced_date, code) for code in dict.fromkeys(synced_codes)])
+            conn.commit()
+        
+        logger.debug(f"✅ 일봉 저장: {len(rows)}개 (동기화 {len(synced_codes)}종목)")
+        return len(rows)
+    
+    def get_daily_bar_sync_state(self, stock_codes: Sequence[str]) -> Dict[str, Tuple[str, Optional[str]]]:
+        """
+        종목별 일봉 동기화 상태
+        
+        Returns:
+            {종목코드: (마지막 조회일, 저장된 마지막 거래일)} - 한 번도 조회하지 않은 종목은 제외
+        """
+        state: Dict[str, Tuple[str, Optional[str]]] = {}
+        codes = list(dict.fromkeys(stock_codes))
+        with self.get_connection() as conn:
+            for i in range(0, len(codes), 500):
+                chunk = codes[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for row in conn.execute(
+                    f"SELECT stock_code, synced_date, last_trade_date FROM daily_bar_sync "
+                    f"WHERE stock_code IN ({placeholders})", chunk
+                ):
+                    state[row[0]] = (row[1], row[2])
+        return state
+    
+    def get_daily_closes(self, stock_codes: Sequence[str], max_bars: int = 120) -> pd.DataFrame:
+        """
+        종목별 최근 N개 일봉 종가 (긴 형식)
+        
+        Args:
+            stock_codes: 종목코드 목록
+            max_bars: 종목별 최대 봉 수 (최근 순)
+        
+        Returns:
+            DataFrame (stock_code, trade_date, close_price) - 종목·거래일 오름차순
+        """
+        codes = list(dict.fromkeys(stock_codes))
+        frames = []
+        with self.get_connection() as conn:
+            for i in range(0, len(codes), 500):
+                chunk = codes[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                frames.append(pd.read_sql_query(f"""
+                    SELECT stock_code, trade_date, close_price FROM (
+                        SELECT stock_code, trade_date, close_price,
+                               ROW_NUMBER() OVER (PARTITION BY stock_code ORDER BY trade_date DESC) AS rn
+                        FROM daily_bars
+                        WHERE stock_code IN ({placeholders})
+                    )
+                    WHERE rn <= ?
+                    ORDER BY stock_code, trade_date
+                """, conn, params=(*chunk, max_bars)))
+        if not frames:
+            return pd.DataFrame(columns=['stock_code', 'trade_date', 'close_price'])
+        return pd.concat(frames, ignore_index=True)
+
+    # ============================================
+    # 투자자/배당 피처 (오프라인 빌더)
+    # ============================================
+
+    def save_investor_features(self, features: List[Dict[str, Any]]) -> int:
+        """
+        투자자 수급 피처 UPSERT (종목당 최신 1행)
+
+        Args:
+            features: INVESTOR_FEATURE_COLUMNS 키를 가진 딕셔너리 목록
+
+        Returns:
+            저장한 종목 수
+        """
+        rows = [tuple(f.get(c) for c in INVESTOR_FEATURE_COLUMNS) for f in features]
+        if not rows:
+            return 0
+        columns = ', '.join(INVESTOR_FEATURE_COLUMNS)
+        updates = ', '.join(f"{c} = excluded.{c}" for c in INVESTOR_FEATURE_COLUMNS[1:])
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(f"""
+                INSERT INTO investor_features ({columns})
+                VALUES ({','.join('?' * len(INVESTOR_FEATURE_COLUMNS))})
+                ON CONFLICT(stock_code) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+            """, rows)
+            conn.commit()
+        logger.debug(f"✅ 투자자 피처 저장: {len(rows)}개")
+        return len(rows)
+
+    def save_dividend_features(self, features: List[Dict[str, Any]]) -> int:
+        """
+        배당 피처 스냅샷 교체 (순위에서 빠진 종목 제거, 단일 트랜잭션)
+
+        Args:
+            features: DIVIDEND_FEATURE_COLUMNS 키를 가진 딕셔너리 목록
+
+        Returns:
+            저장한 종목 수
+        """
+        rows = [tuple(f.get(c) for c in DIVIDEND_FEATURE_COLUMNS) for f in features]
+        if not rows:
+            return 0
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM dividend_features")
+            conn.executemany(f"""
+                INSERT OR REPLACE INTO dividend_features ({', '.join(DIVIDEND_FEATURE_COLUMNS)})
+                VALUES ({','.join('?' * len(DIVIDEND_FEATURE_COLUMNS))})
+            """, rows)
+            conn.commit()
+        logger.debug(f"✅ 배당 피처 저장: {len(rows)}개")
+        return len(rows)
+
+    def get_investor_feature_dates(self, stock_codes: Sequence[str]) -> Dict[str, str]:
+        """
+        종목별 투자자 피처 수집일 (재개용)
+
+        Returns:
+            {종목코드: as_of_date} - 피처가 없는 종목은 제외
+        """
+        dates: Dict[str, str] = {}
+        codes = list(dict.fromkeys(stock_codes))
+        with self.get_connection() as conn:
+            for i in range(0, len(codes), 500):
+                chunk = codes[i:i + 500]
+                placeholders = ','.join('?' * len(chunk))
+                for row in conn.execute(
+                    f"SELECT stock_code, as_of_date FROM investor_features "
+                    f"WHERE stock_code IN ({placeholders})", chunk
+                ):
+                    dates[row[0]] = row[1]
+        return dates
+
+    def get_feature_scores(self, max_age_days: int = 7) -> Dict[str, Dict[str, float]]:
+        """
+        최근 피처 점수 전체 (스크리닝 시 1회 로드 → 종목별 O(1) 조회)
+
+        Args:
+            max_age_days: 허용 수집일 경과 일수 (초과 피처는 제외)
+
+        Returns:
+            {'investor': {종목코드: 점수}, 'dividend': {종목코드: 점수}}
+        """
+        cutoff = (date.today() - timedelta(days=max_age_days)).isoformat()
+        with self.get_connection() as conn:
+            investor = dict(conn.execute(
+                "SELECT stock_code, investor_score FROM investor_features WHERE as_of_date >= ?", (cutoff,)
+            ).fetchall())
+            dividend = dict(conn.execute(
+                "SELECT stock_code, dividend_score FROM dividend_features WHERE as_of_date >= ?", (cutoff,)
+            ).fetchall())
+        return {'investor': investor, 'dividend': dividend}
+
+    def get_foreign_flows(self, max_age_days: int = 7) -> Dict[str, Dict[str, Any]]:
+        """
+        최근 외국인 수급 전체 (리스크 분석 시 1회 로드 → 종목별 O(1) 조회)
+
+        Args:
+            max_age_days: 허용 수집일 경과 일수 (초과 피처는 제외)
+
+        Returns:
+            {종목코드: {'as_of_date', 'days', 'foreign_net_qty', 'foreign_buy_streak', ...}}
+        """
+        cutoff = (date.today() - timedelta(days=max_age_days)).isoformat()
+        with self.get_connection() as conn:
+            rows = conn.execute(f"""
+                SELECT stock_code, as_of_date, days, foreign_net_qty, {', '.join(FOREIGN_TREND_COLUMNS)}
+                FROM investor_features WHERE as_of_date >= ?
+            """, (cutoff,)).fetchall()
+        return {row['stock_code']: dict(row) for row in rows}
+
+    # ============================================
+    # 재무제표 캐시 (종목 × 결산기)
+    # ============================================
+
+    def save_financial_statements(self, stock_code: str, period_type: str, fiscal_period: str,
+                                  statements: Dict[str, List[Dict[str, Any]]], checked_at: date,
+                                  pending_kinds: Sequence[str] = ()) -> int:
+        """
+        재무비율 응답 행 저장 + 확인 기록 갱신 (단일 트랜잭션)
+
+        Args:
+            stock_code: 종목코드
+            period_type: 분류 구분 (0: 년, 1: 분기)
+            fiscal_period: 최신 결산년월 ('' = 무자료)
+            statements: {종류: output 행 목록}
+            checked_at: 조회일
+            pending_kinds: 조회 실패로 아직 못 받은 종류 (다음 조회에서 이것만 재조회)
+
+        Returns:
+            저장한 종류 수
+        """
+        rows = [(stock_code, period_type, fiscal_period, kind, json.dumps(kind_rows, ensure_ascii=False))
+                for kind, kind_rows in statements.items() if kind_rows is not None]
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("""
+                INSERT OR REPLACE INTO financial_statements
+                    (stock_code, period_type, fiscal_period, kind, rows_json)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+            conn.execute("""
+                INSERT OR REPLACE INTO financial_statement_checks
+                    (stock_code, period_type, fiscal_period, checked_at, pending_kinds)
+                VALUES (?, ?, ?, ?, ?)
+            """, (stock_code, period_type, fiscal_period, checked_at.isoformat(), ','.join(pending_kinds)))
+            conn.commit()
+        return len(rows)
+
+    def get_financial_statements(self, stock_code: str, period_type: str) -> Optional[Dict[str, Any]]:
+        """
+        최신 결산기 재무비율 응답 행
+
+        Returns:
+            {'fiscal_period', 'checked_at' (date), 'statements': {종류: 행 목록}, 'pending': [미조회 종류]}
+            또는 None (확인 기록 없음)
+        """
+        with self.get_connection() as conn:
+            check = conn.execute(
+                "SELECT fiscal_period, checked_at, pending_kinds FROM financial_statement_checks "
+                "WHERE stock_code = ? AND period_type = ?", (stock_code, period_type)
+            ).fetchone()
+            if check is None:
+                return None
+            rows = conn.execute(
+                "SELECT kind, rows_json FROM financial_statements "
+                "WHERE stock_code = ? AND period_type = ? AND fiscal_period = ?",
+                (stock_code, period_type, check['fiscal_period'])
+            ).fetchall()
+        return {
+            'fiscal_period': check['fiscal_period'],
+            'checked_at': date.fromisoformat(check['checked_at']),
+            'statements': {row['kind']: json.loads(row['rows_json']) for row in rows},
+            'pending': [kind for kind in (check['pending_kinds'] or '').split(',') if kind],
+        }
+
+    # ============================================
+    # 스크리닝 결과 (스냅샷 날짜 × 옵션 해시 × 코드 버전)
+    # ============================================
+
+    def save_screening_run(self, snapshot_date: date, options_hash: str, code_version: str,
+                           rows: List[Dict[str, Any]], input_hashes: Optional[Dict[str, str]] = None,
+                           meta: Optional[Dict[str, Any]] = None) -> int:
+        """
+        스크리닝 실행 결과 저장 (같은 키의 이전 결과 교체, 단일 트랜잭션)
+
+        Args:
+            snapshot_date: 스냅샷 날짜
+            options_hash: 결과에 영향을 주는 옵션 해시
+            code_version: 평가 코드 버전
+            rows: 결과 행 목록 ('symbol' 필수)
+            input_hashes: {종목코드: 평가 입력 해시} (증분 재평가용)
+            meta: options_json, universe_size, fetched_count, reused_count, elapsed_sec
+
+        Returns:
+            저장한 행 수
+        """
+        key = (str(snapshot_date), options_hash, code_version)
+        input_hashes = input_hashes or {}
+        meta = meta or {}
+        records = []
+        for row in rows:
+            code = row.get('symbol')
+            if not code:
+                continue
+            records.append((
+                *key, code, input_hashes.get(code),
+                *(row.get(field) for _, field in SCREENING_RESULT_FIELDS),
+                *(None if row.get(flag) is None else int(bool(row.get(flag))) for flag in SCREENING_FLAG_FIELDS),
+                json.dumps(row, ensure_ascii=False, default=_json_default),
+            ))
+        columns = ('snapshot_date', 'options_hash', 'code_version', 'stock_code', 'input_hash',
+                   *(column for column, _ in SCREENING_RESULT_FIELDS), *SCREENING_FLAG_FIELDS, 'payload')
+
+        with self.get_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM screening_results WHERE snapshot_date = ? AND options_hash = ? "
+                         "AND code_version = ?", key)
+            conn.executemany(f"""
+                INSERT INTO screening_results ({', '.join(columns)})
+                VALUES ({','.join('?' * len(columns))})
+                ON CONFLICT(snapshot_date, options_hash, code_version, stock_code) DO NOTHING
+            """, records)
+            conn.execute("""
+                INSERT OR REPLACE INTO screening_runs (
+                    snapshot_date, options_hash, code_version, options_json,
+                    universe_size, fetched_count, scored_count, reused_count, elapsed_sec
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (*key, meta.get('options_json'), meta.get('universe_size'), meta.get('fetched_count'),
+                  len(records), meta.get('reused_count'), meta.get('elapsed_sec')))
+            conn.commit()
+        logger.info(f"✅ 스크리닝 결과 저장: {len(records)}개 ({key[0]}, {options_hash[:8]}, {code_version})")
+        return len(records)
+
+    def get_screening_run(self, snapshot_date: date, options_hash: str,
+                          code_version: str) -> Optional[Dict[str, Any]]:
+        """완료된 스크리닝 실행 정보 (없으면 None)"""
+        with self.get_connection() as conn:
+            row = conn.execute(
+                "SELECT * FROM screening_runs WHERE snapshot_date = ? AND options_hash = ? AND code_version = ?",
+                (str(snapshot_date), options_hash, code_version)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_screening_rows(self, snapshot_date: date, options_hash: str,
+                           code_version: str) -> List[Dict[str, Any]]:
+        """저장된 결과 행 (저장 순서)"""
+        with self.get_connection() as conn:
+            payloads = conn.execute(
+                "SELECT payload FROM screening_results WHERE snapshot_date = ? AND options_hash = ? "
+                "AND code_version = ? ORDER BY id", (str(snapshot_date), options_hash, code_version)
+            ).fetchall()
+        return [json.loads(p[0]) for p in payloads]
+
+    def get_latest_screening_inputs(self, options_hash: str, code_version: str,
+                                    before: date = None) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """
+        같은 옵션·코드 버전의 가장 최근 실행 결과 (증분 재평가용)
+
+        Args:
+            before: 이 날짜 이전 실행만 (None이면 전체)
+
+        Returns:
+            {종목코드: (평가 입력 해시, 결과 행)} - 입력 해시가 없는 행은 제외
+        """
+        query = "SELECT MAX(snapshot_date) FROM screening_runs WHERE options_hash = ? AND code_version = ?"
+        params: List[Any] = [options_hash, code_version]
+        if before is not None:
+            query += " AND snapshot_date < ?"
+            params.append(str(before))
+        with self.get_connection() as conn:
+            latest = conn.execute(query, params).fetchone()[0]
+            if not latest:
+                return {}
+            rows = conn.execute(
+                "SELECT stock_code, input_hash, payload FROM screening_results WHERE snapshot_date = ? "
+                "AND options_hash = ? AND code_version = ? AND input_hash IS NOT NULL",
+                (latest, options_hash, code_version)
+            ).fetchall()
+        return {code: (input_hash, json.loads(payload)) for code, input_hash, payload in rows}
+
+    def get_stats_dates(self) -> Tuple[Optional[str], Optional[str]]:
+        """(최신 섹터 통계 날짜, 최신 글로벌 통계 날짜) - 평가 컨텍스트 식별용"""
+        return self._latest_stats_date('sector_stats'), self._latest_stats_date('global_stats')
+
     # ============================================
     # 섹터 통계
     # ============================================
     
+    def _ensure_sector_stat_columns(self, conn: sqlite3.Connection, columns: List[str]):
+        """sector_stats 테이블에 없는 지표 컬럼 추가 (새 지표 = 새 컬럼)"""
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(sector_stats)")}
+        for column in columns:
+            if column not in existing:
+                conn.execute(f'ALTER TABLE sector_stats ADD COLUMN "{column}" REAL')
+                logger.info(f"📌 sector_stats 컬럼 추가: {column}")
+    
     def compute_sector_stats(self, snapshot_date: date = None) -> Dict[str, Dict]:
         """
-        섹터 통계 계산 및 저장
+        섹터 통계 계산 및 저장 (벡터화 엔진 + 단일 배치 저장)
         
         Args:
             snapshot_date: 기준 날짜 (None이면 오늘)
         
         Returns:
             섹터별 통계 딕셔너리
+            
+        Note:
+            표본 정책은 sector_stats_engine 참고 (n < 5 섹터는 저장 안 함, 0/NaN 값 제외)
+            - 5 ≤ n < 10: 저장 → 사용 시 글로벌만
+            - 10 ≤ n < 30: 저장 → 사용 시 가중 평균
+            - n ≥ 30: 저장 → 사용 시 섹터 우선
         """
         if snapshot_date is None:
             snapshot_date = date.today()
@@ -281,126 +980,228 @@ class DBCacheManager:
             logger.warning(f"⚠️ {snapshot_date} 스냅샷 없음")
             return {}
         
-        # 섹터별 그룹화
-        sector_groups = df.groupby('sector_normalized')
+        metrics = list(self.sector_metrics)
+        frame = compute_sector_frame(df, sector_col='sector_normalized', metrics=metrics)
+        if frame.empty:
+            logger.warning(f"⚠️ {snapshot_date} 통계 저장 가능한 섹터 없음 (모두 n < 5)")
+            return {}
         
-        sector_stats = {}
-        saved_count = 0
+        columns = stat_columns(metrics)
+        date_key = snapshot_date.isoformat() if isinstance(snapshot_date, date) else str(snapshot_date)
+        rows = [
+            (sector, date_key, int(rec['sample_size']),
+             *(None if pd.isna(rec[c]) else float(rec[c]) for c in columns))
+            for sector, rec in zip(frame.index, frame.to_dict('records'))
+        ]
+        
+        column_sql = ", ".join(f'"{c}"' for c in columns)
+        update_sql = ", ".join(f'"{c}" = excluded."{c}"' for c in ['sample_size'] + columns)
+        upsert_sql = f"""
+            INSERT INTO sector_stats (sector, snapshot_date, sample_size, {column_sql})
+            VALUES ({", ".join("?" * (3 + len(columns)))})
+            ON CONFLICT(sector, snapshot_date) DO UPDATE SET {update_sql}
+        """
+        
+        # ✅ 전시장 분포 (섹터 무관 전체 종목, 정렬 표본 포함) - 섹터 표본 부족 시 글로벌 대체용
+        global_rows = []
+        for metric in metrics:
+            if metric not in df.columns:
+                continue
+            dist = EmpiricalDistribution(pd.to_numeric(df[metric], errors='coerce').to_numpy(dtype=float))
+            if not dist.size:
+                continue
+            bp = dist.breakpoints()
+            global_rows.append((
+                date_key, metric, dist.size,
+                bp['p10'], bp['p25'], bp['p50'], bp['p75'], bp['p90'],
+                bp['mean'], bp['std'], bp['min'], bp['max'],
+                sqlite3.Binary(dist.to_bytes())
+            ))
         
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            
-            for sector, group in sector_groups:
-                if sector is None or pd.isna(sector):
-                    continue
-                
-                n = len(group)
-                
-                # 최소 표본 크기 확인 (v2.3: 30 → 5)
-                # - n < 5: 극소 표본, 저장 안 함
-                # - 5 ≤ n < 10: 저장 → 사용 시 글로벌만
-                # - 10 ≤ n < 30: 저장 → 사용 시 가중 평균
-                # - n ≥ 30: 저장 → 사용 시 섹터 우선
-                if n < 5:
-                    logger.debug(f"⚠️ {sector}: 극소 표본 (n={n}) - 저장 안 함")
-                    continue
-                
-                if n < 10:
-                    logger.info(f"📌 {sector}: 소표본 저장 (n={n}) - 글로벌 대체 예정")
-                elif n < 30:
-                    logger.info(f"📌 {sector}: 중표본 저장 (n={n}) - 가중 평균 예정")
-                
-                # PER, PBR, ROE 추출 (유효값만)
-                per_values = group['per'].dropna().values
-                pbr_values = group['pbr'].dropna().values
-                roe_values = group['roe'].dropna().values
-                
-                # 퍼센타일 계산
-                def calc_percentiles(values):
-                    if len(values) == 0:
-                        return {}
-                    return {
-                        'p10': np.percentile(values, 10),
-                        'p25': np.percentile(values, 25),
-                        'p50': np.percentile(values, 50),
-                        'p75': np.percentile(values, 75),
-                        'p90': np.percentile(values, 90),
-                        'mean': np.mean(values),
-                        'std': np.std(values),
-                        'min': np.min(values),
-                        'max': np.max(values),
-                    }
-                
-                per_pct = calc_percentiles(per_values)
-                pbr_pct = calc_percentiles(pbr_values)
-                roe_pct = calc_percentiles(roe_values)
-                
-                # DB 저장
-                try:
-                    cursor.execute("""
-                        INSERT INTO sector_stats (
-                            sector, snapshot_date, sample_size,
-                            per_p10, per_p25, per_p50, per_p75, per_p90, per_mean, per_std, per_min, per_max,
-                            pbr_p10, pbr_p25, pbr_p50, pbr_p75, pbr_p90, pbr_mean, pbr_std, pbr_min, pbr_max,
-                            roe_p10, roe_p25, roe_p50, roe_p75, roe_p90, roe_mean, roe_std, roe_min, roe_max
-                        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        ON CONFLICT(sector, snapshot_date) DO UPDATE SET
-                            sample_size = excluded.sample_size,
-                            per_p50 = excluded.per_p50,
-                            pbr_p50 = excluded.pbr_p50,
-                            roe_p50 = excluded.roe_p50
-                    """, (
-                        sector, snapshot_date, n,
-                        per_pct.get('p10'), per_pct.get('p25'), per_pct.get('p50'), per_pct.get('p75'), per_pct.get('p90'),
-                        per_pct.get('mean'), per_pct.get('std'), per_pct.get('min'), per_pct.get('max'),
-                        pbr_pct.get('p10'), pbr_pct.get('p25'), pbr_pct.get('p50'), pbr_pct.get('p75'), pbr_pct.get('p90'),
-                        pbr_pct.get('mean'), pbr_pct.get('std'), pbr_pct.get('min'), pbr_pct.get('max'),
-                        roe_pct.get('p10'), roe_pct.get('p25'), roe_pct.get('p50'), roe_pct.get('p75'), roe_pct.get('p90'),
-                        roe_pct.get('mean'), roe_pct.get('std'), roe_pct.get('min'), roe_pct.get('max')
-                    ))
-                    
-                    saved_count += 1
-                    
-                    # 반환용 딕셔너리 (기존 캐시 형식 호환)
-                    sector_stats[sector] = {
-                        'sample_size': n,
-                        'per_percentiles': per_pct,
-                        'pbr_percentiles': pbr_pct,
-                        'roe_percentiles': roe_pct,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                
-                except Exception as e:
-                    logger.error(f"❌ 섹터 통계 저장 실패 ({sector}): {e}")
-                    continue
-            
-            conn.commit()
+            try:
+                self._ensure_sector_stat_columns(conn, columns)
+                conn.executemany(upsert_sql, rows)
+                conn.executemany("""
+                    INSERT OR REPLACE INTO global_stats (
+                        snapshot_date, metric, sample_size,
+                        p10, p25, p50, p75, p90, mean, std, min, max, sorted_values
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, global_rows)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"❌ 섹터 통계 저장 실패: {e}")
+                return {}
+        
+        self._invalidate_sector_stats()
         
-        logger.info(f"✅ 섹터 통계 계산 완료: {saved_count}개 섹터")
+        sector_stats = frame_to_sector_stats(frame, metrics=metrics)
+        for sector, stats in sector_stats.items():
+            n = stats['sample_size']
+            if n < 10:
+                logger.debug(f"📌 {sector}: 소표본 저장 (n={n}) - 글로벌 대체 예정")
+            elif n < 30:
+                logger.debug(f"📌 {sector}: 중표본 저장 (n={n}) - 가중 평균 예정")
+        
+        logger.info(f"✅ 섹터 통계 계산 완료: {len(sector_stats)}개 섹터")
         return sector_stats
     
+    def _invalidate_sector_stats(self):
+        """섹터 통계 읽기 캐시 무효화 (버전 증가)"""
+        with self._sector_stats_lock:
+            self._sector_stats_version += 1
+            self._sector_stats_cache.clear()
+            self._global_dist_cache.clear()
+            self._sector_index_cache.clear()
+            self._stats_latest.clear()
+    
+    def _latest_stats_date(self, table: str = 'sector_stats') -> Optional[str]:
+        """
+        최신 통계 날짜 (버전 스탬프 + 주기적 재확인)
+        
+        같은 프로세스의 compute_sector_stats는 버전 증가로 즉시 반영되고,
+        다른 프로세스(일일 수집기 등)의 갱신은 SECTOR_STATS_RECHECK_INTERVAL마다 확인합니다.
+        
+        Args:
+            table: 'sector_stats' 또는 'global_stats'
+        """
+        now = time.monotonic()
+        with self._sector_stats_lock:
+            version = self._sector_stats_version
+            latest = self._stats_latest.get(table)
+            if latest and latest[0] == version and now - latest[1] < SECTOR_STATS_RECHECK_INTERVAL:
+                return latest[2]
+        
+        with self.get_connection() as conn:
+            row = conn.execute(f"SELECT MAX(snapshot_date) FROM {table}").fetchone()
+        latest_date = str(row[0]) if row and row[0] else None
+        
+        with self._sector_stats_lock:
+            if self._sector_stats_version == version:
+                self._stats_latest[table] = (version, now, latest_date)
+        return latest_date
+    
     def get_sector_stats(self, snapshot_date: date = None) -> Dict[str, Dict]:
         """
-        섹터 통계 조회 (프리컴퓨팅된 것)
+        섹터 통계 조회 (프리컴퓨팅된 것, 프로세스 내 읽기 캐시)
         
         Args:
             snapshot_date: 기준 날짜 (None이면 최신)
         
         Returns:
             섹터별 통계 딕셔너리 (기존 pickle 캐시 형식 호환)
+            
+        Note:
+            섹터별 통계 dict는 캐시와 공유되므로 읽기 전용으로 사용하세요.
         """
         if snapshot_date is None:
-            # 최신 날짜 조회
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute("SELECT MAX(snapshot_date) FROM sector_stats")
-                result = cursor.fetchone()
-                if result and result[0]:
-                    snapshot_date = result[0]
-                else:
-                    logger.warning("⚠️ 섹터 통계 없음")
+            key = self._latest_stats_date('sector_stats')
+            if key is None:
+                logger.warning("⚠️ 섹터 통계 없음")
+                return {}
+        else:
+            key = snapshot_date.isoformat() if isinstance(snapshot_date, date) else str(snapshot_date)
+        
+        with self._sector_stats_lock:
+            version = self._sector_stats_version
+            cached = self._sector_stats_cache.get(key)
+        if cached is not None:
+            return dict(cached)
+        
+        sector_stats = self._load_sector_stats(key)
+        if sector_stats:
+            with self._sector_stats_lock:
+                if self._sector_stats_version == version:
+                    self._sector_stats_cache[key] = sector_stats
+        return dict(sector_stats)
+    
+    def get_global_distributions(self, snapshot_date: date = None) -> Dict[str, EmpiricalDistribution]:
+        """
+        전시장 지표 분포 조회 (정렬 배열, 프로세스 내 읽기 캐시)
+        
+        Args:
+            snapshot_date: 기준 날짜 (None이면 최신)
+        
+        Returns:
+            {지표: EmpiricalDistribution} - 없으면 빈 dict
+        """
+        try:
+            if snapshot_date is None:
+                key = self._latest_stats_date('global_stats')
+                if key is None:
                     return {}
+            else:
+                key = snapshot_date.isoformat() if isinstance(snapshot_date, date) else str(snapshot_date)
+            
+            with self._sector_stats_lock:
+                version = self._sector_stats_version
+                cached = self._global_dist_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            with self.get_connection() as conn:
+                rows = conn.execute(
+                    "SELECT metric, sorted_values FROM global_stats WHERE snapshot_date = ?", (key,)
+                ).fetchall()
+            distributions = {row[0]: EmpiricalDistribution.from_bytes(row[1]) for row in rows}
+            
+            with self._sector_stats_lock:
+                if self._sector_stats_version == version:
+                    self._global_dist_cache[key] = distributions
+            logger.debug(f"✅ 글로벌 분포 로드: {', '.join(f'{m}(n={d.size})' for m, d in distributions.items())} ({key})")
+            return distributions
+        except Exception as e:
+            logger.debug(f"글로벌 분포 조회 실패: {e}")
+            return {}
+    
+    def get_sector_percentile_index(self, snapshot_date: date = None) -> Optional[SectorPercentileIndex]:
+        """
+        섹터 × 지표별 정렬 표본 인덱스 (스냅샷당 1회 구성, 스레드 간 공유)
         
+        sector_stats와 같은 스냅샷/표본 정책으로 구성되어 breakpoint 대신
+        정확한 섹터 내 퍼센타일(searchsorted)을 제공합니다.
+        
+        Args:
+            snapshot_date: 기준 날짜 (None이면 최신 섹터 통계 날짜)
+        
+        Returns:
+            SectorPercentileIndex 또는 None (섹터 통계 없음)
+        """
+        try:
+            if snapshot_date is None:
+                key = self._latest_stats_date('sector_stats')
+                if key is None:
+                    return None
+            else:
+                key = snapshot_date.isoformat() if isinstance(snapshot_date, date) else str(snapshot_date)
+            
+            with self._sector_stats_lock:
+                version = self._sector_stats_version
+                cached = self._sector_index_cache.get(key)
+            if cached is not None:
+                return cached
+            
+            metrics = list(self.sector_metrics)
+            column_sql = ", ".join(f'"{m}"' for m in metrics)
+            with self.get_connection() as conn:
+                df = pd.read_sql_query(
+                    f"SELECT sector_normalized, {column_sql} FROM stock_snapshots WHERE snapshot_date = ?",
+                    conn, params=(key,)
+                )
+            index = SectorPercentileIndex.from_frame(df, metrics=metrics, snapshot_date=key)
+            
+            with self._sector_stats_lock:
+                if self._sector_stats_version == version:
+                    self._sector_index_cache[key] = index
+            logger.debug(f"✅ 섹터 퍼센타일 인덱스 구성: {len(index.sectors(metrics[0]))}개 섹터 ({key})")
+            return index
+        except Exception as e:
+            logger.debug(f"섹터 퍼센타일 인덱스 구성 실패: {e}")
+            return None
+    
+    def _load_sector_stats(self, snapshot_date: str) -> Dict[str, Dict]:
+        """DB에서 특정 날짜 섹터 통계 로드"""
         query = """
             SELECT * FROM sector_stats
             WHERE snapshot_date = ?
@@ -413,32 +1214,8 @@ class DBCacheManager:
             logger.warning(f"⚠️ {snapshot_date} 섹터 통계 없음")
             return {}
         
-        # 기존 캐시 형식으로 변환
-        sector_stats = {}
-        for _, row in df.iterrows():
-            sector = row['sector']
-            sector_stats[sector] = {
-                'sample_size': row['sample_size'],
-                'per_percentiles': {
-                    'p10': row['per_p10'], 'p25': row['per_p25'], 'p50': row['per_p50'],
-                    'p75': row['per_p75'], 'p90': row['per_p90'],
-                    'mean': row['per_mean'], 'std': row['per_std'],
-                    'min': row['per_min'], 'max': row['per_max']
-                },
-                'pbr_percentiles': {
-                    'p10': row['pbr_p10'], 'p25': row['pbr_p25'], 'p50': row['pbr_p50'],
-                    'p75': row['pbr_p75'], 'p90': row['pbr_p90'],
-                    'mean': row['pbr_mean'], 'std': row['pbr_std'],
-                    'min': row['pbr_min'], 'max': row['pbr_max']
-                },
-                'roe_percentiles': {
-                    'p10': row['roe_p10'], 'p25': row['roe_p25'], 'p50': row['roe_p50'],
-                    'p75': row['roe_p75'], 'p90': row['roe_p90'],
-                    'mean': row['roe_mean'], 'std': row['roe_std'],
-                    'min': row['roe_min'], 'max': row['roe_max']
-                },
-                'timestamp': str(snapshot_date) if snapshot_date else datetime.now().isoformat()
-            }
+        # 기존 캐시 형식으로 변환 ('{metric}_{stat}' 컬럼 자동 인식 → 추가 지표 포함)
+        sector_stats = frame_to_sector_stats(df, timestamp=str(snapshot_date))
         
         logger.info(f"✅ 섹터 통계 조회: {len(sector_stats)}개 ({snapshot_date})")
         return sector_stats
@@ -499,13 +1276,26 @@ class DBCacheManager:
             cursor.execute("DELETE FROM stock_snapshots WHERE snapshot_date < ?", (cutoff_date,))
             deleted_snapshots = cursor.rowcount
             
-            # 섹터 통계 삭제
+            # 섹터/글로벌 통계 삭제
             cursor.execute("DELETE FROM sector_stats WHERE snapshot_date < ?", (cutoff_date,))
             deleted_stats = cursor.rowcount
+            cursor.execute("DELETE FROM global_stats WHERE snapshot_date < ?", (cutoff_date,))
+            deleted_stats += cursor.rowcount
+            
+            # 일봉 삭제
+            cursor.execute("DELETE FROM daily_bars WHERE trade_date < ?", (cutoff_date,))
+            deleted_bars = cursor.rowcount
+            
+            # 스크리닝 결과 삭제
+            cursor.execute("DELETE FROM screening_results WHERE snapshot_date < ?", (cutoff_date,))
+            cursor.execute("DELETE FROM screening_runs WHERE snapshot_date < ?", (cutoff_date,))
             
             conn.commit()
         
-        logger.info(f"✅ 오래된 데이터 정리: 스냅샷 {deleted_snapshots}개, 통계 {deleted_stats}개")
+        if deleted_stats:
+            self._invalidate_sector_stats()
+        
+        logger.info(f"✅ 오래된 데이터 정리: 스냅샷 {deleted_snapshots}개, 통계 {deleted_stats}개, 일봉 {deleted_bars}개")
         return deleted_snapshots, deleted_stats
 
 
@@ -127,6 +127,115 @@ CREATE TABLE IF NOT EXISTS sector_stats (
 
 CREATE INDEX IF NOT EXISTS idx_sector_stats_date ON sector_stats(sector, snapshot_date);
 
+-- 전시장 지표 분포 (섹터 표본 부족 시 글로벌 대체용)
+CREATE TABLE IF NOT EXISTS global_stats (
+    snapshot_date DATE NOT NULL,
+    metric TEXT NOT NULL,           -- per, pbr, roe, ...
+    
+    sample_size INTEGER NOT NULL,
+    
+    p10 REAL,
+    p25 REAL,
+    p50 REAL,
+    p75 REAL,
+    p90 REAL,
+    mean REAL,
+    std REAL,
+    min REAL,
+    max REAL,
+    
+    sorted_values BLOB NOT NULL,    -- 정렬된 표본 (float64 little-endian, searchsorted용)
+    
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (snapshot_date, metric)
+);
+
+-- 일봉 (차트 API 증분 누적 - 모멘텀 계산용)
+CREATE TABLE IF NOT EXISTS daily_bars (
+    stock_code TEXT NOT NULL,
+    trade_date DATE NOT NULL,       -- 거래일 (YYYY-MM-DD)
+
+    open_price REAL,
+    high_price REAL,
+    low_price REAL,
+    close_price REAL,
+    volume INTEGER,
+    trading_value REAL,             -- 거래대금
+
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (stock_code, trade_date)
+) WITHOUT ROWID;                    -- 종목별 클러스터링 (종목 단위 범위 조회)
+
+-- 일봉 동기화 상태 (종목별 마지막 조회일 - 하루 1회 조회 보장)
+CREATE TABLE IF NOT EXISTS daily_bar_sync (
+    stock_code TEXT PRIMARY KEY,
+    synced_date DATE NOT NULL,      -- 마지막 차트 조회일
+    last_trade_date DATE            -- 저장된 마지막 거래일
+);
+
+-- 투자자 수급 피처 (오프라인 빌더 적재 - 스크리닝 시 조회 전용)
+CREATE TABLE IF NOT EXISTS investor_features (
+    stock_code TEXT PRIMARY KEY,
+    as_of_date DATE NOT NULL,       -- 수집일
+    days INTEGER NOT NULL,          -- 집계 거래일 수
+
+    foreign_net_qty REAL,           -- 외국인 순매수 수량 합계
+    institution_net_qty REAL,       -- 기관 순매수 수량 합계
+    individual_net_qty REAL,        -- 개인 순매수 수량 합계
+    total_volume REAL,              -- 누적 거래량 합계
+    flow_ratio REAL,                -- (외국인+기관) 순매수 / 거래량
+    buy_day_ratio REAL,             -- (외국인+기관) 순매수 일수 비율
+
+    foreign_buy_streak INTEGER,     -- 최근 외국인 연속 순매수 일수 (5거래일, 5만주 초과)
+    foreign_sell_streak INTEGER,    -- 최근 외국인 연속 순매도 일수
+    foreign_buy_days INTEGER,       -- 최근 5거래일 중 외국인 순매수 일수
+    foreign_sell_days INTEGER,      -- 최근 5거래일 중 외국인 순매도 일수
+
+    investor_score REAL NOT NULL,   -- 0~100
+
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 배당 피처 (배당률 순위 스냅샷)
+CREATE TABLE IF NOT EXISTS dividend_features (
+    stock_code TEXT PRIMARY KEY,
+    as_of_date DATE NOT NULL,       -- 수집일
+
+    dividend_yield REAL,            -- 시가배당률 (%)
+    dividend_per_share REAL,        -- 주당배당금
+    record_date DATE,               -- 배당기준일
+
+    dividend_score REAL NOT NULL,   -- 0~100
+
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- 재무비율 4종 응답 (FinancialStatementService 영구 캐시 - 종목 × 결산기)
+CREATE TABLE IF NOT EXISTS financial_statements (
+    stock_code TEXT NOT NULL,
+    period_type TEXT NOT NULL,      -- 분류 구분 (0: 년, 1: 분기)
+    fiscal_period TEXT NOT NULL,    -- 최신 결산년월 (YYYYMM)
+    kind TEXT NOT NULL,             -- financial / profit / stability / growth
+    rows_json TEXT NOT NULL,        -- 엔드포인트 output 행 (JSON)
+
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (stock_code, period_type, fiscal_period, kind)
+);
+
+-- 재무제표 확인 기록 (종목별 최신 결산기 + 마지막 조회일 - 공시 전 재조회 방지)
+CREATE TABLE IF NOT EXISTS financial_statement_checks (
+    stock_code TEXT NOT NULL,
+    period_type TEXT NOT NULL,
+    fiscal_period TEXT NOT NULL,    -- 최신 결산년월 ('' = 무자료)
+    checked_at DATE NOT NULL,       -- 마지막 조회일
+    pending_kinds TEXT NOT NULL DEFAULT '',  -- 조회 실패로 아직 못 받은 종류 (쉼표 구분, 다음 조회에서 이것만 재조회)
+
+    PRIMARY KEY (stock_code, period_type)
+);
+
 -- 포트폴리오 (사용자 포트폴리오 추적)
 CREATE TABLE IF NOT EXISTS portfolio (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -164,21 +273,45 @@ CREATE TABLE IF NOT EXISTS transactions (
 
 CREATE INDEX IF NOT EXISTS idx_transactions_portfolio ON transactions(portfolio_name, transaction_date);
 
--- 스크리닝 결과 히스토리 (일별 스크리닝 결과 저장)
+-- 스크리닝 실행 (스냅샷 날짜 × 옵션 해시 × 코드 버전당 1행, 완료된 실행만 기록)
+CREATE TABLE IF NOT EXISTS screening_runs (
+    snapshot_date DATE NOT NULL,
+    options_hash TEXT NOT NULL,     -- 결과에 영향을 주는 옵션 해시
+    code_version TEXT NOT NULL,     -- 평가 코드 버전
+    
+    options_json TEXT,              -- 옵션 원문 (JSON)
+    universe_size INTEGER,
+    fetched_count INTEGER,
+    scored_count INTEGER,
+    reused_count INTEGER,           -- 입력 스냅샷 변화 없어 재사용한 종목 수
+    elapsed_sec REAL,
+    
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    
+    PRIMARY KEY (snapshot_date, options_hash, code_version)
+);
+
+CREATE INDEX IF NOT EXISTS idx_screening_runs_lookup ON screening_runs(options_hash, code_version, snapshot_date);
+
+-- 스크리닝 결과 (실행별 종목 행)
 CREATE TABLE IF NOT EXISTS screening_results (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
-    screening_date DATE NOT NULL,
+    snapshot_date DATE NOT NULL,
+    options_hash TEXT NOT NULL,
+    code_version TEXT NOT NULL,
     
     stock_code TEXT NOT NULL,
     stock_name TEXT,
+    input_hash TEXT,                -- 평가 입력 스냅샷 해시 (증분 재평가 판단)
     
     -- 점수
     value_score REAL,
     quality_score REAL,
     mos_score REAL,
-    total_score REAL,
+    momentum_score REAL,
     
     -- 평가
+    grade TEXT,
     rating TEXT,                    -- STRONG_BUY, BUY, HOLD, SELL
     
     -- 주요 지표
@@ -190,13 +323,24 @@ CREATE TABLE IF NOT EXISTS screening_results (
     -- 섹터
     sector TEXT,
     
+    -- 기준 충족 플래그 (0/1)
+    per_ok INTEGER,
+    pbr_ok INTEGER,
+    roe_ok INTEGER,
+    score_ok INTEGER,
+    is_value_stock INTEGER,
+    
+    payload TEXT,                   -- 결과 행 원문 (JSON)
+    
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     
-    UNIQUE(screening_date, stock_code)
+    UNIQUE(snapshot_date, options_hash, code_version, stock_code)
 );
 
-CREATE INDEX IF NOT EXISTS idx_screening_date ON screening_results(screening_date);
-CREATE INDEX IF NOT EXISTS idx_screening_rating ON screening_results(rating);
+CREATE INDEX IF NOT EXISTS idx_screening_results_score ON screening_results(snapshot_date, options_hash, code_version, value_score DESC);
+CREATE INDEX IF NOT EXISTS idx_screening_results_grade ON screening_results(snapshot_date, grade);
+CREATE INDEX IF NOT EXISTS idx_screening_results_sector ON screening_results(snapshot_date, sector);
+CREATE INDEX IF NOT EXISTS idx_screening_results_pass ON screening_results(snapshot_date, is_value_stock, score_ok);
 
 -- 데이터 수집 로그 (수집 이력 추적)
 CREATE TABLE IF NOT EXISTS collection_log (
@@ -16,6 +16,7 @@ from rich.progress import Progress
 from rich.table import Table
 from typing import List, Dict, Any, Tuple
 from numbers import Real
+import functools
 from kis_data_provider import KISDataProvider
 from investment_opinion_analyzer import InvestmentOpinionAnalyzer
 from estimate_performance_analyzer import EstimatePerformanceAnalyzer
@@ -23,6 +24,8 @@ from financial_ratio_analyzer import FinancialRatioAnalyzer
 from profit_ratio_analyzer import ProfitRatioAnalyzer
 from stability_ratio_analyzer import StabilityRatioAnalyzer
 from growth_ratio_analyzer import GrowthRatioAnalyzer
+from financial_statement_service import get_financial_statement_service
+from analysis_legs import Leg, run_legs
 from test_integrated_analysis import create_integrated_analysis
 # 백테스팅 관련 import는 함수 내부에서 처리
 
@@ -170,10 +173,12 @@ class EnhancedIntegratedAnalyzer:
         self.opinion_analyzer = InvestmentOpinionAnalyzer()
         self.estimate_analyzer = EstimatePerformanceAnalyzer()
         self.provider = KISDataProvider()
-        self.financial_ratio_analyzer = FinancialRatioAnalyzer(self.provider)
-        self.profit_ratio_analyzer = ProfitRatioAnalyzer(self.provider)
-        self.stability_ratio_analyzer = StabilityRatioAnalyzer(self.provider)
-        self.growth_ratio_analyzer = GrowthRatioAnalyzer(self.provider)
+        # 재무비율 4종은 하나의 조회 계획 + (종목, 결산기) 영구 캐시를 공유
+        self.statements = get_financial_statement_service(self.provider)
+        self.financial_ratio_analyzer = FinancialRatioAnalyzer(self.provider, statements=self.statements)
+        self.profit_ratio_analyzer = ProfitRatioAnalyzer(self.provider, statements=self.statements)
+        self.stability_ratio_analyzer = StabilityRatioAnalyzer(self.provider, statements=self.statements)
+        self.growth_ratio_analyzer = GrowthRatioAnalyzer(self.provider, statements=self.statements)
         self.kospi_data = None
         # 공급자 호출 경합 완화용(부분적) 락
         self._provider_lock = Lock()
@@ -353,9 +358,11 @@ class EnhancedIntegratedAnalyzer:
         """KOSPI 마스터 데이터를 로드합니다."""
         try:
             # KOSPI 마스터 데이터 로드
-            kospi_file = 'kospi_code.xlsx'
-            if os.path.exists(kospi_file):
-                self.kospi_data = pd.read_excel(kospi_file, engine="openpyxl")  # 명시적 엔진 지정
+            from kospi_master import get_kospi_master
+            master = get_kospi_master()  # .mst 직접 파싱 + 해시 캐시 (Excel 파싱 생략)
+            kospi_file = master.source or 'kospi_code.mst'
+            if not master.empty:
+                self.kospi_data = master.dataframe()
                 # ✅ 단축코드 6자리 0패딩 강제 (문자열 기준)
                 self.kospi_data['단축코드'] = (
                     self.kospi_data['단축코드']
@@ -390,7 +397,7 @@ class EnhancedIntegratedAnalyzer:
         except Exception as e:
             console.print(
                 "❌ KOSPI 데이터 로드 실패: "
-                f"{e}\n    ↳ openpyxl 미설치 여부, 파일 경로/권한, 시트 포맷을 확인하세요."
+                f"{e}\n    ↳ kospi_code.mst(또는 kospi_code.xlsx) 경로/권한, 포맷을 확인하세요."
             )
             self.kospi_data = pd.DataFrame()
             self._kospi_index = {}
@@ -425,128 +432,69 @@ class EnhancedIntegratedAnalyzer:
         
         return stocks
     
-    def get_financial_ratios_data(self, symbol: str) -> Dict[str, Any]:
-        """종목의 재무비율 데이터를 수집합니다. (고급 재시도 로직 적용)"""
+    def _ratio_fragment(self, symbol: str) -> Dict[str, Any]:
+        """재무비율 레그 (무자료는 영구 실패로 간주: 우선주/비커버리지 가능성 높음)"""
+        financial_ratios = self.financial_ratio_analyzer.get_financial_ratios(symbol)
+        if not financial_ratios:
+            logger.debug(f"⚠️ {symbol} 재무비율 무자료: 즉시 중단")
+            return {}
+        latest_ratios = financial_ratios[0]
+        return {
+            'roe': latest_ratios.get('roe', 0),
+            'roa': latest_ratios.get('roa', 0),
+            'debt_ratio': latest_ratios.get('debt_ratio', 0),
+            'equity_ratio': latest_ratios.get('equity_ratio', 0),
+            'revenue_growth_rate': latest_ratios.get('revenue_growth_rate', 0),
+            'operating_income_growth_rate': latest_ratios.get('operating_income_growth_rate', 0),
+            'net_income_growth_rate': latest_ratios.get('net_income_growth_rate', 0)
+        }
+    
+    def _profit_fragment(self, symbol: str) -> Dict[str, Any]:
+        """수익성비율 레그 (무자료 즉시 중단)"""
+        profit_ratios = self.profit_ratio_analyzer.get_profit_ratios(symbol)
+        if not profit_ratios:
+            logger.debug(f"⚠️ {symbol} 수익성비율 무자료: 즉시 중단")
+            return {}
+        latest_profit = profit_ratios[0]
+        return {
+            'net_profit_margin': latest_profit.get('net_profit_margin', 0),
+            'gross_profit_margin': latest_profit.get('gross_profit_margin', 0),
+            'profitability_grade': latest_profit.get('profitability_grade', '평가불가')
+        }
+    
+    def _stability_fragment(self, symbol: str) -> Dict[str, Any]:
+        """안정성비율 레그"""
+        stability_ratios = self.stability_ratio_analyzer.get_stability_ratios(symbol)
+        if not stability_ratios:
+            return {}
+        latest_stability = stability_ratios[0]
+        return {
+            'current_ratio': latest_stability.get('current_ratio', 0),
+            'quick_ratio': latest_stability.get('quick_ratio', 0),
+            'borrowing_dependency': latest_stability.get('borrowing_dependency', 0),
+            'stability_grade': latest_stability.get('stability_grade', '평가불가')
+        }
+    
+    def _growth_fragment(self, symbol: str) -> Dict[str, Any]:
+        """성장성비율 레그"""
+        growth_ratios = self.growth_ratio_analyzer.get_growth_ratios(symbol)
+        if not growth_ratios:
+            return {}
+        latest_growth = growth_ratios[0]
+        return {
+            # 성장률 키 일원화: revenue_growth (YoY, %)
+            'revenue_growth': latest_growth.get('revenue_growth_rate', 0),
+            'operating_income_growth_rate_annual': latest_growth.get('operating_income_growth_rate', 0),
+            'equity_growth_rate': latest_growth.get('equity_growth_rate', 0),
+            'total_asset_growth_rate': latest_growth.get('total_asset_growth_rate', 0),
+            'growth_grade': latest_growth.get('growth_grade', '평가불가')
+        }
+    
+    def _merge_financial_fragments(self, *fragments: Dict[str, Any]) -> Dict[str, Any]:
+        """재무비율 4종 레그 결과 병합 + 데이터 결측 플래그 (실무 판단을 위한 구분)"""
         financial_data = {}
-        
-        # 1. 재무비율 분석 (고급 재시도 로직 + 무자료 즉시 중단)
-        max_retries = 2
-        for attempt in range(max_retries + 1):
-            try:
-                rate_limiter.acquire()
-                financial_ratios = self.financial_ratio_analyzer.get_financial_ratios(symbol)
-                if financial_ratios and len(financial_ratios) > 0:
-                    latest_ratios = financial_ratios[0]
-                    financial_data.update({
-                        'roe': latest_ratios.get('roe', 0),
-                        'roa': latest_ratios.get('roa', 0),
-                        'debt_ratio': latest_ratios.get('debt_ratio', 0),
-                        'equity_ratio': latest_ratios.get('equity_ratio', 0),
-                        'revenue_growth_rate': latest_ratios.get('revenue_growth_rate', 0),
-                        'operating_income_growth_rate': latest_ratios.get('operating_income_growth_rate', 0),
-                        'net_income_growth_rate': latest_ratios.get('net_income_growth_rate', 0)
-                    })
-                    break
-                else:
-                    # 무자료는 영구 실패로 간주(우선주/비커버리지 가능성 높음)
-                    if attempt == 0:
-                        logger.debug(f"⚠️ {symbol} 재무비율 무자료: 즉시 중단")
-                        break
-                    if attempt < max_retries:
-                        logger.debug(f"🔄 {symbol} 재무비율 조회 재시도 중... ({attempt + 1}/{max_retries})")
-                        time.sleep(0.5)
-                        continue
-                    else:
-                        logger.debug(f"⚠️ {symbol} 재무비율 데이터 없음")
-            except Exception as e:
-                if attempt < max_retries:
-                    logger.debug(f"🔄 {symbol} 재무비율 API 호출 재시도 중... ({attempt + 1}/{max_retries}): {e}")
-                    time.sleep(0.5)
-                    continue
-                else:
-                    logger.warning(f"❌ {symbol} 재무비율 API 호출 최종 실패: {e}")
-        
-        # 2. 수익성비율 분석 (강화된 재시도 로직 + 무자료 즉시 중단)
-        max_retries = 3  # 재시도 횟수 감소 (5 → 3)
-        for attempt in range(max_retries + 1):
-            try:
-                rate_limiter.acquire()
-                profit_ratios = self.profit_ratio_analyzer.get_profit_ratios(symbol)
-                if profit_ratios and len(profit_ratios) > 0:
-                    latest_profit = profit_ratios[0]
-                    financial_data.update({
-                        'net_profit_margin': latest_profit.get('net_profit_margin', 0),
-                        'gross_profit_margin': latest_profit.get('gross_profit_margin', 0),
-                        'profitability_grade': latest_profit.get('profitability_grade', '평가불가')
-                    })
-                    break
-                else:
-                    # 무자료는 영구 실패로 간주(우선주/비커버리지 가능성 높음)
-                    if attempt == 0:
-                        logger.debug(f"⚠️ {symbol} 수익성비율 무자료: 즉시 중단")
-                        break
-                    if attempt < max_retries:
-                        # 지수 백오프: 2초, 4초, 8초
-                        wait_time = 2 ** (attempt + 1)
-                        logger.debug(f"🔄 {symbol} 수익성비율 조회 재시도 중... ({attempt + 1}/{max_retries}, {wait_time}초 대기)")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        logger.debug(f"⚠️ {symbol} 수익성비율 데이터 없음")
-            except Exception as e:
-                if attempt < max_retries:
-                    # 지수 백오프: 2초, 4초, 8초
-                    wait_time = 2 ** (attempt + 1)
-                    logger.debug(f"🔄 {symbol} 수익성비율 API 호출 재시도 중... ({attempt + 1}/{max_retries}, {wait_time}초 대기): {e}")
-                    time.sleep(wait_time)
-                    continue
-                else:
-                    # 연결 오류인 경우에만 경고, 다른 오류는 디버그
-                    if 'Connection' in str(e) or 'RemoteDisconnected' in str(e):
-                        logger.warning(f"❌ {symbol} 수익성비율 API 연결 실패: {e}")
-                    else:
-                        logger.debug(f"❌ {symbol} 수익성비율 API 호출 실패: {e}")
-                    
-                    # 실패 시 기본값 설정
-                    financial_data.update({
-                        'net_profit_margin': 0,
-                        'gross_profit_margin': 0,
-                        'profitability_grade': '데이터없음'
-                    })
-        
-        # 3. 안정성비율 분석 (기본 재시도 로직)
-        try:
-            rate_limiter.acquire()
-            stability_ratios = self.stability_ratio_analyzer.get_stability_ratios(symbol)
-            if stability_ratios and len(stability_ratios) > 0:
-                latest_stability = stability_ratios[0]
-                financial_data.update({
-                    'current_ratio': latest_stability.get('current_ratio', 0),
-                    'quick_ratio': latest_stability.get('quick_ratio', 0),
-                    'borrowing_dependency': latest_stability.get('borrowing_dependency', 0),
-                    'stability_grade': latest_stability.get('stability_grade', '평가불가')
-                })
-        except Exception as e:
-            logger.warning(f"❌ {symbol} 안정성비율 분석 실패: {e}")
-        
-        # 4. 성장성비율 분석 (기본 재시도 로직)
-        try:
-            rate_limiter.acquire()
-            growth_ratios = self.growth_ratio_analyzer.get_growth_ratios(symbol)
-            if growth_ratios and len(growth_ratios) > 0:
-                latest_growth = growth_ratios[0]
-                financial_data.update({
-                    # 성장률 키 일원화: revenue_growth (YoY, %)
-                    'revenue_growth': latest_growth.get('revenue_growth_rate', 0),
-                    'operating_income_growth_rate_annual': latest_growth.get('operating_income_growth_rate', 0),
-                    'equity_growth_rate': latest_growth.get('equity_growth_rate', 0),
-                    'total_asset_growth_rate': latest_growth.get('total_asset_growth_rate', 0),
-                    'growth_grade': latest_growth.get('growth_grade', '평가불가')
-                })
-        except Exception as e:
-            logger.warning(f"❌ {symbol} 성장성비율 분석 실패: {e}")
-        
-        # 데이터 결측 플래그 추가 (실무 판단을 위한 구분)
+        for fragment in fragments:
+            financial_data.update(fragment or {})
         financial_data['__missing_flags__'] = {
             'ratios': not (self._has_numeric(financial_data, 'roe') or self._has_numeric(financial_data, 'roa')),
             'profit': not self._has_numeric(financial_data, 'net_profit_margin'),
@@ -554,9 +502,64 @@ class EnhancedIntegratedAnalyzer:
             'growth': not (self._has_numeric(financial_data, 'revenue_growth') or
                             self._has_numeric(financial_data, 'revenue_growth_rate'))
         }
-        
         return financial_data
     
+    def _financial_from_statements(self, symbol: str, statements: Dict[str, Any]) -> Dict[str, Any]:
+        """재무제표 응답(캐시) → 재무비율 4종 조각 병합 (조각별 실패는 해당 조각만 제외)"""
+        fragments = []
+        for fragment_fn, label in ((self._ratio_fragment, '재무비율'), (self._profit_fragment, '수익성비율'),
+                                   (self._stability_fragment, '안정성비율'), (self._growth_fragment, '성장성비율')):
+            try:
+                fragments.append(fragment_fn(symbol))
+            except Exception as e:
+                logger.warning(f"❌ {symbol} {label} 분석 실패: {e}")
+        return self._merge_financial_fragments(*fragments)
+    
+    def _financial_legs(self, symbol: str) -> List[Leg]:
+        """재무제표 조회 계획(4개 엔드포인트, 캐시 우선) + 병합 노드 ('financial')"""
+        return [
+            Leg('statements', functools.partial(self.statements.get_statements, symbol), default={},
+                label=f"{symbol} 재무제표"),
+            # 조회 계획이 끝나면 4종 분석기는 메모리 캐시에서 바로 파싱
+            Leg('financial', functools.partial(self._financial_from_statements, symbol), deps=('statements',),
+                default={}),
+        ]
+    
+    def get_financial_ratios_data(self, symbol: str) -> Dict[str, Any]:
+        """종목의 재무비율 데이터를 수집합니다. (재무제표 서비스 1회 조회 계획, 새 결산기 전에는 캐시)"""
+        return run_legs(self._financial_legs(symbol))['financial']
+    
+    def _fetch_price_info(self, symbol: str) -> Dict[str, Any]:
+        """현재가/52주 고저/PER/PBR 레그 (공급자 호출 경합 완화 락)"""
+        with self._provider_lock:
+            return self.provider.get_stock_price_info(symbol)
+    
+    def _fetch_risk_analysis(self, symbol: str, price_info: Dict[str, Any]) -> Dict[str, Any]:
+        """시장 리스크 분석 레그 (공유 리스크 서비스 + 현재가 레그 응답 재사용, 추가 API 호출 없음)"""
+        from market_risk_analyzer import get_market_risk_service
+        return get_market_risk_service(self.provider).analyze_stock_risk(symbol, price_info=price_info or {}) or {}
+    
+    def _stock_legs(self, symbol: str, days_back: int = 30) -> List[Leg]:
+        """
+        종목 1개 분석 그래프
+        
+        투자의견 / 추정실적 / 재무비율 4종(+병합) / 현재가는 서로 독립이라 동시에 진행하고,
+        리스크는 현재가 응답을 받아 공유 시장 상태로 계산합니다.
+        점수 계산은 모든 레그가 끝난 뒤 (실패 레그는 기본값) 수행합니다.
+        """
+        return [
+            Leg('opinion', functools.partial(self.opinion_analyzer.analyze_single_stock, symbol, days_back=days_back),
+                retries=2, accept=bool, default={}, label=f"{symbol} 투자의견 분석"),
+            Leg('estimate', functools.partial(self.estimate_analyzer.analyze_single_stock, symbol),
+                retries=2, accept=bool, default={}, label=f"{symbol} 추정실적 분석"),
+            *self._financial_legs(symbol),
+            Leg('price', functools.partial(self._fetch_price_info, symbol), retries=2,
+                accept=lambda info: bool(info) and self._finite(info.get('current_price')) > 0,
+                label=f"{symbol} 현재가 조회"),
+            Leg('risk', functools.partial(self._fetch_risk_analysis, symbol), deps=('price',), default={},
+                label=f"{symbol} 리스크 점수 계산"),
+        ]
+    
     def calculate_enhanced_integrated_score(self, opinion_analysis: Dict[str, Any], 
                                             estimate_analysis: Dict[str, Any], 
                                             financial_data: Dict[str, Any],
@@ -959,41 +962,13 @@ class EnhancedIntegratedAnalyzer:
                     'enhanced_score': 0, 'enhanced_grade': 'F',
                     'financial_data': {}, 'opinion_analysis': {}, 'estimate_analysis': {}
                 }
-            # 투자의견 분석 (재시도 로직 적용)
-            opinion_analysis = {}
-            max_retries = 2
-            for attempt in range(max_retries + 1):
-                try:
-                    opinion_analysis = self.opinion_analyzer.analyze_single_stock(symbol, days_back=days_back)
-                    if opinion_analysis:
-                        break
-                except Exception as e:
-                    if attempt < max_retries:
-                        logger.debug(f"🔄 {symbol} 투자의견 분석 재시도 중... ({attempt + 1}/{max_retries}): {e}")
-                        time.sleep(0.5)
-                        continue
-                    else:
-                        logger.warning(f"❌ {symbol} 투자의견 분석 최종 실패: {e}")
-                        opinion_analysis = {}
-            
-            # 추정실적 분석 (재시도 로직 적용)
-            estimate_analysis = {}
-            for attempt in range(max_retries + 1):
-                try:
-                    estimate_analysis = self.estimate_analyzer.analyze_single_stock(symbol)
-                    if estimate_analysis:
-                        break
-                except Exception as e:
-                    if attempt < max_retries:
-                        logger.debug(f"🔄 {symbol} 추정실적 분석 재시도 중... ({attempt + 1}/{max_retries}): {e}")
-                        time.sleep(0.5)
-                        continue
-                    else:
-                        logger.warning(f"❌ {symbol} 추정실적 분석 최종 실패: {e}")
-                        estimate_analysis = {}
-            
-            # 재무비율 데이터 수집 (이미 고급 재시도 로직 적용됨)
-            financial_data = self.get_financial_ratios_data(symbol)
+            # API 레그 동시 진행 (투자의견/추정실적/재무비율 4종/현재가/리스크, 종목 지연 ≈ 가장 긴 레그)
+            legs = run_legs(self._stock_legs(symbol, days_back))
+            opinion_analysis = legs['opinion']
+            estimate_analysis = legs['estimate']
+            financial_data = dict(legs['financial'])
+            price_info = legs['price']
+            risk_analysis = legs['risk']
             
             # PER 데이터 추가 (estimate_analysis에서 가져오기, 없으면 0으로 초기화)
             if estimate_analysis and 'valuation_analysis' in estimate_analysis:
@@ -1021,67 +996,38 @@ class EnhancedIntegratedAnalyzer:
                 market_cap = float(getattr(row, '시가총액', 0) or 0)
                 current_price = float(getattr(row, '현재가', 0) or 0)
             
-            # KIS API에서 현재가/52주 고저 **1회 조회** (재시도 로직 + 락)
-            price_position = None  # ✅ 루프 전 안전 초기화 (재시도 실패 시 UnboundLocal 방지)
-            for attempt in range(max_retries + 1):
-                try:
-                    rate_limiter.acquire()
-                    with self._provider_lock:
-                        price_info = self.provider.get_stock_price_info(symbol)
-                    if price_info and 'current_price' in price_info and price_info['current_price'] > 0:
-                        current_price = float(price_info['current_price'])
-                        # 52주 위치 계산 (동일 응답 사용)
-                        w52_high = float(price_info.get('w52_high', 0) or 0)
-                        w52_low = float(price_info.get('w52_low', 0) or 0)
-                        if w52_high > w52_low > 0:
-                            price_position = ((current_price - w52_low) / (w52_high - w52_low)) * 100
-                        
-                        # PER, PBR, EPS, BPS 데이터 추가 (KIS API에서 직접 조회)
-                        per_value = price_info.get('per', 0)
-                        pbr_value = price_info.get('pbr', 0)
-                        eps_value = price_info.get('eps', 0)
-                        bps_value = price_info.get('bps', 0)
-                        
-                        financial_data.update({
-                            'per': float(per_value) if per_value is not None and per_value != '' else 0,
-                            'pbr': float(pbr_value) if pbr_value is not None and pbr_value != '' else 0,
-                            'eps': float(eps_value) if eps_value is not None and eps_value != '' else 0,
-                            'bps': float(bps_value) if bps_value is not None and bps_value != '' else 0
-                        })
-                        break
-                    else:
-                        if attempt < max_retries:
-                            logger.debug(f"🔄 {symbol} 현재가 조회 재시도 중... ({attempt + 1}/{max_retries})")
-                            time.sleep(0.5)
-                            continue
-                        else:
-                            logger.warning(f"⚠️ {symbol} 현재가 데이터 없음")
-                            current_price = 0
-                except Exception as e:
-                    if attempt < max_retries:
-                        logger.debug(f"🔄 {symbol} 현재가 조회 재시도 중... ({attempt + 1}/{max_retries}): {e}")
-                        time.sleep(0.5)
-                        continue
-                    else:
-                        logger.warning(f"❌ {symbol} 현재가 조회 최종 실패: {e}")
-                        current_price = 0
-            
-            # price_position은 위 루프에서 함께 계산됨 (중복 호출 제거)
+            # KIS API 현재가/52주 고저 (레그 1회 조회 결과)
+            price_position = None
+            if price_info:
+                current_price = float(price_info['current_price'])
+                # 52주 위치 계산 (동일 응답 사용)
+                w52_high = float(price_info.get('w52_high', 0) or 0)
+                w52_low = float(price_info.get('w52_low', 0) or 0)
+                if w52_high > w52_low > 0:
+                    price_position = ((current_price - w52_low) / (w52_high - w52_low)) * 100
+                
+                # PER, PBR, EPS, BPS 데이터 추가 (KIS API에서 직접 조회)
+                per_value = price_info.get('per', 0)
+                pbr_value = price_info.get('pbr', 0)
+                eps_value = price_info.get('eps', 0)
+                bps_value = price_info.get('bps', 0)
+                
+                financial_data.update({
+                    'per': float(per_value) if per_value is not None and per_value != '' else 0,
+                    'pbr': float(pbr_value) if pbr_value is not None and pbr_value != '' else 0,
+                    'eps': float(eps_value) if eps_value is not None and eps_value != '' else 0,
+                    'bps': float(bps_value) if bps_value is not None and bps_value != '' else 0
+                })
+            else:
+                current_price = 0
             
-            # 리스크 점수 계산 (시장 리스크 분석기 사용)
+            # 리스크 점수 (시장 리스크 분석기 레그 결과)
             risk_score = None
-            risk_analysis = {}
-            try:
-                from market_risk_analyzer import create_market_risk_analyzer
-                risk_analyzer = create_market_risk_analyzer(self.provider)
-                risk_analysis = risk_analyzer.analyze_stock_risk(symbol)
-                rs = risk_analysis.get('risk_score', 0)
+            if risk_analysis:
                 try:
-                    risk_score = max(0.0, min(10.0, float(rs or 0)))
+                    risk_score = max(0.0, min(10.0, float(risk_analysis.get('risk_score', 0) or 0)))
                 except Exception:
                     risk_score = None
-            except Exception as e:
-                logger.debug(f"리스크 점수 계산 실패: {e}")
             
             # 향상된 통합 점수 계산 (저평가 가치주 발굴 중심, 리스크 반영)
             enhanced_score = self.calculate_enhanced_integrated_score(
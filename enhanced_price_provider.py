@@ -34,10 +34,15 @@ class EnhancedPriceProvider:
     def _load_kospi_master_data(self) -> Optional[pd.DataFrame]:
         """KOSPI 마스터 데이터 로드"""
         try:
-            # 여러 가능한 파일 경로 시도
+            # ✅ 공유 마스터 우선 (kospi_code.mst 직접 파싱 + 해시 캐시, Excel 파싱 생략)
+            from kospi_master import get_kospi_master
+            master = get_kospi_master()
+            if not master.empty:
+                logger.info(f"✅ KOSPI 마스터 데이터 로드 성공: {master.source} (종목코드: 단축코드)")
+                return master.dataframe().set_index('단축코드')
+            
+            # 여러 가능한 파일 경로 시도 (비표준 위치)
             possible_paths = [
-                'kospi_code.xlsx',
-                'kospi_code.mst',
                 'data/kospi_code.xlsx',
                 'cache/kospi_code.xlsx'
             ]
@@ -70,10 +75,6 @@ class EnhancedPriceProvider:
                         else:
                             logger.debug(f"⚠️ {path}에서 종목코드 컬럼을 찾을 수 없습니다. 사용 가능한 컬럼: {list(df.columns)}")
                             
-                    elif path.endswith('.mst'):
-                        # .mst 파일 처리 (필요시)
-                        logger.debug(f"⚠️ .mst 파일 처리는 아직 구현되지 않았습니다: {path}")
-                        pass
                 except Exception as e:
                     logger.debug(f"⚠️ {path} 로드 실패: {e}")
                     continue
@@ -5,6 +5,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Any
 from kis_token_manager import KISTokenManager
+from kis_rate_limiter import KISGlobalRateLimiter
 from estimate_performance_models import (
     EstimatePerformanceRequest,
     EstimatePerformanceResponse,
@@ -29,10 +30,8 @@ class EstimatePerformanceClient:
         self.request_interval = 0.12  # API TPS 제한 준수
 
     def _rate_limit(self):
-        """API 요청 속도를 제어합니다."""
-        elapsed_time = time.time() - self.last_request_time
-        if elapsed_time < self.request_interval:
-            time.sleep(self.request_interval - elapsed_time)
+        """API 요청 속도를 제어합니다 (전역/프로세스 간 공유 계정 쿼터)."""
+        KISGlobalRateLimiter.rate_limit(self.request_interval, lane='quotations')
         self.last_request_time = time.time()
 
     def _send_request(self, request_data: EstimatePerformanceRequest, max_retries: int = 3) -> Optional[EstimatePerformanceResponse]:
@@ -0,0 +1,457 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+투자자 수급 / 배당 피처 오프라인 빌더
+
+스크리닝 중 후보마다 투자자 동향·배당 API를 호출하면 AppKey가 차단되므로,
+장 마감 후 별도 작업으로 수집해 DB(investor_features, dividend_features)에 저장하고
+스크리닝 시에는 테이블을 1회 로드해 종목별 O(1)로 조회합니다.
+
+- 투자자 수급: 종목별 get_investor_trend_daily 1회 (최근 lookback_days 일)
+- 배당: get_dividend_ranking (코스피/코스닥 배당률 순위 스냅샷, 수 회 호출)
+- 호출 간격: 전역 Rate Limiter TPS × tps_share (나머지 쿼터는 다른 작업용)
+- 재개: 오늘 이미 수집한 종목은 건너뜀, batch_size 종목마다 저장
+- 중단: max_calls / time_budget 도달 시 남은 종목은 다음 실행에서 이어서 수집
+
+실행:
+    python feature_builder.py                      # 장중에는 거부 (--force로 무시)
+    python feature_builder.py --max-calls 500 --time-budget 30
+"""
+
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 투자자 동향 집계 기간 (달력일)
+INVESTOR_LOOKBACK_DAYS = 30
+
+# 배당률 순위 조회 업종 (코스피 종합, 코스닥 종합)
+DIVIDEND_UPJONGS = ('0001', '1001')
+
+# 업종별 배당률 순위 조회 한도
+DIVIDEND_RANKING_LIMIT = 500
+
+# 피처 유효 기간 (일) - 초과 시 중립 점수
+FEATURE_MAX_AGE_DAYS = 7
+
+# 점수 테이블 재로드 간격 (초) - 빌더가 다른 프로세스에서 갱신한 값 반영
+FEATURE_RELOAD_INTERVAL = 300.0
+
+# 피처가 없을 때의 중립 점수
+NEUTRAL_SCORE = 50.0
+
+# 수급 비율 포화점: (외국인+기관) 순매수가 거래량의 10%면 만점 가감
+FLOW_RATIO_SATURATION = 0.10
+
+# 배당률 포화점 (%): 5% 이상이면 100점
+DIVIDEND_YIELD_SATURATION = 5.0
+
+# 외국인 추세 판단: 최근 거래일 수 / 매매 판단 수량 (이 수량을 넘는 순매수·순매도만 집계)
+FOREIGN_TREND_DAYS = 5
+FOREIGN_TREND_QTY = 50000
+
+# 정규장 (장중에는 CLI 실행 거부)
+MARKET_OPEN = (9, 0)
+MARKET_CLOSE = (15, 30)
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """API 문자열 숫자 → float (빈 값/파싱 실패는 None)"""
+    try:
+        if value is None or str(value).strip() == '':
+            return None
+        return float(str(value).replace(',', ''))
+    except (TypeError, ValueError):
+        return None
+
+
+def _normalize_code(value: Any) -> Optional[str]:
+    """6자리 종목코드 (형식 불일치는 None)"""
+    code = str(value or '').strip()
+    if code.startswith('A') and len(code) == 7:
+        code = code[1:]
+    if not code.isdigit() or len(code) > 6:
+        return None
+    return code.zfill(6)
+
+
+def is_market_hours(now: Optional[datetime] = None) -> bool:
+    """평일 정규장(09:00~15:30) 여부"""
+    now = now or datetime.now()
+    if now.weekday() >= 5:
+        return False
+    return MARKET_OPEN <= (now.hour, now.minute) < MARKET_CLOSE
+
+
+def investor_flow_score(flow_ratio: float, buy_day_ratio: float) -> float:
+    """
+    투자자 수급 점수 (0~100, 중립 50)
+
+    - 순매수 강도: (외국인+기관) 순매수 / 거래량, ±FLOW_RATIO_SATURATION에서 ±40점
+    - 순매수 지속성: 순매수 일수 비율, 0% → -10점, 100% → +10점
+    """
+    strength = max(-1.0, min(1.0, flow_ratio / FLOW_RATIO_SATURATION))
+    persistence = 2.0 * max(0.0, min(1.0, buy_day_ratio)) - 1.0
+    return max(0.0, min(100.0, NEUTRAL_SCORE + 40.0 * strength + 10.0 * persistence))
+
+
+def dividend_yield_score(dividend_yield: Optional[float]) -> float:
+    """배당 점수 (0% → 50점, DIVIDEND_YIELD_SATURATION% 이상 → 100점 선형)"""
+    if dividend_yield is None or dividend_yield != dividend_yield:
+        return NEUTRAL_SCORE
+    ratio = max(0.0, min(dividend_yield, DIVIDEND_YIELD_SATURATION)) / DIVIDEND_YIELD_SATURATION
+    return NEUTRAL_SCORE + 50.0 * ratio
+
+
+def foreign_trend_stats(foreign_by_day: Sequence[float], days: int = FOREIGN_TREND_DAYS,
+                        threshold: float = FOREIGN_TREND_QTY) -> Dict[str, int]:
+    """
+    최근 외국인 순매수 수량 → 연속/누적 매매 일수
+
+    Args:
+        foreign_by_day: 일별 외국인 순매수 수량 (최신 먼저)
+        days: 판단 기간 (최근 거래일 수)
+        threshold: 매수/매도로 보는 최소 수량
+
+    Returns:
+        {'foreign_buy_streak', 'foreign_sell_streak', 'foreign_buy_days', 'foreign_sell_days'}
+    """
+    recent = list(foreign_by_day)[:days]
+    sides = [1 if qty > threshold else -1 if qty < -threshold else 0 for qty in recent]
+    streak = 0
+    for side in sides:
+        if side == 0 or side != sides[0]:
+            break
+        streak += 1
+    return {
+        'foreign_buy_streak': streak if sides and sides[0] > 0 else 0,
+        'foreign_sell_streak': streak if sides and sides[0] < 0 else 0,
+        'foreign_buy_days': sides.count(1),
+        'foreign_sell_days': sides.count(-1),
+    }
+
+
+def build_investor_feature(symbol: str, rows: Sequence[Dict], as_of: date,
+                           lookback_days: int = INVESTOR_LOOKBACK_DAYS) -> Optional[Dict[str, Any]]:
+    """
+    일별 투자자 매매동향 → 피처 1행
+
+    Args:
+        symbol: 종목코드
+        rows: get_investor_trend_daily 응답 (일자별 행)
+        as_of: 수집일
+        lookback_days: 집계 기간 (달력일, 이전 날짜 행은 제외)
+
+    Returns:
+        investor_features 행 딕셔너리 (유효 행이 없으면 None)
+    """
+    start = (as_of - timedelta(days=lookback_days)).strftime('%Y%m%d')
+    foreign = institution = individual = volume = 0.0
+    days = buy_days = 0
+    foreign_by_date = []
+    for row in rows or []:
+        if not isinstance(row, dict) or str(row.get('stck_bsop_date', '')) < start:
+            continue
+        f = _to_float(row.get('frgn_ntby_qty'))
+        o = _to_float(row.get('orgn_ntby_qty'))
+        if f is None and o is None:
+            continue
+        smart = (f or 0.0) + (o or 0.0)
+        foreign += f or 0.0
+        foreign_by_date.append((str(row.get('stck_bsop_date', '')), f or 0.0))
+        institution += o or 0.0
+        individual += _to_float(row.get('prsn_ntby_qty')) or 0.0
+        volume += _to_float(row.get('acml_vol')) or 0.0
+        days += 1
+        buy_days += smart > 0
+    if not days:
+        return None
+
+    flow_ratio = (foreign + institution) / volume if volume > 0 else 0.0
+    buy_day_ratio = buy_days / days
+    return {
+        'stock_code': symbol,
+        'as_of_date': as_of.isoformat(),
+        'days': days,
+        'foreign_net_qty': foreign,
+        'institution_net_qty': institution,
+        'individual_net_qty': individual,
+        'total_volume': volume,
+        'flow_ratio': flow_ratio,
+        'buy_day_ratio': buy_day_ratio,
+        'investor_score': investor_flow_score(flow_ratio, buy_day_ratio),
+        **foreign_trend_stats([qty for _, qty in sorted(foreign_by_date, reverse=True)]),
+    }
+
+
+def build_dividend_features(rows: Iterable[Dict], as_of: date) -> List[Dict[str, Any]]:
+    """
+    배당률 순위 응답 → 피처 행 목록 (종목 중복 시 순위가 높은 첫 행 사용)
+
+    Args:
+        rows: get_dividend_ranking 응답 행
+        as_of: 수집일
+    """
+    features: Dict[str, Dict[str, Any]] = {}
+    for row in rows or []:
+        if not isinstance(row, dict):
+            continue
+        code = _normalize_code(row.get('sht_cd') or row.get('stk_shrn_cd') or row.get('mksc_shrn_iscd'))
+        dividend_yield = _to_float(row.get('divi_rate'))
+        if code is None or dividend_yield is None or code in features:
+            continue
+        record_date = str(row.get('record_date') or '').strip()
+        features[code] = {
+            'stock_code': code,
+            'as_of_date': as_of.isoformat(),
+            'dividend_yield': dividend_yield,
+            'dividend_per_share': _to_float(row.get('per_sto_divi_amt')),
+            'record_date': (f"{record_date[:4]}-{record_date[4:6]}-{record_date[6:8]}"
+                            if len(record_date) == 8 and record_date.isdigit() else None),
+            'dividend_score': dividend_yield_score(dividend_yield),
+        }
+    return list(features.values())
+
+
+class FeatureBuilder:
+    """투자자/배당 피처 수집 작업 (재개 가능, 호출 예산 제한)"""
+
+    def __init__(self, mcp, db=None, lookback_days: int = INVESTOR_LOOKBACK_DAYS,
+                 tps_share: float = 0.5, batch_size: int = 50):
+        """
+        Args:
+            mcp: MCPKISIntegration 인스턴스 (get_investor_trend_daily, get_dividend_ranking)
+            db: DBCacheManager (기본: 전역 DB 캐시)
+            lookback_days: 투자자 동향 집계 기간 (달력일)
+            tps_share: 전역 TPS 중 이 작업이 쓸 비율 (0~1]
+            batch_size: 중간 저장 단위 (종목 수)
+        """
+        if db is None:
+            from db_cache_manager import get_db_cache
+            db = get_db_cache()
+        self.mcp = mcp
+        self.db = db
+        self.lookback_days = lookback_days
+        self.tps_share = max(0.05, min(1.0, tps_share))
+        self.batch_size = max(1, batch_size)
+
+    def _call_interval(self) -> float:
+        """호출 간 최소 간격 (초)"""
+        from kis_rate_limiter import KISGlobalRateLimiter
+        return 1.0 / max(0.01, KISGlobalRateLimiter.get_max_tps() * self.tps_share)
+
+    def pending_investor_symbols(self, symbols: Iterable, today: Optional[date] = None) -> List[str]:
+        """오늘 아직 수집하지 않은 종목 (입력 순서 유지)"""
+        today = (today or date.today()).isoformat()
+        codes = list(dict.fromkeys(c for c in (_normalize_code(s) for s in symbols) if c))
+        built = self.db.get_investor_feature_dates(codes)
+        return [code for code in codes if built.get(code) != today]
+
+    def build_dividend(self, today: Optional[date] = None,
+                       upjongs: Sequence[str] = DIVIDEND_UPJONGS) -> int:
+        """
+        배당률 순위 스냅샷 수집 → dividend_features 교체
+
+        Returns:
+            저장한 종목 수 (전 업종 조회 실패 시 기존 스냅샷 유지, 0 반환)
+        """
+        today = today or date.today()
+        rows: List[Dict] = []
+        for upjong in upjongs:
+            ranking = self.mcp.get_dividend_ranking(limit=DIVIDEND_RANKING_LIMIT, use_pagination=True,
+                                                    upjong=upjong)
+            rows.extend(ranking or [])
+        features = build_dividend_features(rows, today)
+        if not features:
+            logger.warning("⚠️ 배당 피처 수집 실패: 순위 데이터 없음 (기존 스냅샷 유지)")
+            return 0
+        saved = self.db.save_dividend_features(features)
+        logger.info(f"💰 배당 피처 저장: {saved}개")
+        return saved
+
+    def build_investor(self, symbols: Iterable, today: Optional[date] = None,
+                       max_calls: Optional[int] = None,
+                       time_budget: Optional[float] = None) -> Dict[str, int]:
+        """
+        종목별 투자자 동향 수집 → investor_features 저장
+
+        Args:
+            symbols: 대상 종목 (우선순위 순)
+            today: 수집일 (기본: 오늘)
+            max_calls: 이번 실행의 최대 API 호출 수
+            time_budget: 이번 실행의 최대 소요 시간 (초)
+
+        Returns:
+            {'requested', 'skipped', 'fetched', 'failed', 'saved', 'remaining'}
+        """
+        today = today or date.today()
+        symbols = list(symbols)
+        pending = self.pending_investor_symbols(symbols, today)
+        stats = {'requested': len(symbols), 'skipped': len(symbols) - len(pending),
+                 'fetched': 0, 'failed': 0, 'saved': 0, 'remaining': len(pending)}
+
+        interval = self._call_interval()
+        start_date = (today - timedelta(days=self.lookback_days)).strftime('%Y%m%d')
+        end_date = today.strftime('%Y%m%d')
+        started = time.monotonic()
+        last_call = 0.0
+        buffer: List[Dict[str, Any]] = []
+
+        for calls, code in enumerate(pending):
+            if max_calls is not None and calls >= max_calls:
+                break
+            if time_budget is not None and time.monotonic() - started >= time_budget:
+                break
+            wait = interval - (time.monotonic() - last_call)
+            if wait > 0:
+                time.sleep(wait)
+            last_call = time.monotonic()
+
+            try:
+                rows = self.mcp.get_investor_trend_daily(code, start_date=start_date, end_date=end_date,
+                                                         use_pagination=False)
+            except Exception as e:
+                logger.debug(f"투자자 동향 조회 실패: {code}, {e}")
+                rows = None
+            stats['remaining'] -= 1
+            feature = build_investor_feature(code, rows, today, self.lookback_days) if rows else None
+            if feature is None:
+                stats['failed'] += 1  # 저장하지 않음 → 다음 실행에서 재시도
+                continue
+            stats['fetched'] += 1
+            buffer.append(feature)
+            if len(buffer) >= self.batch_size:
+                stats['saved'] += self.db.save_investor_features(buffer)
+                buffer = []
+
+        if buffer:
+            stats['saved'] += self.db.save_investor_features(buffer)
+
+        logger.info(
+            f"👥 투자자 피처: 수집 {stats['fetched']}개, 실패 {stats['failed']}개, "
+            f"오늘 수집분 {stats['skipped']}개 건너뜀, 남은 종목 {stats['remaining']}개"
+        )
+        return stats
+
+    def run(self, symbols: Iterable, today: Optional[date] = None, max_calls: Optional[int] = None,
+            time_budget: Optional[float] = None, include_dividend: bool = True) -> Dict[str, Any]:
+        """배당 스냅샷 → 투자자 동향 순으로 수집"""
+        dividend = self.build_dividend(today) if include_dividend else 0
+        if max_calls is not None and include_dividend:
+            max_calls = max(0, max_calls - len(DIVIDEND_UPJONGS))
+        investor = self.build_investor(symbols, today, max_calls=max_calls, time_budget=time_budget)
+        return {'dividend_saved': dividend, 'investor': investor}
+
+
+class FeatureScoreTable:
+    """
+    스크리닝용 피처 점수 조회 (테이블 1회 로드 → 종목별 O(1), 스레드 간 공유)
+
+    Example:
+        scores = FeatureScoreTable()
+        scores.investor_score('005930')   # 피처 없으면 50.0
+    """
+
+    def __init__(self, db=None, max_age_days: int = FEATURE_MAX_AGE_DAYS,
+                 reload_interval: float = FEATURE_RELOAD_INTERVAL):
+        """
+        Args:
+            db: DBCacheManager (기본: 전역 DB 캐시, 최초 조회 시 연결)
+            max_age_days: 피처 유효 기간 (일)
+            reload_interval: 재로드 간격 (초)
+        """
+        self._db = db
+        self.max_age_days = max_age_days
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._scores: Optional[Dict[str, Dict[str, float]]] = None
+        self._loaded_at = 0.0
+
+    def _table(self, kind: str) -> Dict[str, float]:
+        scores = self._scores
+        if scores is None or time.monotonic() - self._loaded_at >= self.reload_interval:
+            with self._lock:
+                if self._scores is None or time.monotonic() - self._loaded_at >= self.reload_interval:
+                    self._scores = self._load()
+                    self._loaded_at = time.monotonic()
+                scores = self._scores
+        return scores.get(kind, {})
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        try:
+            if self._db is None:
+                from db_cache_manager import get_db_cache
+                self._db = get_db_cache()
+            scores = self._db.get_feature_scores(self.max_age_days)
+            logger.debug(f"피처 점수 로드: 투자자 {len(scores['investor'])}개, 배당 {len(scores['dividend'])}개")
+            return scores
+        except Exception as e:
+            logger.warning(f"⚠️ 피처 점수 로드 실패 (중립 점수 사용): {e}")
+            return {}
+
+    def invalidate(self):
+        """다음 조회 시 재로드"""
+        with self._lock:
+            self._scores = None
+
+    def investor_score(self, symbol: str, default: float = NEUTRAL_SCORE) -> float:
+        score = self._table('investor').get(symbol)
+        return float(score) if score is not None else default
+
+    def dividend_score(self, symbol: str, default: float = NEUTRAL_SCORE) -> float:
+        score = self._table('dividend').get(symbol)
+        return float(score) if score is not None else default
+
+
+def main():
+    """CLI: 최근 스냅샷 종목(시가총액 순)을 대상으로 피처 수집"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="투자자 수급/배당 피처 오프라인 수집")
+    parser.add_argument('--max-stocks', type=int, default=1000, help="대상 종목 수 (시가총액 상위)")
+    parser.add_argument('--max-calls', type=int, default=None, help="최대 API 호출 수")
+    parser.add_argument('--time-budget', type=float, default=None, help="최대 소요 시간 (분)")
+    parser.add_argument('--tps-share', type=float, default=0.5, help="사용할 TPS 비율 (0~1)")
+    parser.add_argument('--skip-dividend', action='store_true', help="배당 스냅샷 수집 생략")
+    parser.add_argument('--force', action='store_true', help="장중에도 실행")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(name)s - %(message)s')
+
+    if is_market_hours() and not args.force:
+        logger.error("❌ 장중에는 실행하지 않습니다 (스크리닝 쿼터 보호). --force로 무시할 수 있습니다.")
+        return 1
+
+    from db_cache_manager import get_db_cache
+    from value_stock_finder import ValueStockFinder
+
+    db = get_db_cache()
+    snapshots = db.get_latest_snapshots(max_age_days=7)
+    if snapshots.empty:
+        logger.error("❌ 대상 종목 없음: 최근 7일 스냅샷이 없습니다 (daily_price_collector 먼저 실행)")
+        return 1
+    snapshots = snapshots.drop_duplicates('stock_code').sort_values('market_cap', ascending=False)
+    symbols = snapshots['stock_code'].head(args.max_stocks).tolist()
+
+    mcp = ValueStockFinder().mcp_integration
+    if mcp is None:
+        logger.error("❌ MCP 통합 초기화 실패")
+        return 1
+
+    builder = FeatureBuilder(mcp, db=db, tps_share=args.tps_share)
+    result = builder.run(
+        symbols,
+        max_calls=args.max_calls,
+        time_budget=args.time_budget * 60 if args.time_budget else None,
+        include_dividend=not args.skip_dividend,
+    )
+    logger.info(f"✅ 피처 수집 완료: {result}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -10,7 +10,6 @@ import pandas as pd
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-import time
 from parallel_utils import parallel_analyze_stocks, parallel_analyze_with_retry, batch_parallel_analyze
 
 logger = logging.getLogger(__name__)
@@ -18,17 +17,23 @@ logger = logging.getLogger(__name__)
 class FinancialRatioAnalyzer:
     """재무비율 분석 클래스"""
     
-    def __init__(self, provider):
+    def __init__(self, provider, statements=None):
+        """
+        Args:
+            provider: KISDataProvider
+            statements: FinancialStatementService (기본: 공급자별 공유 서비스 - 4종 분석기가 같은 캐시 사용)
+        """
         self.provider = provider
-        self.last_request_time = 0
-        self.request_interval = 2.5  # API 요청 간격 제어 (2.5초)
+        self._statements = statements
     
-    def _rate_limit(self):
-        """API 요청 속도를 제어합니다."""
-        elapsed_time = time.time() - self.last_request_time
-        if elapsed_time < self.request_interval:
-            time.sleep(self.request_interval - elapsed_time)
-        self.last_request_time = time.time()
+    @property
+    def statements(self):
+        """재무제표 통합 조회 서비스 (최초 사용 시 공유 서비스 연결)"""
+        service = getattr(self, '_statements', None)
+        if service is None:
+            from financial_statement_service import get_financial_statement_service
+            service = self._statements = get_financial_statement_service(self.provider)
+        return service
     
     def _to_float(self, value: Any, default: float = 0.0) -> float:
         """안전하게 float 타입으로 변환합니다."""
@@ -42,49 +47,21 @@ class FinancialRatioAnalyzer:
     
     def get_financial_ratios(self, symbol: str, period_type: str = "0", max_retries: int = 2) -> Optional[List[Dict[str, Any]]]:
         """
-        종목의 재무비율을 조회합니다.
+        종목의 재무비율을 조회합니다. (재무제표 서비스 캐시 경유 - 새 결산기 공시 전에는 API 호출 없음)
         
         Args:
             symbol: 종목코드 (6자리)
             period_type: 분류 구분 코드 (0: 년, 1: 분기)
-            max_retries: 최대 재시도 횟수
+            max_retries: (호환용) 재시도는 재무제표 서비스의 조회 계획이 담당
         
         Returns:
             재무비율 데이터 리스트
         """
-        for attempt in range(max_retries + 1):
-            try:
-                self._rate_limit()
-                
-                path = "/uapi/domestic-stock/v1/finance/financial-ratio"
-                params = {
-                    "FID_DIV_CLS_CODE": period_type,  # 0: 년, 1: 분기
-                    "fid_cond_mrkt_div_code": "J",    # 국내주식
-                    "fid_input_iscd": symbol
-                }
-                
-                data = self.provider._send_request(path, "FHKST66430300", params)
-                if data and 'output' in data and data['output']:
-                    return self._parse_financial_ratio_data(data['output'])
-                else:
-                    if attempt < max_retries:
-                        logger.debug(f"🔄 {symbol} 재무비율 조회 재시도 중... ({attempt + 1}/{max_retries})")
-                        time.sleep(0.5)
-                        continue
-                    else:
-                        logger.debug(f"⚠️ {symbol} 재무비율 데이터 없음")
-                        return None
-                        
-            except Exception as e:
-                if attempt < max_retries:
-                    logger.debug(f"🔄 {symbol} 재무비율 API 호출 재시도 중... ({attempt + 1}/{max_retries}): {e}")
-                    time.sleep(0.5)
-                    continue
-                else:
-                    logger.debug(f"❌ {symbol} 재무비율 API 호출 실패: {e}")
-                    return None
-        
-        return None
+        rows = self.statements.get_rows(symbol, 'financial', period_type)
+        if not rows:
+            logger.debug(f"⚠️ {symbol} 재무비율 데이터 없음")
+            return None
+        return self._parse_financial_ratio_data(rows)
     
     def _parse_financial_ratio_data(self, output_list: List[Dict]) -> List[Dict[str, Any]]:
         """재무비율 응답 데이터를 파싱합니다."""
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KIS 재무제표(재무비율 4종) 통합 조회 서비스
+
+FinancialRatioAnalyzer / ProfitRatioAnalyzer / StabilityRatioAnalyzer / GrowthRatioAnalyzer가
+각자 재시도·대기하며 같은 종목의 finance 엔드포인트를 따로 호출하던 것을
+종목당 하나의 조회 계획(4개 엔드포인트 동시 진행, 예약 재시도)으로 묶고,
+응답 행을 (종목, 결산년월) 키로 DB에 영구 저장해 모든 분석기가 캐시에서 읽게 합니다.
+
+재무제표는 분기마다만 바뀌므로 저장된 최신 결산기의 다음 결산기가 끝나기 전에는
+API를 다시 부르지 않습니다. 다음 결산기 종료 후에는 공시 여부를
+FINANCE_RECHECK_DAYS 간격으로만 확인합니다.
+(매일 재스캔 → 새 분기 공시 전까지 finance 호출 0회)
+
+KIS 업무 오류 응답(rt_cd != '0', 비커버리지 종목의 무자료 등)은 무자료([])로 저장해
+FINANCE_EMPTY_RECHECK_DAYS마다만 재확인하고, 전송 실패한 엔드포인트만 미조회(pending)로
+남겨 다음 조회에서 그 종류만 다시 부릅니다 (성공한 종류는 바로 저장).
+
+Example:
+    service = get_financial_statement_service(provider)
+    rows = service.get_rows('005930', 'profit')   # 엔드포인트 output 원본 행 (최신 결산기 먼저)
+"""
+
+import calendar
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from analysis_legs import Leg, run_legs
+
+logger = logging.getLogger(__name__)
+
+# ✅ 재무비율 4종 엔드포인트 (종류 → 경로, TR ID)
+FINANCE_ENDPOINTS = {
+    'financial': ('/uapi/domestic-stock/v1/finance/financial-ratio', 'FHKST66430300'),
+    'profit': ('/uapi/domestic-stock/v1/finance/profit-ratio', 'FHKST66430400'),
+    'stability': ('/uapi/domestic-stock/v1/finance/stability-ratio', 'FHKST66430600'),
+    'growth': ('/uapi/domestic-stock/v1/finance/growth-ratio', 'FHKST66430800'),
+}
+
+# 다음 결산기 종료 후 공시 확인 간격 (일)
+FINANCE_RECHECK_DAYS = 7
+
+# 무자료 종목(우선주/비커버리지) 재확인 간격 (일)
+FINANCE_EMPTY_RECHECK_DAYS = 30
+
+# 엔드포인트별 재시도 (전송 오류 재시도는 provider._send_request가 별도 수행)
+FINANCE_RETRIES = 1
+FINANCE_RETRY_BACKOFF = 1.0
+
+# 일부 엔드포인트 실패 시 같은 프로세스에서 재조회를 미루는 시간 (초) - 분석기 4종이 연달아 재시도하지 않도록
+FINANCE_FAILURE_COOLDOWN = 300.0
+
+# 조회 계획 실행 스레드 수 (분석 레그 풀과 분리 - 레그 안에서 계획을 실행해도 교착 없음)
+FINANCE_PLAN_WORKERS = 8
+
+# 업무 오류 중 일시 장애로 보는 게이트웨이 메시지 코드 접두사 (유량 초과/토큰 만료 등 → 재시도)
+GATEWAY_ERROR_PREFIX = 'EGW'
+
+# 분류 구분 코드 → 결산기 간격 (개월)
+PERIOD_STEP_MONTHS = {'0': 12, '1': 3}
+
+
+def _period_end(fiscal_period: str) -> Optional[date]:
+    """결산년월(YYYYMM) → 그 달 말일 (형식 불일치는 None)"""
+    try:
+        year, month = int(fiscal_period[:4]), int(fiscal_period[4:6])
+        return date(year, month, calendar.monthrange(year, month)[1])
+    except (TypeError, ValueError):
+        return None
+
+
+def next_period_end(fiscal_period: str, period_type: str = '0') -> Optional[date]:
+    """저장된 최신 결산기 다음 결산기의 종료일"""
+    end = _period_end(fiscal_period)
+    if end is None:
+        return None
+    months = end.year * 12 + end.month - 1 + PERIOD_STEP_MONTHS.get(str(period_type), 12)
+    return _period_end(f"{months // 12:04d}{months % 12 + 1:02d}")
+
+
+def needs_refresh(fiscal_period: Optional[str], checked_at: Optional[date], period_type: str = '0',
+                  today: Optional[date] = None, recheck_days: int = FINANCE_RECHECK_DAYS) -> bool:
+    """
+    저장된 재무제표를 다시 조회해야 하는지
+
+    - 확인 기록 없음 → 조회
+    - 무자료 → FINANCE_EMPTY_RECHECK_DAYS마다
+    - 다음 결산기가 끝나기 전 → 조회 안 함 (새 재무제표가 나올 수 없음)
+    - 다음 결산기 종료 후 → 종료일(또는 마지막 확인) 이후 recheck_days마다 공시 확인
+    """
+    today = today or date.today()
+    if checked_at is None:
+        return True
+    if not fiscal_period:
+        return (today - checked_at).days >= FINANCE_EMPTY_RECHECK_DAYS
+    upcoming = next_period_end(fiscal_period, period_type)
+    if upcoming is None:
+        return (today - checked_at).days >= recheck_days
+    if today <= upcoming:
+        return False
+    return (today - max(checked_at, upcoming)).days >= recheck_days
+
+
+def latest_fiscal_period(statements: Dict[str, List[Dict[str, Any]]]) -> str:
+    """엔드포인트 행들의 최신 결산년월 (없으면 '')"""
+    periods = [str(row.get('stac_yymm') or '') for rows in statements.values() for row in rows or []
+               if isinstance(row, dict)]
+    return max(periods, default='')
+
+
+class FinancialStatementService:
+    """종목별 재무비율 4종 통합 조회 + (종목, 결산년월) 영구 캐시"""
+
+    def __init__(self, provider, db=None, recheck_days: int = FINANCE_RECHECK_DAYS):
+        """
+        Args:
+            provider: KISDataProvider (_send_request, 전역 Rate Limiter 경유)
+                또는 weakref.ref(공급자) - 공유 서비스가 공급자 수명을 늘리지 않도록
+            db: DBCacheManager (기본: 전역 DB 캐시, 최초 조회 시 연결)
+            recheck_days: 다음 결산기 종료 후 공시 확인 간격 (일)
+        """
+        self._provider = provider
+        self._db = db
+        self.recheck_days = recheck_days
+        self._memory: Dict[tuple, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.api_calls = 0
+
+    @property
+    def provider(self):
+        provider = self._provider
+        return provider() if isinstance(provider, weakref.ref) else provider
+
+    @property
+    def db(self):
+        if self._db is None:
+            from db_cache_manager import get_db_cache
+            self._db = get_db_cache()
+        return self._db
+
+    def _key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _plan_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=FINANCE_PLAN_WORKERS,
+                                                    thread_name_prefix='finance-plan')
+            return self._executor
+
+    def _checked(self, entry: Optional[Dict[str, Any]], period_type: str) -> bool:
+        """확인 기록이 아직 유효한지 (결산기 기준, 미조회 종류는 따지지 않음)"""
+        return entry is not None and not needs_refresh(entry.get('fiscal_period'), entry.get('checked_at'),
+                                                       period_type, recheck_days=self.recheck_days)
+
+    def _is_fresh(self, entry: Optional[Dict[str, Any]], period_type: str) -> bool:
+        if entry is not None and entry.get('pending'):
+            # 일부 엔드포인트 실패 → 이 프로세스는 유예 시간 동안 재조회 안 함 (DB에서 읽은 항목은 바로 재조회)
+            return time.monotonic() < entry.get('retry_after', 0.0)
+        return self._checked(entry, period_type)
+
+    def _fetch_endpoint(self, symbol: str, kind: str, period_type: str) -> List[Dict[str, Any]]:
+        """엔드포인트 1개 조회 → output 행 (무자료/업무 오류는 [], 전송 실패는 예외 → 예약 재시도)"""
+        path, tr_id = FINANCE_ENDPOINTS[kind]
+        params = {
+            "FID_DIV_CLS_CODE": period_type,  # 0: 년, 1: 분기
+            "fid_cond_mrkt_div_code": "J",    # 국내주식
+            "fid_input_iscd": symbol
+        }
+        with self._lock:
+            self.api_calls += 1
+        data = self.provider._send_request(path, tr_id, params, business_errors=True)
+        if data is None:
+            raise ConnectionError(f"{kind} 응답 없음")
+        rt_cd = data.get('rt_cd')
+        if rt_cd is not None and rt_cd != '0':
+            msg_cd = str(data.get('msg_cd') or '')
+            if msg_cd.startswith(GATEWAY_ERROR_PREFIX):
+                raise ConnectionError(f"{kind} 게이트웨이 오류 {msg_cd}: {data.get('msg1')}")
+            logger.debug(f"{symbol} {kind} 재무비율 무자료 ({msg_cd}: {data.get('msg1')})")
+            return []
+        output = data.get('output') or []
+        return [row for row in output if isinstance(row, dict)] if isinstance(output, list) else []
+
+    def _fetch_plan(self, symbol: str, period_type: str,
+                    kinds: Optional[List[str]] = None) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+        """엔드포인트 동시 조회 (기본 4종, 실패한 종류는 None)"""
+        legs = [
+            Leg(kind, lambda kind=kind: self._fetch_endpoint(symbol, kind, period_type),
+                retries=FINANCE_RETRIES, backoff=FINANCE_RETRY_BACKOFF, label=f"{symbol} {kind} 재무비율")
+            for kind in (kinds or FINANCE_ENDPOINTS)
+        ]
+        return run_legs(legs, executor=self._plan_executor())
+
+    def _load(self, symbol: str, period_type: str) -> Optional[Dict[str, Any]]:
+        try:
+            return self.db.get_financial_statements(symbol, period_type)
+        except Exception as e:
+            logger.warning(f"⚠️ {symbol} 재무제표 캐시 조회 실패: {e}")
+            return None
+
+    def _refresh(self, symbol: str, period_type: str, cached: Optional[Dict[str, Any]],
+                 full: bool = False) -> Dict[str, Any]:
+        cached = cached or {}
+        # 확인 기록이 유효하면 지난번 실패한 종류만, 아니면(새 결산기 확인/강제 조회) 4종 모두 조회
+        if not full and cached.get('pending') and cached.get('checked_at') and self._checked(cached, period_type):
+            kinds = list(cached['pending'])
+        else:
+            kinds = list(FINANCE_ENDPOINTS)
+        fetched = self._fetch_plan(symbol, period_type, kinds)
+        succeeded = {kind: rows for kind, rows in fetched.items() if rows is not None}
+        pending = [kind for kind in kinds if kind not in succeeded]
+        statements = dict(cached.get('statements') or {})
+        statements.update(succeeded)
+        fiscal_period = latest_fiscal_period(statements)
+        entry = {
+            'fiscal_period': fiscal_period if succeeded else cached.get('fiscal_period', ''),
+            'statements': statements,
+            # 성공한 종류가 있으면 확인 기록 갱신, 전부 실패하면 기존 기록 유지
+            'checked_at': date.today() if succeeded else cached.get('checked_at'),
+            'pending': pending,
+        }
+        if pending:
+            entry['retry_after'] = time.monotonic() + FINANCE_FAILURE_COOLDOWN
+        try:
+            if succeeded:
+                self.db.save_financial_statements(symbol, period_type, fiscal_period, statements,
+                                                  entry['checked_at'], pending_kinds=pending)
+        except Exception as e:
+            logger.warning(f"⚠️ {symbol} 재무제표 캐시 저장 실패: {e}")
+        if cached and entry['fiscal_period'] != cached.get('fiscal_period'):
+            logger.info(f"📑 {symbol} 새 결산기 재무제표: {cached.get('fiscal_period') or '-'} → {entry['fiscal_period']}")
+        return entry
+
+    def get_statements(self, symbol: str, period_type: str = '0', refresh: bool = False) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        종목의 재무비율 4종 응답 행 (메모리 → DB → 조회 계획 순)
+
+        Args:
+            symbol: 종목코드
+            period_type: 분류 구분 코드 (0: 년, 1: 분기)
+            refresh: True면 캐시 신선도와 무관하게 조회
+
+        Returns:
+            {'financial'|'profit'|'stability'|'growth': output 행 목록} (조회 실패 종류는 없음)
+        """
+        key = (str(symbol), str(period_type))
+        entry = self._memory.get(key)
+        if not refresh and self._is_fresh(entry, key[1]):
+            return entry['statements']
+        with self._key_lock(key):  # 같은 종목 동시 요청은 계획 1회만 실행
+            entry = self._memory.get(key)
+            if not refresh and self._is_fresh(entry, key[1]):
+                return entry['statements']
+            cached = entry if entry is not None else self._load(*key)
+            if refresh or not self._is_fresh(cached, key[1]):
+                cached = self._refresh(key[0], key[1], cached, full=refresh)
+            self._memory[key] = cached
+            return cached['statements']
+
+    def get_rows(self, symbol: str, kind: str, period_type: str = '0') -> Optional[List[Dict[str, Any]]]:
+        """재무비율 1종 응답 행 (조회 실패 시 None, 무자료는 [])"""
+        return self.get_statements(symbol, period_type).get(kind)
+
+    def clear_memory(self):
+        """프로세스 메모리 캐시 비우기 (DB 캐시는 유지)"""
+        with self._lock:
+            self._memory.clear()
+
+
+_services: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+_services_lock = threading.Lock()
+
+
+def get_financial_statement_service(provider) -> FinancialStatementService:
+    """
+    공급자별 공유 재무제표 서비스 (분석기 4종이 같은 캐시/조회 계획 사용)
+
+    서비스는 공급자를 약한 참조로만 들고 있어 공급자가 사라지면 항목도 함께 정리됩니다.
+    """
+    with _services_lock:
+        service = _services.get(provider)
+        if service is None:
+            service = FinancialStatementService(weakref.ref(provider))
+            _services[provider] = service
+        return service
@@ -15,6 +15,7 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
 from kis_token_manager import get_token_manager
+from kis_rate_limiter import KISGlobalRateLimiter
 
 try:
     from config_manager import ConfigManager
@@ -94,15 +95,9 @@ class KISAPIManager:
             return False
         return True
     
-    def _rate_limit_check(self) -> None:
-        """Rate Limiting 체크"""
-        current_time = time.time()
-        time_since_last_request = current_time - self.last_request_time
-        
-        if time_since_last_request < (1.0 / self.config.max_tps):
-            sleep_time = (1.0 / self.config.max_tps) - time_since_last_request
-            time.sleep(sleep_time)
-        
+    def _rate_limit_check(self, lane: Optional[str] = None) -> None:
+        """Rate Limiting 체크 (전역/프로세스 간 공유 계정 쿼터, max_tps는 상한으로만 반영)"""
+        KISGlobalRateLimiter.rate_limit(1.0 / self.config.max_tps, lane=lane)
         self.last_request_time = time.time()
         self.request_count += 1
     
@@ -162,7 +157,7 @@ class KISAPIManager:
             return None
         
         try:
-            self._rate_limit_check()
+            self._rate_limit_check(lane='quotations')
             
             url = f"{self.config.base_url}/uapi/domestic-stock/v1/quotations/inquire-price"
             headers = {
@@ -213,7 +208,7 @@ class KISAPIManager:
             return None
         
         try:
-            self._rate_limit_check()
+            self._rate_limit_check(lane='finance')
             
             url = f"{self.config.base_url}/uapi/domestic-stock/v1/finance/annual-index"
             headers = {
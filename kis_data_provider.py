@@ -9,7 +9,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Optional, List, Any
 from functools import lru_cache  # ✅ 중복 호출 방지용 캐시
 from kis_token_manager import KISTokenManager
-from kis_rate_limiter import KISGlobalRateLimiter  # ✅ 전역 Rate Limiter
+from kis_rate_limiter import KISGlobalRateLimiter, lane_for_path  # ✅ 전역 Rate Limiter
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +31,8 @@ class KISDataProvider:
             "appkey": self.token_manager.app_key,
             "appsecret": self.token_manager.app_secret,
         }
+        # ✅ 같은 AppKey 프로세스끼리 공유 쿼터 (kis_quota_<키>.bin)
+        KISGlobalRateLimiter.set_app_key(self.token_manager.app_key)
         
         # 세션 설정 개선 (연결 재사용 및 안정성 향상)
         self.session = requests.Session()
@@ -51,8 +53,8 @@ class KISDataProvider:
         })
         
         # KIS API 제한: 실전 20건/초, 모의 2건/초
-        # ⚠️ AppKey 차단 방지: 0.5초 간격 (2건/초, 90% 마진)
-        self.request_interval = 0.5  # 0.5초 간격 (초당 2건) - 안전 우선!
+        # ✅ 호출 간격은 전역 Rate Limiter의 계정 쿼터를 따름 (기본 0.5초 = 초당 2건)
+        self.request_interval = KISGlobalRateLimiter.get_interval()
         self.consecutive_500_errors = 0  # 연속 500 오류 카운터
         
         # ✅ 종목명 캐시 초기화 (최초 1회만)
@@ -64,34 +66,34 @@ class KISDataProvider:
             return  # 이미 로드됨
         
         try:
-            df = pd.read_excel('kospi_code.xlsx')
-            cache = {}
-            
-            for _, row in df.iterrows():
-                code = str(row.get('단축코드', '')).strip()
-                name = str(row.get('한글명', '')).strip()
-                
-                if code and name and len(code) == 6 and code.isdigit():
-                    cache[code] = name
+            from kospi_master import get_kospi_master
+            cache = dict(get_kospi_master().code_to_name)
             
             KISDataProvider._stock_name_cache = cache
             logger.info(f"✅ 종목명 캐시 로드: {len(cache)}개")
         except Exception as e:
             # ✅ 경로/시트명 친절한 안내 (크리티컬 - 디버깅 속도 향상)
-            logger.warning(f"⚠️ 종목명 캐시 로드 실패: {e} (파일: kospi_code.xlsx, 시트: 기본)")
+            logger.warning(f"⚠️ 종목명 캐시 로드 실패: {e} (파일: kospi_code.mst / kospi_code.xlsx)")
             logger.info("💡 파일 확인 사항: 1) 파일 존재 여부, 2) 컬럼명 '단축코드'/'한글명' 존재 여부")
             KISDataProvider._stock_name_cache = {}  # 빈 캐시로 초기화
     
-    def _rate_limit(self):
+    def _rate_limit(self, path: Optional[str] = None):
         """✅ API 요청 속도를 제어합니다 (전역 Rate Limiter 사용)"""
-        # ✅ 전역 Rate Limiter 사용 - KISDataProvider와 MCPKISIntegration 모두 동일한 Lock 공유
-        KISGlobalRateLimiter.rate_limit(self.request_interval)
+        # ✅ 전역 Rate Limiter 사용 - KISDataProvider와 MCPKISIntegration 모두 동일한 쿼터 공유
+        KISGlobalRateLimiter.rate_limit(lane=lane_for_path(path))
 
-    def _send_request(self, path: str, tr_id: str, params: dict, max_retries: int = 2) -> Optional[dict]:
-        """중앙 집중화된 API GET 요청 메서드 (재시도 로직 포함)"""
+    def _send_request(self, path: str, tr_id: str, params: dict, max_retries: int = 2,
+                      business_errors: bool = False) -> Optional[dict]:
+        """
+        중앙 집중화된 API GET 요청 메서드 (재시도 로직 포함)
+
+        Args:
+            business_errors: True면 rt_cd != '0' 업무 오류 응답(무자료 등)을 None 대신 그대로 반환
+                (호출자가 무자료와 전송 실패를 구분할 때 사용)
+        """
         for attempt in range(max_retries + 1):
             try:
-                self._rate_limit()
+                self._rate_limit(path)
                 token = self.token_manager.get_valid_token()
                 headers = {**self.headers, "authorization": f"Bearer {token}", "tr_id": tr_id}
                 
@@ -116,6 +118,10 @@ class KISDataProvider:
                 # ✅ 유연한 성공 판정 (크리티컬 - rt_cd 부재/스키마 변동 대응)
                 rt_cd = data.get('rt_cd')
                 if rt_cd is not None and rt_cd != '0':
+                    if business_errors:
+                        logger.debug(f"API 업무 응답 ({tr_id}|{params.get('FID_INPUT_ISCD') or params.get('fid_input_iscd')}): "
+                                     f"{data.get('msg_cd')} {data.get('msg1')}")
+                        return data
                     logger.warning(f"⚠️ API 오류 ({tr_id}|{params.get('FID_INPUT_ISCD')}): {data.get('msg1', '알 수 없는 오류')}")
                     return None
                 
@@ -301,44 +307,19 @@ class KISDataProvider:
         try:
             logger.info(f"🔍 KOSPI 마스터 파일에서 {max_count}개 종목 코드 추출 후 API로 시세 조회")
             
-            # ✨ KOSPI 마스터 파일 사용 (하드코딩 대신)
-            import pandas as pd
-            from pathlib import Path
-            
-            kospi_file = Path("kospi_code.xlsx")
+            # ✨ KOSPI 마스터 사용 (하드코딩 대신, 파싱 결과는 해시 캐시)
+            from kospi_master import get_kospi_master
             
-            if not kospi_file.exists():
-                logger.error(f"❌ KOSPI 마스터 파일을 찾을 수 없습니다: {kospi_file}")
+            master = get_kospi_master()
+            if master.empty:
+                logger.error("❌ KOSPI 마스터 파일을 찾을 수 없습니다: kospi_code.mst / kospi_code.xlsx")
                 logger.info("💡 하드코딩된 폴백 리스트 사용")
                 return self._get_hardcoded_fallback_stocks(max_count)
             
-            # 엑셀 파일 읽기
-            df = pd.read_excel(kospi_file)
-            logger.info(f"✅ KOSPI 마스터 파일 로드: {len(df)}개 종목 (엑셀 읽기 완료)")
+            df = master.frame
+            logger.info(f"✅ KOSPI 마스터 로드: {len(df)}개 종목")
             logger.info(f"📡 이제 각 종목의 현재가/PER/PBR을 API로 조회합니다 ({max_count}번 API 호출)")
             
-            # ✅ 섹터 매핑 테이블 (mcp_kis_integration.py와 동일)
-            kospi200_sector_map = {
-                '1': '건설',
-                '2': '운송장비',
-                '5': '전기전자',
-                '6': '금융',
-                '7': '제조업',
-                '9': '제조업',
-                'A': '바이오/제약',
-                'B': 'IT',
-            }
-            
-            industry_large_map = {
-                16: '제조업',
-                19: '유통',
-                21: '지주회사',
-                26: '건설',
-                27: '제조업',
-                29: 'IT',
-                30: 'IT',
-            }
-            
             # 시가총액으로 정렬 (내림차순)
             if '시가총액' in df.columns:
                 df = df.sort_values('시가총액', ascending=False)
@@ -377,40 +358,8 @@ class KISDataProvider:
                     
                     stock_names[code] = name  # 종목명 매핑 저장
                     
-                    # ✅ 섹터 추출 (mcp_kis_integration.py 로직 동일)
-                    sector = None
-                    
-                    # 1순위: KRX 섹터 플래그
-                    if row.get('KRX은행') == 'Y' or row.get('KRX증권') == 'Y' or row.get('KRX섹터_보험') == 'Y':
-                        sector = '금융'
-                    elif row.get('KRX자동차') == 'Y':
-                        sector = '운송장비'
-                    elif row.get('KRX반도체') == 'Y':
-                        sector = '전기전자'
-                    elif row.get('KRX미디어통신') == 'Y':
-                        sector = '통신'
-                    elif row.get('KRX섹터_운송') == 'Y' or row.get('KRX선박') == 'Y':
-                        sector = '운송'
-                    elif row.get('KRX바이오') == 'Y':
-                        sector = '바이오/제약'
-                    elif row.get('KRX에너지화학') == 'Y':
-                        sector = '제조업'
-                    elif row.get('KRX철강') == 'Y':
-                        sector = '제조업'
-                    elif row.get('KRX건설') == 'Y':
-                        sector = '건설'
-                    
-                    # 2순위: KOSPI200 섹터업종 코드
-                    if not sector:
-                        kospi200_code = str(row.get('KOSPI200섹터업종', '')).strip()
-                        if kospi200_code and kospi200_code != '0':
-                            sector = kospi200_sector_map.get(kospi200_code)
-                    
-                    # 3순위: 지수업종 대분류
-                    if not sector:
-                        large_code = row.get('지수업종대분류')
-                        if large_code and large_code != 0:
-                            sector = industry_large_map.get(large_code)
+                    # ✅ 섹터 추출 (kospi_master 공유 인덱스, mcp_kis_integration.py와 동일 규칙)
+                    sector = master.code_to_sector.get(code)
                     
                     # ✅ 섹터 폴백 라벨 통일 (크리티컬 - 후속 정규화 일관성)
                     stock_sectors[code] = sector or '미분류'
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KIS API 프로세스 간 쿼터 공유 백엔드
+
+KISGlobalRateLimiter는 프로세스 안의 모든 호출을 계정 TPS 그리드에 맞추지만,
+Streamlit 앱 / 일일 수집기 / CLI를 같은 AppKey로 동시에 띄우거나 파드를 늘리면
+프로세스마다 따로 쿼터를 써서 합계가 계정 TPS를 넘습니다 (EGW00201).
+여기의 백엔드는 같은 그리드(GCRA의 다음 빈 슬롯 시각, TAT)를 프로세스 밖에 두어
+모든 프로세스가 하나의 계정 예산을 나눠 쓰게 합니다.
+
+- FileQuotaBackend : 같은 호스트의 프로세스 공유 (mmap 8바이트 TAT + 파일 락)
+- RedisQuotaBackend: 여러 호스트/파드 공유 (Lua 스크립트 1회 왕복, Redis 서버 시각 기준)
+- 그 외 reserve(increment) -> 대기 초 를 제공하는 객체면 무엇이든 사용 가능
+
+KIS_QUOTA_BACKEND 환경변수로 선택합니다.
+    (미설정) / 'file'      : 임시 디렉토리의 AppKey별 파일 (기본)
+    'file:/path/quota.bin' : 지정 파일
+    'redis://host:6379/0'  : Redis (redis 패키지 필요)
+    'local' / 'off'        : 공유 안 함 (프로세스 내 제한만)
+
+Example:
+    backend = FileQuotaBackend('/tmp/kis_quota_test.bin')
+    wait = backend.reserve(0.05)   # 이 호출의 슬롯까지 남은 시간(초)
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# 공유 TAT가 현재보다 이만큼 이상 앞서 있으면 손상/시계 역행으로 보고 초기화 (초)
+MAX_TAT_AHEAD = 60.0
+
+# 기본 공유 파일 이름 접두사 (임시 디렉토리)
+QUOTA_FILE_PREFIX = 'kis_quota_'
+
+_TAT = struct.Struct('<d')
+
+
+def quota_key(app_key: Optional[str] = None) -> str:
+    """AppKey별 공유 키 (AppKey 원문은 파일명/Redis 키에 남기지 않음)"""
+    key = os.environ.get('KIS_QUOTA_KEY') or app_key
+    if not key:
+        return 'default'
+    return hashlib.sha1(str(key).encode('utf-8')).hexdigest()[:12]
+
+
+class FileQuotaBackend:
+    """호스트 공유 쿼터 (mmap 파일의 TAT를 파일 락 안에서 갱신)"""
+
+    name = 'file'
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: 공유 파일 경로 (없으면 생성, 같은 경로를 쓰는 프로세스끼리 공유)
+
+        Raises:
+            OSError: 파일 생성/매핑 실패
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 파일 락은 프로세스 단위라 같은 프로세스의 스레드끼리는 별도 Lock 필요
+        self._thread_lock = threading.Lock()
+        self._open()
+
+    def _open(self):
+        """파일 열기 + 매핑 (fork된 자식은 부모와 락을 공유하지 않도록 다시 호출)"""
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            self._lock_file()
+            try:
+                if os.fstat(self._fd).st_size < _TAT.size:
+                    os.ftruncate(self._fd, _TAT.size)
+            finally:
+                self._unlock_file()
+            self._mmap = mmap.mmap(self._fd, _TAT.size)
+        except Exception:
+            os.close(self._fd)
+            raise
+        self._pid = os.getpid()
+
+    if os.name == 'nt':
+        def _lock_file(self):
+            import msvcrt
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+
+        def _unlock_file(self):
+            import msvcrt
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+    else:
+        def _lock_file(self):
+            import fcntl
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+        def _unlock_file(self):
+            import fcntl
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def reserve(self, increment: float) -> float:
+        """
+        공유 그리드에서 슬롯 1개 예약
+
+        Args:
+            increment: 이 호출이 차지하는 시간 (호출 간격 × 비용, 초)
+
+        Returns:
+            예약한 슬롯까지 남은 대기 시간 (초)
+        """
+        with self._thread_lock:
+            if self._pid != os.getpid():
+                self._mmap.close()  # 부모에서 상속한 매핑/디스크립터 (이 프로세스 사본만 정리)
+                os.close(self._fd)
+                self._open()
+            self._lock_file()
+            try:
+                now = time.time()
+                tat, = _TAT.unpack_from(self._mmap, 0)
+                if tat - now > MAX_TAT_AHEAD:
+                    tat = now
+                slot = max(now, tat)
+                _TAT.pack_into(self._mmap, 0, slot + increment)
+            finally:
+                self._unlock_file()
+        return slot - now
+
+    def close(self):
+        try:
+            self._mmap.close()
+        finally:
+            os.close(self._fd)
+
+
+class RedisQuotaBackend:
+    """여러 호스트/파드 공유 쿼터 (Redis, 서버 시각 기준 GCRA)"""
+
+    name = 'redis'
+
+    # TAT 갱신 + 대기 시간 반환 (원자적, 키는 그리드가 비면 만료)
+    SCRIPT = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+if tat < now or tat - now > tonumber(ARGV[2]) then tat = now end
+local next_tat = tat + tonumber(ARGV[1])
+redis.call('SET', KEYS[1], tostring(next_tat), 'PX', math.ceil((next_tat - now) * 1000) + 1000)
+return tostring(tat - now)
+"""
+
+    def __init__(self, client, key: str = 'kis:quota:default'):
+        """
+        Args:
+            client: redis.Redis 호환 클라이언트 (register_script 지원)
+            key: 공유 TAT 키 (AppKey별로 분리)
+        """
+        self.client = client
+        self.key = key
+        self._script = client.register_script(self.SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str, key: str = 'kis:quota:default') -> 'RedisQuotaBackend':
+        """redis:// URL로 생성 (redis 패키지 필요)"""
+        import redis  # 선택 의존성
+        return cls(redis.Redis.from_url(url), key=key)
+
+    def reserve(self, increment: float) -> float:
+        """공유 그리드에서 슬롯 1개 예약 → 대기 시간 (초)"""
+        return max(0.0, float(self._script(keys=[self.key], args=[increment, MAX_TAT_AHEAD])))
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception as e:
+            logger.debug(f"Redis 쿼터 백엔드 종료 실패(무시): {e}")
+
+
+def default_quota_path(app_key: Optional[str] = None) -> str:
+    """AppKey별 기본 공유 파일 경로 (임시 디렉토리)"""
+    return os.path.join(tempfile.gettempdir(), f"{QUOTA_FILE_PREFIX}{quota_key(app_key)}.bin")
+
+
+def create_quota_backend(spec: Optional[str] = None, app_key: Optional[str] = None):
+    """
+    설정 문자열 → 공유 쿼터 백엔드
+
+    Args:
+        spec: KIS_QUOTA_BACKEND 형식 (None이면 환경변수, 그것도 없으면 'file')
+        app_key: AppKey (기본 파일명/Redis 키 분리용)
+
+    Returns:
+        백엔드 또는 None (공유 안 함 / 생성 실패)
+    """
+    spec = (spec if spec is not None else os.environ.get('KIS_QUOTA_BACKEND', 'file')).strip()
+    try:
+        if spec.lower() in ('', 'local', 'off', 'none'):
+            return None
+        if spec.startswith(('redis://', 'rediss://', 'unix://')):
+            return RedisQuotaBackend.from_url(spec, key=f"kis:quota:{quota_key(app_key)}")
+        if spec.lower() == 'file':
+            return FileQuotaBackend(default_quota_path(app_key))
+        if spec.lower().startswith('file:'):
+            return FileQuotaBackend(spec[5:])
+        logger.warning(f"⚠️ 알 수 없는 KIS_QUOTA_BACKEND: {spec} (프로세스 내 제한만 사용)")
+    except ImportError as e:
+        logger.warning(f"⚠️ 쿼터 백엔드 의존성 없음 ({spec}): {e} - 프로세스 내 제한만 사용")
+    except Exception as e:
+        logger.warning(f"⚠️ 쿼터 백엔드 생성 실패 ({spec}): {e} - 프로세스 내 제한만 사용")
+    return None
@@ -3,65 +3,383 @@
 """
 KIS API 전역 Rate Limiter
 모든 KIS API 호출이 이 싱글톤 Rate Limiter를 공유
+
+✅ 토큰 버킷(GCRA) + 엔드포인트 레인 방식
+- 계정 TPS 쿼터(실전 20건/초, 모의 2건/초)에 맞춘 단일 슬롯 그리드 → 전역 TPS 초과 없음
+- 약 1초 분량의 예약 창(window)을 레인(quotations/ranking/finance/default) 가중치로 분할
+- 창에 여유가 있으면 어느 레인이든 예약 가능 → 단일 레인만 돌아도 전체 쿼터 사용
+- 창이 가득 차면 자기 몫(quota) 미만인 레인만 예약 가능 → 경합 시 가중치대로 보장
+- Lock 안에서는 슬롯 예약만 하고, 대기(sleep)는 Lock 밖에서 수행
+- 같은 그리드를 프로세스 밖(kis_quota 공유 백엔드)에도 예약 → 같은 AppKey를 쓰는
+  여러 프로세스/파드가 계정 쿼터 하나를 나눠 씀 (대기 = 프로세스 내/공유 슬롯 중 늦은 쪽)
 """
 
+import logging
+import os
 import time
-import random
+import math
 import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+from kis_quota import create_quota_backend
+
+logger = logging.getLogger(__name__)
+
+# ✅ 계정 유형별 공식 TPS 쿼터
+ACCOUNT_TPS_QUOTA = {
+    'real': 20.0,  # 실전투자: 20건/초
+    'mock': 2.0,   # 모의투자: 2건/초
+}
+
+# ✅ 쿼터 대비 사용률 (90% 마진, 환경변수 KIS_TPS_UTILIZATION로 조절)
+DEFAULT_TPS_UTILIZATION = 0.9
+
+# ✅ 설정이 없을 때의 기본 TPS (기존 0.5초 간격과 동일)
+DEFAULT_MAX_TPS = 2.0
+
+# ✅ 레인별 보장 가중치 (합계 1.0)
+DEFAULT_LANE_WEIGHTS = {
+    'quotations': 0.5,  # 현재가/호가/차트/투자자 등 시세
+    'ranking': 0.2,     # 시가총액/거래량/PER/배당 순위
+    'finance': 0.2,     # 재무비율/손익/대차대조표
+    'default': 0.1,     # 분류되지 않은 호출
+}
+
+# ✅ 경로 → 레인 분류용 키워드 (순서대로 검사)
+_RANKING_MARKERS = (
+    'ranking/', 'volume-rank', 'inquire-market-cap', 'quotations/inquire-financial-ratio',
+)
+_FINANCE_MARKERS = (
+    'finance/', 'inquire-income-statement', 'inquire-balance-sheet',
+)
+_QUOTATION_MARKERS = ('quotations/',)
+
+
+def lane_for_path(path: Optional[str]) -> str:
+    """
+    KIS API 경로를 레인 이름으로 분류
+
+    Args:
+        path: '/uapi/domestic-stock/v1/quotations/inquire-price' 또는 상대경로
+
+    Returns:
+        'quotations' | 'ranking' | 'finance' | 'default'
+    """
+    if not path:
+        return 'default'
+    p = str(path)
+    if any(marker in p for marker in _RANKING_MARKERS):
+        return 'ranking'
+    if any(marker in p for marker in _FINANCE_MARKERS):
+        return 'finance'
+    if any(marker in p for marker in _QUOTATION_MARKERS):
+        return 'quotations'
+    return 'default'
+
+
+def _env_float(name: str) -> Optional[float]:
+    """환경변수를 float로 읽기 (없거나 잘못되면 None)"""
+    raw = os.environ.get(name)
+    if raw is None or str(raw).strip() == '':
+        return None
+    try:
+        return float(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Lane:
+    """레인 1개의 예약 상태 (창 내 보장 몫 + 아직 도래하지 않은 예약 슬롯)"""
+
+    __slots__ = ('name', 'weight', 'quota', 'pending')
+
+    def __init__(self, name: str, weight: float, quota: int):
+        self.name = name
+        self.weight = weight
+        self.quota = quota      # 창이 가득 찼을 때도 보장되는 예약 수
+        self.pending = deque()  # 예약된 슬롯 시각 (monotonic, 오름차순)
+
 
 class KISGlobalRateLimiter:
     """
     KIS API 전역 Rate Limiter (싱글톤)
     KISDataProvider와 MCPKISIntegration이 모두 이 클래스를 사용
     """
-    
+
     # 클래스 레벨 변수 (모든 곳에서 공유)
     _lock = threading.Lock()
     _last_request_time = 0.0
-    _request_interval = 0.5  # 기본 0.5초 (초당 2건)
-    
+    _max_tps = DEFAULT_MAX_TPS
+    _request_interval = 1.0 / DEFAULT_MAX_TPS  # 기본 0.5초 (초당 2건)
+    _window_seconds = 1.0  # 예약 창 길이 (KIS는 초 단위로 유량 측정)
+    _window_slots = 4      # 창에 담기는 슬롯 수 (재구성 시 계산)
+    _next_slot = 0.0       # 전역 그리드의 다음 빈 슬롯 시각 (monotonic)
+    _lane_weights: Dict[str, float] = dict(DEFAULT_LANE_WEIGHTS)
+    _lanes: Dict[str, _Lane] = {}
+
+    # 프로세스 간 공유 쿼터 (첫 예약 시 KIS_QUOTA_BACKEND로 생성, None이면 프로세스 내 제한만)
+    _shared_lock = threading.Lock()
+    _shared = None
+    _shared_ready = False
+    _shared_app_key: Optional[str] = None
+
+    @classmethod
+    def _rebuild_lanes(cls):
+        """현재 TPS/가중치로 창 크기와 레인별 보장 몫 재계산 (호출자가 _lock 보유)"""
+        total = sum(w for w in cls._lane_weights.values() if w > 0) or 1.0
+        cls._window_slots = max(len(cls._lane_weights), int(math.ceil(cls._max_tps * cls._window_seconds)))
+        lanes = {}
+        for name, weight in cls._lane_weights.items():
+            if weight <= 0:
+                continue
+            share = weight / total
+            lane = _Lane(name, share, max(1, int(cls._window_slots * share)))
+            # 기존 예약은 유지 (재설정 직후 버스트 방지)
+            prev = cls._lanes.get(name)
+            if prev:
+                lane.pending = prev.pending
+            lanes[name] = lane
+        cls._lanes = lanes
+
     @classmethod
-    def rate_limit(cls, interval: float = None):
+    def _try_reserve(cls, lane: Optional[str], cost: float) -> Tuple[Optional[float], float]:
         """
-        API 호출 전에 이 메서드를 호출하여 Rate Limit 적용
-        
+        슬롯 예약 시도 (호출자가 _lock 보유)
+
+        Returns:
+            (예약된 슬롯 시각 또는 None, 기준 시각 now)
+        """
+        if not cls._lanes:
+            cls._rebuild_lanes()
+        own = cls._lanes.get(lane or 'default') or cls._lanes.get('default') \
+            or next(iter(cls._lanes.values()))
+        now = time.monotonic()
+
+        # 이미 도래한 예약은 창에서 제거
+        outstanding = 0
+        for item in cls._lanes.values():
+            while item.pending and item.pending[0] <= now:
+                item.pending.popleft()
+            outstanding += len(item.pending)
+
+        # 창에 여유가 있거나, 자기 보장 몫 미만이면 예약 가능
+        if outstanding >= cls._window_slots and len(own.pending) >= own.quota:
+            return None, now
+
+        slot = max(now, cls._next_slot)
+        cls._next_slot = slot + cls._request_interval * cost
+        own.pending.append(slot)
+        cls._last_request_time = time.time() + (slot - now)
+        return slot, now
+
+    @classmethod
+    def reserve(cls, lane: Optional[str] = None, cost: float = 1.0) -> Optional[float]:
+        """
+        대기 없이 슬롯 예약만 시도 (asyncio 등 비동기 호출자용)
+
         Args:
-            interval: API 호출 간격 (None이면 기본값 사용)
+            lane: 레인 이름 (None/미등록이면 'default')
+            cost: 소비할 슬롯 수
+
+        Returns:
+            예약 성공 시 슬롯까지 남은 대기 시간(초), 창이 가득 차면 None (잠시 후 재시도)
         """
-        if interval is None:
-            interval = cls._request_interval
-        
+        cost = max(1.0, float(cost or 1.0))
         with cls._lock:
-            elapsed = time.time() - cls._last_request_time
-            wait = interval - elapsed
-            
+            slot, now = cls._try_reserve(lane, cost)
+            increment = cls._request_interval * cost
+        if slot is None:
+            return None
+        wait = max(0.0, slot - now)
+
+        # ✅ 프로세스 간 공유 그리드에도 예약 (다른 프로세스 호출과 합쳐 계정 쿼터 준수)
+        shared = cls._shared if cls._shared_ready else cls._shared_backend()
+        if shared is not None:
+            try:
+                wait = max(wait, shared.reserve(increment))
+            except Exception as e:
+                logger.warning(f"⚠️ 공유 쿼터 예약 실패, 프로세스 내 제한만 사용: {e}")
+                cls.set_shared_backend(None)
+        return wait
+
+    @classmethod
+    def _shared_backend(cls):
+        """공유 쿼터 백엔드 (최초 1회 생성)"""
+        with cls._shared_lock:
+            if not cls._shared_ready:
+                cls._shared = create_quota_backend(app_key=cls._shared_app_key)
+                cls._shared_ready = True
+                if cls._shared is not None:
+                    logger.info(f"✅ KIS 공유 쿼터 백엔드: {cls._shared.name}")
+            return cls._shared
+
+    @classmethod
+    def set_shared_backend(cls, backend):
+        """
+        공유 쿼터 백엔드 지정
+
+        Args:
+            backend: reserve(increment) -> 대기 초 를 제공하는 객체 (None이면 공유 안 함)
+        """
+        with cls._shared_lock:
+            previous, cls._shared = cls._shared, backend
+            cls._shared_ready = True
+        if previous is not None and previous is not backend and hasattr(previous, 'close'):
+            try:
+                previous.close()
+            except Exception as e:
+                logger.debug(f"이전 공유 쿼터 백엔드 종료 실패(무시): {e}")
+
+    @classmethod
+    def set_app_key(cls, app_key: Optional[str]):
+        """
+        공유 쿼터 키로 쓸 AppKey 지정 (TPS 설정은 그대로)
+
+        KISDataProvider/MCPKISIntegration 생성 시 호출되어 어느 진입점이든
+        같은 AppKey 프로세스끼리 같은 쿼터 파일/키를 사용
+
+        Args:
+            app_key: AppKey (비어 있으면 무시, 바뀌면 백엔드 재생성)
+        """
+        if not app_key or app_key == cls._shared_app_key:
+            return
+        cls._shared_app_key = app_key
+        if cls._shared_ready:
+            cls.set_shared_backend(create_quota_backend(app_key=app_key))
+
+    @classmethod
+    def get_shared_backend(cls):
+        """현재 공유 쿼터 백엔드 (없으면 None)"""
+        return cls._shared if cls._shared_ready else cls._shared_backend()
+
+    @classmethod
+    def acquire(cls, lane: Optional[str] = None, cost: float = 1.0) -> float:
+        """
+        레인 슬롯 1개(또는 cost배)를 예약하고 해당 시각까지 대기
+
+        Args:
+            lane: 레인 이름 (None/미등록이면 'default')
+            cost: 소비할 슬롯 수 (슬로우 모드 등에서 1보다 크게)
+
+        Returns:
+            실제 대기한 시간 (초)
+        """
+        waited = 0.0
+        while True:
+            wait = cls.reserve(lane, cost)
+
+            # ✅ Lock 밖에서 대기 (다른 스레드의 예약을 막지 않음)
+            if wait is None:
+                # 창이 가득 참 → 한 슬롯 뒤 재시도
+                retry_after = cls._request_interval
+                time.sleep(retry_after)
+                waited += retry_after
+                continue
+
             if wait > 0:
-                # 약간의 지터 추가 (0-30ms)
-                time.sleep(wait + random.uniform(0, 0.03))
-            
-            cls._last_request_time = time.time()
-    
+                time.sleep(wait)
+            return waited + wait
+
+    @classmethod
+    def rate_limit(cls, interval: float = None, lane: Optional[str] = None):
+        """
+        API 호출 전에 이 메서드를 호출하여 Rate Limit 적용
+
+        Args:
+            interval: API 호출 간격 (None이면 전역 쿼터 사용, 지정 시 쿼터보다 느린 경우에만 반영)
+            lane: 엔드포인트 레인 ('quotations', 'ranking', 'finance', 'default')
+        """
+        cls.acquire(lane=lane, cost=cls.cost_for_interval(interval))
+
+    @classmethod
+    def cost_for_interval(cls, interval: Optional[float]) -> float:
+        """호출 간격 요청을 슬롯 수로 환산 (쿼터보다 빠른 간격은 1슬롯)"""
+        if interval is None or cls._request_interval <= 0:
+            return 1.0
+        return max(1.0, interval / cls._request_interval)
+
+    @classmethod
+    def configure(cls, max_tps: Optional[float] = None, lane_weights: Optional[Dict[str, float]] = None):
+        """
+        전역 TPS와 레인 가중치 설정
+
+        Args:
+            max_tps: 초당 최대 요청 수 (None이면 유지)
+            lane_weights: {'quotations': 0.5, ...} (None이면 유지, 'default' 레인은 항상 포함)
+        """
+        with cls._lock:
+            if max_tps is not None:
+                cls._max_tps = max(0.1, float(max_tps))
+                cls._request_interval = 1.0 / cls._max_tps
+            if lane_weights is not None:
+                weights = {k: float(v) for k, v in lane_weights.items() if v and float(v) > 0}
+                weights.setdefault('default', DEFAULT_LANE_WEIGHTS['default'])
+                cls._lane_weights = weights
+            cls._rebuild_lanes()
+
+    @classmethod
+    def configure_for_account(cls, is_test: bool = False, max_tps: Optional[float] = None,
+                              utilization: Optional[float] = None, app_key: Optional[str] = None):
+        """
+        계정 유형(실전/모의)의 공식 쿼터로 TPS 설정
+
+        우선순위: 환경변수 KIS_MAX_TPS > max_tps 인자 > 계정 쿼터 × 사용률
+
+        Args:
+            is_test: 모의투자 여부
+            max_tps: 명시적 TPS (config.yaml kis_api.max_tps)
+            utilization: 쿼터 사용률 (None이면 KIS_TPS_UTILIZATION 또는 0.9)
+            app_key: AppKey (같은 AppKey 프로세스끼리 공유 쿼터 사용, 바뀌면 백엔드 재생성)
+        """
+        cls.set_app_key(app_key)
+        env_tps = _env_float('KIS_MAX_TPS')
+        if env_tps is not None:
+            tps = env_tps
+        elif max_tps:
+            tps = float(max_tps)
+        else:
+            if utilization is None:
+                utilization = _env_float('KIS_TPS_UTILIZATION') or DEFAULT_TPS_UTILIZATION
+            quota = ACCOUNT_TPS_QUOTA['mock' if is_test else 'real']
+            tps = quota * min(1.0, max(0.05, utilization))
+        cls.configure(max_tps=tps)
+
     @classmethod
     def set_interval(cls, interval: float):
         """
         전역 API 호출 간격 설정
-        
+
         Args:
             interval: 초 단위 간격 (예: 0.5 = 초당 2건)
         """
-        with cls._lock:
-            cls._request_interval = max(0.1, interval)  # 최소 0.1초
-    
+        cls.configure(max_tps=1.0 / max(0.05, interval))  # 최소 0.05초 (실전 20건/초)
+
     @classmethod
     def get_interval(cls) -> float:
         """현재 설정된 간격 반환"""
         return cls._request_interval
-    
+
+    @classmethod
+    def get_max_tps(cls) -> float:
+        """현재 설정된 초당 최대 요청 수 반환"""
+        return cls._max_tps
+
+    @classmethod
+    def get_lane_weights(cls) -> Dict[str, float]:
+        """현재 레인 가중치 반환 (복사본)"""
+        return dict(cls._lane_weights)
+
     @classmethod
     def get_last_request_time(cls) -> float:
         """마지막 요청 시각 반환"""
         return cls._last_request_time
 
+
+# ✅ 환경변수로 초기 TPS 지정 (없으면 기존과 동일한 초당 2건)
+_initial_tps = _env_float('KIS_MAX_TPS')
+if _initial_tps is not None:
+    KISGlobalRateLimiter.configure(max_tps=_initial_tps)
+
 # 전역 싱글톤 인스턴스 (import해서 사용)
 rate_limiter = KISGlobalRateLimiter()
-
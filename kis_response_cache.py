@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KIS API 응답 영구 캐시 (SQLite, 프로세스 간 공유)
+
+MCPKISIntegration의 메모리 LRU(OrderedDict) 아래 2차 캐시 계층입니다.
+Streamlit 재실행, CLI, daily_price_collector, 워커 프로세스가 재무/순위/차트처럼
+TTL이 긴 응답을 다시 받지 않도록 디스크에 보관합니다.
+
+- 키: _make_api_call의 정규화 키 (endpoint:tr_id:params) 그대로 사용
+- TTL: 조회 시점의 엔드포인트 TTL로 판단 (cache_ttl/cache_ttl_overrides 변경 즉시 반영)
+- 동시성: WAL + busy_timeout, 스레드별 커넥션 (여러 프로세스/스레드 안전)
+- 크기 제한: 만료 항목 정리 후 max_entries 초과분은 오래된 순으로 제거
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = 'cache/kis_response_cache.db'
+
+# 최대 보관 항목 수 (초과 시 오래된 항목부터 제거)
+DEFAULT_MAX_ENTRIES = 50000
+
+# 이 TTL(초) 미만 응답은 디스크에 저장하지 않음 (현재가/호가 등 실시간성 데이터)
+DEFAULT_MIN_TTL = 60.0
+
+# N회 저장마다 만료/초과 항목 정리
+PRUNE_EVERY = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_response_cache (
+    cache_key   TEXT PRIMARY KEY,
+    endpoint    TEXT NOT NULL,
+    payload     BLOB NOT NULL,
+    created_at  REAL NOT NULL,
+    expires_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_api_response_cache_created ON api_response_cache(created_at);
+CREATE INDEX IF NOT EXISTS idx_api_response_cache_expires ON api_response_cache(expires_at);
+"""
+
+
+class ResponseCache:
+    """
+    SQLite 기반 API 응답 캐시 (경로별 공유 인스턴스)
+
+    Example:
+        cache = ResponseCache.for_path('cache/kis_response_cache.db')
+        hit = cache.get(key, ttl=3600)          # (data, created_at) 또는 None
+        cache.put(key, data, ttl=3600, endpoint='finance/financial-ratio')
+    """
+
+    _registry: Dict[str, 'ResponseCache'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, db_path: str = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 min_ttl: float = DEFAULT_MIN_TTL):
+        """
+        Args:
+            db_path: SQLite 파일 경로
+            max_entries: 최대 보관 항목 수
+            min_ttl: 디스크 저장 최소 TTL (초)
+        """
+        self.db_path = Path(os.path.expanduser(str(db_path)))
+        self.max_entries = max_entries
+        self.min_ttl = min_ttl
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._disabled = False
+        self._prune_lock = threading.Lock()
+        self._puts_since_prune = 0
+
+    @classmethod
+    def for_path(cls, db_path: str = DEFAULT_CACHE_PATH) -> 'ResponseCache':
+        """경로별 공유 인스턴스 반환"""
+        key = os.path.abspath(os.path.expanduser(str(db_path)))
+        with cls._registry_lock:
+            cache = cls._registry.get(key)
+            if cache is None:
+                cache = cls(key)
+                cls._registry[key] = cache
+            return cache
+
+    def accepts(self, ttl: float) -> bool:
+        """해당 TTL 응답을 디스크에 보관하는지 여부"""
+        return not self._disabled and ttl >= self.min_ttl
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """스레드별 커넥션 (최초 사용 시 스키마/WAL 설정, 실패 시 캐시 비활성화)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            return conn
+        if self._disabled:
+            return None
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA busy_timeout=5000")
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    conn.commit()
+                    self._initialized = True
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except Exception as e:
+            logger.warning(f"⚠️ 응답 캐시 DB 사용 불가, 메모리 캐시만 사용: {e}")
+            self._disabled = True
+            return None
+        self._local.conn = conn
+        return conn
+
+    def get(self, cache_key: str, ttl: float) -> Optional[Tuple[Dict, float]]:
+        """
+        캐시 조회
+
+        Args:
+            cache_key: 정규화된 캐시 키
+            ttl: 현재 엔드포인트 TTL (초)
+
+        Returns:
+            (응답 데이터, 저장 시각) 또는 None
+        """
+        if not self.accepts(ttl):
+            return None
+        conn = self._connect()
+        if conn is None:
+            return None
+        try:
+            row = conn.execute(
+                "SELECT payload, created_at FROM api_response_cache WHERE cache_key = ? AND created_at >= ?",
+                (cache_key, time.time() - ttl)
+            ).fetchone()
+            if row is None:
+                return None
+            return json.loads(zlib.decompress(row[0]).decode('utf-8')), row[1]
+        except Exception as e:
+            logger.debug(f"응답 캐시 조회 실패(무시): {e}")
+            return None
+
+    def put(self, cache_key: str, data: Dict, ttl: float, endpoint: str = "",
+            created_at: Optional[float] = None):
+        """
+        캐시 저장 (UPSERT)
+
+        Args:
+            cache_key: 정규화된 캐시 키
+            data: 응답 데이터 (JSON 직렬화 가능)
+            ttl: 엔드포인트 TTL (초) - 만료 항목 정리 기준
+            endpoint: 엔드포인트 (통계/정리용)
+            created_at: 저장 시각 (기본: 현재)
+        """
+        if not self.accepts(ttl):
+            return
+        conn = self._connect()
+        if conn is None:
+            return
+        now = time.time() if created_at is None else created_at
+        try:
+            payload = zlib.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO api_response_cache "
+                    "(cache_key, endpoint, payload, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                    (cache_key, endpoint, payload, now, now + ttl)
+                )
+        except Exception as e:
+            logger.debug(f"응답 캐시 저장 실패(무시): {e}")
+            return
+
+        with self._prune_lock:
+            self._puts_since_prune += 1
+            due = self._puts_since_prune >= PRUNE_EVERY
+            if due:
+                self._puts_since_prune = 0
+        if due:
+            self.prune()
+
+    def prune(self) -> int:
+        """
+        만료 항목 삭제 + max_entries 초과분 제거 (오래된 순)
+
+        Returns:
+            삭제된 항목 수
+        """
+        conn = self._connect()
+        if conn is None:
+            return 0
+        try:
+            with conn:
+                deleted = conn.execute(
+                    "DELETE FROM api_response_cache WHERE expires_at < ?", (time.time(),)
+                ).rowcount
+                count = conn.execute("SELECT COUNT(*) FROM api_response_cache").fetchone()[0]
+                excess = count - self.max_entries
+                if excess > 0:
+                    deleted += conn.execute(
+                        "DELETE FROM api_response_cache WHERE cache_key IN ("
+                        "SELECT cache_key FROM api_response_cache ORDER BY created_at ASC LIMIT ?)",
+                        (excess,)
+                    ).rowcount
+            if deleted:
+                logger.debug(f"🗑️ 응답 캐시 정리: {deleted}개 삭제")
+            return deleted
+        except Exception as e:
+            logger.debug(f"응답 캐시 정리 실패(무시): {e}")
+            return 0
+
+    def clear(self):
+        """전체 캐시 삭제"""
+        conn = self._connect()
+        if conn is None:
+            return
+        try:
+            with conn:
+                conn.execute("DELETE FROM api_response_cache")
+        except Exception as e:
+            logger.warning(f"응답 캐시 삭제 실패: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """엔드포인트별 보관 항목 수"""
+        conn = self._connect()
+        if conn is None:
+            return {}
+        try:
+            rows = conn.execute(
+                "SELECT endpoint, COUNT(*) FROM api_response_cache GROUP BY endpoint"
+            ).fetchall()
+            return {endpoint: count for endpoint, count in rows}
+        except Exception as e:
+            logger.debug(f"응답 캐시 통계 조회 실패: {e}")
+            return {}
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KIS API 토큰 메모리 캐시 (프로세스 전역)
+
+매 요청마다 파일 락 + JSON 파싱을 하지 않도록 토큰을 메모리에 보관하고,
+다음 경우에만 디스크에서 다시 읽습니다.
+- 메모리 토큰이 만료 임박 (기본 1시간 여유)
+- 다른 프로세스가 캐시 파일을 새로 썼음 (inode/mtime/size 변경, stat 1회로 감지)
+
+KISTokenManager, MCPKISIntegration, ValueStockFinder가 같은 경로에 대해
+같은 TokenCache 인스턴스를 공유합니다.
+"""
+
+import json
+import os
+import time
+import logging
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 만료 여유 시간 (기존 kis_token_manager.py와 동일한 1시간)
+DEFAULT_REFRESH_MARGIN = 3600.0
+
+# 파일 변경 감지(stat) 최소 간격 (초)
+DEFAULT_STAT_INTERVAL = 1.0
+
+
+def parse_token_cache(cache: Dict) -> Tuple[Optional[str], Optional[float]]:
+    """
+    토큰 캐시 JSON을 (토큰, 만료 epoch초)로 해석
+
+    지원 형식:
+    - 기존: {"token": "...", "expires_at": "2025-10-10T10:00:00" 또는 epoch 숫자}
+    - 신규: {"access_token": "...", "issue_time": 123456, "expires_in": 86400}
+
+    Returns:
+        (token, expires_at) - 해석 불가 시 (None, None)
+    """
+    if not isinstance(cache, dict):
+        return None, None
+
+    if 'token' in cache and 'expires_at' in cache:
+        token = cache.get('token')
+        expires_at_value = cache.get('expires_at')
+        if not token or not expires_at_value:
+            return None, None
+        # ✅ 숫자(epoch timestamp) vs 문자열(ISO format) 구분
+        if isinstance(expires_at_value, (int, float)):
+            return token, float(expires_at_value)
+        if isinstance(expires_at_value, str):
+            try:
+                return token, datetime.fromisoformat(expires_at_value).timestamp()
+            except ValueError:
+                return None, None
+        return None, None
+
+    if 'access_token' in cache and 'issue_time' in cache:
+        token = cache.get('access_token')
+        issue_time = cache.get('issue_time')
+        if not token or not issue_time:
+            return None, None
+        return token, float(issue_time) + float(cache.get('expires_in', 86400))
+
+    return None, None
+
+
+class TokenCache:
+    """
+    토큰 파일 앞단의 프로세스 전역 메모리 캐시 (경로별 싱글톤)
+
+    Example:
+        cache = TokenCache.for_path("~/.kis/token_cache.json")
+        token = cache.get()
+        if not token:
+            token = issue_new_token()
+            cache.store(token, expires_in=86400)
+    """
+
+    _registry: Dict[str, 'TokenCache'] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, cache_path: str, refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+                 stat_interval: float = DEFAULT_STAT_INTERVAL):
+        self.cache_path = os.path.abspath(os.path.expanduser(str(cache_path)))
+        self.refresh_margin = refresh_margin
+        self.stat_interval = stat_interval
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._signature: Optional[Tuple[int, int, int]] = None
+        self._last_stat = 0.0
+
+    @classmethod
+    def for_path(cls, cache_path: str) -> 'TokenCache':
+        """경로별 공유 인스턴스 반환 (같은 파일 → 같은 메모리 캐시)"""
+        key = os.path.abspath(os.path.expanduser(str(cache_path)))
+        with cls._registry_lock:
+            cache = cls._registry.get(key)
+            if cache is None:
+                cache = cls(key)
+                cls._registry[key] = cache
+            return cache
+
+    @property
+    def expires_at(self) -> float:
+        """메모리 토큰 만료 시각 (epoch초, 없으면 0)"""
+        return self._expires_at
+
+    def _file_lock(self):
+        """멀티프로세스 파일 락 (filelock 미설치 시 no-op)"""
+        try:
+            from filelock import FileLock
+            return FileLock(f"{self.cache_path}.lock", timeout=5)
+        except ImportError:
+            return nullcontext()
+
+    def _stat_signature(self) -> Optional[Tuple[int, int, int]]:
+        """파일 식별 정보 (inode, mtime_ns, size) - 없으면 None"""
+        try:
+            st = os.stat(self.cache_path)
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _is_fresh(self, now: float, margin: float) -> bool:
+        return bool(self._token) and now < self._expires_at - margin
+
+    def _reload(self):
+        """디스크에서 토큰 다시 읽기 (호출자가 self._lock 보유)"""
+        self._last_stat = time.time()
+        signature = self._stat_signature()
+        if signature is None:
+            self._token, self._expires_at, self._signature = None, 0.0, None
+            return
+
+        try:
+            with self._file_lock():
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    cache = json.load(f)
+                signature = self._stat_signature()
+        except (json.JSONDecodeError, ValueError) as parse_err:
+            logger.warning(f"⚠️ 토큰 캐시 손상, 삭제 후 재발급: {parse_err}")
+            self._remove_file()
+            self._token, self._expires_at, self._signature = None, 0.0, None
+            return
+        except Exception as e:
+            logger.warning(f"토큰 캐시 로드 실패: {e}")
+            self._token, self._expires_at, self._signature = None, 0.0, None
+            return
+
+        token, expires_at = parse_token_cache(cache)
+        if token is None:
+            logger.warning("⚠️ 알 수 없는 캐시 형식입니다. 새 토큰을 발급합니다.")
+        self._token, self._expires_at, self._signature = token, expires_at or 0.0, signature
+
+    def get(self, margin: Optional[float] = None) -> Optional[str]:
+        """
+        유효한 토큰 반환 (메모리 우선, 필요 시에만 디스크 재로드)
+
+        Args:
+            margin: 만료 여유 시간 (초, None이면 refresh_margin)
+
+        Returns:
+            유효한 토큰 또는 None (발급 필요)
+        """
+        margin = self.refresh_margin if margin is None else margin
+        now = time.time()
+
+        with self._lock:
+            if self._is_fresh(now, margin):
+                # 다른 프로세스가 새 토큰을 썼는지 저렴하게 확인 (stat 1회, 간격 제한)
+                if now - self._last_stat < self.stat_interval:
+                    return self._token
+                self._last_stat = now
+                if self._stat_signature() == self._signature:
+                    return self._token
+
+            self._reload()
+            if self._is_fresh(now, margin):
+                hours = (self._expires_at - now) / 3600
+                logger.debug(f"✅ 캐시된 토큰 로드 (남은 시간: {hours:.1f}시간)")
+                return self._token
+
+            if self._token:
+                logger.debug("⏰ 캐시된 토큰이 만료되었거나 만료가 임박했습니다")
+            return None
+
+    def store(self, token: str, expires_in: float = 86400, expires_at: Optional[float] = None):
+        """
+        토큰을 메모리와 디스크에 저장 (원자적 쓰기 + 0o600 퍼미션)
+
+        ✅ 기존 kis_token_manager.py 형식 사용 (호환성)
+
+        Args:
+            token: 액세스 토큰
+            expires_in: 만료까지 남은 시간 (초)
+            expires_at: 만료 epoch초 (지정 시 expires_in보다 우선)
+        """
+        if expires_at is None:
+            expires_at = time.time() + float(expires_in)
+
+        with self._lock:
+            self._token, self._expires_at = token, float(expires_at)
+            self._last_stat = time.time()
+            try:
+                with self._file_lock():
+                    cache_dir = os.path.dirname(self.cache_path)
+                    if cache_dir:
+                        os.makedirs(cache_dir, exist_ok=True)
+
+                    tmp_path = f"{self.cache_path}.tmp"
+                    cache = {
+                        'token': token,  # 기존 시스템 키명
+                        'expires_at': datetime.fromtimestamp(expires_at).isoformat()  # 기존 시스템 키명
+                    }
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump(cache, f, indent=2)
+                    try:
+                        os.chmod(tmp_path, 0o600)
+                    except Exception:
+                        pass  # Windows에서는 실패할 수 있음
+                    os.replace(tmp_path, self.cache_path)
+                    self._signature = self._stat_signature()
+                logger.debug(f"💾 토큰 캐시 저장 완료 (만료: {datetime.fromtimestamp(expires_at):%Y-%m-%d %H:%M:%S})")
+            except Exception as e:
+                logger.warning(f"토큰 캐시 저장 실패: {e}")
+
+    def invalidate(self, remove_file: bool = True):
+        """
+        토큰 무효화 (401 응답 등)
+
+        Args:
+            remove_file: 디스크 캐시 파일도 삭제할지 여부
+        """
+        with self._lock:
+            self._token, self._expires_at, self._signature = None, 0.0, None
+            if remove_file:
+                self._remove_file()
+
+    def _remove_file(self):
+        try:
+            os.unlink(self.cache_path)
+        except FileNotFoundError:
+            pass
+        except Exception as del_err:
+            logger.debug(f"토큰 캐시 삭제 실패(무시): {del_err}")
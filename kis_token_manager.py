@@ -4,7 +4,9 @@ import json
 import os
 import logging
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
+
+from kis_token_cache import TokenCache
 
 logger = logging.getLogger(__name__)
 
@@ -40,71 +42,37 @@ class KISTokenManager:
             logger.error(f"❌ 설정 파일에 'kis_api' 또는 'app_key'/'app_secret' 항목이 없습니다.")
             sys.exit(1)
 
+        self._token_cache = TokenCache.for_path(cache_path)  # ✅ 프로세스 전역 메모리 토큰 캐시
         self.token = None
         self.access_token = None  # 컬렉터들이 사용하는 속성
         self.headers = {}
         self._initialized = True
 
     def _load_token_from_cache(self) -> bool:
-        """파일 캐시에서 토큰을 로드하고 유효성을 검사합니다."""
-        if not os.path.exists(self.cache_path):
-            logger.info("📝 토큰 캐시 파일이 없습니다. 새 토큰을 발급합니다.")
+        """메모리/파일 캐시에서 토큰을 로드하고 유효성을 검사합니다."""
+        token = self._token_cache.get()
+        if not token or token.strip() == "":
+            if not os.path.exists(self.cache_path):
+                logger.info("📝 토큰 캐시 파일이 없습니다. 새 토큰을 발급합니다.")
+            else:
+                logger.info("⚠️ 캐시된 토큰이 없거나 만료가 임박하여 갱신합니다.")
             return False
 
-        try:
-            with open(self.cache_path, 'r') as f:
-                cache = json.load(f)
+        if token != self.token:
+            expires_at = datetime.fromtimestamp(self._token_cache.expires_at)
+            remaining_time = expires_at - datetime.now()
+            logger.info(f"♻️ 캐시된 토큰을 재사용합니다. (만료: {expires_at.strftime('%Y-%m-%d %H:%M:%S')}, 남은 시간: {remaining_time})")
 
-            # 캐시 파일에 필요한 키가 있는지 확인
-            if 'token' not in cache or 'expires_at' not in cache:
-                logger.warning("⚠️ 캐시 파일에 필요한 정보가 없습니다. 새 토큰을 발급합니다.")
-                return False
-
-            # ✅ expires_at 타입 호환 (ISO 문자열 or epoch 숫자)
-            expires_at_value = cache['expires_at']
-            current_time = datetime.now()
-            
-            if isinstance(expires_at_value, (int, float)):
-                expires_at = datetime.fromtimestamp(expires_at_value)
-            elif isinstance(expires_at_value, str):
-                expires_at = datetime.fromisoformat(expires_at_value)
-            else:
-                logger.warning(f"⚠️ 알 수 없는 expires_at 타입: {type(expires_at_value)}")
-                return False
-
-            # 토큰이 유효한지 확인 (1시간 여유분 포함)
-            if expires_at > current_time + timedelta(hours=1):
-                self.token = cache['token']
-                self.access_token = self.token  # 컬렉터들이 사용하는 속성
-                # 토큰이 비어있지 않은지 확인
-                if not self.token or self.token.strip() == "":
-                    logger.warning("⚠️ 캐시된 토큰이 비어있습니다. 새 토큰을 발급합니다.")
-                    return False
-
-                self._update_headers()
-                remaining_time = expires_at - current_time
-                logger.info(f"♻️ 캐시된 토큰을 재사용합니다. (만료: {expires_at.strftime('%Y-%m-%d %H:%M:%S')}, 남은 시간: {remaining_time})")
-                return True
-            else:
-                logger.info("⚠️ 캐시된 토큰이 만료되었거나 만료가 임박하여 갱신합니다.")
-                return False
-
-        except (json.JSONDecodeError, KeyError, OSError) as e:
-            logger.warning(f"⚠️ 캐시 파일이 손상되었거나 읽을 수 없습니다: {e}. 새 토큰을 발급합니다.")
-            return False
+        self.token = token
+        self.access_token = self.token  # 컬렉터들이 사용하는 속성
+        self._update_headers()
+        return True
 
     def _save_token_to_cache(self, token_data: dict):
-        """발급받은 토큰 정보와 만료 시간을 파일에 저장합니다."""
-        try:
-            expires_in = token_data.get('expires_in', 86400)
-            expires_at = datetime.now() + timedelta(seconds=expires_in)
-
-            cache = {'token': self.token, 'expires_at': expires_at.isoformat()}
-            with open(self.cache_path, 'w') as f:
-                json.dump(cache, f)
-            logger.info(f"✅ 토큰 정보를 '{self.cache_path}' 파일에 저장했습니다.")
-        except OSError as e:
-            logger.error(f"❌ 토큰 캐시 파일 저장에 실패했습니다: {e}")
+        """발급받은 토큰 정보와 만료 시간을 메모리와 파일에 저장합니다."""
+        expires_in = token_data.get('expires_in', 86400)
+        self._token_cache.store(self.token, expires_in=expires_in)
+        logger.info(f"✅ 토큰 정보를 '{self.cache_path}' 파일에 저장했습니다.")
 
     def _issue_new_token(self):
         """KIS API 서버로부터 새로운 인증 토큰을 발급받습니다."""
@@ -155,34 +123,21 @@ class KISTokenManager:
         """
         토큰이 만료되었는지 확인합니다.
 
+        ✅ 매 호출마다 파일을 읽지 않고 프로세스 전역 메모리 캐시로 확인
+        (만료 임박 또는 다른 프로세스의 파일 갱신 시에만 디스크 재로드)
+
         Returns:
             bool: 토큰이 만료되었으면 True, 그렇지 않으면 False
         """
-        if not os.path.exists(self.cache_path):
-            return True
-
-        try:
-            with open(self.cache_path, 'r') as f:
-                cache = json.load(f)
-
-            if 'expires_at' not in cache:
-                return True
-
-            # ✅ expires_at 타입 호환 (ISO 문자열 or epoch 숫자)
-            expires_at_value = cache['expires_at']
-            current_time = datetime.now()
-            
-            if isinstance(expires_at_value, (int, float)):
-                expires_at = datetime.fromtimestamp(expires_at_value)
-            elif isinstance(expires_at_value, str):
-                expires_at = datetime.fromisoformat(expires_at_value)
-            else:
-                return True  # 알 수 없는 타입이면 만료로 간주
-
-            # 1시간 여유분을 두고 만료 확인
-            return expires_at <= current_time + timedelta(hours=1)
-        except (json.JSONDecodeError, KeyError, OSError):
+        token = self._token_cache.get()
+        if not token:
             return True
+        if token != self.access_token:
+            # 다른 프로세스가 갱신한 토큰으로 교체
+            self.token = token
+            self.access_token = token
+            self._update_headers()
+        return False
 
     def get_valid_token(self) -> str:
         """
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+KOSPI 종목 마스터 로더 (kospi_code.mst 직접 파싱 + 바이너리 캐시)
+
+여러 모듈이 시작할 때마다 kospi_code.xlsx를 pd.read_excel(openpyxl)로 따로 읽던 것을
+하나의 로더로 통합합니다.
+
+- kospi_code.mst를 메모리에서 직접 파싱 (임시 파일 없음, 고정폭 뒷부분 228자)
+- .mst가 없으면 kospi_code.xlsx로 폴백 (최초 1회만 Excel 파싱)
+- 파싱 결과를 원본 파일 해시별 Feather 캐시로 저장 (pyarrow 없으면 pickle)
+- 프로세스 내에서는 (경로, 수정시각, 크기)가 같으면 같은 KospiMaster 공유
+  → 프로세스 시작과 Streamlit 재실행 모두 Excel 파싱 생략
+- 공유 인덱스(읽기 전용): 코드 → 행, 코드 → 종목명, 종목명 → 코드, 코드 → 마스터 섹터
+- 마스터 섹터는 컬럼 단위(np.select)로 한 번 계산해 캐시에 함께 저장,
+  종목명 키워드 폴백은 하나의 정규식으로 미리 컴파일
+
+Example:
+    master = get_kospi_master()
+    master.code_to_name.get('005930')       # '삼성전자'
+    master.name_to_code.get('삼성전자')      # '005930'
+    df = master.dataframe()                  # 수정 가능한 복사본
+"""
+
+import hashlib
+import io
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow  # noqa: F401  (Feather 캐시용, 없으면 pickle)
+    FEATHER_AVAILABLE = True
+except ImportError:
+    FEATHER_AVAILABLE = False
+
+# 마스터 파일 탐색 순서 (.mst 우선)
+MASTER_SOURCES = ('kospi_code.mst', 'kospi_code.xlsx')
+
+# 파싱 캐시 디렉토리 (DB 캐시와 같은 위치)
+CACHE_DIR = 'cache'
+
+# .mst 인코딩
+MST_ENCODING = 'cp949'
+
+# .mst 앞부분 컬럼 (단축코드 9자리, 표준코드 12자리, 나머지는 한글명)
+PART1_COLUMNS = ['단축코드', '표준코드', '한글명']
+
+# .mst 뒷부분 고정폭 필드 (kospi_master_download.py와 동일)
+PART2_WIDTHS = [
+    2, 1, 4, 4, 4, 1, 1, 1, 1, 1,
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 1, 1, 1, 1, 1, 1, 1, 1, 1,
+    1, 9, 5, 5, 1, 1, 1, 2, 1, 1,
+    1, 2, 2, 2, 3, 1, 3, 12, 12, 8,
+    15, 21, 2, 7, 1, 1, 1, 1, 1, 9,
+    9, 9, 5, 9, 8, 9, 3, 1, 1, 1,
+]
+PART2_COLUMNS = [
+    '그룹코드', '시가총액규모', '지수업종대분류', '지수업종중분류', '지수업종소분류',
+    '제조업', '저유동성', '지배구조지수종목', 'KOSPI200섹터업종', 'KOSPI100',
+    'KOSPI50', 'KRX', 'ETP', 'ELW발행', 'KRX100',
+    'KRX자동차', 'KRX반도체', 'KRX바이오', 'KRX은행', 'SPAC',
+    'KRX에너지화학', 'KRX철강', '단기과열', 'KRX미디어통신', 'KRX건설',
+    'Non1', 'KRX증권', 'KRX선박', 'KRX섹터_보험', 'KRX섹터_운송',
+    'SRI', '기준가', '매매수량단위', '시간외수량단위', '거래정지',
+    '정리매매', '관리종목', '시장경고', '경고예고', '불성실공시',
+    '우회상장', '락구분', '액면변경', '증자구분', '증거금비율',
+    '신용가능', '신용기간', '전일거래량', '액면가', '상장일자',
+    '상장주수', '자본금', '결산월', '공모가', '우선주',
+    '공매도과열', '이상급등', 'KRX300', 'KOSPI', '매출액',
+    '영업이익', '경상이익', '당기순이익', 'ROE', '기준년월',
+    '시가총액', '그룹사코드', '회사신용한도초과', '담보대출가능', '대주가능',
+]
+PART2_LENGTH = sum(PART2_WIDTHS)  # 227 (줄바꿈 제외)
+
+# KOSPI200 섹터업종 코드 → 섹터명 (KIS 공식)
+KOSPI200_SECTOR_MAP = {
+    '1': '건설',
+    '2': '운송장비',  # 조선
+    '5': '전기전자',  # IT
+    '6': '금융',
+    '7': '제조업',  # 음식료
+    '9': '제조업',  # 산업재
+    'A': '바이오/제약',
+    'B': 'IT',  # 게임/미디어
+}
+
+# 지수업종 대분류 코드 → 섹터명
+INDUSTRY_LARGE_MAP = {
+    16: '제조업',  # 섬유의복
+    19: '유통',
+    21: '지주회사',
+    26: '건설',
+    27: '제조업',  # 전기전자/기계
+    29: 'IT',  # 서비스업
+    30: 'IT',  # 오락문화
+}
+
+# KRX 섹터 플래그 → 섹터명 (우선순위 순, 'Y'인 첫 플래그 적용)
+KRX_FLAG_SECTORS = (
+    (('KRX은행', 'KRX증권', 'KRX섹터_보험'), '금융'),
+    (('KRX자동차',), '운송장비'),
+    (('KRX반도체',), '전기전자'),
+    (('KRX미디어통신',), '통신'),
+    (('KRX섹터_운송', 'KRX선박'), '운송'),
+    (('KRX바이오',), '바이오/제약'),
+    (('KRX에너지화학',), '제조업'),
+    (('KRX철강',), '제조업'),
+    (('KRX건설',), '건설'),
+)
+
+# 마스터 섹터 컬럼 (캐시에 함께 저장, 규칙 변경 시 SECTOR_RULES_VERSION 증가 → 캐시 무효화)
+SECTOR_COLUMN = '마스터섹터'
+SECTOR_RULES_VERSION = 1
+
+# 종목명 키워드 → 섹터 (우선순위 순, 마스터 섹터가 없거나 '제조업'일 때 폴백)
+NAME_SECTOR_KEYWORDS = (
+    (r"(금융지주|은행|생명보험|손해보험|손보|생보|증권|카드|캐피탈|저축은행|자산운용)", "금융"),
+    # ✅ 통신 (KT&G 제외)
+    (r"(?:^| )(kt|케이티|sk텔레콤|lg유플러스)(?:$| )(?!.*앤지)(?!.*&g)", "통신"),
+    # ✅ 담배/식품 (우선 처리)
+    (r"(케이티앤지|kt&g|담배|필수소비재)", "필수소비재"),
+    # ✅ 방산/항공우주
+    (r"(항공우주|korea aerospace|kai|방산|미사일|레이다)", "제조업"),
+    # 2차전지
+    (r"(에너지솔루션|배터리|2차전지)", "전기전자"),
+    (r"(반도체|하이닉스|sdi|전자|디스플레이)", "전기전자"),
+    (r"(자동차|현대차|기아|모비스|운송장비|부품)", "운송장비"),
+    (r"(항공|대한항공|아시아나|해운|hmm|에이치엠엠|물류|로지스틱스|글로비스)", "운송"),
+    (r"(전력|가스|유틸리티|전기공사|한전|한국전력)", "전기가스"),
+    (r"(지주|홀딩스|holdings)", "지주회사"),
+    (r"(바이오|제약|pharma|bio|cell|트리온|셀트리온)", "바이오/제약"),
+    # ↓ 가장 마지막: 과대매칭 방지
+    (r"(기계|장비|중공업|로템|케미칼|화학)", "제조업"),
+)
+
+# 키워드 전체를 하나의 정규식으로 컴파일
+# 위치마다 전방탐색 (?=(p0)|(p1)|...)으로 그 위치에서 맞는 가장 앞선 패턴을 잡고,
+# 전체 위치 중 최소 패턴 번호를 취하면 패턴을 순서대로 re.search 한 결과와 같습니다.
+_NAME_SECTOR_REGEX = re.compile(
+    '(?=' + '|'.join(f"(?P<k{i}>{pattern})" for i, (pattern, _) in enumerate(NAME_SECTOR_KEYWORDS)) + ')',
+    re.IGNORECASE,
+)
+
+
+def parse_kospi_mst(data: bytes, encoding: str = MST_ENCODING) -> pd.DataFrame:
+    """
+    kospi_code.mst 내용 → DataFrame (임시 파일 없이 메모리에서 파싱)
+
+    각 줄의 뒤 227자는 고정폭 필드, 앞부분은 단축코드(9)/표준코드(12)/한글명입니다.
+    뒷부분은 pd.read_fwf로 읽어 기존 스크립트(kospi_master_download.py)와 같은
+    컬럼 타입을 유지합니다.
+
+    Args:
+        data: .mst 파일 바이트
+        encoding: 문자 인코딩
+
+    Returns:
+        단축코드/표준코드/한글명 + PART2_COLUMNS DataFrame (단축코드는 문자열)
+    """
+    part1, part2 = [], []
+    for line in data.decode(encoding, errors='replace').splitlines():
+        if len(line) <= PART2_LENGTH:
+            continue
+        head = line[:-PART2_LENGTH]
+        part1.append((head[0:9].rstrip(), head[9:21].rstrip(), head[21:].strip()))
+        part2.append(line[-PART2_LENGTH:])
+
+    df1 = pd.DataFrame(part1, columns=PART1_COLUMNS)
+    if not part2:
+        return pd.concat([df1, pd.DataFrame(columns=PART2_COLUMNS)], axis=1)
+    df2 = pd.read_fwf(io.StringIO('\n'.join(part2)), widths=PART2_WIDTHS,
+                      names=PART2_COLUMNS, header=None)
+    return pd.concat([df1, df2], axis=1)
+
+
+def _read_excel_master(path: Path) -> pd.DataFrame:
+    """kospi_code.xlsx 폴백 (단축코드 문자열 정규화)"""
+    df = pd.read_excel(path)
+    if '단축코드' in df.columns:
+        df['단축코드'] = (
+            df['단축코드'].astype(str).str.strip()
+            .str.replace(r'\.0$', '', regex=True)  # float로 읽힌 흔적 제거
+            .str.zfill(6)
+        )
+    return df
+
+
+def _flag(frame: pd.DataFrame, column: str) -> np.ndarray:
+    """KRX 플래그 컬럼 == 'Y' 마스크 (컬럼 없으면 전부 False)"""
+    if column not in frame.columns:
+        return np.zeros(len(frame), dtype=bool)
+    return frame[column].eq('Y').to_numpy()
+
+
+def classify_master_sectors(frame: pd.DataFrame) -> pd.Series:
+    """
+    마스터 전 종목 섹터 (컬럼 단위 1회 계산)
+
+    우선순위: KRX 섹터 플래그 → KOSPI200 섹터업종 코드 → 지수업종 대분류
+
+    Returns:
+        frame과 같은 인덱스의 섹터 Series (분류 불가는 NaN, 캐시 왕복 후에도 동일)
+    """
+    if frame.empty:
+        return pd.Series([], index=frame.index, dtype=object)
+
+    conditions = [np.logical_or.reduce([_flag(frame, f) for f in flags]) for flags, _ in KRX_FLAG_SECTORS]
+    choices = [sector for _, sector in KRX_FLAG_SECTORS]
+
+    if 'KOSPI200섹터업종' in frame.columns:
+        kospi200 = frame['KOSPI200섹터업종'].astype(str).str.strip().map(KOSPI200_SECTOR_MAP)
+        conditions.append(kospi200.notna().to_numpy())
+        choices.append(kospi200.to_numpy(dtype=object))
+    if '지수업종대분류' in frame.columns:
+        large = pd.to_numeric(frame['지수업종대분류'], errors='coerce').map(INDUSTRY_LARGE_MAP)
+        conditions.append(large.notna().to_numpy())
+        choices.append(large.to_numpy(dtype=object))
+
+    choices = [np.broadcast_to(np.asarray(c, dtype=object), len(frame)) for c in choices]
+    return pd.Series(np.select(conditions, choices, default=np.nan), index=frame.index).infer_objects()
+
+
+@lru_cache(maxsize=8192)
+def classify_sector_by_name(name: str) -> Optional[str]:
+    """
+    종목명 키워드 폴백 섹터 (정규식 1회 스캔, 결과 캐시)
+
+    '보통주'/'우선주'를 제거한 이름에 NAME_SECTOR_KEYWORDS를 우선순위대로 적용한 것과 같습니다.
+    """
+    if not name:
+        return None
+    name_clean = name.replace('보통주', '').replace('우선주', '').strip()
+    best = None
+    for match in _NAME_SECTOR_REGEX.finditer(name_clean):
+        index = int(match.lastgroup[1:])  # 바깥 그룹 k{i}가 마지막에 닫힘
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break
+    return NAME_SECTOR_KEYWORDS[best][1] if best is not None else None
+
+
+class KospiMaster:
+    """파싱된 마스터 + 공유 인덱스 (생성 후 읽기 전용)"""
+
+    def __init__(self, frame: pd.DataFrame, source: Optional[str] = None, digest: Optional[str] = None):
+        """
+        Args:
+            frame: 마스터 DataFrame (단축코드/한글명 컬럼)
+            source: 원본 파일 경로 (정보용)
+            digest: 원본 파일 해시 (정보용)
+        """
+        self.frame = frame
+        self.source = source
+        self.digest = digest
+
+        codes = frame['단축코드'].astype(str).str.strip() if '단축코드' in frame.columns else pd.Series(dtype=str)
+        names = frame['한글명'].astype(str).str.strip() if '한글명' in frame.columns else pd.Series(dtype=str)
+        valid = codes.str.len().eq(6) & codes.str.isdigit()
+
+        self.code_to_row: Mapping[str, int] = MappingProxyType(
+            {code: i for i, code in zip(frame.index[valid], codes[valid])}
+        )
+        self.code_to_name: Mapping[str, str] = MappingProxyType(dict(zip(codes[valid], names[valid])))
+        # 대문자 종목명 → 코드 (같은 이름은 뒤 행 우선, 기존 캐시와 동일)
+        self.name_to_code: Mapping[str, str] = MappingProxyType(
+            dict(zip(names.str.upper(), codes.str.zfill(6)))
+        )
+        sectors = frame[SECTOR_COLUMN] if SECTOR_COLUMN in frame.columns else classify_master_sectors(frame)
+        has_sector = valid & sectors.notna()
+        self.code_to_sector: Mapping[str, str] = MappingProxyType(dict(zip(codes[has_sector], sectors[has_sector])))
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    def dataframe(self) -> pd.DataFrame:
+        """수정 가능한 복사본 (공유 frame은 수정하지 말 것)"""
+        return self.frame.copy()
+
+    def row(self, code: str) -> Optional[pd.Series]:
+        """종목코드 → 마스터 행 (없으면 None)"""
+        i = self.code_to_row.get(str(code).strip().zfill(6))
+        return self.frame.loc[i] if i is not None else None
+
+
+def _file_digest(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+def _cache_paths(cache_dir: Path, stem: str, digest: str) -> Tuple[Path, Path]:
+    base = cache_dir / f"{stem}_{digest}"
+    return base.with_suffix('.feather'), base.with_suffix('.pkl')
+
+
+def _read_cache(cache_dir: Path, stem: str, digest: str) -> Optional[pd.DataFrame]:
+    feather, pickle = _cache_paths(cache_dir, stem, digest)
+    try:
+        if FEATHER_AVAILABLE and feather.exists():
+            return pd.read_feather(feather)
+        if pickle.exists():
+            return pd.read_pickle(pickle)
+    except Exception as e:
+        logger.warning(f"⚠️ 마스터 캐시 읽기 실패 (재파싱): {e}")
+    return None
+
+
+def _write_cache(frame: pd.DataFrame, cache_dir: Path, stem: str, digest: str):
+    feather, pickle = _cache_paths(cache_dir, stem, digest)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # 같은 원본의 이전 해시 캐시 정리
+        for old in cache_dir.glob(f"{stem}_*"):
+            if old not in (feather, pickle):
+                old.unlink(missing_ok=True)
+        if FEATHER_AVAILABLE:
+            try:
+                frame.reset_index(drop=True).to_feather(feather)
+                return
+            except Exception as e:
+                logger.debug(f"Feather 저장 실패, pickle 사용: {e}")
+        frame.to_pickle(pickle)
+    except Exception as e:
+        logger.warning(f"⚠️ 마스터 캐시 저장 실패 (무시): {e}")
+
+
+def load_kospi_master(path: Optional[str] = None, cache_dir: Optional[str] = CACHE_DIR) -> KospiMaster:
+    """
+    마스터 로드 (해시 캐시 우선, 없으면 파싱 후 캐시 저장)
+
+    Args:
+        path: 마스터 파일 경로 (None이면 MASTER_SOURCES 순서로 탐색)
+        cache_dir: 캐시 디렉토리 (None이면 캐시 미사용)
+
+    Returns:
+        KospiMaster (파일이 없으면 빈 마스터)
+    """
+    source = Path(path) if path else next((Path(p) for p in MASTER_SOURCES if Path(p).exists()), None)
+    if source is None or not source.exists():
+        logger.warning(f"⚠️ KOSPI 마스터 파일 없음: {path or ', '.join(MASTER_SOURCES)} "
+                       f"(python kospi_master_download.py 실행)")
+        return KospiMaster(pd.DataFrame(columns=PART1_COLUMNS))
+
+    digest = _file_digest(source)
+    stem = f"kospi_master_{source.suffix.lstrip('.')}_v{SECTOR_RULES_VERSION}"
+    frame = _read_cache(Path(cache_dir), stem, digest) if cache_dir else None
+    if frame is not None:
+        logger.debug(f"✅ KOSPI 마스터 캐시 사용: {source} ({len(frame)}개, {digest})")
+        return KospiMaster(frame, str(source), digest)
+
+    if source.suffix == '.mst':
+        frame = parse_kospi_mst(source.read_bytes())
+    else:
+        frame = _read_excel_master(source)
+    frame[SECTOR_COLUMN] = classify_master_sectors(frame)  # 캐시에 함께 저장
+    logger.info(f"✅ KOSPI 마스터 파싱: {source} ({len(frame)}개)")
+    if cache_dir:
+        _write_cache(frame, Path(cache_dir), stem, digest)
+    return KospiMaster(frame, str(source), digest)
+
+
+# ============================================
+# 프로세스 전역 인스턴스
+# ============================================
+_master: Optional[KospiMaster] = None
+_master_key: Optional[Tuple] = None
+_master_lock = threading.Lock()
+
+
+def _source_key(sources: Sequence[str]) -> Tuple:
+    """(경로, 수정시각, 크기) - 파일 교체 감지용"""
+    for p in sources:
+        try:
+            stat = os.stat(p)
+            return (p, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            continue
+    return ()
+
+
+def get_kospi_master(refresh: bool = False) -> KospiMaster:
+    """
+    프로세스 공유 마스터 (원본 파일이 바뀌면 자동 재로드)
+
+    Args:
+        refresh: True면 강제 재로드
+    """
+    global _master, _master_key
+    key = _source_key(MASTER_SOURCES)
+    master = _master
+    if master is not None and not refresh and key == _master_key:
+        return master
+    with _master_lock:
+        if _master is None or refresh or key != _master_key:
+            _master = load_kospi_master()
+            _master_key = key
+        return _master
@@ -4,6 +4,9 @@
 """
 
 import logging
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from rich.console import Console
@@ -13,12 +16,35 @@ from rich.panel import Panel
 logger = logging.getLogger(__name__)
 console = Console()
 
+# 시장 공통 상태(종목명 인덱스, 외국인 수급 이력) 재로드 간격 (초)
+MARKET_STATE_TTL = 1800.0
+
+# 외국인 수급 이력 유효 기간 (일) - 오프라인 피처 빌더 수집분
+FOREIGN_FLOW_MAX_AGE_DAYS = 7
+
 class MarketRiskAnalyzer:
     """시장 리스크 분석기"""
     
-    def __init__(self, kis_provider):
-        self.provider = kis_provider
-        self._kospi_index = None
+    def __init__(self, kis_provider, feature_db=None, state_ttl: float = MARKET_STATE_TTL):
+        """
+        Args:
+            kis_provider: KISDataProvider (종목 현재가 조회)
+                또는 weakref.ref(공급자) - 공유 서비스가 공급자 수명을 늘리지 않도록
+            feature_db: 외국인 수급 이력 DB (기본: 전역 DB 캐시, 최초 조회 시 연결)
+            state_ttl: 시장 공통 상태 재로드 간격 (초)
+        """
+        self._provider = kis_provider
+        self._feature_db = feature_db
+        self.state_ttl = state_ttl
+        self._state_lock = threading.Lock()
+        self._state_loaded_at = 0.0
+        self._kospi_index = None  # {종목코드: 종목명}
+        self._foreign_flows = None  # {종목코드: 외국인 수급 이력 행}
+    
+    @property
+    def provider(self):
+        provider = self._provider
+        return provider() if isinstance(provider, weakref.ref) else provider
     
     def _to_float(self, x, default=0.0):
         """안전한 float 변환"""
@@ -35,22 +61,61 @@ class MarketRiskAnalyzer:
         except Exception:
             return None
     
+    def _ensure_market_state(self):
+        """시장 공통 상태 로드 (TTL 만료 시에만 재로드, 종목별 분석은 공유 상태를 읽기만 함)"""
+        if self._kospi_index is not None and time.monotonic() - self._state_loaded_at < self.state_ttl:
+            return
+        with self._state_lock:
+            if self._kospi_index is not None and time.monotonic() - self._state_loaded_at < self.state_ttl:
+                return
+            self._kospi_index = self._load_name_index()
+            self._foreign_flows = self._load_foreign_flows()
+            self._state_loaded_at = time.monotonic()
+    
     def _ensure_kospi_index(self):
-        """KOSPI 인덱스 캐시 초기화 (한 번만)"""
-        if self._kospi_index is None:
-            try:
-                from enhanced_integrated_analyzer import EnhancedIntegratedAnalyzer
-                analyzer = EnhancedIntegratedAnalyzer()
-                self._kospi_index = getattr(analyzer, "_kospi_index", {}) or {}
-            except Exception:
-                self._kospi_index = {}
+        """KOSPI 종목명 인덱스 (시장 공통 상태)"""
+        self._ensure_market_state()
+    
+    def _load_name_index(self) -> Dict[str, str]:
+        """KOSPI 마스터 종목명 인덱스 (프로세스 공유 마스터 재사용)"""
+        try:
+            from kospi_master import get_kospi_master
+            return dict(get_kospi_master().code_to_name)
+        except Exception as e:
+            logger.debug(f"KOSPI 종목명 인덱스 로드 실패: {e}")
+            return {}
+    
+    def _load_foreign_flows(self) -> Dict[str, Dict[str, Any]]:
+        """시장 전체 외국인 수급 이력 (오프라인 피처 빌더 적재분, 1회 로드)"""
+        try:
+            if self._feature_db is None:
+                from db_cache_manager import get_db_cache
+                self._feature_db = get_db_cache()
+            flows = self._feature_db.get_foreign_flows(FOREIGN_FLOW_MAX_AGE_DAYS)
+            logger.debug(f"외국인 수급 이력 로드: {len(flows)}개 종목")
+            return flows
+        except Exception as e:
+            logger.warning(f"⚠️ 외국인 수급 이력 로드 실패 (중립 추세 사용): {e}")
+            return {}
+    
+    def invalidate_market_state(self):
+        """다음 분석 시 시장 공통 상태 재로드"""
+        with self._state_lock:
+            self._kospi_index = None
+            self._foreign_flows = None
+        
+    def analyze_stock_risk(self, symbol: str, price_info: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        개별 종목의 시장 리스크 분석
         
-    def analyze_stock_risk(self, symbol: str) -> Dict[str, Any]:
-        """개별 종목의 시장 리스크 분석"""
+        종목별 호출은 현재가 1회뿐이고 (price_info를 넘기면 0회),
+        종목명/외국인 추세는 공유 시장 상태에서 조회합니다.
+        """
         
         try:
-            # 현재가 정보 가져오기
-            price_info = self.provider.get_stock_price_info(symbol)
+            # 현재가 정보 가져오기 (이미 조회한 응답이 있으면 재사용)
+            if price_info is None:
+                price_info = self.provider.get_stock_price_info(symbol)
             
             if not price_info:
                 return self._create_default_risk_profile(symbol)
@@ -182,55 +247,37 @@ class MarketRiskAnalyzer:
         return max(0, min(10, risk_score))  # 0-10 범위로 제한
     
     def _analyze_foreign_trend(self, symbol: str, current_foreign_net_buy: float) -> Dict[str, Any]:
-        """외국인 투자자 동향 트렌드 분석"""
+        """외국인 투자자 동향 트렌드 분석 (최근 5거래일 이력은 공유 시장 상태에서 조회)"""
         try:
-            # 최근 5일간의 외국인 매매 데이터 분석
-            price_history = self.provider.get_daily_price_history(symbol, 5)
+            # 최근 활동 분석 (당일 순매수는 종목 현재가 응답 값)
+            if current_foreign_net_buy < -100000:
+                recent_activity = 'heavy_selling'
+            elif current_foreign_net_buy < -50000:
+                recent_activity = 'moderate_selling'
+            elif current_foreign_net_buy > 100000:
+                recent_activity = 'heavy_buying'
+            elif current_foreign_net_buy > 50000:
+                recent_activity = 'moderate_buying'
+            else:
+                recent_activity = 'neutral'
             
-            if price_history is None or price_history.empty:
+            self._ensure_market_state()
+            flow = (self._foreign_flows or {}).get(symbol)
+            if not flow or flow.get('foreign_sell_days') is None:
                 return {
                     'consecutive_selling_days': 0,
                     'consecutive_buying_days': 0,
                     'trend_strength': 'neutral',
-                    'recent_activity': 'unknown'
+                    'recent_activity': recent_activity
                 }
             
-            # 외국인 매매 데이터 추출 (컬럼명 확인 필요)
-            foreign_data = []
-            for _, row in price_history.iterrows():
-                # 외국인 매매 데이터 컬럼 찾기
-                foreign_col = None
-                for col in price_history.columns:
-                    if 'foreign' in col.lower() or '외국인' in col:
-                        foreign_col = col
-                        break
-                
-                if foreign_col and foreign_col in price_history.columns:
-                    try:
-                        foreign_data.append(float(row[foreign_col] or 0))
-                    except Exception:
-                        foreign_data.append(0.0)
-                else:
-                    foreign_data.append(0.0)
-            
-            # 연속 매도/매수 일수 계산
-            consecutive_selling = 0
-            consecutive_buying = 0
-            
-            for i in range(len(foreign_data) - 1, -1, -1):  # 최근부터 역순
-                if foreign_data[i] < -50000:  # 5만주 이상 매도
-                    consecutive_selling += 1
-                    consecutive_buying = 0
-                elif foreign_data[i] > 50000:  # 5만주 이상 매수
-                    consecutive_buying += 1
-                    consecutive_selling = 0
-                else:
-                    break
+            # 연속/누적 매도·매수 일수 (5만주 초과 기준, 피처 빌더에서 계산)
+            consecutive_selling = int(flow.get('foreign_sell_streak') or 0)
+            consecutive_buying = int(flow.get('foreign_buy_streak') or 0)
+            total_selling = int(flow.get('foreign_sell_days') or 0)
+            total_buying = int(flow.get('foreign_buy_days') or 0)
             
             # 트렌드 강도 분석
-            total_selling = sum(1 for x in foreign_data if x < -50000)
-            total_buying = sum(1 for x in foreign_data if x > 50000)
-            
             if total_selling >= 3:
                 trend_strength = 'strong_selling'
             elif total_selling >= 2:
@@ -242,25 +289,14 @@ class MarketRiskAnalyzer:
             else:
                 trend_strength = 'neutral'
             
-            # 최근 활동 분석
-            if current_foreign_net_buy < -100000:
-                recent_activity = 'heavy_selling'
-            elif current_foreign_net_buy < -50000:
-                recent_activity = 'moderate_selling'
-            elif current_foreign_net_buy > 100000:
-                recent_activity = 'heavy_buying'
-            elif current_foreign_net_buy > 50000:
-                recent_activity = 'moderate_buying'
-            else:
-                recent_activity = 'neutral'
-            
             return {
                 'consecutive_selling_days': consecutive_selling,
                 'consecutive_buying_days': consecutive_buying,
                 'trend_strength': trend_strength,
                 'recent_activity': recent_activity,
                 'total_selling_days': total_selling,
-                'total_buying_days': total_buying
+                'total_buying_days': total_buying,
+                'as_of_date': flow.get('as_of_date')
             }
             
         except Exception as e:
@@ -429,16 +465,9 @@ class MarketRiskAnalyzer:
         try:
             # KOSPI 마스터 데이터에서 종목명 찾기 (캐시된 인덱스 사용)
             self._ensure_kospi_index()
-            if symbol in self._kospi_index:
-                stock_info = self._kospi_index[symbol]
-                # Pandas 객체에서 한글명 가져오기
-                if hasattr(stock_info, '한글명'):
-                    return stock_info.한글명
-                elif hasattr(stock_info, '__getattr__'):
-                    try:
-                        return getattr(stock_info, '한글명', '')
-                    except:
-                        pass
+            name = (self._kospi_index or {}).get(symbol)
+            if name:
+                return name
             
             # 하드코딩된 주요 종목명 (백업)
             stock_names = {
@@ -975,3 +1004,23 @@ class MarketRiskAnalyzer:
 def create_market_risk_analyzer(kis_provider):
     """시장 리스크 분석기 생성"""
     return MarketRiskAnalyzer(kis_provider)
+
+
+_services: 'weakref.WeakKeyDictionary' = weakref.WeakKeyDictionary()
+_services_lock = threading.Lock()
+
+
+def get_market_risk_service(kis_provider) -> MarketRiskAnalyzer:
+    """
+    공급자별 공유 리스크 분석 서비스 (시장 공통 상태를 세션 동안 재사용)
+    
+    종목마다 create_market_risk_analyzer()를 부르면 종목명 인덱스/외국인 수급 이력을
+    매번 다시 만들지만, 이 서비스는 TTL(MARKET_STATE_TTL) 동안 한 벌만 유지합니다.
+    서비스는 공급자를 약한 참조로만 들고 있어 공급자가 사라지면 항목도 함께 정리됩니다.
+    """
+    with _services_lock:
+        service = _services.get(kis_provider)
+        if service is None:
+            service = MarketRiskAnalyzer(weakref.ref(kis_provider))
+            _services[kis_provider] = service
+        return service
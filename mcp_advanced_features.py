@@ -22,6 +22,8 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from kis_rate_limiter import KISGlobalRateLimiter, lane_for_path
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -122,6 +124,7 @@ class MCPAdvancedAnalyzer:
             url = f"{self.oauth_manager.base_url}/uapi/domestic-stock/v1/{endpoint}"
             headers = self._get_auth_headers()
             
+            KISGlobalRateLimiter.rate_limit(lane=lane_for_path(endpoint))  # ✅ 전역/프로세스 간 공유 계정 쿼터
             response = self.session.get(url, headers=headers, params=params, timeout=10)
             
             if response.status_code == 200:
@@ -0,0 +1,476 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+MCP KIS API 비동기 클라이언트
+회로차단기, 연속 500 처리, tr_cont 페이징, TTL 캐시를 갖춘 요청 구현으로
+N개 요청을 동시에 진행시키는 asyncio 클라이언트 (동기 _send_request도 이 구현 사용)
+
+- 상태(캐시/회로차단기/500 카운터/토큰)는 MCPKISIntegration 인스턴스와 공유
+- 전송은 aiohttp 우선, 미설치 시 requests를 스레드에서 실행 (동일 의미 유지)
+- 속도 제어는 전역 KISGlobalRateLimiter 레인 예약 (await로 대기, 스레드 점유 없음)
+
+Example:
+    mcp = MCPKISIntegration(oauth)
+    prices = mcp.get_current_prices(['005930', '000660'])      # 동기 래퍼
+    prices = await mcp.async_client.get_current_prices([...])  # 비동기
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from kis_rate_limiter import KISGlobalRateLimiter, lane_for_path
+
+try:
+    import aiohttp
+    HAS_AIOHTTP = True
+except ImportError:
+    aiohttp = None
+    HAS_AIOHTTP = False
+
+logger = logging.getLogger(__name__)
+
+# ✅ 기본 동시 진행 요청 수 (실제 속도는 전역 Rate Limiter가 결정)
+DEFAULT_MAX_IN_FLIGHT = 8
+
+# ✅ 재시도 대상 일시적 HTTP 오류 (mcp_kis_integration.TRANSIENT_HTTP_STATUS와 동일)
+_TRANSIENT_HTTP_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# ✅ 현재 태스크 트리의 세션 스코프 (gather로 생성된 하위 태스크에 자동 전파)
+_SCOPE: contextvars.ContextVar[Optional[Dict]] = contextvars.ContextVar('kis_async_scope', default=None)
+
+
+class _HTTPStatusError(Exception):
+    """비동기 전송 계층의 HTTP 오류 (상태 코드 + 응답 헤더)"""
+
+    def __init__(self, status: int, headers: Dict[str, str]):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+        self.headers = headers
+
+
+def run_coroutine_sync(coro: Awaitable) -> Any:
+    """
+    동기 코드에서 코루틴 실행
+
+    이미 이벤트 루프가 돌고 있는 스레드(Streamlit/Jupyter 등)에서는
+    별도 스레드에서 새 루프로 실행합니다.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    result: Dict[str, Any] = {}
+
+    def _runner():
+        try:
+            result['value'] = asyncio.run(coro)
+        except BaseException as e:  # 호출 스레드로 전달
+            result['error'] = e
+
+    thread = threading.Thread(target=_runner, name="kis-async-runner", daemon=True)
+    thread.start()
+    thread.join()
+    if 'error' in result:
+        raise result['error']
+    return result.get('value')
+
+
+class AsyncKISClient:
+    """MCPKISIntegration 상태를 공유하는 asyncio KIS 클라이언트"""
+
+    def __init__(self, mcp, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        """
+        Args:
+            mcp: MCPKISIntegration 인스턴스 (캐시/회로차단기/토큰 공유)
+            max_in_flight: 동시에 진행할 최대 요청 수
+        """
+        self.mcp = mcp
+        self.max_in_flight = max(1, int(max_in_flight))
+        self._local = threading.local()  # requests 폴백용 스레드별 세션
+
+    # === 세션/전송 ===
+
+    @asynccontextmanager
+    async def _session_scope(self, blocking: bool = False):
+        """
+        요청 묶음 동안 사용할 전송 세션 + 동시성 세마포어 (중첩 호출 시 바깥 스코프 재사용)
+
+        Args:
+            blocking: True면 MCPKISIntegration 공유 requests 세션으로 바로 전송
+                      (동기 래퍼 전용 루프, 호출 간 연결 재사용)
+        """
+        state = _SCOPE.get()
+        if state is not None and state['client'] is self:
+            yield state
+            return
+
+        session = None
+        if HAS_AIOHTTP and not blocking:
+            timeout = self.mcp.timeout
+            connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+            session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+                connector=aiohttp.TCPConnector(limit=self.max_in_flight),
+                headers={'User-Agent': 'KIS-API-Client/1.0'}
+            )
+        state = {
+            'client': self,
+            'session': session,
+            'semaphore': asyncio.Semaphore(self.max_in_flight),
+            'recovery_lock': asyncio.Lock(),
+            'blocking': blocking,
+        }
+        token = _SCOPE.set(state)
+        try:
+            yield state
+        finally:
+            _SCOPE.reset(token)
+            if session is not None:
+                await session.close()
+
+    def _thread_session(self) -> requests.Session:
+        """requests 폴백용 스레드별 세션 (requests.Session은 스레드 세이프 아님)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self.mcp._init_session()
+            self._local.session = session
+        return session
+
+    async def _http_get(self, state: Dict, url: str, headers: Dict, params: Dict) -> Tuple[Any, Dict[str, str], str]:
+        """
+        GET 요청 전송
+
+        Returns:
+            (파싱된 JSON 또는 None, 응답 헤더, 본문 일부)
+
+        Raises:
+            _HTTPStatusError: 4xx/5xx 응답
+            ConnectionError / asyncio.TimeoutError: 연결/타임아웃 오류
+        """
+        session = state['session']
+        if session is not None:
+            async with session.get(url, headers=headers, params=params) as resp:
+                resp_headers = {k: v for k, v in resp.headers.items()}
+                if resp.status >= 400:
+                    raise _HTTPStatusError(resp.status, resp_headers)
+                text = await resp.text()
+        else:
+            def _get():
+                return self._thread_session().get(url, headers=headers, params=params, timeout=self.mcp.timeout)
+            try:
+                if state['blocking']:
+                    resp = self.mcp._session_get(url, headers, params)
+                else:
+                    resp = await asyncio.to_thread(_get)
+            except requests.exceptions.Timeout as e:
+                raise asyncio.TimeoutError(str(e))
+            except requests.exceptions.ConnectionError as e:
+                raise ConnectionError(str(e))
+            resp_headers = dict(resp.headers)
+            if resp.status_code >= 400:
+                raise _HTTPStatusError(resp.status_code, resp_headers)
+            text = resp.text
+
+        try:
+            return json.loads(text), resp_headers, text[:200]
+        except ValueError:
+            return None, resp_headers, text[:200]
+
+    async def _rate_limit(self, path: str):
+        """전역 Rate Limiter 레인 예약 후 await로 대기 (스레드 점유 없음)"""
+        cost = KISGlobalRateLimiter.cost_for_interval(self.mcp._current_interval())
+        lane = lane_for_path(path)
+        while True:
+            wait = KISGlobalRateLimiter.reserve(lane, cost)
+            if wait is None:
+                await asyncio.sleep(KISGlobalRateLimiter.get_interval())
+                continue
+            if wait > 0:
+                await asyncio.sleep(wait)
+            return
+
+    # === 요청 (MCPKISIntegration._send_request의 단일 구현) ===
+
+    def send_request_sync(self, path: str, tr_id: str, params: dict, max_retries: int = 2) -> Optional[dict]:
+        """
+        send_request 동기 실행 (MCPKISIntegration._send_request가 사용)
+
+        전용 루프에서 blocking 스코프로 실행하므로 공유 requests 세션을 재사용합니다.
+        """
+        async def _run():
+            async with self._session_scope(blocking=True):
+                return await self.send_request(path, tr_id, params, max_retries=max_retries)
+
+        return run_coroutine_sync(_run())
+
+    async def send_request(self, path: str, tr_id: str, params: dict, max_retries: int = 2,
+                           _total_attempts: int = 0) -> Optional[dict]:
+        """
+        중앙 집중화된 비동기 API GET 요청 (재시도 로직 + 회로차단기 + 쿨다운)
+
+        동기 MCPKISIntegration._send_request도 이 구현을 send_request_sync로 실행합니다.
+        """
+        mcp = self.mcp
+        async with self._session_scope() as state:
+            max_total_attempts = max_retries + 3
+            if _total_attempts > max_total_attempts:
+                logger.error(f"❌ 최대 시도 횟수 초과 ({_total_attempts}회) → 중단")
+                return None
+
+            # ✅ 회로차단기: 엔드포인트별 실패 카운터 + 쿨다운 복구
+            if not mcp._circuit_allows(path):
+                return None
+
+            # ✅ 연속 500 오류: 한 코루틴만 30초 대기하고 나머지는 그 결과를 기다림
+            if mcp.consecutive_500_errors >= mcp.max_consecutive_500_errors:
+                async with state['recovery_lock']:
+                    if mcp.consecutive_500_errors >= mcp.max_consecutive_500_errors:
+                        logger.error(f"❌ 연속 500 오류 {mcp.consecutive_500_errors}회 초과 - AppKey 차단 의심 (EGW00201)")
+                        logger.error("⏸️  30초 대기 후 재시도 (일반적으로 5~10분 내 자동 해제)")
+                        logger.error("💡 지속 시: 프로그램 중단 → 5~10분 대기 → 재실행 권장")
+                        await asyncio.sleep(30)
+                        recreated = mcp._recreate_session()
+                        mcp.consecutive_500_errors = 0
+                        if not recreated:
+                            return None
+                return await self.send_request(path, tr_id, params, max_retries=1,
+                                               _total_attempts=_total_attempts + 1)
+
+            for attempt in range(max_retries + 1):
+                try:
+                    async with state['semaphore']:
+                        await self._rate_limit(path)
+
+                        token = mcp._load_cached_token()
+                        if not token:
+                            # 발급은 동기 OAuth 매니저 사용 (드묾 → 스레드에서 실행)
+                            token = await asyncio.to_thread(mcp._acquire_token)
+                        if not token:
+                            return None
+
+                        data, headers, snippet = await self._http_get(
+                            state, f"{mcp.base_url}{path}", mcp._request_headers(token, tr_id), params
+                        )
+
+                    if data is None:
+                        logger.error(
+                            f"❌ JSON 파싱 실패 ({tr_id}). "
+                            f"Content-Type={headers.get('Content-Type', '')}, 응답 일부: {snippet}"
+                        )
+                        return None
+
+                    return mcp._finalize_response(data, tr_id, path, params, headers.get('tr_cont', ''))
+
+                except _HTTPStatusError as e:
+                    status = e.status
+
+                    # ✅ 401 Unauthorized: 토큰 캐시 파기 후 재발급 시도
+                    if status == 401:
+                        logger.warning("🔐 401 Unauthorized: 토큰 캐시 파기 후 1회 재발급 시도")
+                        mcp._token_cache.invalidate()
+                        if attempt < max_retries:
+                            await asyncio.sleep(0.5 * (2 ** attempt))
+                            continue
+                        logger.error("❌ 401 복구 실패 (최대 재시도 초과)")
+                        return None
+
+                    if status in _TRANSIENT_HTTP_STATUS:
+                        if status == 500:
+                            mcp._note_500_error()
+                        if attempt < max_retries:
+                            backoff = mcp._retry_backoff(status, attempt, e.headers.get("Retry-After"))
+                            logger.warning(
+                                f"⚠️ 일시적 오류 {status} → {backoff:.1f}s 후 재시도 "
+                                f"({attempt + 1}/{max_retries}) tr_id={tr_id}"
+                            )
+                            # ✅ 스케줄된 백오프 (세마포어 반납 후 대기 → 다른 요청 진행)
+                            await asyncio.sleep(backoff)
+                            continue
+                        logger.error(f"❌ 최대 재시도 초과 {status} tr_id={tr_id}")
+                        return None
+
+                    # ✅ 비과도성 4xx도 회로차단기 카운트 증가 (403/404/422 등)
+                    mcp._record_failure(path)
+                    logger.error(f"❌ 고정 오류 HTTP {status} tr_id={tr_id}")
+                    return None
+
+                except (ConnectionError, asyncio.TimeoutError) as e:
+                    kind = "타임아웃" if isinstance(e, asyncio.TimeoutError) else "연결 오류"
+                    if attempt < max_retries:
+                        backoff = 0.3 * (2 ** attempt)
+                        logger.debug(f"🔄 {kind} 재시도 {attempt + 1}/{max_retries}, {backoff:.1f}s")
+                        await asyncio.sleep(backoff)
+                        continue
+                    mcp._record_failure(path)
+                    logger.error(f"❌ {kind} tr_id={tr_id}")
+                    return None
+
+                except Exception as e:
+                    if HAS_AIOHTTP and isinstance(e, aiohttp.ClientError):
+                        if attempt < max_retries:
+                            await asyncio.sleep(0.3 * (2 ** attempt))
+                            continue
+                    mcp._record_failure(path)
+                    logger.error(f"❌ 예외 tr_id={tr_id}: {e}")
+                    return None
+
+            return None
+
+    async def make_api_call(self, endpoint: str, params: Dict = None, tr_id: str = "",
+                            use_cache: bool = True) -> Optional[Dict]:
+        """API 호출 래퍼 (MCPKISIntegration 캐시 공유, 엔드포인트별 차등 TTL)"""
+        mcp = self.mcp
+        endpoint = mcp._normalize_endpoint(endpoint)
+        original_params = params or {}
+        cache_key = mcp._cache_key(endpoint, tr_id, original_params)
+        ttl = mcp._cache_ttl_for(endpoint)
+
+        if use_cache:
+            cached = mcp._cache_get(cache_key, ttl, endpoint)
+            if cached is not None:
+                return cached
+
+        data = await self.send_request(f"/uapi/domestic-stock/v1/{endpoint}", tr_id, original_params)
+
+        if data and use_cache:
+            mcp._cache_put(cache_key, data, ttl, endpoint)
+        return data
+
+    async def fetch_all_pages(self, endpoint: str, base_params: Dict, tr_id: str,
+                              ctx_keys: Optional[Dict[str, str]] = None,
+                              max_pages: int = 10, use_cache: bool = True,
+                              min_batch_size: Optional[int] = None) -> List[Dict]:
+        """페이지네이션 지원 API 호출 (tr_cont / CTX 토큰, 페이지는 순차 요청)"""
+        mcp = self.mcp
+        all_rows: List[Dict] = []
+        ctx_token = ""
+        ctx_in_key = (ctx_keys or {}).get("in", "")
+        ctx_out_key = (ctx_keys or {}).get("out", "")
+
+        try:
+            for page_num in range(max_pages):
+                params = dict(base_params)
+                if ctx_token and ctx_in_key:
+                    params[ctx_in_key] = ctx_token
+
+                data = await self.make_api_call(endpoint, params, tr_id, use_cache)
+                if not data:
+                    logger.debug(f"📄 페이지 {page_num + 1}: API 응답 없음")
+                    break
+
+                page_data = mcp._page_rows(data)
+                if not page_data:
+                    logger.debug(f"📄 페이지 {page_num + 1}: 데이터 없음")
+                    break
+                all_rows.extend(page_data)
+
+                has_next, ctx_token = mcp._next_page(data, ctx_out_key, ctx_token)
+                if not has_next:
+                    break
+                if min_batch_size and len(page_data) < min_batch_size:
+                    break
+            return all_rows
+        except Exception as e:
+            logger.error(f"❌ 페이지네이션 실패: {e}")
+            return []
+
+    # === 단건 조회 (동기 API와 동일한 반환 형식) ===
+
+    async def get_current_price(self, symbol: str, market_type: str = "J") -> Optional[Dict]:
+        """주식현재가 시세 조회"""
+        try:
+            market_type = self.mcp._validate_market(market_type)
+            data = await self.make_api_call(
+                endpoint="quotations/inquire-price",
+                params={"FID_COND_MRKT_DIV_CODE": market_type, "FID_INPUT_ISCD": symbol},
+                tr_id="FHKST01010100"
+            )
+            return self.mcp._first_output(data)
+        except Exception as e:
+            logger.error(f"현재가 조회 실패: {symbol}, {e}")
+            return None
+
+    async def get_financial_ratio(self, symbol: str) -> Optional[Dict]:
+        """국내주식 재무비율 조회 (PER, PBR, ROE 등)"""
+        try:
+            data = await self.make_api_call(
+                endpoint="finance/financial-ratio",
+                params=self.mcp._financial_ratio_params(symbol),
+                tr_id="FHKST66430300"
+            )
+            return self.mcp._latest_output(data)
+        except Exception as e:
+            logger.error(f"재무비율 조회 실패: {symbol}, {e}")
+            return None
+
+    async def get_chart_data(self, symbol: str, period: str = "D", days: int = 365,
+                             use_pagination: bool = True, market_type: str = "J") -> Optional[List[Dict]]:
+        """차트 데이터 조회 (일/주/월봉, 페이지네이션 지원)"""
+        try:
+            base_params = self.mcp._chart_params(symbol, period, days, market_type)
+            if use_pagination:
+                rows = await self.fetch_all_pages(
+                    endpoint="quotations/inquire-daily-itemchartprice",
+                    base_params=base_params,
+                    tr_id="FHKST03010100",
+                    max_pages=20
+                )
+                return rows or None
+            data = await self.make_api_call(
+                endpoint="quotations/inquire-daily-itemchartprice",
+                params=base_params,
+                tr_id="FHKST03010100"
+            )
+            if not data:
+                return None
+            return data.get('output2') or data.get('output') or data.get('output1')
+        except Exception as e:
+            logger.error(f"차트 데이터 조회 실패: {symbol}, {e}")
+            return None
+
+    # === 대량 조회 (N개 요청 동시 진행, 속도는 전역 Rate Limiter) ===
+
+    async def _gather_map(self, symbols: List[str], fetch: Callable[[str], Awaitable[Any]]) -> Dict[str, Any]:
+        """종목별 코루틴을 동시에 실행하고 {종목코드: 결과} 반환 (실패/빈 결과 제외)"""
+        uniq = list(dict.fromkeys(
+            s for s in (str(x).strip().zfill(6) for x in symbols if x) if s.isdigit() and len(s) == 6
+        ))
+        if not uniq:
+            return {}
+
+        async with self._session_scope():
+            results = await asyncio.gather(*(fetch(s) for s in uniq), return_exceptions=True)
+
+        out: Dict[str, Any] = {}
+        for symbol, result in zip(uniq, results):
+            if isinstance(result, BaseException):
+                logger.debug(f"대량 조회 실패 {symbol}: {result}")
+                continue
+            if result:
+                out[symbol] = result
+        return out
+
+    async def get_current_prices(self, symbols: List[str], market_type: str = "J") -> Dict[str, Dict]:
+        """여러 종목 현재가 동시 조회 → {종목코드: 시세데이터}"""
+        price_map = await self._gather_map(symbols, lambda s: self.get_current_price(s, market_type))
+        logger.info(f"✅ 비동기 현재가 조회 완료: {len(price_map)}/{len(symbols)}개")
+        return price_map
+
+    async def get_financial_ratios_many(self, symbols: List[str]) -> Dict[str, Dict]:
+        """여러 종목 재무비율 동시 조회 → {종목코드: 재무비율}"""
+        return await self._gather_map(symbols, self.get_financial_ratio)
+
+    async def get_chart_data_many(self, symbols: List[str], period: str = "D", days: int = 365,
+                                  use_pagination: bool = True, market_type: str = "J") -> Dict[str, List[Dict]]:
+        """여러 종목 차트 동시 조회 → {종목코드: 차트 행 목록}"""
+        return await self._gather_map(
+            symbols, lambda s: self.get_chart_data(s, period, days, use_pagination, market_type)
+        )
@@ -17,7 +17,9 @@ from pathlib import Path
 from typing import Any, Dict, Optional, List, Callable, Tuple
 
 import requests
-from kis_rate_limiter import KISGlobalRateLimiter  # ✅ 전역 Rate Limiter
+from kis_rate_limiter import KISGlobalRateLimiter, lane_for_path  # ✅ 전역 Rate Limiter (레인별 보장 몫)
+from kis_token_cache import TokenCache  # ✅ 프로세스 전역 토큰 캐시
+from kis_response_cache import ResponseCache, DEFAULT_CACHE_PATH as RESPONSE_CACHE_PATH  # ✅ 영구 응답 캐시 (2차)
 
 logger = logging.getLogger(__name__)
 
@@ -91,6 +93,9 @@ ETF_KEYWORDS = (
     # 주의: INDEX, TRUST, FUTURE는 일반 종목명에도 포함될 수 있어 제외
 )
 
+# ✅ 재시도 대상 일시적 HTTP 오류
+TRANSIENT_HTTP_STATUS = frozenset({429, 500, 502, 503, 504})
+
 # ✅ 허용된 시장 구분
 _ALLOWED_MARKETS = {"J", "Q", "NX", "UN"}
 
@@ -110,8 +115,8 @@ class MCPKISIntegration:
     MOM_LOOKBACK_D = 60  # 60D (3M) 또는 100D (5M) 중 택1
     MOM_LABEL = f"{int(MOM_LOOKBACK_D/20)}M({MOM_LOOKBACK_D}D)"  # 자동 라벨
     
-    # ✅ 종목명→코드 캐시 (클래스 레벨, 프로세스 생명주기 동안 유지)
-    _name_code_cache: Optional[Dict[str, str]] = None
+    # ✅ 종목명→코드 검색 인덱스 (클래스 레벨, 프로세스 생명주기 동안 유지)
+    _name_index = None  # name_index.NameIndex (대문자 종목명 → 종목코드)
     _cache_lock_static = threading.Lock()
     
     # ✅ 토큰 캐시 파일 경로 (환경변수 지원 + 플랫폼별 기본값)
@@ -169,11 +174,14 @@ class MCPKISIntegration:
         })
         return session
     
-    def __init__(self, oauth_manager, request_interval: float = 0.5, timeout: tuple = (10, 30), backoff_cap: float = 30.0):
+    def __init__(self, oauth_manager, request_interval: Optional[float] = None, timeout: tuple = (10, 30), backoff_cap: float = 30.0,
+                 response_cache_path: Optional[str] = RESPONSE_CACHE_PATH):
         """
         Args:
-            request_interval: API 호출 간격 (기본 0.5초 = 2건/초, 안전 마진 90%)
+            request_interval: API 호출 간격 (None이면 전역 Rate Limiter의 계정 TPS 쿼터 사용,
+                지정 시 쿼터보다 느린 경우에만 추가로 감속)
             backoff_cap: 백오프 최대 시간 (기본 30초, 혼잡 시 과도한 재시도 방지)
+            response_cache_path: 영구 응답 캐시(SQLite) 경로 (None이면 메모리 캐시만 사용)
         
         Note:
             공식 유량 제한:
@@ -201,6 +209,8 @@ class MCPKISIntegration:
             "appkey": appkey,
             "appsecret": appsecret,
         }
+        # ✅ 같은 AppKey 프로세스끼리 공유 쿼터 (kis_quota_<키>.bin)
+        KISGlobalRateLimiter.set_app_key(appkey)
         
         # ✅ 세션 초기화 (공통 메서드 사용)
         self.session = self._init_session()
@@ -208,14 +218,14 @@ class MCPKISIntegration:
         # ✅ 멀티스레드 안전성을 위한 Lock
         self._lock = threading.Lock()
         self._cache_lock = threading.Lock()
-        self._token_lock = threading.Lock()  # 토큰 캐시 파일 I/O 보호
+        self._token_cache = TokenCache.for_path(self.TOKEN_CACHE_FILE)  # ✅ 프로세스 전역 메모리 토큰 캐시
         self._session_lock = threading.Lock()  # 세션 요청 보호 (requests.Session은 스레드 세이프 아님)
         
         # Rate limiting 설정 (인자화 + 적응형)
         # KIS API 공식 제한: 실전 20건/초, 모의 2건/초
         # ⚠️ 차단 방지: 0.5초 간격(2건/초, 90% 마진) - 장기 운영 안전값
         self.last_request_time = 0
-        self.request_interval = request_interval  # 환경별 조절 가능
+        self.request_interval = request_interval  # 환경별 조절 가능 (None = 전역 쿼터)
         self.timeout = timeout  # (connect, read) 타임아웃
         self.backoff_cap = backoff_cap  # 백오프 최대 시간 (초)
         self.consecutive_500_errors = 0
@@ -248,6 +258,10 @@ class MCPKISIntegration:
         # 캐시 설정 (엔드포인트별 차등 TTL + 진짜 LRU)
         self.cache: OrderedDict[str, Tuple[dict, float]] = OrderedDict()  # (데이터, 타임스탬프)
         self.cache_maxsize = 2000  # 캐시 무한증가 방지
+        # ✅ 2차 영구 캐시 (프로세스/실행 간 공유, TTL 긴 엔드포인트만 저장)
+        self.response_cache: Optional[ResponseCache] = (
+            ResponseCache.for_path(response_cache_path) if response_cache_path else None
+        )
         self.cache_ttl = {
             'default': 60,       # 기본 1분
             'quotations': 10,    # 현재가 10초 (실시간성)
@@ -925,77 +939,10 @@ class MCPKISIntegration:
         
         # 2. ✅ 마스터파일 섹터 조회 (KIS 권장, 최우선!)
         if not MCPKISIntegration._master_sector_cache:
-            # 최초 1회만 로드
+            # 최초 1회만 로드 (kospi_master 공유 인덱스, 파싱 결과는 해시 캐시)
             try:
-                import pandas as pd
-                df = pd.read_excel('kospi_code.xlsx')
-                
-                # ✅ KOSPI200 섹터업종 코드 → 섹터명 매핑 (KIS 공식)
-                kospi200_sector_map = {
-                    '1': '건설',
-                    '2': '운송장비',  # 조선
-                    '5': '전기전자',  # IT
-                    '6': '금융',
-                    '7': '제조업',  # 음식료
-                    '9': '제조업',  # 산업재
-                    'A': '바이오/제약',
-                    'B': 'IT',  # 게임/미디어
-                }
-                
-                # ✅ 지수업종 대분류 코드 → 섹터명 매핑
-                industry_large_map = {
-                    16: '제조업',  # 섬유의복
-                    19: '유통',
-                    21: '지주회사',
-                    26: '건설',
-                    27: '제조업',  # 전기전자/기계
-                    29: 'IT',  # 서비스업
-                    30: 'IT',  # 오락문화
-                }
-                
-                for _, row in df.iterrows():
-                    code = str(row.get('단축코드', '')).strip()
-                    if not code or len(code) != 6 or not code.isdigit():
-                        continue
-                    
-                    sector = None
-                    
-                    # ✅ 1순위: KRX 섹터 플래그 (가장 정확!)
-                    if row.get('KRX은행') == 'Y' or row.get('KRX증권') == 'Y' or row.get('KRX섹터_보험') == 'Y':
-                        sector = '금융'
-                    elif row.get('KRX자동차') == 'Y':
-                        sector = '운송장비'
-                    elif row.get('KRX반도체') == 'Y':
-                        sector = '전기전자'
-                    elif row.get('KRX미디어통신') == 'Y':
-                        sector = '통신'
-                    elif row.get('KRX섹터_운송') == 'Y' or row.get('KRX선박') == 'Y':
-                        sector = '운송'
-                    elif row.get('KRX바이오') == 'Y':
-                        sector = '바이오/제약'
-                    elif row.get('KRX에너지화학') == 'Y':
-                        sector = '제조업'
-                    elif row.get('KRX철강') == 'Y':
-                        sector = '제조업'
-                    elif row.get('KRX건설') == 'Y':
-                        sector = '건설'
-                    
-                    # ✅ 2순위: KOSPI200 섹터업종 코드
-                    if not sector:
-                        kospi200_code = str(row.get('KOSPI200섹터업종', '')).strip()
-                        if kospi200_code and kospi200_code != '0':
-                            sector = kospi200_sector_map.get(kospi200_code)
-                    
-                    # ✅ 3순위: 지수업종 대분류
-                    if not sector:
-                        large_code = row.get('지수업종대분류')
-                        if large_code and large_code != 0:
-                            sector = industry_large_map.get(large_code)
-                    
-                    # 캐시에 저장
-                    if sector:
-                        MCPKISIntegration._master_sector_cache[code] = sector
-                
+                from kospi_master import get_kospi_master
+                MCPKISIntegration._master_sector_cache = get_kospi_master().code_to_sector
                 logger.info(f"✅ 마스터파일 섹터 캐시 로드: {len(MCPKISIntegration._master_sector_cache)}개")
             except Exception as e:
                 logger.warning(f"⚠️ 마스터파일 섹터 로드 실패: {e}")
@@ -1019,36 +966,12 @@ class MCPKISIntegration:
         # 3. ✅ 종목명 기반 폴백 (ChatGPT 권장 - 섹터 API 실패 대응)
         # ✅ "제조업"도 폴백 대상에 포함 (과대매칭 보정)
         if (not sector or sector.strip() == "" or sector.strip() == "제조업") and stock_name:
-            # ✅ "보통주" 제거 후 매칭
-            import re
-            name_clean = stock_name.replace('보통주', '').replace('우선주', '').strip()
-            
-            # ✅ 정규식 기반 키워드 매칭 (우선순위 순서, ChatGPT 권장)
-            NAME_KEYWORDS = [
-                (r"(금융지주|은행|생명보험|손해보험|손보|생보|증권|카드|캐피탈|저축은행|자산운용)", "금융"),
-                # ✅ 통신 (KT&G 제외)
-                (r"(?:^| )(kt|케이티|sk텔레콤|lg유플러스)(?:$| )(?!.*앤지)(?!.*&g)", "통신"),
-                # ✅ 담배/식품 (우선 처리)
-                (r"(케이티앤지|kt&g|담배|필수소비재)", "필수소비재"),
-                # ✅ 방산/항공우주
-                (r"(항공우주|korea aerospace|kai|방산|미사일|레이다)", "제조업"),
-                # 2차전지
-                (r"(에너지솔루션|배터리|2차전지)", "전기전자"),
-                (r"(반도체|하이닉스|sdi|전자|디스플레이)", "전기전자"),
-                (r"(자동차|현대차|기아|모비스|운송장비|부품)", "운송장비"),
-                (r"(항공|대한항공|아시아나|해운|hmm|에이치엠엠|물류|로지스틱스|글로비스)", "운송"),
-                (r"(전력|가스|유틸리티|전기공사|한전|한국전력)", "전기가스"),
-                (r"(지주|홀딩스|holdings)", "지주회사"),
-                (r"(바이오|제약|pharma|bio|cell|트리온|셀트리온)", "바이오/제약"),
-                # ↓ 가장 마지막: 과대매칭 방지 (ChatGPT 권장)
-                (r"(기계|장비|중공업|로템|케미칼|화학)", "제조업"),
-            ]
-            
-            for pattern, sec in NAME_KEYWORDS:
-                if re.search(pattern, name_clean, re.IGNORECASE):
-                    sector = sec
-                    logger.info(f"✅ 종목명 폴백: {symbol} {name_clean} → {sec}")
-                    break
+            # ✅ 정규식 기반 키워드 매칭 (우선순위 순서, 미리 컴파일된 단일 정규식 + 이름별 캐시)
+            from kospi_master import classify_sector_by_name
+            name_sector = classify_sector_by_name(stock_name)
+            if name_sector:
+                sector = name_sector
+                logger.debug(f"✅ 종목명 폴백: {symbol} {stock_name} → {name_sector}")
         
         # 4. 표준화
         result = self._normalize_sector(sector) if sector else "기타"
@@ -1110,7 +1033,7 @@ class MCPKISIntegration:
     
     def search_stock_by_name(self, name: str) -> Optional[str]:
         """
-        종목명으로 종목코드 검색 (메모리 캐시 + 디스크 I/O 최소화)
+        종목명으로 종목코드 검색 (메모리 인덱스 + 디스크 I/O 최소화)
         
         Args:
             name: 종목명 (부분 일치 가능)
@@ -1119,9 +1042,8 @@ class MCPKISIntegration:
             종목코드 (6자리) 또는 None
             
         Note:
-            1. 메모리 캐시 우선 (프로세스 생명주기 동안 유지)
-            2. KOSPI 마스터 파일 (첫 호출 시만 로드)
-            3. 시가총액 API (폴백)
+            1. 종목명 인덱스 우선 (KOSPI 마스터로 첫 호출 시만 구축, 프로세스 생명주기 동안 유지)
+            2. 시가총액 API (폴백)
             
         Example:
             code = mcp.search_stock_by_name("삼성전자")  # "005930"
@@ -1133,74 +1055,22 @@ class MCPKISIntegration:
             
             search_name = name.strip().upper()
             
-            # ✅ 0단계: 메모리 캐시 확인 (가장 빠름, < 0.001초)
-            with MCPKISIntegration._cache_lock_static:
-                if MCPKISIntegration._name_code_cache is not None:
-                    # 정확한 일치
-                    if search_name in MCPKISIntegration._name_code_cache:
-                        code = MCPKISIntegration._name_code_cache[search_name]
-                        logger.debug(f"✅ 캐시 히트 (정확): '{name}' → {code}")
-                        return code
-                    
-                    # ✅ 부분 일치 스코어링 (비결정성 제거)
-                    candidates = []
-                    for cached_name, cached_code in MCPKISIntegration._name_code_cache.items():
-                        if search_name in cached_name:
-                            # 전방 일치가 더 높은 점수
-                            score = 3 if cached_name.startswith(search_name) else 1
-                            # 길이 차이가 작을수록 높은 점수
-                            score += 1.0 / (1 + abs(len(search_name) - len(cached_name)))
-                            candidates.append((score, len(cached_name), cached_name, cached_code))
-                        elif cached_name in search_name:
-                            score = 2 if search_name.startswith(cached_name) else 1
-                            score += 1.0 / (1 + abs(len(search_name) - len(cached_name)))
-                            candidates.append((score, len(cached_name), cached_name, cached_code))
-                    
-                    if candidates:
-                        # 스코어 내림차순, 길이 오름차순 정렬 (가장 유사한 것 우선)
-                        candidates.sort(key=lambda x: (-x[0], x[1]))
-                        best_match = candidates[0]
-                        logger.debug(f"✅ 캐시 히트 (부분, 스코어={best_match[0]:.1f}): '{name}' → {best_match[3]} ({best_match[2]})")
-                        return best_match[3]
-            
-            # 1단계: KOSPI 마스터 파일에서 검색 + 캐시 구축 (첫 호출만)
-            try:
-                import pandas as pd
-                
-                kospi_file = Path("kospi_code.xlsx")
-                if kospi_file.exists():
-                    # ✅ 캐시 구축 (프로세스 레벨, 1회만)
-                    with MCPKISIntegration._cache_lock_static:
-                        if MCPKISIntegration._name_code_cache is None:
-                            logger.info("📚 종목명 캐시 구축 중... (Excel 로드)")
-                            
-                            try:
-                                df = pd.read_excel(kospi_file)
-                                
-                                if '한글명' in df.columns and '단축코드' in df.columns:
-                                    temp_cache = {}
-                                    for _, row in df.iterrows():
-                                        stock_name = str(row['한글명']).upper()
-                                        stock_code = str(row['단축코드']).zfill(6)
-                                        temp_cache[stock_name] = stock_code
-                                    
-                                    # ✅ 성공 시에만 전역 캐시 할당
-                                    MCPKISIntegration._name_code_cache = temp_cache
-                                    logger.info(f"✅ 종목명 캐시 구축 완료: {len(MCPKISIntegration._name_code_cache)}개")
-                                else:
-                                    logger.warning("⚠️ KOSPI 마스터 파일 컬럼 불일치 (한글명/단축코드 없음)")
-                                    MCPKISIntegration._name_code_cache = {}  # 빈 캐시로 초기화
-                                    
-                            except Exception as load_err:
-                                logger.warning(f"⚠️ KOSPI 마스터 파일 로딩 실패, 캐시 무효화: {load_err}")
-                                MCPKISIntegration._name_code_cache = {}  # 빈 캐시로 초기화
-                    
-                    # 캐시에서 재검색 (재귀 호출) - 빈 캐시여도 안전
-                    if MCPKISIntegration._name_code_cache:
-                        return self.search_stock_by_name(name)
-                    
-            except Exception as e:
-                logger.debug(f"KOSPI 마스터 파일 검색 실패: {e}")
+            # ✅ 1단계: 종목명 인덱스 (첫 호출 시 KOSPI 마스터로 구축, 파싱 결과는 kospi_master 해시 캐시)
+            index = self._get_name_index()
+            if len(index):
+                # 정확한 일치
+                i = index.get(search_name)
+                if i is not None:
+                    code = index.value(i)
+                    logger.debug(f"✅ 캐시 히트 (정확): '{name}' → {code}")
+                    return code
+                
+                # ✅ 부분 일치 스코어링 (전방 일치 > 포함, 길이 차이 작을수록 우선 - 2-gram 인덱스)
+                best_match = index.best_partial(search_name)
+                if best_match:
+                    score, i = best_match
+                    logger.debug(f"✅ 캐시 히트 (부분, 스코어={score:.1f}): '{name}' → {index.value(i)} ({index.names[i]})")
+                    return index.value(i)
             
             # 2단계: 시가총액 상위 종목에서 검색 (API 사용)
             logger.debug(f"시가총액 API로 종목명 검색 시도: '{name}'")
@@ -1222,6 +1092,30 @@ class MCPKISIntegration:
             logger.error(f"종목명 검색 중 오류: {name}, {e}")
             return None
     
+    @staticmethod
+    def _get_name_index():
+        """
+        종목명 검색 인덱스 (프로세스 레벨, 최초 1회 구축)
+        
+        Returns:
+            NameIndex (마스터 로딩 실패 시 빈 인덱스)
+        """
+        index = MCPKISIntegration._name_index
+        if index is not None:
+            return index
+        from name_index import NameIndex
+        with MCPKISIntegration._cache_lock_static:
+            if MCPKISIntegration._name_index is None:
+                try:
+                    from kospi_master import get_kospi_master
+                    name_to_code = get_kospi_master().name_to_code
+                    MCPKISIntegration._name_index = NameIndex(list(name_to_code), values=list(name_to_code.values()))
+                    logger.info(f"✅ 종목명 인덱스 구축 완료: {len(name_to_code)}개")
+                except Exception as load_err:
+                    logger.warning(f"⚠️ KOSPI 마스터 로딩 실패, 빈 인덱스 사용: {load_err}")
+                    MCPKISIntegration._name_index = NameIndex([])
+            return MCPKISIntegration._name_index
+    
     def _resolve_symbol(self, code_or_name: str) -> Optional[str]:
         """
         종목코드 또는 종목명을 종목코드로 변환
@@ -1250,135 +1144,56 @@ class MCPKISIntegration:
             logger.error(f"종목 코드/이름 변환 실패: {code_or_name}, {e}")
             return None
     
-    def _rate_limit(self):
-        """API 요청 속도를 제어합니다 (전역 Rate Limiter 사용)"""
-        # ✅ 전역 Rate Limiter 사용 - KISDataProvider와 동일한 Lock 공유
+    def _effective_interval(self) -> float:
+        """현재 적용되는 기본 호출 간격 (인스턴스 설정 또는 전역 쿼터)"""
+        return self.request_interval or KISGlobalRateLimiter.get_interval()
+    
+    def _current_interval(self) -> Optional[float]:
+        """
+        이번 요청에 적용할 호출 간격 (슬로우 모드 반영)
+        
+        Returns:
+            간격(초) 또는 None (전역 쿼터 그대로 사용)
+        """
         # 적응형 레이트 리밋 (슬로우 모드)
         if self._adaptive_rate and time.time() < self._slow_mode_until:
-            interval = self.request_interval * 4.0  # 4배 느리게
+            interval = self._effective_interval() * 4.0  # 4배 느리게
             logger.debug(f"🐢 슬로우 모드: 간격 {interval:.2f}초 (남은 시간: {self._slow_mode_until - time.time():.1f}초)")
-        else:
-            interval = self.request_interval
-            # 슬로우 모드 종료
-            if self._adaptive_rate and time.time() >= self._slow_mode_until:
-                self._adaptive_rate = False
-                logger.info("⚡ 슬로우 모드 종료, 정상 속도 복귀")
+            return interval
         
-        # 전역 Rate Limiter 호출
-        KISGlobalRateLimiter.rate_limit(interval)
+        # 슬로우 모드 종료
+        if self._adaptive_rate and time.time() >= self._slow_mode_until:
+            self._adaptive_rate = False
+            logger.info("⚡ 슬로우 모드 종료, 정상 속도 복귀")
+        return self.request_interval
+    
+    def _rate_limit(self, path: Optional[str] = None):
+        """API 요청 속도를 제어합니다 (전역 Rate Limiter 사용)
+        
+        Args:
+            path: 요청 경로 (엔드포인트 레인 분류용: 시세/순위/재무)
+        """
+        # ✅ 전역 Rate Limiter 사용 - KISDataProvider와 동일한 쿼터 공유
+        # 전역 Rate Limiter 호출 (엔드포인트 레인별 보장 몫)
+        KISGlobalRateLimiter.rate_limit(self._current_interval(), lane=lane_for_path(path))
     
     def _load_cached_token(self) -> Optional[str]:
         """
-        디스크에서 캐시된 토큰 로드 (24시간 유효성 확인, 멀티프로세스 안전)
+        캐시된 토큰 로드 (프로세스 전역 메모리 캐시, 24시간 유효성 확인)
         
-        ✅ 기존 kis_token_manager.py 형식과 호환:
-        - 기존: {"token": "...", "expires_at": "2025-10-10T10:00:00"}
-        - 신규: {"access_token": "...", "issue_time": 123456, "expires_in": 86400}
+        ✅ 매 요청마다 파일 락/JSON 파싱을 하지 않음:
+        - 메모리 토큰이 유효하면 즉시 반환
+        - 만료 임박 또는 다른 프로세스가 파일을 갱신한 경우(stat 변경)에만 디스크 재로드
+        - 기존 kis_token_manager.py 형식과 호환 (kis_token_cache.parse_token_cache)
         
         Returns:
             유효한 토큰이 있으면 반환, 없으면 None
         """
-        # ✅ 멀티프로세스 파일 락 (filelock)
-        lock_path = f"{self.TOKEN_CACHE_FILE}.lock"
-        try:
-            from filelock import FileLock
-            lock = FileLock(lock_path, timeout=5)
-        except ImportError:
-            # filelock 없으면 스레드 락만 사용 (폴백)
-            logger.warning(
-                "⚠️ filelock 미설치 - 멀티프로세스 환경에서 토큰 캐시 경합 가능. "
-                "설치 권장: pip install filelock"
-            )
-            lock = self._token_lock
-        
-        with lock:
-            try:
-                from pathlib import Path
-                cache_file = Path(self.TOKEN_CACHE_FILE)
-                
-                if not cache_file.exists():
-                    return None
-                
-                # ✅ 파싱 실패 시 즉시 캐시 삭제 후 복구
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache = json.load(f)
-                except (json.JSONDecodeError, ValueError) as parse_err:
-                    logger.warning(f"⚠️ 토큰 캐시 손상, 삭제 후 재발급: {parse_err}")
-                    try:
-                        cache_file.unlink(missing_ok=True)
-                    except Exception:
-                        pass
-                    return None
-                
-                # ✅ 기존 형식 호환 (kis_token_manager.py + value_stock_finder.py)
-                if 'token' in cache and 'expires_at' in cache:
-                    token = cache.get('token')
-                    expires_at_value = cache.get('expires_at')
-                    
-                    if not token or not expires_at_value:
-                        return None
-                    
-                    # expires_at 파싱 (ISO 형식 문자열 or epoch timestamp 숫자)
-                    try:
-                        now = datetime.now()
-                        
-                        # ✅ 숫자(epoch timestamp) vs 문자열(ISO format) 구분
-                        if isinstance(expires_at_value, (int, float)):
-                            # epoch timestamp → datetime 변환
-                            expires_at = datetime.fromtimestamp(expires_at_value)
-                        elif isinstance(expires_at_value, str):
-                            # ISO format string → datetime 변환
-                            expires_at = datetime.fromisoformat(expires_at_value)
-                        else:
-                            logger.warning(f"알 수 없는 expires_at 타입: {type(expires_at_value)}")
-                            return None
-                        
-                        # 1시간 여유 (기존 시스템과 동일)
-                        if expires_at > now + timedelta(hours=1):
-                            remaining = expires_at - now
-                            hours = remaining.total_seconds() / 3600
-                            logger.debug(f"✅ 캐시된 토큰 사용 [기존 형식] (남은 시간: {hours:.1f}시간)")
-                            return token
-                        else:
-                            logger.debug("⏰ 캐시된 토큰이 만료되었습니다 [기존 형식]")
-                            return None
-                    except Exception as e:
-                        logger.warning(f"expires_at 파싱 실패: {e}")
-                        return None
-                
-                # ✅ 신규 형식 (우리가 만든 형식)
-                elif 'access_token' in cache and 'issue_time' in cache:
-                    token = cache.get('access_token')
-                    issue_time = cache.get('issue_time')
-                    expires_in = cache.get('expires_in', 86400)  # 기본 24시간
-                    
-                    if not token or not issue_time:
-                        return None
-                    
-                    # 만료 시간 확인 (5분 여유)
-                    elapsed = time.time() - issue_time
-                    if elapsed >= (expires_in - 300):
-                        logger.debug("⏰ 캐시된 토큰이 만료되었습니다 [신규 형식]")
-                        return None
-                    
-                    # 남은 시간 계산
-                    remaining = expires_in - elapsed
-                    hours = remaining / 3600
-                    logger.debug(f"✅ 캐시된 토큰 사용 [신규 형식] (남은 시간: {hours:.1f}시간)")
-                    return token
-                
-                else:
-                    logger.warning("⚠️ 알 수 없는 캐시 형식입니다. 새 토큰을 발급합니다.")
-                    return None
-                
-            except Exception as e:
-                logger.warning(f"토큰 캐시 로드 실패: {e}")
-                return None
+        return self._token_cache.get()
     
     def _save_token_cache(self, token: str, expires_in: int = 86400):
         """
-        토큰을 디스크에 캐싱 (24시간 유효, 원자적 쓰기 + 안전한 퍼미션)
+        토큰을 메모리 + 디스크에 캐싱 (24시간 유효, 원자적 쓰기 + 안전한 퍼미션)
         
         ✅ 기존 kis_token_manager.py 형식 사용 (호환성)
         ✅ 멀티스레드/프로세스 안전 (파일 락 + 원자적 교체)
@@ -1387,70 +1202,17 @@ class MCPKISIntegration:
             token: 액세스 토큰
             expires_in: 만료 시간 (초, 기본 86400초 = 24시간)
         """
-        # ✅ 멀티프로세스 파일 락 (filelock)
-        lock_path = f"{self.TOKEN_CACHE_FILE}.lock"
-        try:
-            from filelock import FileLock
-            lock = FileLock(lock_path, timeout=5)
-        except ImportError:
-            # filelock 없으면 스레드 락만 사용 (폴백)
-            logger.warning(
-                "⚠️ filelock 미설치 - 멀티프로세스 환경에서 토큰 캐시 경합 가능. "
-                "설치 권장: pip install filelock"
-            )
-            lock = self._token_lock
-        
-        with lock:
-            try:
-                from pathlib import Path
-                import os
-                
-                cache_file = Path(self.TOKEN_CACHE_FILE)
-                tmp_file = cache_file.with_suffix(".tmp")
-                
-                # ✅ 기존 형식 사용 (kis_token_manager.py와 호환)
-                expires_at = datetime.now() + timedelta(seconds=expires_in)
-                cache = {
-                    'token': token,  # 기존 시스템 키명
-                    'expires_at': expires_at.isoformat()  # 기존 시스템 키명
-                }
-                
-                # 캐시 디렉토리 생성
-                cache_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                # ✅ 원자적 쓰기: 임시 파일에 쓰고 rename (레이스 방지)
-                with open(tmp_file, 'w', encoding='utf-8') as f:
-                    json.dump(cache, f, indent=2)
-                
-                # ✅ 파일 퍼미션: 소유자만 읽기/쓰기 (0o600)
-                try:
-                    os.chmod(tmp_file, 0o600)
-                except Exception:
-                    pass  # Windows에서는 실패할 수 있음
-                
-                # ✅ 원자적 교체 (Windows 안전성: os.replace 사용)
-                os.replace(str(tmp_file), str(cache_file))
-                
-                logger.debug(f"💾 토큰 캐시 저장 완료 (만료: {expires_at.strftime('%Y-%m-%d %H:%M:%S')})")
-                
-            except Exception as e:
-                logger.warning(f"토큰 캐시 저장 실패: {e}")
+        self._token_cache.store(token, expires_in=expires_in)
+    
+    # === 요청 공통 헬퍼 (동기 _send_request / 비동기 AsyncKISClient 공용) ===
     
-    def _send_request(self, path: str, tr_id: str, params: dict, max_retries: int = 2, _total_attempts: int = 0) -> Optional[dict]:
+    def _circuit_allows(self, path: str) -> bool:
         """
-        KISDataProvider와 동일한 방식의 API 요청 메서드
-        중앙 집중화된 API GET 요청 (재시도 로직 + 회로차단기 + 쿨다운)
+        회로차단기 확인: 엔드포인트별 실패 카운터 + 쿨다운 복구
         
-        Args:
-            _total_attempts: Internal recursion guard (세션 재생성 무한루프 방지)
+        Returns:
+            요청 진행 가능 여부 (쿨다운 중이면 False)
         """
-        # ✅ 재귀 호출 무한루프 방지 (세션 재생성 포함 최대 시도)
-        max_total_attempts = max_retries + 3  # retries + session recreate tries
-        if _total_attempts > max_total_attempts:
-            logger.error(f"❌ 최대 시도 횟수 초과 ({_total_attempts}회) → 중단")
-            return None
-        
-        # ✅ 회로차단기: 엔드포인트별 실패 카운터 + 쿨다운 복구
         if self._fail_counts[path] >= self.max_endpoint_failures:
             # 쿨다운 확인 (60초 후 자동 재시도)
             last_fail_time = self._fail_metadata.get(path, 0)
@@ -1458,264 +1220,195 @@ class MCPKISIntegration:
             
             if cooldown_remaining > 0:
                 logger.error(f"🚫 Circuit open for {path} (쿨다운 {int(cooldown_remaining)}초 남음)")
-                return None
+                return False
+            # 쿨다운 후 카운터 반으로 감소 (점진 복구)
+            old_count = self._fail_counts[path]
+            self._fail_counts[path] = max(0, old_count // 2)
+            logger.info(f"⚡ Circuit 쿨다운 완료: {path} (카운터 {old_count} → {self._fail_counts[path]})")
+        return True
+    
+    def _record_failure(self, path: str):
+        """회로차단기 실패 기록 (카운터 증가 + 마지막 실패 시각)"""
+        self._fail_counts[path] += 1
+        self._fail_metadata[path] = time.time()
+    
+    def _record_success(self, path: str):
+        """성공 기록: 500 카운터 리셋 + 회로차단기 시간 기반 복구"""
+        # 성공적인 요청 시 카운터 리셋 + 점진 감소
+        if self.consecutive_500_errors > 0:
+            logger.debug(f"✅ 요청 성공, 500 오류 카운터 리셋 ({self.consecutive_500_errors} → 0)")
+        self.consecutive_500_errors = 0
+        
+        # ✅ 회로차단기 시간 기반 복구 (일정 시간 성공 유지 시 완전 리셋)
+        current_time = time.time()
+        last_success = self._success_metadata.get(path, 0)
+        
+        if self._fail_counts.get(path, 0) > 0:
+            # 마지막 성공 후 일정 시간 경과 시 완전 리셋
+            if last_success > 0 and (current_time - last_success) >= self.circuit_recovery_time:
+                old_count = self._fail_counts[path]
+                self._fail_counts[path] = 0
+                logger.info(f"✅ 회로차단기 완전 복구: {path} ({old_count} → 0, {self.circuit_recovery_time:.0f}초 무오류)")
             else:
-                # 쿨다운 후 카운터 반으로 감소 (점진 복구)
+                # 점진 감소 (즉시 0이 아닌 천천히 회복)
                 old_count = self._fail_counts[path]
-                self._fail_counts[path] = max(0, old_count // 2)
-                logger.info(f"⚡ Circuit 쿨다운 완료: {path} (카운터 {old_count} → {self._fail_counts[path]})")
-                # 재시도 진행
-        
-        # ✅ 연속 500 오류가 너무 많으면 세션 재생성 후 재시도
-        if self.consecutive_500_errors >= self.max_consecutive_500_errors:
-            logger.error(f"❌ 연속 500 오류 {self.consecutive_500_errors}회 초과 - AppKey 차단 의심 (EGW00201)")
-            logger.error("⏸️  30초 대기 후 재시도 (일반적으로 5~10분 내 자동 해제)")
-            logger.error("💡 지속 시: 프로그램 중단 → 5~10분 대기 → 재실행 권장")
-            time.sleep(30)  # 30초 대기 (일반적으로 수 초~수 분 내 자동 해제)
-            
-            # ✅ 세션 재생성 (공통 메서드 사용, 세션 락 보호)
-            with self._session_lock:
-                try:
-                    self.session.close()
-                except Exception:
-                    pass
-                
-                try:
-                    self.session = self._init_session()
-                    logger.info("✅ 세션 재생성 완료, 재귀 호출로 재시도")
-                except Exception as e:
-                    logger.error(f"❌ 세션 재생성 실패: {e}")
-                    self.consecutive_500_errors = 0
-                    return None
-            
-            # ✅ 세션 재생성 성공 시 재귀 호출로 재시도 (무한루프 방지)
-            self.consecutive_500_errors = 0
-            return self._send_request(path, tr_id, params, max_retries=1, _total_attempts=_total_attempts + 1)
+                self._fail_counts[path] = max(0, old_count - 1)
+                logger.debug(f"✅ 회로차단기 카운터 감소: {path} ({old_count} → {self._fail_counts[path]})")
+        
+        # 마지막 성공 시각 기록
+        self._success_metadata[path] = current_time
+    
+    def _note_500_error(self):
+        """500 오류 기록 (2회 이상 연속 시 슬로우 모드 진입)"""
+        self.consecutive_500_errors += 1
+        # ✅ 적응형 레이트 리밋: 2회 이상 500 발생 시 즉시 슬로우 모드 (AppKey 차단 방지)
+        if self.consecutive_500_errors >= 2:
+            self._adaptive_rate = True
+            self._slow_mode_until = time.time() + self._slow_mode_duration
+            logger.warning(f"⚠️ 연속 500 오류 {self.consecutive_500_errors}회 → {self._slow_mode_duration:.0f}초간 슬로우 모드 (간격 4배, AppKey 차단 방지)")
+    
+    def _retry_backoff(self, status: int, attempt: int, retry_after: Optional[str]) -> float:
+        """
+        일시적 오류 재시도 대기 시간 계산
         
-        for attempt in range(max_retries + 1):
+        ✅ Retry-After 헤더 존중 (숫자/HTTP-date 모두 파싱), 500 에러는 더 길게, 강한 지터
+        """
+        backoff = None
+        if retry_after:
             try:
-                self._rate_limit()
-                
-                # ✅ 캐시된 토큰 우선 사용 (1일 1회 발급 제한 준수)
-                token = self._load_cached_token()
-                
-                # 캐시에 없거나 만료된 경우에만 새로 발급
-                if not token:
-                    logger.info("🔄 새로운 토큰 발급 중...")
-                    
-                    # OAuth 매니저 호환성 처리 (get_rest_token/get_valid_token 모두 지원)
-                    if hasattr(self.oauth_manager, 'get_rest_token'):
-                        token = self.oauth_manager.get_rest_token()
-                    elif hasattr(self.oauth_manager, 'get_valid_token'):
-                        token = self.oauth_manager.get_valid_token()
-                    else:
-                        logger.error("OAuth 매니저에서 토큰 가져오기 메서드를 찾을 수 없습니다")
-                        return None
-                    
-                    if not token:
-                        logger.error("OAuth 토큰을 가져올 수 없습니다")
-                        return None
-                    
-                    # ✅ 새로 발급받은 토큰 캐싱 (24시간 유효)
-                    self._save_token_cache(token, expires_in=86400)
-                
-                # 헤더 구성 (KISDataProvider와 동일)
-                headers = {
-                    **self.headers, 
-                    "authorization": f"Bearer {token}", 
-                    "tr_id": tr_id
-                }
-                
-                url = f"{self.base_url}{path}"
-                
-                # ✅ 세션 요청 (스레드 세이프 보호 - 최소 범위만 잠금)
-                with self._session_lock:
-                    response = self.session.get(
-                        url, 
-                        headers=headers, 
-                        params=params, 
-                        timeout=self.timeout
-                    )
-                # 락 밖에서 처리 (JSON 파싱, 상태 체크 등 → 동시성 ↑)
-                response.raise_for_status()
-                
-                # ✅ JSON 파싱 실패 대처 (HTML 에러페이지 등)
+                # 숫자 형식 시도
+                backoff = float(retry_after)
+            except ValueError:
+                # HTTP-date 형식 시도 (timezone-aware 보장)
                 try:
-                    data = response.json()
-                except ValueError as json_err:
-                    # ✅ Content-Type 확인으로 더 명확한 진단
-                    content_type = response.headers.get("Content-Type", "")
-                    logger.error(
-                        f"❌ JSON 파싱 실패 ({tr_id}): {json_err}. "
-                        f"Content-Type={content_type}, "
-                        f"응답 일부: {response.text[:200]}"
-                    )
-                    return None
-                
-                # ✅ rt_cd가 있는 경우만 체크 (일부 엔드포인트는 rt_cd 없음)
-                if 'rt_cd' in data and data.get('rt_cd') != '0':
-                    # ✅ 디버깅 정보 풍부화 (msg1, msg_cd, 종목코드 등) + 민감정보 마스킹
-                    error_msg = data.get('msg1') or data.get('msg_cd') or 'unknown'
-                    logger.warning(
-                        f"⚠️ API 오류 (rt_cd={data.get('rt_cd')}): "
-                        f"tr_id={tr_id}, path={path}, msg={error_msg}, params={self._safe_params(params)}"
-                    )
-                    return None
-                
-                # ✅ 페이징 지원: tr_cont 헤더를 body에 추가
-                tr_cont = response.headers.get('tr_cont', '')
-                if tr_cont:
-                    data['tr_cont'] = tr_cont
-                
-                # 성공적인 요청 시 카운터 리셋 + 점진 감소
-                if self.consecutive_500_errors > 0:
-                    logger.debug(f"✅ 요청 성공, 500 오류 카운터 리셋 ({self.consecutive_500_errors} → 0)")
-                self.consecutive_500_errors = 0
-                
-                # ✅ 회로차단기 시간 기반 복구 (일정 시간 성공 유지 시 완전 리셋)
-                current_time = time.time()
-                last_success = self._success_metadata.get(path, 0)
-                
-                if self._fail_counts.get(path, 0) > 0:
-                    # 마지막 성공 후 일정 시간 경과 시 완전 리셋
-                    if last_success > 0 and (current_time - last_success) >= self.circuit_recovery_time:
-                        old_count = self._fail_counts[path]
-                        self._fail_counts[path] = 0
-                        logger.info(f"✅ 회로차단기 완전 복구: {path} ({old_count} → 0, {self.circuit_recovery_time:.0f}초 무오류)")
-                    else:
-                        # 점진 감소 (즉시 0이 아닌 천천히 회복)
-                        old_count = self._fail_counts[path]
-                        self._fail_counts[path] = max(0, old_count - 1)
-                        logger.debug(f"✅ 회로차단기 카운터 감소: {path} ({old_count} → {self._fail_counts[path]})")
-                
-                # 마지막 성공 시각 기록
-                self._success_metadata[path] = current_time
-                
-                return data
-                
-            except requests.exceptions.HTTPError as e:
-                status = e.response.status_code
-                
-                # ✅ 401 Unauthorized: 토큰 캐시 파기 후 재발급 시도
-                if status == 401:
-                    logger.warning("🔐 401 Unauthorized: 토큰 캐시 파기 후 1회 재발급 시도")
-                    try:
-                        from pathlib import Path
-                        Path(self.TOKEN_CACHE_FILE).unlink(missing_ok=True)
-                    except Exception as del_err:
-                        logger.debug(f"토큰 캐시 삭제 실패(무시): {del_err}")
-                    if attempt < max_retries:
-                        time.sleep(0.5 * (2 ** attempt))
-                        continue
-                    else:
-                        logger.error("❌ 401 복구 실패 (최대 재시도 초과)")
-                        return None
-                
-                # ✅ 일시적 오류 (429, 500, 502, 503, 504) → 재시도
-                transient_errors = {429, 500, 502, 503, 504}
-                if status in transient_errors:
-                    if status == 500:
-                        self.consecutive_500_errors += 1
-                        # ✅ 적응형 레이트 리밋: 2회 이상 500 발생 시 즉시 슬로우 모드 (AppKey 차단 방지)
-                        if self.consecutive_500_errors >= 2:
-                            self._adaptive_rate = True
-                            self._slow_mode_until = time.time() + self._slow_mode_duration
-                            logger.warning(f"⚠️ 연속 500 오류 {self.consecutive_500_errors}회 → {self._slow_mode_duration:.0f}초간 슬로우 모드 (간격 4배, AppKey 차단 방지)")
-                    if attempt < max_retries:
-                        # ✅ Retry-After 헤더 존중 (숫자/HTTP-date 모두 파싱)
-                        retry_after = e.response.headers.get("Retry-After")
-                        if retry_after:
-                            try:
-                                # 숫자 형식 시도
-                                backoff = float(retry_after)
-                            except ValueError:
-                                # HTTP-date 형식 시도 (timezone-aware 보장)
-                                try:
-                                    from email.utils import parsedate_to_datetime
-                                    from datetime import timezone
-                                    
-                                    retry_dt = parsedate_to_datetime(retry_after)
-                                    
-                                    # ✅ timezone-aware datetime 보장
-                                    if retry_dt.tzinfo is None:
-                                        retry_dt = retry_dt.replace(tzinfo=timezone.utc)
-                                    
-                                    now_utc = datetime.now(timezone.utc)
-                                    backoff = max(0.0, (retry_dt - now_utc).total_seconds())
-                                except Exception:
-                                    # 파싱 실패 시 기본 백오프 (500 에러는 더 길게)
-                                    if status == 500:
-                                        base = 5.0 * (2 ** attempt)  # 500 에러는 5배 더 긴 대기 (차단 방지)
-                                    else:
-                                        base = 2.0 * (2 ** attempt)
-                                    backoff = min(self.backoff_cap, base)
-                        else:
-                            # 기본 백오프 (500 에러는 더 길게, 차단 방지)
-                            if status == 500:
-                                base = 5.0 * (2 ** attempt)  # 5초, 10초, 20초, 30초...
-                            else:
-                                base = 2.0 * (2 ** attempt)  # 2초, 4초, 8초, 16초...
-                            backoff = min(self.backoff_cap, base)  # 인자화된 캡
-                        
-                        # ✅ 하한선: request_interval 이상 (빠른 재시도 방지)
-                        backoff = max(self.request_interval * 3, backoff)  # 최소 1.5초 (차단 방지)
-                        
-                        # ✅ 강한 지터 추가 (동시 재시도 분산)
-                        backoff += random.uniform(0, 1.0)
-                        
-                        logger.warning(
-                            f"⚠️ 일시적 오류 {status} → {backoff:.1f}s 후 재시도 "
-                            f"({attempt + 1}/{max_retries}) tr_id={tr_id}"
-                        )
-                        time.sleep(backoff)
-                        continue
-                    else:
-                        logger.error(f"❌ 최대 재시도 초과 {status} tr_id={tr_id}")
-                        return None
-                else:
-                    # ✅ 비과도성 4xx도 회로차단기 카운트 증가 (403/404/422 등)
-                    self._fail_counts[path] += 1
-                    self._fail_metadata[path] = time.time()  # 마지막 실패 시각 기록
-                    logger.error(f"❌ 고정 오류 HTTP {status} tr_id={tr_id}")
-                    return None
+                    from email.utils import parsedate_to_datetime
+                    from datetime import timezone
                     
-            except requests.exceptions.ConnectionError as e:
-                if attempt < max_retries:
-                    backoff = 0.3 * (2 ** attempt)
-                    logger.debug(f"🔄 연결 오류 재시도 {attempt + 1}/{max_retries}, {backoff:.1f}s")
-                    time.sleep(backoff)
-                    continue
-                else:
-                    self._fail_counts[path] += 1  # ✅ 회로차단기 카운터 증가
-                    self._fail_metadata[path] = time.time()  # 마지막 실패 시각 기록
-                    logger.error(f"❌ 연결 실패 tr_id={tr_id}")
-                    return None
+                    retry_dt = parsedate_to_datetime(retry_after)
                     
-            except requests.exceptions.Timeout as e:
-                if attempt < max_retries:
-                    backoff = 0.3 * (2 ** attempt)
-                    logger.debug(f"🔄 타임아웃 재시도 {attempt + 1}/{max_retries}, {backoff:.1f}s")
-                    time.sleep(backoff)
-                    continue
-                else:
-                    self._fail_counts[path] += 1  # ✅ 회로차단기 카운터 증가
-                    self._fail_metadata[path] = time.time()  # 마지막 실패 시각 기록
-                    logger.error(f"❌ 타임아웃 tr_id={tr_id}")
-                    return None
+                    # ✅ timezone-aware datetime 보장
+                    if retry_dt.tzinfo is None:
+                        retry_dt = retry_dt.replace(tzinfo=timezone.utc)
                     
-            except Exception as e:
-                self._fail_counts[path] += 1  # ✅ 회로차단기 카운터 증가
-                self._fail_metadata[path] = time.time()  # 마지막 실패 시각 기록
-                logger.error(f"❌ 예외 tr_id={tr_id}: {e}")
-                return None
+                    now_utc = datetime.now(timezone.utc)
+                    backoff = max(0.0, (retry_dt - now_utc).total_seconds())
+                except Exception:
+                    backoff = None
         
-        return None
+        if backoff is None:
+            # 기본 백오프 (500 에러는 더 길게, 차단 방지)
+            if status == 500:
+                base = 5.0 * (2 ** attempt)  # 5초, 10초, 20초, 30초...
+            else:
+                base = 2.0 * (2 ** attempt)  # 2초, 4초, 8초, 16초...
+            backoff = min(self.backoff_cap, base)  # 인자화된 캡
+        
+        # ✅ 하한선: request_interval 이상 (빠른 재시도 방지)
+        backoff = max(self._effective_interval() * 3, backoff)  # 최소 3슬롯 (차단 방지)
+        
+        # ✅ 강한 지터 추가 (동시 재시도 분산)
+        return backoff + random.uniform(0, 1.0)
     
-    def _make_api_call(self, endpoint: str, params: Dict = None, tr_id: str = "", use_cache: bool = True) -> Optional[Dict]:
+    def _acquire_token(self) -> Optional[str]:
         """
-        API 호출 래퍼 (캐시 지원, 엔드포인트별 차등 TTL)
-        실제 호출은 _send_request 사용
+        요청용 토큰 반환 (메모리 캐시 우선, 없으면 OAuth 매니저로 발급 후 캐싱)
+        
+        ✅ 캐시된 토큰 우선 사용 (1일 1회 발급 제한 준수)
+        """
+        token = self._load_cached_token()
+        if token:
+            return token
+        
+        # 캐시에 없거나 만료된 경우에만 새로 발급
+        logger.info("🔄 새로운 토큰 발급 중...")
+        
+        # OAuth 매니저 호환성 처리 (get_rest_token/get_valid_token 모두 지원)
+        if hasattr(self.oauth_manager, 'get_rest_token'):
+            token = self.oauth_manager.get_rest_token()
+        elif hasattr(self.oauth_manager, 'get_valid_token'):
+            token = self.oauth_manager.get_valid_token()
+        else:
+            logger.error("OAuth 매니저에서 토큰 가져오기 메서드를 찾을 수 없습니다")
+            return None
+        
+        if not token:
+            logger.error("OAuth 토큰을 가져올 수 없습니다")
+            return None
+        
+        # ✅ 새로 발급받은 토큰 캐싱 (24시간 유효)
+        self._save_token_cache(token, expires_in=86400)
+        return token
+    
+    def _request_headers(self, token: str, tr_id: str) -> Dict[str, str]:
+        """헤더 구성 (KISDataProvider와 동일)"""
+        return {
+            **self.headers,
+            "authorization": f"Bearer {token}",
+            "tr_id": tr_id
+        }
+    
+    def _finalize_response(self, data: Any, tr_id: str, path: str, params: dict, tr_cont: str) -> Optional[dict]:
         """
+        파싱된 응답 검증 (rt_cd 확인 + tr_cont 페이징 헤더 병합)
+        
+        Returns:
+            정상 응답 dict 또는 None (API 오류)
+        """
+        # ✅ rt_cd가 있는 경우만 체크 (일부 엔드포인트는 rt_cd 없음)
+        if 'rt_cd' in data and data.get('rt_cd') != '0':
+            # ✅ 디버깅 정보 풍부화 (msg1, msg_cd, 종목코드 등) + 민감정보 마스킹
+            error_msg = data.get('msg1') or data.get('msg_cd') or 'unknown'
+            logger.warning(
+                f"⚠️ API 오류 (rt_cd={data.get('rt_cd')}): "
+                f"tr_id={tr_id}, path={path}, msg={error_msg}, params={self._safe_params(params)}"
+            )
+            return None
+        
+        # ✅ 페이징 지원: tr_cont 헤더를 body에 추가
+        if tr_cont:
+            data['tr_cont'] = tr_cont
+        
+        self._record_success(path)
+        return data
+    
+    def _session_get(self, url: str, headers: Dict[str, str], params: dict) -> requests.Response:
+        """공유 세션 GET (스레드 세이프 보호, 상태 체크는 호출 측)"""
+        with self._session_lock:
+            return self.session.get(url, headers=headers, params=params, timeout=self.timeout)
+    
+    def _recreate_session(self) -> bool:
+        """
+        공유 세션 재생성 (연속 500 오류 복구용, 세션 락 보호)
+        
+        Returns:
+            재생성 성공 여부
+        """
+        with self._session_lock:
+            try:
+                self.session.close()
+            except Exception:
+                pass
+            
+            try:
+                self.session = self._init_session()
+                logger.info("✅ 세션 재생성 완료, 재귀 호출로 재시도")
+                return True
+            except Exception as e:
+                logger.error(f"❌ 세션 재생성 실패: {e}")
+                return False
+    
+    def _send_request(self, path: str, tr_id: str, params: dict, max_retries: int = 2) -> Optional[dict]:
+        """
+        KISDataProvider와 동일한 방식의 API 요청 메서드
+        중앙 집중화된 API GET 요청 (재시도 로직 + 회로차단기 + 쿨다운)
+        
+        ✅ 재시도/401/연속 500/회로차단기 로직은 mcp_kis_async.AsyncKISClient.send_request 하나로 관리
+           (전용 루프 + 공유 requests 세션으로 동기 실행)
+        """
+        return self.async_client.send_request_sync(path, tr_id, params, max_retries=max_retries)
+    
+    def _normalize_endpoint(self, endpoint: str) -> str:
+        """엔드포인트 검증 + uapi 접두사 자동 보정"""
         # ✅ 엔드포인트 검증 (assert → ValueError, 프로덕션 안전)
         if endpoint.startswith("/"):
             raise ValueError(f"엔드포인트는 상대경로여야 합니다: {endpoint}")
@@ -1729,38 +1422,88 @@ class MCPKISIntegration:
             logger.debug(f"⚠️ 자동 수정: /uapi/domestic-stock/v1/ 접두사 제거 → {endpoint}")
         elif endpoint.startswith("uapi/"):
             logger.warning(f"⚠️ 불완전한 uapi 접두사: {endpoint} (자동 수정 불가)")
+        return endpoint
+    
+    def _cache_key(self, endpoint: str, tr_id: str, params: Optional[Dict]) -> str:
+        """
+        캐시 키 생성 (정규화된 파라미터 사용 + tr_id 포함으로 충돌 방지)
         
-        # ✅ 캐시 키 생성 (정규화된 파라미터 사용 + tr_id 포함으로 충돌 방지)
-        # 주의: 캐시 키에만 정규화 적용, 실제 요청에는 원본 params 사용!
-        original_params = params or {}
-        normalized_for_cache = self._normalize_params_for_cache_key(original_params)
-        cache_key = f"{endpoint}:{tr_id}:{json.dumps(normalized_for_cache, sort_keys=True, ensure_ascii=False)}"
-        
-        # ✅ 캐시 TTL 결정 (오버라이드 우선, 없으면 패턴 매칭)
+        주의: 캐시 키에만 정규화 적용, 실제 요청에는 원본 params 사용!
+        """
+        normalized_for_cache = self._normalize_params_for_cache_key(params or {})
+        return f"{endpoint}:{tr_id}:{json.dumps(normalized_for_cache, sort_keys=True, ensure_ascii=False)}"
+    
+    def _cache_ttl_for(self, endpoint: str) -> float:
+        """캐시 TTL 결정 (오버라이드 우선, 없으면 패턴 매칭)"""
         if endpoint in self.cache_ttl_overrides:
-            ttl = self.cache_ttl_overrides[endpoint]
+            return self.cache_ttl_overrides[endpoint]
         elif 'quotations' in endpoint:
-            ttl = self.cache_ttl['quotations']
+            return self.cache_ttl['quotations']
         elif 'ranking' in endpoint:
-            ttl = self.cache_ttl['ranking']
+            return self.cache_ttl['ranking']
         elif 'financial' in endpoint or 'finance' in endpoint:
-            ttl = self.cache_ttl['financial']
+            return self.cache_ttl['financial']
         elif 'dividend' in endpoint:
-            ttl = self.cache_ttl['dividend']
-        else:
-            ttl = self.cache_ttl['default']
+            return self.cache_ttl['dividend']
+        return self.cache_ttl['default']
+    
+    def _cache_get(self, cache_key: str, ttl: float, endpoint: str = "") -> Optional[Dict]:
+        """캐시 확인 (메모리 LRU → 영구 캐시 순, Lock으로 보호)"""
+        with self._cache_lock:
+            if cache_key in self.cache:
+                cached_data, timestamp = self.cache.pop(cache_key)  # 제거
+                if time.time() - timestamp < ttl:
+                    # ✅ 히트 시 뒤로 이동 (LRU)
+                    self.cache[cache_key] = (cached_data, timestamp)
+                    logger.debug(f"✓ 캐시 사용: {endpoint} (TTL={ttl}초)")
+                    return cached_data
+                # TTL 만료된 경우 재생성
+        
+        # ✅ 2차 영구 캐시 (다른 프로세스/이전 실행이 저장한 응답)
+        if self.response_cache is not None:
+            hit = self.response_cache.get(cache_key, ttl)
+            if hit is not None:
+                cached_data, timestamp = hit
+                self._cache_put_memory(cache_key, cached_data, timestamp)  # 원래 저장 시각 유지 (TTL 일관성)
+                logger.debug(f"✓ 영구 캐시 사용: {endpoint} (TTL={ttl}초)")
+                return cached_data
+        return None
+    
+    def _cache_put_memory(self, cache_key: str, data: Dict, timestamp: float):
+        """메모리 LRU 저장 (Lock으로 보호, 진짜 LRU)"""
+        with self._cache_lock:
+            # ✅ 캐시 무한증가 방지: LRU 방식 (가장 오래 미사용 항목 제거)
+            if len(self.cache) >= self.cache_maxsize:
+                self.cache.popitem(last=False)  # OrderedDict: 가장 앞(오래된) 항목 제거
+                logger.debug(f"🗑️ 캐시 한계 도달, LRU 항목 제거")
+            
+            self.cache[cache_key] = (data, timestamp)
+    
+    def _cache_put(self, cache_key: str, data: Dict, ttl: float, endpoint: str = ""):
+        """캐시 저장 (메모리 LRU + TTL 긴 응답은 영구 캐시에도 저장)"""
+        now = time.time()
+        self._cache_put_memory(cache_key, data, now)
+        logger.debug(f"💾 캐시 저장: {endpoint} (TTL={ttl}초, 크기={len(self.cache)}/{self.cache_maxsize})")
+        
+        if self.response_cache is not None:
+            self.response_cache.put(cache_key, data, ttl, endpoint, created_at=now)
+    
+    def _make_api_call(self, endpoint: str, params: Dict = None, tr_id: str = "", use_cache: bool = True) -> Optional[Dict]:
+        """
+        API 호출 래퍼 (캐시 지원, 엔드포인트별 차등 TTL)
+        실제 호출은 _send_request 사용
+        """
+        endpoint = self._normalize_endpoint(endpoint)
+        
+        original_params = params or {}
+        cache_key = self._cache_key(endpoint, tr_id, original_params)
+        ttl = self._cache_ttl_for(endpoint)
         
         # ✅ 캐시 확인 (Lock으로 보호, LRU 방식)
         if use_cache:
-            with self._cache_lock:
-                if cache_key in self.cache:
-                    cached_data, timestamp = self.cache.pop(cache_key)  # 제거
-                    if time.time() - timestamp < ttl:
-                        # ✅ 히트 시 뒤로 이동 (LRU)
-                        self.cache[cache_key] = (cached_data, timestamp)
-                        logger.debug(f"✓ 캐시 사용: {endpoint} (TTL={ttl}초)")
-                        return cached_data
-                    # TTL 만료된 경우 재생성
+            cached = self._cache_get(cache_key, ttl, endpoint)
+            if cached is not None:
+                return cached
         
         # KISDataProvider의 _send_request 방식 사용 (원본 params 전달!)
         path = f"/uapi/domestic-stock/v1/{endpoint}"
@@ -1768,17 +1511,50 @@ class MCPKISIntegration:
         
         # ✅ 캐시 저장 (Lock으로 보호, 진짜 LRU)
         if data and use_cache:
-            with self._cache_lock:
-                # ✅ 캐시 무한증가 방지: LRU 방식 (가장 오래 미사용 항목 제거)
-                if len(self.cache) >= self.cache_maxsize:
-                    self.cache.popitem(last=False)  # OrderedDict: 가장 앞(오래된) 항목 제거
-                    logger.debug(f"🗑️ 캐시 한계 도달, LRU 항목 제거")
-                
-                self.cache[cache_key] = (data, time.time())
-                logger.debug(f"💾 캐시 저장: {endpoint} (TTL={ttl}초, 크기={len(self.cache)}/{self.cache_maxsize})")
+            self._cache_put(cache_key, data, ttl, endpoint)
         
         return data
     
+    @staticmethod
+    def _page_rows(data: Dict) -> List[Dict]:
+        """페이지 응답에서 행 목록 추출 (output2 우선 - 차트 데이터는 output2에 있음!)"""
+        page_data = data.get("output2") or data.get("output") or data.get("output1") or []
+        # 리스트가 아니면 리스트로 변환
+        if isinstance(page_data, dict):
+            page_data = [page_data]
+        return page_data
+    
+    @staticmethod
+    def _next_page(data: Dict, ctx_out_key: str, ctx_token: str) -> Tuple[bool, str]:
+        """
+        다음 페이지 존재 여부 판단 (동기/비동기 페이징 공용)
+        
+        Returns:
+            (다음 페이지 요청 여부, 다음 CTX 토큰)
+        """
+        # 2. CTX 토큰 방식 (우선 체크)
+        if ctx_out_key:
+            # CTX 방식은 tr_cont 무시하고 토큰으로만 제어
+            new_token = data.get(ctx_out_key, "")
+            if not new_token or new_token == ctx_token:
+                logger.debug(f"📄 페이징 완료: CTX 토큰 없음 또는 중복")
+                return False, ctx_token
+            return True, new_token
+        
+        # 1. tr_cont 헤더 방식
+        tr_cont = data.get("tr_cont", "")
+        if tr_cont in ("F", "M"):
+            # F(다음 페이지 있음), M(중간) → 계속
+            return True, ctx_token
+        if tr_cont in ("D", "", None):
+            # D(완료), 빈값, None → 종료
+            logger.debug(f"📄 페이징 완료: tr_cont={tr_cont or '없음'}")
+            return False, ctx_token
+        # ✅ 알 수 없는 값 → 보수적으로 한 번 더 시도 후 종료
+        # 다음 루프에서 데이터 없으면 자동 종료됨
+        logger.warning(f"⚠️ 알 수 없는 tr_cont='{tr_cont}' → 다음 페이지 시도 후 종료 예정")
+        return True, ctx_token
+    
     def _fetch_all_pages(self, endpoint: str, base_params: Dict, tr_id: str, 
                         ctx_keys: Optional[Dict[str, str]] = None, 
                         max_pages: int = 10, 
@@ -1844,16 +1620,12 @@ class MCPKISIntegration:
                     break
                 
                 # 데이터 추출 (output2 우선 - 차트 데이터는 output2에 있음!)
-                page_data = data.get("output2") or data.get("output") or data.get("output1") or []
+                page_data = self._page_rows(data)
                 
                 if not page_data:
                     logger.debug(f"📄 페이지 {page_num + 1}: 데이터 없음")
                     break
                 
-                # 리스트가 아니면 리스트로 변환
-                if isinstance(page_data, dict):
-                    page_data = [page_data]
-                
                 all_rows.extend(page_data)
                 page_count += 1  # ✅ 페이지 카운터 증가
                 
@@ -1865,29 +1637,9 @@ class MCPKISIntegration:
                     logger.debug(f"📄 페이지 {page_count}: {len(page_data)}개 수집 (누적: {len(all_rows)}개)")
                 
                 # 다음 페이지 토큰 확인
-                # 2. CTX 토큰 방식 (우선 체크)
-                if ctx_out_key:
-                    # CTX 방식은 tr_cont 무시하고 토큰으로만 제어
-                    new_token = data.get(ctx_out_key, "")
-                    if not new_token or new_token == ctx_token:
-                        logger.debug(f"📄 페이징 완료: CTX 토큰 없음 또는 중복")
-                        break
-                    ctx_token = new_token
-                else:
-                    # 1. tr_cont 헤더 방식
-                    tr_cont = data.get("tr_cont", "")
-                    if tr_cont in ("F", "M"):
-                        # F(다음 페이지 있음), M(중간) → 계속
-                        pass
-                    elif tr_cont in ("D", "", None):
-                        # D(완료), 빈값, None → 종료
-                        logger.debug(f"📄 페이징 완료: tr_cont={tr_cont or '없음'}")
-                        break
-                    else:
-                        # ✅ 알 수 없는 값 → 보수적으로 한 번 더 시도 후 종료
-                        logger.warning(f"⚠️ 알 수 없는 tr_cont='{tr_cont}' → 다음 페이지 시도 후 종료 예정")
-                        # 다음 루프에서 데이터 없으면 자동 종료됨
-                        pass
+                has_next, ctx_token = self._next_page(data, ctx_out_key, ctx_token)
+                if not has_next:
+                    break
                 
                 # ✅ 데이터가 적으면 마지막 페이지로 판단 (옵션화)
                 if min_batch_size and len(page_data) < min_batch_size:
@@ -1927,6 +1679,104 @@ class MCPKISIntegration:
             logger.error(f"현재가 조회 실패: {symbol}, {e}")
             return None
     
+    # === 대량 조회 (비동기 클라이언트 동기 래퍼) ===
+    
+    @property
+    def async_client(self):
+        """
+        상태(캐시/회로차단기/토큰)를 공유하는 비동기 클라이언트 (지연 생성)
+        
+        Example:
+            prices = await mcp.async_client.get_current_prices(symbols)
+        """
+        client = getattr(self, '_async_client', None)
+        if client is None:
+            from mcp_kis_async import AsyncKISClient
+            client = AsyncKISClient(self)
+            self._async_client = client
+        return client
+    
+    @property
+    def daily_bar_store(self):
+        """
+        로컬 일봉 저장소 (daily_bars 테이블, 지연 생성)
+        
+        Example:
+            mcp.daily_bar_store.sync(symbols)        # 누락 구간만 조회
+            mcp.daily_bar_store.momentum(symbols)    # 저장분으로 모멘텀 계산
+        """
+        store = getattr(self, '_daily_bar_store', None)
+        if store is None:
+            from daily_bar_store import DailyBarStore
+            store = DailyBarStore(self)
+            self._daily_bar_store = store
+        return store
+    
+    @property
+    def feature_scores(self):
+        """
+        오프라인 빌더가 적재한 투자자/배당 점수 테이블 (feature_builder, 지연 생성)
+        
+        Example:
+            mcp.feature_scores.investor_score('005930')   # 피처 없으면 50.0
+        """
+        table = getattr(self, '_feature_scores', None)
+        if table is None:
+            from feature_builder import FeatureScoreTable
+            table = FeatureScoreTable()
+            self._feature_scores = table
+        return table
+    
+    @property
+    def candidate_universe(self):
+        """
+        순위 API 병합 후보 유니버스 빌더 (세션별 캐시, 지연 생성)
+        
+        Example:
+            candidates = mcp.candidate_universe.build(pool_size=2000)
+        """
+        builder = getattr(self, '_candidate_universe', None)
+        if builder is None:
+            from candidate_universe import CandidateUniverseBuilder
+            builder = CandidateUniverseBuilder(self)
+            self._candidate_universe = builder
+        return builder
+    
+    def get_current_prices(self, symbols: List[str], market_type: str = "J") -> Dict[str, Dict]:
+        """
+        여러 종목 현재가 동시 조회 (비동기 클라이언트 동기 래퍼)
+        
+        Returns:
+            {종목코드: 시세데이터} (실패 종목 제외)
+        """
+        from mcp_kis_async import run_coroutine_sync
+        try:
+            return run_coroutine_sync(self.async_client.get_current_prices(symbols, market_type))
+        except Exception as e:
+            logger.error(f"대량 현재가 조회 실패: {e}")
+            return {}
+    
+    def get_financial_ratios_many(self, symbols: List[str]) -> Dict[str, Dict]:
+        """여러 종목 재무비율 동시 조회 → {종목코드: 재무비율}"""
+        from mcp_kis_async import run_coroutine_sync
+        try:
+            return run_coroutine_sync(self.async_client.get_financial_ratios_many(symbols))
+        except Exception as e:
+            logger.error(f"대량 재무비율 조회 실패: {e}")
+            return {}
+    
+    def get_chart_data_many(self, symbols: List[str], period: str = "D", days: int = 365,
+                            use_pagination: bool = True, market_type: str = "J") -> Dict[str, List[Dict]]:
+        """여러 종목 차트 동시 조회 → {종목코드: 차트 행 목록}"""
+        from mcp_kis_async import run_coroutine_sync
+        try:
+            return run_coroutine_sync(
+                self.async_client.get_chart_data_many(symbols, period, days, use_pagination, market_type)
+            )
+        except Exception as e:
+            logger.error(f"대량 차트 조회 실패: {e}")
+            return {}
+    
     def get_asking_price(self, symbol: str) -> Optional[Dict]:
         """주식현재가 호가/예상체결 조회"""
         try:
@@ -1944,6 +1794,27 @@ class MCPKISIntegration:
             logger.error(f"호가 조회 실패: {symbol}, {e}")
             return None
     
+    @staticmethod
+    def _chart_params(symbol: str, period: str = "D", days: int = 365, market_type: str = "J") -> Dict[str, str]:
+        """차트 조회 기본 파라미터 (동기/비동기 공용)"""
+        period_map = {
+            "D": "D",  # 일봉
+            "W": "W",  # 주봉
+            "M": "M"   # 월봉
+        }
+        
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        
+        return {
+            "FID_COND_MRKT_DIV_CODE": market_type,
+            "FID_INPUT_ISCD": symbol,
+            "FID_INPUT_DATE_1": start_date.strftime("%Y%m%d"),
+            "FID_INPUT_DATE_2": end_date.strftime("%Y%m%d"),
+            "FID_PERIOD_DIV_CODE": period_map.get(period, "D"),
+            "FID_ORG_ADJ_PRC": "0"  # 0:수정주가, 1:원주가
+        }
+    
     def get_chart_data(self, symbol: str, period: str = "D", days: int = 365, 
                       use_pagination: bool = True, market_type: str = "J") -> Optional[List[Dict]]:
         """
@@ -1961,23 +1832,7 @@ class MCPKISIntegration:
             TODO: KIS API가 기간별 엔드포인트 분리 시 period에 따라 분기 필요
         """
         try:
-            period_map = {
-                "D": "D",  # 일봉
-                "W": "W",  # 주봉
-                "M": "M"   # 월봉
-            }
-            
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
-            
-            base_params = {
-                "FID_COND_MRKT_DIV_CODE": market_type,
-                "FID_INPUT_ISCD": symbol,
-                "FID_INPUT_DATE_1": start_date.strftime("%Y%m%d"),
-                "FID_INPUT_DATE_2": end_date.strftime("%Y%m%d"),
-                "FID_PERIOD_DIV_CODE": period_map.get(period, "D"),
-                "FID_ORG_ADJ_PRC": "0"  # 0:수정주가, 1:원주가
-            }
+            base_params = self._chart_params(symbol, period, days, market_type)
             
             # ✅ 페이지네이션 지원
             if use_pagination:
@@ -2044,26 +1899,35 @@ class MCPKISIntegration:
             logger.error(f"종목 기본 정보 조회 실패: {symbol}, {e}")
             return None
     
+    @staticmethod
+    def _financial_ratio_params(symbol: str) -> Dict[str, str]:
+        """재무비율 조회 파라미터 (동기/비동기 공용)"""
+        return {
+            "FID_DIV_CLS_CODE": "0",              # 0:년, 1:분기
+            "FID_COND_MRKT_DIV_CODE": "J",        # ✅ 대문자 통일
+            "FID_INPUT_ISCD": symbol               # ✅ 대문자 통일
+        }
+    
+    @staticmethod
+    def _latest_output(data: Optional[dict]) -> Optional[Dict]:
+        """output(list/dict)에서 최신 1건 추출"""
+        if data and 'output' in data:
+            output = data['output']
+            if isinstance(output, list) and len(output) > 0:
+                return output[0]  # 최신 데이터
+            elif isinstance(output, dict):
+                return output
+        return None
+    
     def get_financial_ratios(self, symbol: str) -> Optional[Dict]:
         """국내주식 재무비율 조회 (PER, PBR, ROE 등)"""
         try:
             data = self._make_api_call(
                 endpoint="finance/financial-ratio",
-                params={
-                    "FID_DIV_CLS_CODE": "0",              # 0:년, 1:분기
-                    "FID_COND_MRKT_DIV_CODE": "J",        # ✅ 대문자 통일
-                    "FID_INPUT_ISCD": symbol               # ✅ 대문자 통일
-                },
+                params=self._financial_ratio_params(symbol),
                 tr_id="FHKST66430300"  # 재무비율 TR_ID
             )
-            
-            if data and 'output' in data:
-                output = data['output']
-                if isinstance(output, list) and len(output) > 0:
-                    return output[0]  # 최신 데이터
-                elif isinstance(output, dict):
-                    return output
-            return None
+            return self._latest_output(data)
         except Exception as e:
             logger.error(f"재무비율 조회 실패: {symbol}, {e}")
             return None
@@ -2313,17 +2177,11 @@ class MCPKISIntegration:
             logger.warning(f"⚠️ 시가총액 API 실패, KOSPI 마스터 파일로 대체 시도...")
         
         try:
-            try:
-                import pandas as pd
-            except ImportError:
-                logger.warning("⚠️ pandas 미설치로 KOSPI 마스터 파일 사용 불가")
-                return None
+            from kospi_master import get_kospi_master
             
-            from pathlib import Path
-            
-            kospi_file = Path("kospi_code.xlsx")
-            if kospi_file.exists():
-                df = pd.read_excel(kospi_file)
+            master = get_kospi_master()
+            if not master.empty:
+                df = master.frame
                 
                 # 시가총액으로 정렬
                 if '시가총액' in df.columns:
@@ -3362,13 +3220,15 @@ class MCPKISIntegration:
         else:
             return 'SELL'
     
-    def get_dividend_ranking(self, limit: int = 100, use_pagination: bool = True) -> Optional[List[Dict]]:
+    def get_dividend_ranking(self, limit: int = 100, use_pagination: bool = True,
+                             upjong: str = "0001") -> Optional[List[Dict]]:
         """
         배당률 상위 종목 조회 (페이지네이션 지원, 가치주 발굴에 유용)
         
         Args:
             limit: 조회할 최대 종목 수
             use_pagination: 페이지네이션 사용 여부 (True: 전체 데이터, False: 1페이지만)
+            upjong: 업종 코드 (0001: 코스피 종합, 1001: 코스닥 종합)
         """
         try:
             from datetime import datetime, timedelta
@@ -3379,7 +3239,7 @@ class MCPKISIntegration:
             
             base_params = {
                 "GB1": "0",  # 전체
-                "UPJONG": "0001",  # 코스피 종합
+                "UPJONG": upjong,  # 기본: 코스피 종합
                 "GB2": "0",  # 전체
                 "GB3": "2",  # 현금배당
                 "F_DT": start_date.strftime("%Y%m%d"),
@@ -3663,60 +3523,9 @@ class MCPKISIntegration:
                         })
                     logger.debug(f"✅ 1단계 완료: {len(candidates)}개 후보 (외부 리스트)")
             else:
-                # 기존 방식: 순위 API 조합
+                # 순위 API 조합 (거래량 → 시가총액 → PER → 배당, 세션별 캐시)
                 # 📌 각 API는 30~100개씩만 반환하므로 여러 API를 조합해서 다양한 종목 확보
-                
-                # 1-1. 거래량 상위 종목 (유동성) - 약 30개
-                logger.debug(f"1-1단계: 거래량 상위 종목 조회 (약 30개)...")
-                volume_stocks = self.get_volume_ranking()
-                if volume_stocks:
-                    candidates.extend(volume_stocks)
-                    logger.debug(f"✅ 거래량 상위 {len(volume_stocks)}개 조회")
-                else:
-                    logger.warning("⚠️ 거래량 순위 조회 실패")
-                
-                # 1-2. 시가총액 상위 종목 (대형주) - 약 50~100개
-                if len(candidates) < candidate_pool_size:
-                    logger.debug(f"1-2단계: 시가총액 상위 종목 조회 (약 50~100개)...")
-                    market_cap_stocks = self.get_market_cap_ranking()
-                    if market_cap_stocks:
-                        for stock in market_cap_stocks:
-                            symbol = stock.get('mksc_shrn_iscd', '')
-                            if symbol and not any(c.get('mksc_shrn_iscd') == symbol for c in candidates):
-                                candidates.append(stock)
-                        logger.debug(f"✅ 시가총액 상위 {len(market_cap_stocks)}개 추가 (중복 제외 후: {len(candidates)}개)")
-                
-                # 1-3. PER 순위 (저PER 가치주) - 약 50~100개
-                if len(candidates) < candidate_pool_size:
-                    logger.debug(f"1-3단계: PER 순위 조회 (약 50~100개)...")
-                    per_stocks = self.get_per_ranking()
-                    if per_stocks:
-                        for stock in per_stocks:
-                            symbol = stock.get('mksc_shrn_iscd', '')
-                            if symbol and not any(c.get('mksc_shrn_iscd') == symbol for c in candidates):
-                                candidates.append(stock)
-                        logger.debug(f"✅ PER 순위 {len(per_stocks)}개 추가 (중복 제외 후: {len(candidates)}개)")
-                
-                # 1-4. 배당률 상위 종목 (가치주 특성) - 약 100개
-                if len(candidates) < candidate_pool_size:
-                    logger.debug(f"1-4단계: 배당률 상위 종목 조회 (약 100개)...")
-                    dividend_stocks = self.get_dividend_ranking(limit=100)
-                    if dividend_stocks:
-                        added = 0
-                        for stock in dividend_stocks:
-                            symbol = stock.get('stk_shrn_cd', '') or stock.get('mksc_shrn_iscd', '')
-                            if symbol and len(symbol) == 6:
-                                if not any(c.get('mksc_shrn_iscd') == symbol for c in candidates):
-                                    candidates.append({
-                                        'mksc_shrn_iscd': symbol,
-                                        'hts_kor_isnm': stock.get('hts_kor_isnm', ''),
-                                        'stck_prpr': stock.get('stck_prpr', '0'),
-                                        'acml_vol': stock.get('acml_vol', '0'),
-                                        'prdy_ctrt': stock.get('prdy_ctrt', '0')
-                                    })
-                                    added += 1
-                        logger.debug(f"✅ 배당주 {added}개 추가 (중복 제외 후: {len(candidates)}개)")
-                
+                candidates = self.candidate_universe.build(candidate_pool_size)
                 logger.debug(f"✅ 1단계 완료: 총 {len(candidates)}개 후보 종목 (목표: {candidate_pool_size}개)")
             
             # 2단계: 각 종목의 재무비율 조회 및 가치주 판별
@@ -4189,125 +3998,58 @@ class MCPKISIntegration:
                 
                 logger.info(f"✅ 섹터 내 퍼센타일 적용 완료 ({len(sector_groups)}개 섹터)")
             
-            # ✅ NEW: 모멘텀 가점 (6개월 수익률, 선형 스케일)
-            # ✅ 500 오류 방지: 상위 10개만 적용 (대량 차트 API 호출 방지)
+            # ✅ NEW: 모멘텀 가점 (어댑티브 창 수익률, 선형 스케일)
+            # ✅ 로컬 일봉 저장소: 누락 구간만 조회(종목당 하루 최대 1회) → 전 후보 모멘텀 계산
             if momentum_scoring and len(value_stocks) >= 5:
-                # ✅ API 부하 방지: 상위 10개만 모멘텀 계산 (30→10 감소)
-                momentum_candidates = value_stocks[:min(10, len(value_stocks))]
-                logger.info(f"📈 모멘텀 가점 계산 중 (상위 {len(momentum_candidates)}개 종목만, 500 오류 방지)...")
+                logger.info(f"📈 모멘텀 가점 계산 중 (전체 {len(value_stocks)}개 종목, 로컬 일봉 기준)...")
                 
                 momentum_added = 0
                 momentum_failed = []
                 
-                for idx, stock in enumerate(momentum_candidates):
-                    try:
-                        symbol = stock['symbol']
-                        name = stock.get('name', symbol)
-                        
-                        # ✅ 500 오류 방지: 호출 간 지연 강화 (ChatGPT 권장)
-                        if idx > 0:
-                            # 매 호출마다 2초 대기 (차트 API는 무거움)
-                            time.sleep(2.0)
-                            if idx % 3 == 0:
-                                logger.debug(f"⏸️ 차트 API 부하 방지: 2초 간격 ({idx}/{len(momentum_candidates)})")
-                        
-                        # ✅ 500 오류 방지: 페이지네이션 비활성화 (1페이지만 조회)
-                        # 300일 전체 대신 100일만 조회 (API 부하 감소)
-                        chart_data = self.get_chart_data(symbol, period='D', days=100, use_pagination=False)
-                        
-                        if not chart_data:
-                            momentum_failed.append((name, "차트 데이터 없음"))
-                            continue
-                        
-                        # ✅ 최소 데이터 체크
-                        if len(chart_data) < 60:
-                            momentum_failed.append((name, f"데이터 부족 ({len(chart_data)}일)"))
-                            continue
-                        
-                        # ✅ 역순 정렬 (최신이 마지막)
-                        chart_data = sorted(chart_data, key=lambda x: x.get('stck_bsop_date', ''), reverse=False)
-                        
-                        # ✅ 어댑티브 모멘텀 창 (ChatGPT 권장)
-                        N = len(chart_data)
-                        
-                        # ✅ 모멘텀 설정 상수 사용 (일관성)
-                        target_lookback = self.MOM_LOOKBACK_D
-                        
-                        if N >= target_lookback:
-                            lookback = target_lookback
-                            period_label = f"{int(target_lookback/20)}M"  # 60D→3M, 100D→5M
-                            max_bonus = 20.0 if target_lookback >= 100 else 10.0
-                        elif N >= 60:  # 최소 3개월
-                            lookback = min(N - 1, 60)
-                            period_label = "3M"
-                            max_bonus = 10.0  # ✅ 짧은 기간은 가점 축소
-                        else:
-                            momentum_failed.append((name, f"데이터 부족 ({N}일)"))
-                            continue
-                        
-                        # 실제 사용된 데이터 길이
-                        actual_days = lookback
-                        
-                        price_past = self._to_float(chart_data[-lookback].get('stck_clpr'))
-                        price_now = self._to_float(chart_data[-1].get('stck_clpr'))
-                        
-                        if not price_past or price_past <= 0:
-                            momentum_failed.append((name, f"{period_label} 전 가격 없음"))
-                            continue
-                        
-                        if not price_now or price_now <= 0:
-                            momentum_failed.append((name, "현재 가격 없음"))
-                            continue
-                        
-                        ret_pct = ((price_now - price_past) / price_past) * 100.0
-                        
-                        # ✅ 어댑티브 스케일 (기간에 따라 조정)
-                        if period_label == "6M":
-                            # -30% ~ +50% → -10점 ~ +20점
-                            if ret_pct >= 50:
-                                bump = max_bonus
-                            elif ret_pct <= -30:
-                                bump = -10.0
-                            else:
-                                bump = -10.0 + (ret_pct + 30.0) * 0.375
-                        else:  # 3M
-                            # -20% ~ +30% → -5점 ~ +10점
-                            if ret_pct >= 30:
-                                bump = max_bonus
-                            elif ret_pct <= -20:
-                                bump = -5.0
-                            else:
-                                bump = -5.0 + (ret_pct + 20.0) * 0.30
-                        
-                        stock['score'] = self._clamp_score(stock['score'] + bump)
-                        stock[f'momentum_{period_label.lower()}'] = ret_pct
-                        stock['momentum_period'] = f"{period_label}({actual_days}D)"  # ✅ 실제 길이 명시
-                        
-                        if 'score_breakdown' not in stock:
-                            stock['score_breakdown'] = {}
-                        stock['score_breakdown']['momentum_bonus'] = round(bump, 1)
-                        momentum_added += 1
-                        
-                        # ✅ 라벨 정합 (실제 데이터 길이 명시) - DEBUG 레벨
-                        logger.debug(
-                            f"📈 {name}: {period_label} 수익률 {ret_pct:+.1f}% → 모멘텀 {bump:+.1f}점 "
-                            f"(실제 {actual_days}D/{N}D)"
-                        )
-                        
-                    except Exception as e:
-                        momentum_failed.append((stock.get('name', stock.get('symbol', '?')), str(e)))
-                        logger.debug(f"모멘텀 계산 실패 ({stock.get('name', '?')}): {e}")
+                try:
+                    store = self.daily_bar_store
+                    symbols = [stock['symbol'] for stock in value_stocks]
+                    store.sync(symbols)
+                    momentum = store.momentum(symbols, target_lookback=self.MOM_LOOKBACK_D)
+                except Exception as e:
+                    logger.warning(f"⚠️ 일봉 저장소 사용 불가 → 모멘텀 생략: {e}")
+                    momentum = None
+                
+                for stock in value_stocks:
+                    name = stock.get('name', stock.get('symbol', '?'))
+                    row = momentum.loc[stock['symbol']] if momentum is not None and stock['symbol'] in momentum.index else None
+                    if row is None or row['period_label'] is None:
+                        momentum_failed.append((name, row['reason'] if row is not None else "일봉 저장소 없음"))
                         continue
+                    
+                    period_label = row['period_label']
+                    ret_pct = float(row['ret_pct'])
+                    actual_days = int(row['lookback'])
+                    bump = self._momentum_bump(ret_pct, period_label, float(row['max_bonus']))
+                    
+                    stock['score'] = self._clamp_score(stock['score'] + bump)
+                    stock[f'momentum_{period_label.lower()}'] = ret_pct
+                    stock['momentum_period'] = f"{period_label}({actual_days}D)"  # ✅ 실제 길이 명시
+                    
+                    if 'score_breakdown' not in stock:
+                        stock['score_breakdown'] = {}
+                    stock['score_breakdown']['momentum_bonus'] = round(bump, 1)
+                    momentum_added += 1
+                    
+                    # ✅ 라벨 정합 (실제 데이터 길이 명시) - DEBUG 레벨
+                    logger.debug(
+                        f"📈 {name}: {period_label} 수익률 {ret_pct:+.1f}% → 모멘텀 {bump:+.1f}점 "
+                        f"(실제 {actual_days}D/{int(row['bars'])}D)"
+                    )
                 
                 # ✅ 모멘텀 요약 정보 (ChatGPT 권장)
-                success_rate = momentum_added / len(momentum_candidates) * 100 if momentum_candidates else 0
+                success_rate = momentum_added / len(value_stocks) * 100 if value_stocks else 0
                 logger.info(
-                    f"✅ 모멘텀 가점 완료: {momentum_added}/{len(momentum_candidates)}개 "
-                    f"(성공률 {success_rate:.0f}%, 전체 {len(value_stocks)}개 중 상위만 계산)"
+                    f"✅ 모멘텀 가점 완료: {momentum_added}/{len(value_stocks)}개 "
+                    f"(성공률 {success_rate:.0f}%)"
                 )
                 
-                # ✅ 품질 메트릭: 모멘텀 성공률 (전체 대비 비율)
-                # 상위 10개만 계산하므로, 전체 대비 성공한 비율로 표시
+                # ✅ 품질 메트릭: 모멘텀 성공률 (전체 후보 대비)
                 quality_metrics['momentum_success'] = success_rate / 100.0
                 quality_metrics['momentum_enabled'] = True
                 
@@ -4662,6 +4404,23 @@ class MCPKISIntegration:
             logger.error(f"가치주 발굴 실패: {e}")
             return None
     
+    @staticmethod
+    def _momentum_bump(ret_pct: float, period_label: str, max_bonus: float) -> float:
+        """모멘텀 수익률 → 가점 (기간별 선형 스케일)"""
+        if period_label == "6M":
+            # -30% ~ +50% → -10점 ~ +20점
+            if ret_pct >= 50:
+                return max_bonus
+            if ret_pct <= -30:
+                return -10.0
+            return -10.0 + (ret_pct + 30.0) * 0.375
+        # 3M: -20% ~ +30% → -5점 ~ +10점
+        if ret_pct >= 30:
+            return max_bonus
+        if ret_pct <= -20:
+            return -5.0
+        return -5.0 + (ret_pct + 20.0) * 0.30
+    
     def _clamp_score(self, x: float, lo: float = 0.0, hi: float = 100.0) -> float:
         """
         점수를 범위 내로 클램핑 (NaN 방어 포함)
@@ -4724,17 +4483,15 @@ class MCPKISIntegration:
     
     def _calculate_investor_score(self, symbol: str) -> float:
         """
-        투자자 동향 점수 (⚠️ 500 오류 방지: API 호출 제거)
+        투자자 동향 점수 (investor_features 테이블 조회, API 호출 없음)
         
         Note:
             투자자 동향은 10% 가중치
             → 대량 종목 처리 시 API 호출하면 AppKey 차단 위험
-            → 기본 점수 50점 반환 (중립)
-            → 정확한 투자자 동향이 필요하면 외부 데이터에서 미리 제공
+            → feature_builder.py가 장 마감 후 수집한 점수를 O(1) 조회
+            → 피처가 없거나 오래되면 기본 점수 50점 (중립)
         """
-        # ⚠️ 500 오류 방지: get_investor_trend() 호출 완전 제거
-        # 대량 종목 처리 시 이 함수가 300번 호출되면 AppKey 차단됨
-        return 50.0  # 중립 점수 (투자자 가중치는 10%로 영향 제한적)
+        return self.feature_scores.investor_score(symbol)
     
     def _calculate_trading_quality_score(self, current_price_data: Dict) -> float:
         """
@@ -4787,16 +4544,14 @@ class MCPKISIntegration:
     
     def _calculate_dividend_score(self, symbol: str) -> float:
         """
-        배당률 기반 점수 (⚠️ 500 오류 방지: API 호출 제거)
+        배당률 기반 점수 (dividend_features 테이블 조회, API 호출 없음)
         
         Note:
-            배당률은 5% 가중치밖에 안 되므로 API 호출 비용 대비 효과 낮음
-            → 기본 점수 50점 반환 (중립)
-            → 정확한 배당률이 필요하면 외부 데이터에서 미리 제공해야 함
+            배당률은 5% 가중치
+            → feature_builder.py가 수집한 배당률 순위 스냅샷 점수를 O(1) 조회
+            → 순위에 없는 종목은 기본 점수 50점 (중립)
         """
-        # ⚠️ 500 오류 방지: get_stock_basic_info() 호출 완전 제거
-        # 대량 종목 처리 시 이 함수가 300번 호출되면 AppKey 차단됨
-        return 50.0  # 중립 점수 (배당 가중치는 5%로 영향 미미)
+        return self.feature_scores.dividend_score(symbol)
     
     def _hydrate_current_prices(self, symbols: List[str], market_type: str = "J", use_batch: bool = False) -> Dict[str, Dict]:
         """
@@ -4840,20 +4595,8 @@ class MCPKISIntegration:
                     logger.info(f"📦 개별 조회로 {len(symbols)}개 종목 시세 수집 시작")
                 else:
                     logger.warning(f"⚠️ 멀티시세 API 실패, 개별 조회로 폴백: {len(symbols)}개")
-                price_map = {}
-                
-                for i, symbol in enumerate(symbols):
-                    try:
-                        # 레이트 리밋 준수
-                        if i > 0 and i % 10 == 0:
-                            logger.debug(f"📦 개별 조회 진행: {i}/{len(symbols)}")
-                        
-                        cur = self.get_current_price(symbol, market_type)
-                        if cur:
-                            price_map[symbol] = cur
-                    except Exception as e:
-                        logger.debug(f"개별 조회 실패 {symbol}: {e}")
-                        continue
+                # ✅ 비동기 클라이언트로 동시 조회 (속도는 전역 Rate Limiter가 제어)
+                price_map = self.get_current_prices(symbols, market_type)
                 
                 logger.info(f"✅ 개별 조회 완료: {len(price_map)}/{len(symbols)}개")
                 return price_map
@@ -5302,10 +5045,17 @@ class MCPKISIntegration:
         except:
             return 50.0
     
-    def clear_cache(self):
-        """캐시 초기화 (멀티스레드 안전)"""
+    def clear_cache(self, persistent: bool = False):
+        """
+        캐시 초기화 (멀티스레드 안전)
+        
+        Args:
+            persistent: True면 영구 응답 캐시(SQLite)도 삭제
+        """
         with self._cache_lock:  # ✅ Lock으로 보호
             self.cache.clear()
+        if persistent and self.response_cache is not None:
+            self.response_cache.clear()
         logger.info("KIS API 캐시 초기화 완료")
     
     def close(self):
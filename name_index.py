@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+종목명/기업명 검색 인덱스 (KOSPI 마스터, DART 기업 고유번호 공용)
+
+이름 목록을 질의마다 선형 탐색하던 것(search_stock_by_name 부분 일치,
+find_corp_code_by_name 유사도, search_companies 포함 검색)을 한 번 만든 인덱스로
+대체합니다.
+
+- 정확 일치 / 정규화 이름 일치: 해시 O(1)
+- 전방 일치: 정렬된 이름 배열 + bisect (트라이와 같은 범위 조회, O(log n))
+- 포함 일치: 2-gram 역색인 교집합 후 후보만 검증
+- 유사도(SequenceMatcher) 매칭: 2-gram 공유 후보를 길이/quick_ratio 상한으로 거른 뒤
+  공유 수 상위 후보만 ratio 계산 → DART 전체(약 9만 개)에서도 질의당 수백 개 이하만 비교
+
+Example:
+    index = NameIndex(['삼성전자', '삼성SDI'], values=['005930', '006400'])
+    index.get('삼성전자')                 # 0
+    index.contains('SDI')                # [1]
+    index.fuzzy('삼성 전자', threshold=0.8)  # [(0, 1.0)]
+"""
+
+import bisect
+import logging
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 역색인 n-gram 길이
+NGRAM_SIZE = 2
+
+# 유사도 비교 후보 상한 (2-gram 공유 수 상위)
+MAX_FUZZY_CANDIDATES = 256
+
+# 기본 정규화에서 제거할 법인 표기
+COMPANY_MARKERS = ('주식회사', '(주)', '㈜')
+
+
+def normalize_name(name: str) -> str:
+    """기본 정규화: 법인 표기/공백 제거, 소문자"""
+    if not name:
+        return ''
+    normalized = str(name).strip().lower()
+    for marker in COMPANY_MARKERS:
+        normalized = normalized.replace(marker, '')
+    return ''.join(normalized.split())
+
+
+def _ngrams(text: str, n: int = NGRAM_SIZE) -> Set[str]:
+    """n-gram 집합 (n보다 짧으면 문자열 자체)"""
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NameIndex:
+    """이름 목록 검색 인덱스 (생성 후 읽기 전용, 스레드 세이프)"""
+
+    def __init__(self, names: Sequence[str], values: Optional[Sequence[Any]] = None,
+                 normalizer: Callable[[str], str] = normalize_name):
+        """
+        Args:
+            names: 이름 목록 (위치가 id)
+            values: 이름별 값 (예: 종목코드, 없으면 None)
+            normalizer: 정규화 함수 (유사도/정규화 일치용)
+        """
+        self.names: List[str] = ['' if n is None else str(n) for n in names]
+        self.values: Optional[List[Any]] = list(values) if values is not None else None
+        self.normalizer = normalizer
+
+        # 정확 일치 (같은 이름은 뒤 id 우선 - dict(zip()) 동작과 동일)
+        self._exact: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+
+        # 포함/전방 일치용 소문자 이름
+        self._folded: List[str] = [name.lower() for name in self.names]
+        self._sorted: List[Tuple[str, int]] = sorted((f, i) for i, f in enumerate(self._folded))
+        self._sorted_keys: List[str] = [f for f, _ in self._sorted]
+
+        # 정규화 이름 (유사도/정규화 일치용, 같은 정규화 이름은 앞 id 우선)
+        self._normalized: List[str] = [normalizer(name) for name in self.names]
+        self._by_normalized: Dict[str, int] = {}
+        for i, norm in enumerate(self._normalized):
+            self._by_normalized.setdefault(norm, i)
+
+        self._by_length: Dict[int, List[int]] = {}
+        for i, norm in enumerate(self._normalized):
+            if len(norm) <= 2 * NGRAM_SIZE:  # 짧은 질의 유사도용
+                self._by_length.setdefault(len(norm), []).append(i)
+
+        # 2-gram 역색인 (원문 소문자 / 정규화 이름)
+        self._grams = self._build_postings(self._folded)
+        self._norm_grams = self._build_postings(self._normalized)
+
+    @staticmethod
+    def _build_postings(texts: Sequence[str]) -> Dict[str, List[int]]:
+        postings: Dict[str, List[int]] = {}
+        for i, text in enumerate(texts):
+            for gram in _ngrams(text):
+                postings.setdefault(gram, []).append(i)
+        return postings
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def value(self, i: int) -> Any:
+        """id → 값 (values 미지정이면 이름)"""
+        return self.values[i] if self.values is not None else self.names[i]
+
+    # ============================================
+    # 조회
+    # ============================================
+
+    def get(self, name: str) -> Optional[int]:
+        """정확 일치 id"""
+        return self._exact.get(name)
+
+    def get_normalized(self, name: str) -> Optional[int]:
+        """정규화 이름 일치 id (공백/법인 표기/대소문자 무시)"""
+        return self._by_normalized.get(self.normalizer(name))
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[int]:
+        """전방 일치 id (대소문자 무시, 이름 정렬 순)"""
+        key = prefix.lower()
+        start = bisect.bisect_left(self._sorted_keys, key)
+        ids = []
+        for folded, i in self._sorted[start:]:
+            if not folded.startswith(key) or (limit is not None and len(ids) >= limit):
+                break
+            ids.append(i)
+        return ids
+
+    def contains(self, keyword: str, limit: Optional[int] = None) -> List[int]:
+        """
+        keyword를 포함하는 이름 id (대소문자 무시, id 오름차순)
+
+        2-gram 역색인 교집합으로 후보를 좁힌 뒤 실제 포함 여부를 확인합니다.
+        """
+        key = keyword.lower()
+        if not key:
+            ids = range(len(self.names))
+        elif len(key) < NGRAM_SIZE:
+            ids = (i for i, folded in enumerate(self._folded) if key in folded)
+        else:
+            postings = sorted((self._grams.get(g, []) for g in _ngrams(key)), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:]) if postings else set()
+            ids = (i for i in sorted(candidates) if key in self._folded[i])
+        result = []
+        for i in ids:
+            if limit is not None and len(result) >= limit:
+                break
+            result.append(i)
+        return result
+
+    def contained_in(self, text: str) -> List[int]:
+        """text의 부분 문자열인 이름 id (부분 문자열 해시 조회, O(len²))"""
+        found = set()
+        for start in range(len(text)):
+            for end in range(start + 1, len(text) + 1):
+                i = self._exact.get(text[start:end])
+                if i is not None:
+                    found.add(i)
+        return sorted(found)
+
+    def best_partial(self, query: str) -> Optional[Tuple[float, int]]:
+        """
+        부분 일치 최적 후보 (기존 search_stock_by_name 스코어링과 동일)
+
+        - query ⊂ 이름: 전방 일치 3점, 그 외 1점
+        - 이름 ⊂ query: query가 이름으로 시작하면 2점, 그 외 1점
+        - 공통: + 1 / (1 + 길이 차이), 동점은 짧은 이름 → 앞 id 순
+
+        이름은 대소문자를 구분해 비교합니다 (호출 측에서 대문자 정규화).
+
+        Returns:
+            (점수, id) 또는 None
+        """
+        if not query:
+            return None
+        scored: Dict[int, float] = {}
+        for i in self.contains(query):
+            name = self.names[i]
+            if query not in name:  # contains()는 대소문자 무시
+                continue
+            score = 3 if name.startswith(query) else 1
+            scored[i] = score + 1.0 / (1 + abs(len(query) - len(name)))
+        for i in self.contained_in(query):
+            if i in scored:
+                continue
+            name = self.names[i]
+            score = 2 if query.startswith(name) else 1
+            scored[i] = score + 1.0 / (1 + abs(len(query) - len(name)))
+        if not scored:
+            return None
+        best = min(scored, key=lambda i: (-scored[i], len(self.names[i]), i))
+        return scored[best], best
+
+    def fuzzy(self, query: str, threshold: float = 0.8, limit: int = 1,
+              max_candidates: int = MAX_FUZZY_CANDIDATES) -> List[Tuple[int, float]]:
+        """
+        정규화 이름 유사도 매칭 (SequenceMatcher.ratio >= threshold)
+
+        2-gram을 공유하는 이름을 길이 상한과 quick_ratio(문자 중복 상한)로 먼저 거르고,
+        남은 후보 중 2-gram 공유 수 상위 max_candidates개만 ratio를 계산합니다.
+        (임계값 0.75 이상이면 2-gram 공유 없이 임계값을 넘는 경우는 3자 이하
+        이름뿐이라 짧은 질의는 짧은 이름 전체를 후보로 추가)
+
+        Returns:
+            [(id, 유사도)] - 유사도 내림차순, 동점은 앞 id 우선
+        """
+        norm = self.normalizer(query)
+        if not norm:
+            return []
+        exact = self._by_normalized.get(norm)
+        if exact is not None and limit == 1:
+            return [(exact, 1.0)]
+
+        counts = Counter()
+        for gram in _ngrams(norm):
+            counts.update(self._norm_grams.get(gram, ()))
+        n = len(norm)
+        if n <= NGRAM_SIZE + 1:
+            max_len = int(n * (2.0 - threshold) / max(threshold, 1e-9))
+            for length in range(1, min(max_len, 2 * NGRAM_SIZE) + 1):
+                counts.update(self._by_length.get(length, ()))
+
+        survivors = []
+        matcher = SequenceMatcher(None, '', norm)  # b(질의) 전처리 재사용
+        for i, shared in counts.items():
+            candidate = self._normalized[i]
+            # ratio 상한 = 2·min(len) / (len 합)
+            if 2.0 * min(n, len(candidate)) / (n + len(candidate)) < threshold:
+                continue
+            matcher.set_seq1(candidate)
+            if matcher.quick_ratio() >= threshold:
+                survivors.append((-shared, i))
+        survivors.sort()
+
+        results = []
+        for _, i in survivors[:max_candidates]:
+            # 기존 구현과 같은 비교 방향 (질의, 이름)
+            score = SequenceMatcher(None, norm, self._normalized[i]).ratio()
+            if score >= threshold:
+                results.append((i, score))
+        results.sort(key=lambda r: (-r[1], r[0]))
+        return results[:limit]
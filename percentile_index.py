@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+경험적 퍼센타일 인덱스 (정렬 배열 + searchsorted)
+
+분위수 5개(p10~p90) 선형 보간 대신 실제 표본을 정렬된 NumPy 배열로 보관하고
+np.searchsorted로 O(log n) 퍼센타일을 계산합니다. 배열은 생성 후 읽기 전용이라
+여러 스레드가 락 없이 공유할 수 있습니다.
+
+퍼센타일 정의 (mid-rank):
+    pct(x) = 100 × (#{v < x} + 0.5 × #{v == x}) / n
+"""
+
+import math
+import numbers
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from sector_stats_engine import QUANTILES
+
+
+class EmpiricalDistribution:
+    """정렬된 표본 배열 기반 분포 (불변)"""
+
+    __slots__ = ('values',)
+
+    def __init__(self, values: Iterable[float], drop_zero: bool = True, presorted: bool = False):
+        """
+        Args:
+            values: 표본 값 (NaN/inf 자동 제외)
+            drop_zero: 0 값 제외 (섹터 통계 엔진과 같은 정책)
+            presorted: 이미 정렬·정제된 float64 배열이면 True (복사/정렬 생략)
+        """
+        arr = np.asarray(values, dtype=np.float64)
+        if not presorted:
+            mask = np.isfinite(arr)
+            if drop_zero:
+                mask &= arr != 0
+            arr = np.sort(arr[mask])
+        arr.setflags(write=False)
+        self.values = arr
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> 'EmpiricalDistribution':
+        """to_bytes() 결과에서 복원 (DB BLOB)"""
+        return cls(np.frombuffer(blob, dtype='<f8').astype(np.float64), presorted=True)
+
+    def to_bytes(self) -> bytes:
+        """리틀엔디언 float64 바이트열 (DB BLOB 저장용)"""
+        return self.values.astype('<f8').tobytes()
+
+    @property
+    def size(self) -> int:
+        return int(self.values.size)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def percentile(self, value: Optional[float]) -> Optional[float]:
+        """
+        단일 값 퍼센타일 (0~100)
+
+        Returns:
+            퍼센타일 또는 None (값이 유한수가 아니거나 표본 없음)
+        """
+        if value is None or not isinstance(value, numbers.Real) or not self.size:
+            return None
+        value = float(value)  # numpy 스칼라(np.int64, np.float32 등) 포함
+        if not math.isfinite(value):
+            return None
+        lo = np.searchsorted(self.values, value, side='left')
+        hi = np.searchsorted(self.values, value, side='right')
+        return float(100.0 * (lo + 0.5 * (hi - lo)) / self.size)
+
+    def percentiles(self, values) -> np.ndarray:
+        """
+        벡터화 퍼센타일 (0~100, 유한수가 아니면 NaN)
+
+        Args:
+            values: 배열형 값 목록
+        """
+        x = np.asarray(values, dtype=np.float64)
+        out = np.full(x.shape, np.nan)
+        if not self.size:
+            return out
+        finite = np.isfinite(x)
+        lo = np.searchsorted(self.values, x[finite], side='left')
+        hi = np.searchsorted(self.values, x[finite], side='right')
+        out[finite] = 100.0 * (lo + 0.5 * (hi - lo)) / self.size
+        return out
+
+    def breakpoints(self) -> Dict[str, Any]:
+        """
+        기존 breakpoint dict 형식 (p10~p90 + 요약 통계 + sample_size)
+
+        np.percentile(linear)과 같은 값이라 기존 보간 경로와 호환됩니다.
+        """
+        if not self.size:
+            return {'sample_size': 0}
+        q = np.quantile(self.values, list(QUANTILES.values()))
+        result: Dict[str, Any] = dict(zip(QUANTILES, (float(v) for v in q)))
+        result.update({
+            'mean': float(self.values.mean()),
+            'std': float(self.values.std()),
+            'min': float(self.values[0]),
+            'max': float(self.values[-1]),
+            'sample_size': self.size,
+        })
+        return result
+
+
+class SectorPercentileIndex:
+    """
+    섹터 × 지표별 정렬 표본 인덱스 (스냅샷 1회 구성, 스레드 간 공유)
+
+    지표마다 (섹터, 값) 순으로 한 번 정렬한 배열을 두고, 섹터별 분포는 그 배열의
+    구간 뷰(EmpiricalDistribution)로 보관합니다.
+
+    Example:
+        index = SectorPercentileIndex.from_frame(snapshot_df)
+        index.percentile('전기전자', 'per', 8.5)                  # 단일
+        index.percentiles(df['sector_name'], 'per', df['per'])    # 후보 전체 (벡터화)
+    """
+
+    def __init__(self, distributions: Dict[str, Dict[str, EmpiricalDistribution]],
+                 snapshot_date: Optional[str] = None):
+        """
+        Args:
+            distributions: {지표: {섹터: EmpiricalDistribution}}
+            snapshot_date: 기준 스냅샷 날짜 (정보용)
+        """
+        self._distributions = distributions
+        self.snapshot_date = snapshot_date
+
+    @classmethod
+    def from_frame(cls, df, sector_col: str = 'sector_normalized',
+                   metrics: Optional[Iterable[str]] = None, min_sample_size: Optional[int] = None,
+                   snapshot_date: Optional[str] = None, drop_zero: bool = True) -> 'SectorPercentileIndex':
+        """
+        종목 DataFrame에서 인덱스 구성 (지표별 lexsort 1회)
+
+        Args:
+            df: 종목 행 DataFrame (sector_col + 지표 컬럼)
+            sector_col: 섹터 컬럼명
+            metrics: 지표 목록 (None이면 per/pbr/roe)
+            min_sample_size: 섹터 최소 종목 수 (None이면 섹터 통계 엔진과 동일)
+            snapshot_date: 기준 스냅샷 날짜
+            drop_zero: 0 값 제외
+        """
+        import pandas as pd
+        from sector_stats_engine import DEFAULT_METRICS, MIN_SECTOR_SAMPLE
+
+        metrics = list(metrics or DEFAULT_METRICS)
+        min_sample_size = MIN_SECTOR_SAMPLE if min_sample_size is None else min_sample_size
+        distributions: Dict[str, Dict[str, EmpiricalDistribution]] = {m: {} for m in metrics}
+        if df is None or len(df) == 0 or sector_col not in df.columns:
+            return cls(distributions, snapshot_date)
+
+        sectors = df[sector_col]
+        counts = sectors.value_counts()
+        eligible = counts[counts >= min_sample_size].index
+        frame = df[sectors.isin(eligible)]
+        if frame.empty:
+            return cls(distributions, snapshot_date)
+
+        codes, names = pd.factorize(frame[sector_col], sort=True)
+        for metric in metrics:
+            if metric not in frame.columns:
+                continue
+            values = pd.to_numeric(frame[metric], errors='coerce').to_numpy(dtype=np.float64)
+            mask = np.isfinite(values)
+            if drop_zero:
+                mask &= values != 0
+            v, c = values[mask], codes[mask]
+            order = np.lexsort((v, c))            # 섹터 → 값 순 정렬 (1회)
+            v, c = v[order], c[order]
+            bounds = np.searchsorted(c, np.arange(len(names) + 1), side='left')
+            for i, name in enumerate(names):
+                lo, hi = bounds[i], bounds[i + 1]
+                if hi > lo:
+                    distributions[metric][name] = EmpiricalDistribution(v[lo:hi], presorted=True)
+        return cls(distributions, snapshot_date)
+
+    @property
+    def metrics(self):
+        return list(self._distributions)
+
+    def sectors(self, metric: str):
+        return list(self._distributions.get(metric, {}))
+
+    def get(self, sector: str, metric: str) -> Optional[EmpiricalDistribution]:
+        """섹터 × 지표 분포 (없으면 None)"""
+        return self._distributions.get(metric, {}).get(sector)
+
+    def percentile(self, sector: str, metric: str, value: Optional[float]) -> Optional[float]:
+        """단일 값 섹터 내 퍼센타일 (분포 없으면 None)"""
+        dist = self.get(sector, metric)
+        return dist.percentile(value) if dist is not None else None
+
+    def percentiles(self, sectors, metric: str, values) -> np.ndarray:
+        """
+        후보 전체 섹터 내 퍼센타일 (섹터별 searchsorted 1회, 분포 없으면 NaN)
+
+        Args:
+            sectors: 종목별 섹터명 (배열형)
+            metric: 지표명
+            values: 종목별 값 (배열형)
+        """
+        sectors = np.asarray(sectors, dtype=object)
+        values = np.asarray(values, dtype=np.float64)
+        out = np.full(values.shape, np.nan)
+        by_sector = self._distributions.get(metric, {})
+        for sector in set(sectors.tolist()):
+            dist = by_sector.get(sector)
+            if dist is None:
+                continue
+            rows = sectors == sector
+            out[rows] = dist.percentiles(values[rows])
+        return out
@@ -0,0 +1,775 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+2단계 스크리닝 파이프라인 (조회 I/O 스레드 + 평가 CPU 프로세스 풀)
+
+ValueStockFinder 스크리닝은 종목별로 API 조회와 순수 파이썬 평가
+(evaluate_value_stock, 리스크 평가, MoS, 설명 생성)를 한 스레드에서 섞어 실행해
+평가 부분이 GIL에 묶여 있었습니다. 이를 두 단계로 나눕니다.
+
+- 조회 단계: 스레드 풀 + 배치/백오프 (레이트 리미터가 TPS 보장)
+  → fetch_screening_data: 시세/재무, 섹터 메타데이터, 모멘텀(API)까지 미리 조회
+- 평가 단계: 기본은 현재 프로세스에서 배치 평가 (score_screening_batch 컬럼 단위, API 호출 없음)
+  → cpu_workers를 명시하면(cli.py screen) fork 프로세스 풀로 코어 수만큼 확장
+  → 섹터 통계/퍼센타일 인덱스/KOSPI 마스터를 fork 전에 부모에서 한 번 적재해
+    자식은 읽기 전용(copy-on-write)으로 공유
+  → 멀티스레드 서버(Streamlit)에서 fork하면 상속된 락/커넥션 때문에 자식이 멈출 수 있어 기본값은 끔
+  → fork를 쓸 수 없는 환경(Windows 등)이나 소량이면 현재 프로세스에서 순차 평가
+
+ScreeningEngine은 유니버스 수집 → 조회 → 평가를 UI 없이 실행하고
+ScreeningResult를 돌려줍니다. Streamlit(진행률 콜백 어댑터), cli.py screen 명령,
+야간 배치(cron)가 같은 엔진을 사용합니다.
+
+결과는 DB screening_runs / screening_results에 (스냅샷 날짜, 옵션 해시, 코드 버전)
+키로 저장됩니다. 옵션 해시에는 해석된 유니버스(종목코드)가 포함되므로 유니버스를 넘기지 않은
+CLI 실행과 해석된 유니버스를 넘기는 Streamlit 실행이 같은 키를 씁니다.
+- 같은 날 같은 옵션 재요청 → 저장된 결과를 바로 반환 (조회/평가 없음)
+- 재스크리닝 → 직전 실행과 평가 입력 해시가 같은 종목은 결과 재사용, 바뀐 종목만 재평가
+
+ScreeningEngine.stream은 같은 실행을 종목 단위로 흘려보냅니다. 조회가 끝난 종목을 바로 평가해
+결과 행을 완료 순서대로 내보내므로 UI는 전체 완료를 기다리지 않고 상위 N(TopN)을 갱신하고,
+상위 N이 안정되면 중단(남은 조회 취소)할 수 있습니다.
+
+Example:
+    fetched = fetch_stage(finder, [('005930', '삼성전자')], options)
+    results = score_stage(finder, fetched, options)
+
+    result = ScreeningEngine().run({'max_stocks': 250})
+    result.to_dataframe().head()
+
+    top = TopN(20)
+    with ScreeningEngine().stream({'max_stocks': 250}) as rows:
+        for row in rows:
+            top.add(row)
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import textwrap
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 이 수 미만이면 프로세스 풀 대신 현재 프로세스에서 평가 (fork 비용 > 이득)
+PROCESS_POOL_MIN_ITEMS = 64
+
+# 프로세스 풀 작업 단위 (종목 수)
+SCORE_CHUNK_SIZE = 16
+
+# 현재 프로세스 배치 평가 단위 (종목 수, 진행 표시 간격)
+BATCH_SCORE_SIZE = 200
+
+# 에러 샘플 최대 개수 (UI 표시용)
+MAX_ERROR_SAMPLES = 3
+
+# API 호출 전략 (사이드바 선택값과 동일)
+STRATEGY_FAST = "빠른 모드 (병렬 처리)"
+STRATEGY_SAFE = "안전 모드 (배치 처리)"
+STRATEGY_SEQUENTIAL = "순차 모드 (안전)"
+
+# 동적 컷: 점수 중앙값 대비 비율 (v2.3)
+DYNAMIC_CUT_RATIO = 0.9
+
+# 평가 로직 버전 (score_screening_data 점수/추천 규칙이나 결과 행 형식 변경 시 올림 → 저장 결과 무효화)
+SCORING_VERSION = 1
+
+# 평가 결과에 영향이 없는 옵션 (옵션 해시에서 제외)
+NON_RESULT_OPTIONS = frozenset({'api_strategy', 'fast_mode', 'fast_latency', 'cpu_workers', 'refresh_results',
+                                'stream_top_n', 'stop_when_stable'})
+
+# 스트리밍 상위 N 기본값 / 안정 판단 최소 행 수 (상위 N이 이만큼 연속 그대로면 안정)
+STREAM_TOP_N = 20
+STREAM_STABLE_MIN_ROWS = 30
+
+ProgressCallback = Callable[[int, int], None]
+FetchedItem = Tuple[str, str, Dict[str, Any]]
+
+# fork된 평가 워커가 상속받는 ValueStockFinder (부모에서 풀 생성 직전에 설정)
+_WORKER_FINDER = None
+
+
+class StageErrors:
+    """단계별 오류 집계 (유형별 건수 + 메시지 샘플)"""
+
+    def __init__(self):
+        self.counter: Counter = Counter()
+        self.samples: List[str] = []
+
+    def add(self, label: str, exc: BaseException):
+        msg = f"{label} 분석 오류: {exc}"
+        logger.error(msg)
+        if len(self.samples) < MAX_ERROR_SAMPLES:
+            self.samples.append(textwrap.shorten(msg, width=120, placeholder="..."))
+        self.counter[type(exc).__name__] += 1
+
+    def __bool__(self) -> bool:
+        return bool(self.counter)
+
+
+def process_pool_available() -> bool:
+    """fork 기반 프로세스 풀 사용 가능 여부 (Windows/spawn 전용 환경은 False)"""
+    return os.name != 'nt' and 'fork' in multiprocessing.get_all_start_methods()
+
+
+def default_cpu_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def fetch_stage(finder, items: Sequence[Tuple[str, str]], options: Dict[str, Any],
+                max_workers: int = 3, batch_size: Optional[int] = None, base_delay: float = 0.0,
+                on_progress: Optional[ProgressCallback] = None,
+                errors: Optional[StageErrors] = None) -> List[FetchedItem]:
+    """
+    조회 단계 (스레드 풀, 배치 간 동적 백오프)
+
+    Args:
+        finder: ValueStockFinder (fetch_screening_data 제공)
+        items: [(종목코드, 종목명)]
+        options: 스크리닝 옵션
+        max_workers: 조회 스레드 수
+        batch_size: 배치 크기 (None이면 전체 한 번에)
+        base_delay: 배치 간 기본 대기 (오류 배치마다 1.5배, 최대 4배)
+        on_progress: (완료 수, 전체 수) 콜백
+        errors: 오류 집계 (None이면 내부 생성)
+
+    Returns:
+        [(종목코드, 종목명, stock_data)] - items 순서 유지, 조회 실패 종목 제외
+    """
+    errors = errors if errors is not None else StageErrors()
+    total = len(items)
+    batch_size = batch_size or max(total, 1)
+    fetched: Dict[int, FetchedItem] = {}
+    backoff = 1.0
+    done = 0
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for batch_start in range(0, total, batch_size):
+            batch = list(enumerate(items[batch_start:batch_start + batch_size], start=batch_start))
+            batch_error = False
+            futures = {
+                executor.submit(finder.fetch_screening_data, symbol, name, options): (i, symbol, name)
+                for i, (symbol, name) in batch
+            }
+            for future in concurrent.futures.as_completed(futures):
+                i, symbol, name = futures[future]
+                try:
+                    stock_data = future.result()
+                    if stock_data:
+                        fetched[i] = (symbol, name, stock_data)
+                except Exception as e:
+                    errors.add(name or symbol, e)
+                    batch_error = True
+                done += 1
+                if on_progress:
+                    on_progress(done, total)
+
+            # 동적 백오프 (마지막 배치 이후 생략)
+            if base_delay > 0 and batch_start + batch_size < total:
+                if batch_error:
+                    backoff = min(backoff * 1.5, 4.0)
+                    logger.warning(f"배치 오류 감지, 백오프 증가: {backoff:.1f}x")
+                else:
+                    backoff = max(backoff / 1.2, 1.0)
+                time.sleep(base_delay * backoff)
+
+    return [fetched[i] for i in sorted(fetched)]
+
+
+def _prime_shared_state(finder, fetched: Sequence[FetchedItem]):
+    """fork 전에 평가가 읽는 공유 데이터를 부모에서 적재 (자식은 copy-on-write로 공유)"""
+    for loader in ('_get_global_percentiles_cached', '_get_sector_percentile_index'):
+        try:
+            getattr(finder, loader)()
+        except Exception as e:
+            logger.debug(f"공유 데이터 적재 실패 ({loader}): {e}")
+    for sector in {data.get('sector_name', '') for _, _, data in fetched}:
+        try:
+            finder.get_sector_specific_criteria(sector)
+        except Exception as e:
+            logger.debug(f"섹터 기준 적재 실패 ({sector}): {e}")
+    try:
+        from kospi_master import get_kospi_master
+        get_kospi_master()
+    except Exception as e:
+        logger.debug(f"KOSPI 마스터 적재 실패: {e}")
+
+
+def _score_items(finder, chunk: Sequence[FetchedItem], options: Dict[str, Any],
+                 errors: Optional[StageErrors] = None) -> List[Optional[Dict[str, Any]]]:
+    """
+    묶음 평가 (score_screening_batch 컬럼 단위 평가 우선, 없거나 실패하면 종목별 score_screening_data)
+
+    Args:
+        errors: 종목별 오류 집계 (None이면 예외를 그대로 전파)
+
+    Returns:
+        chunk 순서의 결과 행 목록 (평가 실패/제외 종목은 None)
+    """
+    score_batch = getattr(finder, 'score_screening_batch', None)
+    if score_batch is not None:
+        try:
+            return score_batch(list(chunk), options)
+        except Exception as e:
+            logger.warning(f"⚠️ 배치 평가 실패, 종목별 평가로 대체: {e}")
+    results = []
+    for symbol, name, data in chunk:
+        try:
+            results.append(finder.score_screening_data(symbol, name, data, options))
+        except Exception as e:
+            if errors is None:
+                raise
+            errors.add(name or symbol, e)
+            results.append(None)
+    return results
+
+
+def _score_chunk(chunk: List[FetchedItem], options: Dict[str, Any]) -> List[Optional[Dict[str, Any]]]:
+    """평가 워커 (fork로 상속한 _WORKER_FINDER 사용)"""
+    return _score_items(_WORKER_FINDER, chunk, options)
+
+
+def score_stage(finder, fetched: Sequence[FetchedItem], options: Dict[str, Any],
+                processes: Optional[int] = None, on_progress: Optional[ProgressCallback] = None,
+                errors: Optional[StageErrors] = None) -> List[Dict[str, Any]]:
+    """
+    평가 단계 (processes 명시 시 fork 프로세스 풀, 기본/불가/소량이면 현재 프로세스)
+
+    후보 묶음은 finder.score_screening_batch(컬럼 단위 평가)로 점수화하고,
+    배치 평가가 없거나 실패한 묶음만 종목별 score_screening_data로 평가합니다.
+
+    Args:
+        finder: ValueStockFinder (score_screening_batch/score_screening_data 제공)
+        fetched: fetch_stage 결과
+        options: 스크리닝 옵션
+        processes: 프로세스 수 (None/1이면 현재 프로세스 - 풀은 옵트인)
+            멀티스레드 프로세스(Streamlit 서버)에서 fork하면 자식이 상속한 락 때문에
+            멈출 수 있으므로 스레드가 적은 CLI/배치에서만 명시하세요.
+        on_progress: (완료 수, 전체 수) 콜백
+        errors: 오류 집계
+
+    Returns:
+        결과 행 목록 (fetched 순서, 평가 실패/제외 종목 제외)
+    """
+    global _WORKER_FINDER
+    errors = errors if errors is not None else StageErrors()
+    total = len(fetched)
+    processes = processes or 1
+    use_pool = processes > 1 and total >= PROCESS_POOL_MIN_ITEMS and process_pool_available()
+
+    if not use_pool:
+        results = []
+        for start in range(0, total, BATCH_SCORE_SIZE):
+            chunk = fetched[start:start + BATCH_SCORE_SIZE]
+            results.extend(result for result in _score_items(finder, chunk, options, errors) if result)
+            if on_progress:
+                on_progress(start + len(chunk), total)
+        return results
+
+    _prime_shared_state(finder, fetched)
+    chunks = [list(fetched[i:i + SCORE_CHUNK_SIZE]) for i in range(0, total, SCORE_CHUNK_SIZE)]
+    scored: Dict[int, List[Optional[Dict[str, Any]]]] = {}
+    done = 0
+    _WORKER_FINDER = finder
+    try:
+        context = multiprocessing.get_context('fork')
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(processes, len(chunks)),
+                                                    mp_context=context) as executor:
+            futures = {executor.submit(_score_chunk, chunk, options): n for n, chunk in enumerate(chunks)}
+            for future in concurrent.futures.as_completed(futures):
+                n = futures[future]
+                try:
+                    scored[n] = future.result()
+                except Exception as e:
+                    # 워커 실패(피클링 등) → 해당 묶음은 현재 프로세스에서 재평가
+                    logger.warning(f"⚠️ 평가 워커 실패, 현재 프로세스에서 재평가: {e}")
+                    scored[n] = _score_items(finder, chunks[n], options, errors)
+                done += len(chunks[n])
+                if on_progress:
+                    on_progress(done, total)
+    finally:
+        _WORKER_FINDER = None
+
+    logger.info(f"✅ 프로세스 풀 평가: {total}개 종목, {min(processes, len(chunks))}개 프로세스")
+    return [result for n in sorted(scored) for result in scored[n] if result]
+
+
+def fetch_workers(api_strategy: str, rate_capacity: float = 0) -> int:
+    """API 호출 전략별 조회 스레드 수 (빠른 모드일수록 워커↑, 레이트 리미터가 TPS 보장)"""
+    if api_strategy == STRATEGY_FAST:
+        return min(12, max(4, int(rate_capacity // 2)))
+    if api_strategy == STRATEGY_SAFE:
+        return 5
+    return 1
+
+
+# ============================================
+# 결과 저장 키
+# ============================================
+
+def _json_default(value):
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+def _digest(payload: Any) -> str:
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=_json_default)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def options_hash(options: Dict[str, Any], universe: Sequence[Tuple[str, str]]) -> str:
+    """결과에 영향을 주는 옵션 + 해석된 유니버스(종목코드) 해시"""
+    payload = {k: v for k, v in options.items() if k not in NON_RESULT_OPTIONS}
+    payload['_universe'] = sorted(code for code, _ in universe)
+    return _digest(payload)
+
+
+def code_version() -> str:
+    """평가 코드 버전 ('v{SCORING_VERSION}', UI 등 평가와 무관한 수정은 저장 결과를 무효화하지 않음)"""
+    return f"v{SCORING_VERSION}"
+
+
+def input_hash(stock_data: Dict[str, Any], context: Any = None) -> str:
+    """평가 입력 해시 (stock_data + 평가 컨텍스트: 섹터/글로벌 통계 날짜)"""
+    return _digest({'data': stock_data, 'context': context})
+
+
+# ============================================
+# 헤드리스 스크리닝 엔진
+# ============================================
+
+StageProgressCallback = Callable[[str, int, int], None]
+
+
+@dataclass
+class ScreeningResult:
+    """스크리닝 실행 결과 (UI 독립)"""
+    options: Dict[str, Any]
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    universe_size: int = 0
+    fetched_count: int = 0
+    error_counts: Dict[str, int] = field(default_factory=dict)
+    error_samples: List[str] = field(default_factory=list)
+    started_at: datetime = field(default_factory=datetime.now)
+    elapsed_sec: float = 0.0
+    snapshot_date: Optional[date] = None
+    options_hash: str = ''
+    code_version: str = ''
+    reused_count: int = 0  # 입력 스냅샷이 같아 직전 결과를 재사용한 종목 수
+    from_store: bool = False  # 저장된 결과를 그대로 반환했는지
+    stopped_early: bool = False  # 스트리밍 조기 종료 (일부 종목만 평가, 저장 안 함)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def to_dataframe(self):
+        """
+        결과 DataFrame (동적 컷 보조 컬럼 포함, 추천 → 점수 내림차순 정렬)
+
+        pass_dynamic_cut: value_score >= 중앙값 * DYNAMIC_CUT_RATIO
+        """
+        import pandas as pd
+        df = pd.DataFrame(self.rows)
+        if df.empty:
+            return df
+        try:
+            df["pass_dynamic_cut"] = df["value_score"] >= df["value_score"].median() * DYNAMIC_CUT_RATIO
+        except Exception:
+            df["pass_dynamic_cut"] = False
+        return df.sort_values(["recommendation", "value_score"], ascending=[True, False]).reset_index(drop=True)
+
+    def summary(self) -> Dict[str, Any]:
+        """실행 요약 (로그/CLI 출력용)"""
+        return {
+            'started_at': self.started_at.isoformat(timespec='seconds'),
+            'elapsed_sec': round(self.elapsed_sec, 2),
+            'api_strategy': self.options.get('api_strategy'),
+            'universe_size': self.universe_size,
+            'fetched': self.fetched_count,
+            'scored': len(self.rows),
+            'reused': self.reused_count,
+            'from_store': self.from_store,
+            'stopped_early': self.stopped_early,
+            'snapshot_date': str(self.snapshot_date) if self.snapshot_date else None,
+            'code_version': self.code_version,
+            'errors': dict(self.error_counts),
+            'error_samples': list(self.error_samples),
+        }
+
+
+class ScreeningEngine:
+    """
+    UI 없는 유니버스 스크리닝 (유니버스 수집 → 조회 단계 → 평가 단계 → 결과 저장)
+
+    진행률은 on_progress(단계, 완료 수, 전체 수) 콜백으로만 알리며
+    단계는 'fetch' / 'score' 입니다.
+    """
+
+    def __init__(self, finder=None, store=None, persist: bool = True):
+        """
+        Args:
+            finder: ValueStockFinder (None이면 처음 사용할 때 생성)
+            store: 결과 저장 DBCacheManager (None이면 전역 DB 캐시)
+            persist: False면 결과 저장/재사용 안 함
+        """
+        self._finder = finder
+        self._store = store
+        self.persist = persist
+
+    @property
+    def finder(self):
+        if self._finder is None:
+            from value_stock_finder import ValueStockFinder
+            self._finder = ValueStockFinder()
+        return self._finder
+
+    @property
+    def store(self):
+        """결과 저장소 (사용 불가면 None)"""
+        if not self.persist:
+            return None
+        if self._store is None:
+            try:
+                from db_cache_manager import get_db_cache
+                self._store = get_db_cache()
+            except Exception as e:
+                logger.warning(f"⚠️ 스크리닝 결과 저장소 사용 불가 (저장 없이 실행): {e}")
+                self.persist = False
+                return None
+        return self._store
+
+    def resolve_universe(self, max_stocks: int) -> List[Tuple[str, str]]:
+        """시총 상위 max_stocks개 [(종목코드, 종목명)] (유니버스 조회 실패 시 빈 목록)"""
+        universe = self.finder.get_stock_universe(max_stocks) or {}
+        pairs = []
+        for code, data in list(universe.items())[:max_stocks]:
+            name = data.get('name', '') if isinstance(data, dict) else (data or '')
+            pairs.append((code, name))
+        return pairs
+
+    def _pairs(self, options: Dict[str, Any], universe: Optional[Sequence[Tuple[str, str]]]) -> List[Tuple[str, str]]:
+        """명시 유니버스 또는 options['max_stocks'] 기준 시총 상위 (저장 키는 항상 이 목록 기준)"""
+        return list(universe) if universe is not None else self.resolve_universe(int(options['max_stocks']))
+
+    def load_stored(self, options: Dict[str, Any], universe: Optional[Sequence[Tuple[str, str]]] = None,
+                    snapshot_date: Optional[date] = None) -> Optional[ScreeningResult]:
+        """같은 (스냅샷 날짜, 옵션+유니버스, 코드 버전)의 저장된 결과 (없으면 None)"""
+        store = self.store
+        if store is None:
+            return None
+        from value_stock_finder import QuickPatches
+        options = QuickPatches.merge_options(options)
+        options.setdefault('max_stocks', 15)
+        pairs = self._pairs(options, universe)
+        if not pairs:
+            return None
+        snapshot_date = snapshot_date or date.today()
+        key = (snapshot_date, options_hash(options, pairs), code_version())
+        start = time.perf_counter()
+        try:
+            run = store.get_screening_run(*key)
+            if run is None:
+                return None
+            rows = store.get_screening_rows(*key)
+        except Exception as e:
+            logger.warning(f"⚠️ 저장된 스크리닝 결과 조회 실패: {e}")
+            return None
+        logger.info(f"✅ 저장된 스크리닝 결과 사용: {len(rows)}개 ({snapshot_date})")
+        return ScreeningResult(
+            options=options, rows=rows, universe_size=run.get('universe_size') or 0,
+            fetched_count=run.get('fetched_count') or 0, elapsed_sec=time.perf_counter() - start,
+            snapshot_date=snapshot_date, options_hash=key[1], code_version=key[2],
+            reused_count=run.get('reused_count') or 0, from_store=True,
+        )
+
+    def run(self, options: Optional[Dict[str, Any]] = None,
+            universe: Optional[Sequence[Tuple[str, str]]] = None,
+            on_progress: Optional[StageProgressCallback] = None,
+            refresh: bool = False, snapshot_date: Optional[date] = None) -> ScreeningResult:
+        """
+        스크리닝 실행
+
+        Args:
+            options: 스크리닝 옵션 (누락 키는 기본값으로 채움)
+            universe: [(종목코드, 종목명)] (None이면 options['max_stocks'] 기준 시총 상위)
+            on_progress: (단계, 완료 수, 전체 수) 콜백
+            refresh: True면 저장된 같은 키 결과를 무시하고 다시 실행 (입력이 같은 종목은 재사용)
+            snapshot_date: 결과 저장 날짜 (기본: 오늘)
+
+        Returns:
+            ScreeningResult (유니버스가 비면 universe_size == 0)
+        """
+        from value_stock_finder import QuickPatches
+        options = QuickPatches.merge_options(options)
+        options.setdefault('max_stocks', 15)
+        snapshot_date = snapshot_date or date.today()
+        started_at = datetime.now()
+        start = time.perf_counter()
+
+        # 저장 키는 해석된 유니버스 기준 (유니버스 명시 여부와 무관하게 같은 키)
+        pairs = self._pairs(options, universe)
+        if pairs and not refresh:
+            stored = self.load_stored(options, pairs, snapshot_date)
+            if stored is not None:
+                return stored
+
+        key_hash = options_hash(options, pairs)
+        version = code_version()
+        result = ScreeningResult(options=options, universe_size=len(pairs), started_at=started_at,
+                                 snapshot_date=snapshot_date, options_hash=key_hash, code_version=version)
+        if not pairs:
+            logger.warning("⚠️ 스크리닝 유니버스가 비어 있습니다")
+            return result
+
+        finder = self.finder
+        store = self.store
+        errors = StageErrors()
+        workers = fetch_workers(options['api_strategy'], getattr(getattr(finder, 'rate_limiter', None), 'capacity', 0))
+
+        def _stage(name):
+            return (lambda done, total: on_progress(name, done, total)) if on_progress else None
+
+        fetched = fetch_stage(finder, pairs, options, max_workers=workers,
+                              on_progress=_stage('fetch'), errors=errors)
+        result.fetched_count = len(fetched)
+
+        # 증분 재평가: 직전 실행과 평가 입력이 같은 종목은 저장된 결과 재사용
+        hashes: Dict[str, str] = {}
+        previous: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        if store is not None:
+            try:
+                context = store.get_stats_dates()
+                hashes = {symbol: input_hash(data, context) for symbol, _, data in fetched}
+                previous = store.get_latest_screening_inputs(key_hash, version)
+            except Exception as e:
+                logger.warning(f"⚠️ 직전 스크리닝 결과 조회 실패 (전체 재평가): {e}")
+        reused = {symbol: previous[symbol][1] for symbol, _, _ in fetched
+                  if symbol in previous and previous[symbol][0] == hashes.get(symbol)}
+        to_score = [item for item in fetched if item[0] not in reused]
+
+        scored = score_stage(finder, to_score, options, processes=options.get('cpu_workers'),
+                             on_progress=_stage('score'), errors=errors)
+        by_symbol = {row['symbol']: row for row in scored}
+        by_symbol.update(reused)
+        result.rows = [by_symbol[symbol] for symbol, _, _ in fetched if symbol in by_symbol]
+        result.reused_count = len(reused)
+        result.error_counts = dict(errors.counter)
+        result.error_samples = list(errors.samples)
+        result.elapsed_sec = time.perf_counter() - start
+
+        self._save_run(store, result, hashes)
+
+        logger.info(f"✅ 스크리닝 완료: 대상 {len(pairs)}개, 조회 {len(fetched)}개, "
+                    f"평가 {len(to_score)}개 (재사용 {len(reused)}개), 결과 {len(result.rows)}개, "
+                    f"{result.elapsed_sec:.1f}초")
+        return result
+
+    def _save_run(self, store, result: ScreeningResult, hashes: Dict[str, str]):
+        """실행 결과 저장 (저장소 없음/실패 시 경고만)"""
+        if store is None:
+            return
+        try:
+            store.save_screening_run(result.snapshot_date, result.options_hash, result.code_version, result.rows,
+                                     input_hashes=hashes, meta={
+                'options_json': json.dumps(result.options, ensure_ascii=False, default=_json_default),
+                'universe_size': result.universe_size, 'fetched_count': result.fetched_count,
+                'reused_count': result.reused_count, 'elapsed_sec': result.elapsed_sec,
+            })
+        except Exception as e:
+            logger.warning(f"⚠️ 스크리닝 결과 저장 실패: {e}")
+
+    def stream(self, options: Optional[Dict[str, Any]] = None,
+               universe: Optional[Sequence[Tuple[str, str]]] = None,
+               on_progress: Optional[StageProgressCallback] = None,
+               refresh: bool = False, snapshot_date: Optional[date] = None) -> 'ScreeningStream':
+        """
+        스트리밍 스크리닝 (run과 같은 옵션/저장 키, 평가가 끝난 행부터 바로 내보냄)
+
+        진행률은 on_progress('fetch', 완료 수, 전체 수)로만 보고합니다 (종목마다 조회 직후 평가).
+
+        Example:
+            top = TopN(20)
+            with engine.stream(options) as rows:
+                for row in rows:
+                    top.add(row)
+                    if top.stable:
+                        break   # 남은 조회 취소, 결과 저장 안 함
+        """
+        return ScreeningStream(self, options, universe, on_progress, refresh, snapshot_date)
+
+
+class ScreeningStream:
+    """
+    스트리밍 스크리닝 실행 (ScreeningEngine.stream)
+
+    조회가 끝난 종목을 바로 평가해 결과 행을 완료 순서대로 내보냅니다.
+    (종목 단위 파이프라인이라 평가는 현재 프로세스에서 수행 - 첫 결과까지 전체 조회를 기다리지 않음)
+
+    - 끝까지 반복하면 result.rows가 유니버스 순서로 채워지고 run과 같은 키로 저장
+    - 중간에 close()(with 블록 종료)하면 남은 조회를 취소하고 저장하지 않음 (result.stopped_early)
+    """
+
+    def __init__(self, engine: ScreeningEngine, options, universe, on_progress, refresh, snapshot_date):
+        from value_stock_finder import QuickPatches
+        self.engine = engine
+        self.options = QuickPatches.merge_options(options)
+        self.options.setdefault('max_stocks', 15)
+        self.universe = universe
+        self.on_progress = on_progress
+        self.refresh = refresh
+        self.snapshot_date = snapshot_date or date.today()
+        self.result = ScreeningResult(options=self.options, snapshot_date=self.snapshot_date)
+        self._rows = self._iterate()
+
+    def __iter__(self):
+        return self._rows
+
+    def __enter__(self) -> 'ScreeningStream':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def close(self):
+        """반복 중단 (진행 중인 조회 외 남은 조회 취소)"""
+        self._rows.close()
+
+    def _iterate(self):
+        engine, options, snapshot_date = self.engine, self.options, self.snapshot_date
+        start = time.perf_counter()
+        pairs = engine._pairs(options, self.universe)
+        if pairs and not self.refresh:
+            stored = engine.load_stored(options, pairs, snapshot_date)
+            if stored is not None:
+                self.result = stored
+                yield from stored.rows
+                return
+
+        result = self.result = ScreeningResult(
+            options=options, universe_size=len(pairs), snapshot_date=snapshot_date,
+            options_hash=options_hash(options, pairs), code_version=code_version())
+        if not pairs:
+            logger.warning("⚠️ 스크리닝 유니버스가 비어 있습니다")
+            return
+
+        finder = engine.finder
+        store = engine.store
+        errors = StageErrors()
+        workers = fetch_workers(options['api_strategy'], getattr(getattr(finder, 'rate_limiter', None), 'capacity', 0))
+
+        # 증분 재평가 기준 (run과 동일: 입력 해시가 같으면 직전 결과 재사용)
+        context, previous, hashing = None, {}, store is not None
+        if store is not None:
+            try:
+                context = store.get_stats_dates()
+                previous = store.get_latest_screening_inputs(result.options_hash, result.code_version)
+            except Exception as e:
+                logger.warning(f"⚠️ 직전 스크리닝 결과 조회 실패 (전체 재평가): {e}")
+                hashing = False
+        hashes: Dict[str, str] = {}
+        rows: Dict[int, Dict[str, Any]] = {}
+        complete = False
+
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, workers))
+        try:
+            futures = {
+                executor.submit(finder.fetch_screening_data, symbol, name, options): (i, symbol, name)
+                for i, (symbol, name) in enumerate(pairs)
+            }
+            pending, done = set(futures), 0
+            while pending:
+                # 함께 완료된 조회를 한 묶음으로 배치 평가 (묶음 단위 완료 순서, 묶음 안은 입력 순서)
+                finished, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                ready: Dict[int, Dict[str, Any]] = {}
+                to_score: List[Tuple[int, FetchedItem]] = []
+                for future in finished:
+                    i, symbol, name = futures[future]
+                    done += 1
+                    try:
+                        stock_data = future.result()
+                        if stock_data:
+                            result.fetched_count += 1
+                            if hashing:
+                                hashes[symbol] = input_hash(stock_data, context)
+                            prior = previous.get(symbol)
+                            if prior is not None and prior[0] == hashes.get(symbol):
+                                ready[i] = prior[1]
+                                result.reused_count += 1
+                            else:
+                                to_score.append((i, (symbol, name, stock_data)))
+                    except Exception as e:
+                        errors.add(name or symbol, e)
+                    if self.on_progress:
+                        self.on_progress('fetch', done, len(pairs))
+                if to_score:
+                    scored = _score_items(finder, [item for _, item in to_score], options, errors)
+                    ready.update((i, row) for (i, _), row in zip(to_score, scored))
+                for i, row in sorted(ready.items()):
+                    if row:
+                        rows[i] = row
+                        yield row
+            complete = True
+        finally:
+            executor.shutdown(wait=complete, cancel_futures=not complete)
+            result.rows = [rows[i] for i in sorted(rows)]
+            result.error_counts = dict(errors.counter)
+            result.error_samples = list(errors.samples)
+            result.elapsed_sec = time.perf_counter() - start
+            result.stopped_early = not complete
+
+        engine._save_run(store, result, hashes)
+        logger.info(f"✅ 스트리밍 스크리닝 완료: 대상 {len(pairs)}개, 조회 {result.fetched_count}개 "
+                    f"(재사용 {result.reused_count}개), 결과 {len(result.rows)}개, {result.elapsed_sec:.1f}초")
+
+
+class TopN:
+    """
+    점수 상위 N개 실시간 집계 (스트리밍 표시 + 조기 종료 판단)
+
+    stable: N개가 찼고 최근 patience개 행 동안 상위 N(종목과 순서)이 바뀌지 않음
+    """
+
+    def __init__(self, n: int, patience: Optional[int] = None, key: str = 'value_score'):
+        self.n = max(1, int(n))
+        self.patience = patience if patience is not None else max(STREAM_STABLE_MIN_ROWS, 2 * self.n)
+        self.key = key
+        self.rows: List[Dict[str, Any]] = []
+        self.seen = 0
+        self.unchanged = 0
+
+    def _score(self, row: Dict[str, Any]) -> float:
+        try:
+            return float(row.get(self.key) or 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def add(self, row: Optional[Dict[str, Any]]) -> bool:
+        """행 반영 → 상위 N 변경 여부"""
+        self.seen += 1
+        before = [r.get('symbol') for r in self.rows]
+        if row:
+            self.rows.append(row)
+            self.rows.sort(key=self._score, reverse=True)
+            del self.rows[self.n:]
+        changed = [r.get('symbol') for r in self.rows] != before
+        self.unchanged = 0 if changed else self.unchanged + 1
+        return changed
+
+    @property
+    def stable(self) -> bool:
+        return len(self.rows) >= self.n and self.unchanged >= self.patience
+
+    def to_dataframe(self, columns: Optional[Sequence[str]] = None):
+        """상위 N DataFrame (점수 내림차순, columns 중 있는 컬럼만)"""
+        import pandas as pd
+        df = pd.DataFrame(self.rows)
+        if columns is not None and not df.empty:
+            df = df[[c for c in columns if c in df.columns]]
+        return df
@@ -22,19 +22,23 @@ import logging
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
-import numpy as np
+import pandas as pd
+
+from sector_stats_engine import DEFAULT_METRICS, compute_sector_stats, describe_values
 
 logger = logging.getLogger(__name__)
 
 class SectorCacheManager:
     """섹터 통계 캐시 매니저"""
     
-    def __init__(self, cache_dir: str = 'cache', ttl_hours: int = 24):
+    def __init__(self, cache_dir: str = 'cache', ttl_hours: int = 24, metrics: Optional[List[str]] = None):
         """
         Args:
             cache_dir: 캐시 디렉토리
             ttl_hours: 캐시 유효 시간 (시간)
+            metrics: 섹터 통계 지표 (종목 데이터 키, 기본 per/pbr/roe)
         """
+        self.metrics = list(metrics or DEFAULT_METRICS)
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(exist_ok=True)
         self.cache_file = self.cache_dir / 'sector_stats.pkl'
@@ -88,30 +92,9 @@ class SectorCacheManager:
             logger.error(f"❌ 캐시 저장 실패: {e}")
     
     def calculate_percentiles(self, values: List[float]) -> Dict[str, float]:
-        """퍼센타일 계산"""
-        if not values:
-            return {}
-        
-        # 유효한 값만 필터링
-        valid_values = [v for v in values if v is not None and not np.isnan(v) and v != 0]
-        
-        if len(valid_values) < 3:
-            return {}
-        
+        """퍼센타일 계산 (0/NaN 제외, 유효값 3개 미만이면 빈 dict)"""
         try:
-            percentiles = {
-                'p10': float(np.percentile(valid_values, 10)),
-                'p25': float(np.percentile(valid_values, 25)),
-                'p50': float(np.percentile(valid_values, 50)),
-                'p75': float(np.percentile(valid_values, 75)),
-                'p90': float(np.percentile(valid_values, 90)),
-                'mean': float(np.mean(valid_values)),
-                'std': float(np.std(valid_values)),
-                'min': float(np.min(valid_values)),
-                'max': float(np.max(valid_values)),
-            }
-            return percentiles
-        
+            return describe_values(values or [])
         except Exception as e:
             logger.warning(f"퍼센타일 계산 실패: {e}")
             return {}
@@ -145,59 +128,28 @@ class SectorCacheManager:
             
             logger.info(f"  ✅ 1단계 완료: {len(all_stocks)}개 종목 수집 (섹터 통계용)")
             
-            # 2. 섹터별 분리
+            # 2. 섹터별 분리 (DataFrame 한 번 구성)
             logger.info("  2단계: 섹터별 분리 중...")
-            sector_groups = {}
+            df = pd.DataFrame.from_dict(all_stocks, orient='index')
+            if 'sector' not in df.columns:
+                df['sector'] = '기타'
+            raw_sectors = df['sector'].fillna('기타')
             
-            # ✅ v2.2.3: 섹터명 정규화 필요 - ValueStockFinder의 정규화 사용
-            for stock_code, stock_data in all_stocks.items():
-                raw_sector = stock_data.get('sector', '기타')
-                
-                # ValueStockFinder가 아닌 경우 간단한 정규화
-                if hasattr(stock_provider, '_normalize_sector_name'):
-                    sector = stock_provider._normalize_sector_name(raw_sector)
-                else:
-                    sector = raw_sector  # 정규화 없이 원본 사용
-                
-                if sector not in sector_groups:
-                    sector_groups[sector] = []
-                
-                sector_groups[sector].append(stock_data)
+            # ✅ v2.2.3: 섹터명 정규화 필요 - ValueStockFinder의 정규화 사용 (고유 섹터명만 1회씩)
+            if hasattr(stock_provider, '_normalize_sector_name'):
+                mapping = {raw: stock_provider._normalize_sector_name(raw) for raw in raw_sectors.unique()}
+                df['sector_normalized'] = raw_sectors.map(mapping)
+            else:
+                df['sector_normalized'] = raw_sectors  # 정규화 없이 원본 사용
             
-            logger.info(f"  ✅ {len(sector_groups)}개 섹터 발견")
+            logger.info(f"  ✅ {df['sector_normalized'].nunique()}개 섹터 발견")
             
-            # 3. 섹터별 통계 계산
+            # 3. 섹터별 통계 계산 (벡터화 엔진, DBCacheManager와 동일 정책)
             logger.info("  3단계: 섹터별 통계 계산 중...")
-            sector_stats = {}
+            sector_stats = compute_sector_stats(df, sector_col='sector_normalized', metrics=self.metrics)
             
-            for sector, stocks in sector_groups.items():
-                n = len(stocks)
-                
-                # 최소 표본 크기 확인 (30개 이상)
-                if n < 30:
-                    logger.debug(f"  ⚠️ {sector}: 표본 부족 (n={n}) → 제외")
-                    continue
-                
-                # PER, PBR, ROE 추출
-                per_values = [s.get('per') for s in stocks if s.get('per')]
-                pbr_values = [s.get('pbr') for s in stocks if s.get('pbr')]
-                roe_values = [s.get('roe') for s in stocks if s.get('roe')]
-                
-                # 퍼센타일 계산
-                per_percentiles = self.calculate_percentiles(per_values)
-                pbr_percentiles = self.calculate_percentiles(pbr_values)
-                roe_percentiles = self.calculate_percentiles(roe_values)
-                
-                # 통계 저장
-                sector_stats[sector] = {
-                    'sample_size': n,
-                    'per_percentiles': per_percentiles,
-                    'pbr_percentiles': pbr_percentiles,
-                    'roe_percentiles': roe_percentiles,
-                    'timestamp': datetime.now().isoformat(),
-                }
-                
-                logger.info(f"  ✅ {sector}: n={n}")
+            for sector, stats in sector_stats.items():
+                logger.info(f"  ✅ {sector}: n={stats['sample_size']}")
             
             logger.info(f"✅ 섹터 통계 계산 완료: {len(sector_stats)}개 섹터")
             
@@ -11,6 +11,8 @@ from datetime import datetime
 import requests
 import json
 
+from kis_rate_limiter import KISGlobalRateLimiter
+
 logger = logging.getLogger(__name__)
 
 class SectorIndexProvider:
@@ -36,15 +38,12 @@ class SectorIndexProvider:
             # 추가 업종 코드들은 KIS API 문서 참조
         }
         
-        # API 호출 제한
+        # API 호출 제한 (전역 Rate Limiter의 시세 레인 사용)
         self.last_request_time = 0
-        self.request_interval = 0.1  # 100ms 간격
     
     def _rate_limit(self):
-        """API 요청 속도 제어"""
-        elapsed_time = time.time() - self.last_request_time
-        if elapsed_time < self.request_interval:
-            time.sleep(self.request_interval - elapsed_time)
+        """API 요청 속도 제어 (KISDataProvider/MCPKISIntegration과 동일한 쿼터 공유)"""
+        KISGlobalRateLimiter.rate_limit(lane='quotations')
         self.last_request_time = time.time()
     
     def _to_float(self, value: Any, default: float = 0.0) -> float:
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+섹터 통계 엔진 (벡터화)
+
+DBCacheManager.compute_sector_stats와 SectorCacheManager.compute_sector_stats가
+공유하는 단일 계산 경로입니다.
+
+- 섹터 × 지표 × 분위수를 pandas groupby 한 번으로 계산 (섹터별 파이썬 루프 없음)
+- 지표는 컬럼 이름 목록으로 지정 → debt_ratio, dividend_yield, trading_value 등
+  새 지표도 코드 수정 없이 추가 가능
+- 정책 통일: 최소 표본 MIN_SECTOR_SAMPLE(5), 0/NaN/inf 값 제외, 지표별 유효값 3개 미만은 빈 통계
+
+결과 형식 (기존 pickle/DB 캐시와 호환):
+    {
+        '전기전자': {
+            'sample_size': 42,
+            'per_percentiles': {'p10': ..., 'p25': ..., 'p50': ..., 'p75': ..., 'p90': ...,
+                                'mean': ..., 'std': ..., 'min': ..., 'max': ...},
+            'pbr_percentiles': {...},
+            'roe_percentiles': {...},
+            'timestamp': '2025-10-12T09:00:00'
+        }
+    }
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 기본 지표 (sector_stats 테이블 기본 컬럼)
+DEFAULT_METRICS: Sequence[str] = ('per', 'pbr', 'roe')
+
+# 분위수 이름 → 확률
+QUANTILES: Mapping[str, float] = {'p10': 0.10, 'p25': 0.25, 'p50': 0.50, 'p75': 0.75, 'p90': 0.90}
+
+# 분위수 외 요약 통계 (std는 np.std와 같은 모집단 표준편차)
+SUMMARY_STATS: Sequence[str] = ('mean', 'std', 'min', 'max')
+
+# 통계 이름 순서 (DB 컬럼 '{metric}_{stat}' 생성 순서)
+STAT_NAMES: Sequence[str] = tuple(QUANTILES) + tuple(SUMMARY_STATS)
+
+# 섹터 최소 표본 크기 (v2.3: n < 5 극소 표본은 저장 안 함, 사용 시 표본 크기별 가중)
+MIN_SECTOR_SAMPLE = 5
+
+# 지표별 최소 유효값 수 (미만이면 해당 지표 통계 비움)
+MIN_VALID_VALUES = 3
+
+
+def compute_sector_frame(df: pd.DataFrame, sector_col: str = 'sector_normalized',
+                         metrics: Optional[Iterable[str]] = None,
+                         min_sample_size: int = MIN_SECTOR_SAMPLE,
+                         min_valid_values: int = MIN_VALID_VALUES,
+                         drop_zero: bool = True) -> pd.DataFrame:
+    """
+    섹터 × 지표 × 통계를 한 번의 grouped pass로 계산
+
+    Args:
+        df: 종목 행 DataFrame (sector_col + 지표 컬럼)
+        sector_col: 섹터 컬럼명
+        metrics: 지표 컬럼 목록 (None이면 DEFAULT_METRICS, 없는 컬럼은 NaN 취급)
+        min_sample_size: 섹터 최소 종목 수
+        min_valid_values: 지표별 최소 유효값 수
+        drop_zero: 0 값 제외 여부 (KIS는 적자/미제공을 0으로 반환)
+
+    Returns:
+        index=섹터, columns=['sample_size', '{metric}_{stat}', ...] 인 DataFrame
+    """
+    metrics = list(metrics or DEFAULT_METRICS)
+    columns = ['sample_size'] + [f"{m}_{s}" for m in metrics for s in STAT_NAMES]
+    if df is None or df.empty or sector_col not in df.columns:
+        return pd.DataFrame(columns=columns)
+
+    frame = df[df[sector_col].notna()]
+    sample_size = frame.groupby(sector_col, sort=True).size()
+    sample_size = sample_size[sample_size >= min_sample_size]
+    if sample_size.empty:
+        return pd.DataFrame(columns=columns)
+
+    frame = frame[frame[sector_col].isin(sample_size.index)]
+
+    # ✅ 지표 컬럼 → long 형식 (sector, metric, value) 후 유효값만
+    values = pd.DataFrame({
+        m: pd.to_numeric(frame[m], errors='coerce') if m in frame.columns else np.nan
+        for m in metrics
+    }, index=frame.index)
+    values[sector_col] = frame[sector_col].values
+    long = values.melt(id_vars=sector_col, var_name='metric', value_name='value')
+    valid = np.isfinite(long['value'].to_numpy(dtype=float))
+    if drop_zero:
+        valid &= long['value'].to_numpy(dtype=float) != 0
+    long = long[valid]
+
+    result = pd.DataFrame(index=sample_size.index, columns=columns[1:], dtype=float)
+    result.insert(0, 'sample_size', sample_size.astype(int))
+    if long.empty:
+        return result
+
+    # ✅ 단일 groupby: 분위수 5개 + 요약 통계 4개 + 유효값 수
+    grouped = long.groupby([sector_col, 'metric'], sort=False)['value']
+    quantiles = grouped.quantile(list(QUANTILES.values())).unstack()
+    quantiles.columns = list(QUANTILES)
+    summary = grouped.agg(['mean', 'min', 'max', 'count'])
+    summary['std'] = grouped.std(ddof=0)
+    stats = quantiles.join(summary)
+    stats = stats[stats['count'] >= min_valid_values].drop(columns='count')
+
+    # (sector, metric) × stat → sector × '{metric}_{stat}'
+    wide = stats[list(STAT_NAMES)].unstack('metric')
+    wide.columns = [f"{metric}_{stat}" for stat, metric in wide.columns]
+    result.update(wide)
+    return result
+
+
+def frame_to_sector_stats(frame: pd.DataFrame, timestamp: Optional[str] = None,
+                          metrics: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    섹터 통계 DataFrame(또는 sector_stats 테이블 행) → 기존 캐시 딕셔너리 형식
+
+    Args:
+        frame: compute_sector_frame 결과 (index=섹터) 또는 'sector' 컬럼을 가진 DB 조회 결과
+        timestamp: 결과에 기록할 시각 문자열 (None이면 현재 시각)
+        metrics: 변환할 지표 (None이면 '{metric}_p50' 컬럼에서 자동 감지)
+
+    Returns:
+        {섹터: {'sample_size', '{metric}_percentiles', 'timestamp'}}
+    """
+    if frame is None or frame.empty:
+        return {}
+    if 'sector' in frame.columns:
+        frame = frame.set_index('sector')
+    if metrics is None:
+        metrics = [c[:-len('_p50')] for c in frame.columns if c.endswith('_p50')]
+    timestamp = timestamp or datetime.now().isoformat()
+
+    sector_stats: Dict[str, Dict[str, Any]] = {}
+    for sector, row in zip(frame.index, frame.to_dict('records')):
+        entry: Dict[str, Any] = {'sample_size': int(row['sample_size'])}
+        for metric in metrics:
+            stats = {stat: row.get(f"{metric}_{stat}") for stat in STAT_NAMES}
+            if all(v is None or pd.isna(v) for v in stats.values()):
+                entry[f"{metric}_percentiles"] = {}
+            else:
+                entry[f"{metric}_percentiles"] = {
+                    k: (None if v is None or pd.isna(v) else float(v)) for k, v in stats.items()
+                }
+        entry['timestamp'] = timestamp
+        sector_stats[sector] = entry
+    return sector_stats
+
+
+def compute_sector_stats(df: pd.DataFrame, sector_col: str = 'sector_normalized',
+                         metrics: Optional[Iterable[str]] = None,
+                         min_sample_size: int = MIN_SECTOR_SAMPLE,
+                         timestamp: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """종목 DataFrame → 섹터 통계 딕셔너리 (compute_sector_frame + frame_to_sector_stats)"""
+    metrics = list(metrics or DEFAULT_METRICS)
+    frame = compute_sector_frame(df, sector_col=sector_col, metrics=metrics, min_sample_size=min_sample_size)
+    return frame_to_sector_stats(frame, timestamp=timestamp, metrics=metrics)
+
+
+def describe_values(values: Iterable[Optional[float]], drop_zero: bool = True,
+                    min_valid_values: int = MIN_VALID_VALUES) -> Dict[str, float]:
+    """
+    단일 값 목록의 분위수/요약 통계 (엔진과 같은 정책)
+
+    Returns:
+        {'p10', 'p25', 'p50', 'p75', 'p90', 'mean', 'std', 'min', 'max'} 또는 {} (유효값 부족)
+    """
+    arr = pd.to_numeric(pd.Series(list(values), dtype=object), errors='coerce').to_numpy(dtype=float)
+    mask = np.isfinite(arr)
+    if drop_zero:
+        mask &= arr != 0
+    arr = np.sort(arr[mask])
+    if arr.size < min_valid_values:
+        return {}
+    q = np.quantile(arr, list(QUANTILES.values()))
+    stats = dict(zip(QUANTILES, (float(v) for v in q)))
+    stats.update({
+        'mean': float(arr.mean()),
+        'std': float(arr.std()),
+        'min': float(arr[0]),
+        'max': float(arr[-1]),
+    })
+    return stats
+
+
+def stat_columns(metrics: Iterable[str]) -> List[str]:
+    """지표 목록 → sector_stats 테이블 컬럼 목록 ('{metric}_{stat}')"""
+    return [f"{m}_{s}" for m in metrics for s in STAT_NAMES]
@@ -10,24 +10,29 @@ import pandas as pd
 import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-import time
 
 logger = logging.getLogger(__name__)
 
 class StabilityRatioAnalyzer:
     """안정성비율 분석 클래스"""
     
-    def __init__(self, provider):
+    def __init__(self, provider, statements=None):
+        """
+        Args:
+            provider: KISDataProvider
+            statements: FinancialStatementService (기본: 공급자별 공유 서비스 - 4종 분석기가 같은 캐시 사용)
+        """
         self.provider = provider
-        self.last_request_time = 0
-        self.request_interval = 2.5  # API 요청 간격 제어 (2.5초)
+        self._statements = statements
     
-    def _rate_limit(self):
-        """API 요청 속도를 제어합니다."""
-        elapsed_time = time.time() - self.last_request_time
-        if elapsed_time < self.request_interval:
-            time.sleep(self.request_interval - elapsed_time)
-        self.last_request_time = time.time()
+    @property
+    def statements(self):
+        """재무제표 통합 조회 서비스 (최초 사용 시 공유 서비스 연결)"""
+        service = getattr(self, '_statements', None)
+        if service is None:
+            from financial_statement_service import get_financial_statement_service
+            service = self._statements = get_financial_statement_service(self.provider)
+        return service
     
     def _to_float(self, value: Any, default: float = 0.0) -> float:
         """안전하게 float 타입으로 변환합니다."""
@@ -41,7 +46,7 @@ class StabilityRatioAnalyzer:
     
     def get_stability_ratios(self, symbol: str, period_type: str = "0") -> Optional[List[Dict[str, Any]]]:
         """
-        종목의 안정성비율을 조회합니다.
+        종목의 안정성비율을 조회합니다. (재무제표 서비스 캐시 경유 - 새 결산기 공시 전에는 API 호출 없음)
         
         Args:
             symbol: 종목코드 (6자리)
@@ -50,26 +55,11 @@ class StabilityRatioAnalyzer:
         Returns:
             안정성비율 데이터 리스트
         """
-        self._rate_limit()
-        
-        path = "/uapi/domestic-stock/v1/finance/stability-ratio"
-        params = {
-            "fid_input_iscd": symbol,
-            "fid_div_cls_code": period_type,  # 0: 년, 1: 분기
-            "fid_cond_mrkt_div_code": "J"     # 국내주식
-        }
-        
-        try:
-            data = self.provider._send_request(path, "FHKST66430600", params)
-            if data and 'output' in data:
-                return self._parse_stability_ratio_data(data['output'])
-            else:
-                logger.warning(f"⚠️ {symbol} 안정성비율 조회 실패")
-                return None
-                
-        except Exception as e:
-            logger.error(f"❌ 안정성비율 API 호출 실패 ({symbol}): {e}")
+        rows = self.statements.get_rows(symbol, 'stability', period_type)
+        if rows is None:
+            logger.warning(f"⚠️ {symbol} 안정성비율 조회 실패")
             return None
+        return self._parse_stability_ratio_data(rows)
     
     def _parse_stability_ratio_data(self, output_list: List[Dict]) -> List[Dict[str, Any]]:
         """안정성비율 응답 데이터를 파싱합니다."""
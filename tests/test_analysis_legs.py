@@ -0,0 +1,91 @@
+"""
+분석 레그 의존성 그래프 실행기 단위 테스트
+
+독립 레그 동시 진행(지연 ≈ 최대 레그), 선행 결과 전달, 예약 재시도(대기 중 스레드 미점유),
+실패/무자료 기본값, 부분 결과 콜백, 잘못된 그래프 검증을 테스트합니다.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from analysis_legs import Leg, run_legs
+
+
+def _slow(value, delay=0.2):
+    def fn():
+        time.sleep(delay)
+        return value
+    return fn
+
+
+class TestAnalysisLegs:
+    """analysis_legs 테스트 클래스"""
+
+    def test_independent_legs_run_concurrently(self):
+        """독립 레그 4개(각 0.2초)는 합(0.8초)이 아니라 최대 레그 수준에 끝남"""
+        legs = [Leg(name, _slow(name)) for name in ('opinion', 'estimate', 'price', 'risk')]
+        started = time.perf_counter()
+        results = run_legs(legs, executor=ThreadPoolExecutor(max_workers=4))
+        assert time.perf_counter() - started < 0.6
+        assert results == {'opinion': 'opinion', 'estimate': 'estimate', 'price': 'price', 'risk': 'risk'}
+
+    def test_dependencies_and_partial_results(self):
+        """병합 노드는 선행 결과를 deps 순서로 받고, 끝난 레그부터 콜백으로 전달"""
+        seen = []
+        legs = [
+            Leg('merged', lambda a, b: {**a, **b}, deps=('slow', 'fast'), blocking=False),
+            Leg('slow', _slow({'roe': 10}, delay=0.2)),
+            Leg('fast', lambda: {'per': 5}),
+        ]
+        results = run_legs(legs, on_result=lambda name, value: seen.append(name))
+        assert results['merged'] == {'roe': 10, 'per': 5}
+        assert seen == ['fast', 'slow', 'merged']
+
+    def test_scheduled_retry_does_not_hold_threads(self):
+        """재시도 대기 중에도 단일 스레드 풀이 다른 레그를 처리"""
+        calls = []
+        lock = threading.Lock()
+
+        def flaky():
+            with lock:
+                calls.append(time.perf_counter())
+                if len(calls) < 3:
+                    raise ConnectionError('reset')
+            return {'ok': True}
+
+        legs = [Leg('flaky', flaky, retries=2, backoff=0.3)] + [Leg(f"quick{i}", _slow(i, 0.05)) for i in range(4)]
+        started = time.perf_counter()
+        results = run_legs(legs, executor=ThreadPoolExecutor(max_workers=1))
+        assert results['flaky'] == {'ok': True} and len(calls) == 3
+        # 재시도 대기(0.3 + 0.3)가 스레드를 잡았다면 0.6 + 0.2초 이상
+        assert time.perf_counter() - started < 0.75
+
+    def test_failures_and_empty_results_use_defaults(self):
+        """예외 소진은 기본값, retry_empty=False 무자료는 재시도 없이 기본값"""
+        attempts = []
+
+        def empty():
+            attempts.append(1)
+            return []
+
+        def boom():
+            raise RuntimeError('down')
+
+        legs = [
+            Leg('empty', empty, retries=3, accept=bool, retry_empty=False, default={}),
+            Leg('boom', boom, retries=1, backoff=lambda attempt: 0.01, default={'grade': '데이터없음'}),
+            Leg('after', lambda value: value.get('grade'), deps=('boom',), blocking=False),
+        ]
+        results = run_legs(legs)
+        assert results == {'empty': {}, 'boom': {'grade': '데이터없음'}, 'after': '데이터없음'}
+        assert len(attempts) == 1
+
+    def test_invalid_graph(self):
+        """없는 선행 레그/순환 의존성은 ValueError"""
+        with pytest.raises(ValueError):
+            run_legs([Leg('a', lambda x: x, deps=('missing',))])
+        with pytest.raises(ValueError):
+            run_legs([Leg('a', lambda b: b, deps=('b',)), Leg('b', lambda a: a, deps=('a',))])
@@ -0,0 +1,84 @@
+"""
+CandidateUniverseBuilder 단위 테스트
+
+순위 병합(중복 제거·출처 태그·후보 수 경계), 세션 캐시를 테스트합니다. (네트워크 미사용)
+"""
+
+from datetime import date
+
+from candidate_universe import CandidateUniverseBuilder, merge_rankings
+
+
+def _rows(codes, field='mksc_shrn_iscd'):
+    return [{field: code, 'hts_kor_isnm': f"종목{code}"} for code in codes]
+
+
+class _FakeMCP:
+    """순위 API 대체 (호출 횟수 기록)"""
+
+    def __init__(self, fail=()):
+        self.calls = {}
+        self.fail = set(fail)
+
+    def _ranking(self, source, rows):
+        self.calls[source] = self.calls.get(source, 0) + 1
+        return None if source in self.fail else rows
+
+    def get_volume_ranking(self):
+        return self._ranking('volume', _rows(['000001', '000002']))
+
+    def get_market_cap_ranking(self):
+        return self._ranking('market_cap', _rows(['000002', '000003']))
+
+    def get_per_ranking(self):
+        return self._ranking('per', _rows(['000003', '000004']))
+
+    def get_dividend_ranking(self, limit=100):
+        return self._ranking('dividend', _rows(['000001', '000005', '12345'], field='stk_shrn_cd'))
+
+
+class TestCandidateUniverse:
+    """CandidateUniverseBuilder 테스트 클래스"""
+
+    def test_merge_dedup_and_tags(self):
+        """종목코드 기준 중복 제거, 출처 순서 유지, 출처 태그 누적"""
+        candidates = CandidateUniverseBuilder(_FakeMCP()).build(today=date(2025, 10, 1))
+        assert [c['mksc_shrn_iscd'] for c in candidates] == ['000001', '000002', '000003', '000004', '000005']
+        tags = {c['mksc_shrn_iscd']: c['_sources'] for c in candidates}
+        assert tags['000001'] == ['volume', 'dividend']
+        assert tags['000003'] == ['market_cap', 'per']
+        assert candidates[-1]['stck_prpr'] == '0'  # 배당 행 기본 필드
+
+    def test_pool_size_boundary(self):
+        """출처 경계에서 목표 수 이상이면 이후 출처 신규 종목 제외"""
+        rankings = [('volume', _rows(['000001', '000002'])), ('per', _rows(['000002', '000003']))]
+        candidates = merge_rankings(rankings, pool_size=2)
+        assert [c['mksc_shrn_iscd'] for c in candidates] == ['000001', '000002']
+        assert candidates[1]['_sources'] == ['volume', 'per']
+
+    def test_session_cache_and_retry(self):
+        """같은 세션은 재조회 없음, 실패 출처만 재시도, 다음 세션은 전체 재조회"""
+        mcp = _FakeMCP(fail={'per'})
+        builder = CandidateUniverseBuilder(mcp)
+        day = date(2025, 10, 1)
+
+        first = builder.build(today=day)
+        assert '000004' not in {c['mksc_shrn_iscd'] for c in first}
+        first[0]['_sources'].append('mutated')
+
+        mcp.fail.clear()
+        second = builder.build(today=day)
+        assert mcp.calls == {'volume': 1, 'market_cap': 1, 'dividend': 1, 'per': 2}
+        assert '000004' in {c['mksc_shrn_iscd'] for c in second}
+        assert second[0]['_sources'] == ['volume', 'dividend']  # 반환 행 수정이 캐시에 영향 없음
+
+        builder.build(today=date(2025, 10, 2))
+        assert mcp.calls['volume'] == 2
+
+    def test_large_pool_linear(self):
+        """대규모 후보 (수천 개) 병합"""
+        codes = [f"{i:06d}" for i in range(1, 5001)]
+        rankings = [('volume', _rows(codes)), ('per', _rows(codes[::-1]))]
+        candidates = merge_rankings(rankings)
+        assert len(candidates) == 5000
+        assert all(c['_sources'] == ['volume', 'per'] for c in candidates)
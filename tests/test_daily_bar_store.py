@@ -0,0 +1,102 @@
+"""
+DailyBarStore 단위 테스트
+
+증분 조회 구간, 하루 1회 조회, 벡터화 모멘텀을 테스트합니다. (네트워크 미사용)
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from daily_bar_store import DailyBarStore, chart_rows_to_frame, compute_momentum
+from db_cache_manager import DBCacheManager
+
+
+def _bars(end: date, count: int, start_price: float = 1000.0, step: float = 10.0):
+    """end부터 과거로 count개 평일 봉 (차트 API 응답 형식, 최신 먼저)"""
+    rows, day, price = [], end, start_price + step * (count - 1)
+    while len(rows) < count:
+        if day.weekday() < 5:
+            rows.append({'stck_bsop_date': day.strftime('%Y%m%d'), 'stck_clpr': str(price),
+                         'stck_oprc': str(price), 'stck_hgpr': str(price), 'stck_lwpr': str(price),
+                         'acml_vol': '1000', 'acml_tr_pbmn': str(price * 1000)})
+            price -= step
+        day -= timedelta(days=1)
+    return rows
+
+
+class _FakeMCP:
+    """get_chart_data_many 대체: 호출 기록 + 요청 기간 안의 봉만 반환"""
+
+    def __init__(self, today: date, bars_per_symbol: int = 120):
+        self.today = today
+        self.bars = bars_per_symbol
+        self.calls = []
+
+    def get_chart_data_many(self, symbols, period='D', days=365, use_pagination=True):
+        self.calls.append((tuple(symbols), days))
+        start = (self.today - timedelta(days=days)).strftime('%Y%m%d')
+        return {s: [r for r in _bars(self.today, self.bars) if r['stck_bsop_date'] >= start] for s in symbols}
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DBCacheManager(db_path=str(tmp_path / 'stock_data.db'))
+
+
+class TestDailyBarStore:
+    """DailyBarStore 테스트 클래스"""
+
+    def test_backfill_then_incremental(self, db):
+        """최초 적재 후 다음 날에는 마지막 거래일 이후 구간만 조회"""
+        day1 = date(2025, 10, 1)
+        mcp = _FakeMCP(day1)
+        store = DailyBarStore(mcp, db=db)
+
+        first = store.sync(['005930', '000660'], today=day1)
+        assert first['fetched'] == 2 and first['bars'] > 0
+        assert mcp.calls == [(('005930', '000660'), store.backfill_days)]
+
+        # 같은 날 재실행 → 조회 없음
+        again = store.sync(['005930', '000660'], today=day1)
+        assert again['skipped'] == 2 and len(mcp.calls) == 1
+
+        # 다음 날 → 마지막 거래일(포함)부터 2일 구간만
+        day2 = day1 + timedelta(days=1)
+        mcp.today = day2
+        store.sync(['005930', '000660'], today=day2)
+        assert mcp.calls[-1] == (('005930', '000660'), 2)
+        closes = db.get_daily_closes(['005930'], max_bars=5)
+        assert closes['trade_date'].iloc[-1] == day2.isoformat()
+
+    def test_failed_symbols_retried(self, db):
+        """응답 없는 종목은 동기화 완료로 기록하지 않음"""
+        mcp = _FakeMCP(date(2025, 10, 1))
+        mcp.get_chart_data_many = lambda symbols, **kw: {}
+        store = DailyBarStore(mcp, db=db)
+        stats = store.sync(['005930'], today=date(2025, 10, 1))
+        assert stats['failed'] == 1
+        assert store.plan_sync(['005930'], today=date(2025, 10, 1)) == {store.backfill_days: ['005930']}
+
+    def test_momentum_matches_window_rules(self, db):
+        """전 종목 모멘텀을 어댑티브 창 규칙대로 계산"""
+        today = date(2025, 10, 1)
+        charts = {'000001': _bars(today, 120), '000002': _bars(today, 70), '000003': _bars(today, 30)}
+        db.save_daily_bars(chart_rows_to_frame(charts), synced_codes=list(charts), synced_date=today)
+        store = DailyBarStore(db=db)
+
+        result = store.momentum(['000001', '000002', '000003', '000004'], target_lookback=100)
+
+        full = result.loc['000001']
+        prices = [float(r['stck_clpr']) for r in reversed(charts['000001'])]
+        assert full['period_label'] == '5M' and full['lookback'] == 100
+        assert full['ret_pct'] == pytest.approx((prices[-1] / prices[-100] - 1) * 100)
+        assert result.loc['000002', 'period_label'] == '3M' and result.loc['000002', 'lookback'] == 60
+        assert np.isnan(result.loc['000003', 'ret_pct']) and '데이터 부족' in result.loc['000003', 'reason']
+        assert result.loc['000004', 'reason'] == "차트 데이터 없음"
+
+    def test_compute_momentum_empty(self):
+        """저장분이 없으면 전 종목 실패 사유 기록"""
+        result = compute_momentum(None, ['005930'])
+        assert result.loc['005930', 'reason'] == "차트 데이터 없음"
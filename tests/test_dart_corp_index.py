@@ -0,0 +1,77 @@
+"""
+DART 고유번호 바이너리 인덱스 단위 테스트
+
+CORPCODE.xml 컴파일, mmap 이진 탐색, 파일 교체 감지와
+DartDataProvider / DARTCorpCodeManager 연동을 테스트합니다. (네트워크 미사용)
+"""
+
+from dart_corp_index import (
+    DartCorpIndex, compile_corp_code_xml, compile_corp_codes, get_dart_corp_index, parse_corp_code_xml,
+)
+
+XML = """<?xml version="1.0" encoding="UTF-8"?>
+<result>
+  <list><corp_code>00164779</corp_code><corp_name>SK하이닉스</corp_name>
+        <stock_code>000660</stock_code><modify_date>20240101</modify_date></list>
+  <list><corp_code>00126380</corp_code><corp_name>삼성전자</corp_name>
+        <stock_code>005930</stock_code><modify_date>20240102</modify_date></list>
+  <list><corp_code>00999999</corp_code><corp_name>비상장회사</corp_name>
+        <stock_code> </stock_code><modify_date>20240103</modify_date></list>
+  <list><corp_code></corp_code><corp_name>코드없음</corp_name></list>
+</result>
+""".encode('utf-8')
+
+
+class TestDartCorpIndex:
+    """DartCorpIndex 테스트 클래스"""
+
+    def test_compile_and_lookup(self, tmp_path):
+        """종목코드/고유번호 이진 탐색, 비상장·없는 코드는 None"""
+        path = str(tmp_path / 'corp_codes.bin')
+        assert len(parse_corp_code_xml(XML)) == 3
+        assert compile_corp_code_xml(XML, path) == 3
+
+        index = DartCorpIndex(path)
+        assert len(index) == 3 and index.stock_count == 2
+        assert index.corp_code_for_stock('005930') == '00126380'
+        assert index.corp_code_for_stock('000660') == '00164779'
+        assert index.corp_code_for_stock('123456') is None
+        assert index.by_corp_code('00999999') == {
+            'corp_code': '00999999', 'corp_name': '비상장회사', 'stock_code': '', 'modify_date': '20240103'
+        }
+        assert index.by_stock_code('005930')['corp_name'] == '삼성전자'
+        assert [r['corp_code'] for r in index.records()] == ['00126380', '00164779', '00999999']
+        assert list(index.stock_mapping()) == [('000660', '00164779'), ('005930', '00126380')]
+        index.close()
+
+    def test_duplicates_and_reload(self, tmp_path):
+        """같은 종목코드는 뒤 레코드 우선, 파일이 바뀌면 공유 인덱스 재오픈"""
+        path = str(tmp_path / 'corp_codes.bin')
+        compile_corp_codes([{'corp_code': '00000001', 'corp_name': 'A', 'stock_code': '111111'},
+                            {'corp_code': '00000002', 'corp_name': 'B', 'stock_code': '111111'}], path)
+        first = get_dart_corp_index(path)
+        assert first.corp_code_for_stock('111111') == '00000002'
+        assert get_dart_corp_index(path) is first
+
+        compile_corp_codes([{'corp_code': '00000003', 'corp_name': 'C', 'stock_code': '222222'}], path)
+        second = get_dart_corp_index(path)
+        assert second is not first and second.corp_code_for_stock('222222') == '00000003'
+        assert get_dart_corp_index(str(tmp_path / 'none.bin')) is None
+
+    def test_providers_use_index(self, tmp_path):
+        """DartDataProvider 종목 → 고유번호, DARTCorpCodeManager 캐시 로드"""
+        from corpCode import DARTCorpCodeManager
+        from dart_data_provider import DartDataProvider
+
+        manager = DARTCorpCodeManager('test-key', cache_dir=str(tmp_path))
+        compile_corp_code_xml(XML, manager.index_file)
+        df = manager.get_dart_corp_codes()
+        assert len(df) == 3 and df['is_listed'].tolist() == [True, True, False]
+        assert manager.get_cache_info()['status'] == 'cached'
+
+        provider = DartDataProvider.__new__(DartDataProvider)
+        provider.cache_dir = str(tmp_path / 'dart')
+        provider.corp_code_cache = {}
+        provider._load_corp_code_cache()
+        assert provider.get_corp_code('000660') == '00164779'
+        assert provider.get_corp_code('123456') is None
@@ -0,0 +1,237 @@
+"""
+DBCacheManager 단위 테스트
+
+스냅샷 대량 UPSERT(신규/갱신/중복/거부 보고)와 WAL 설정을 테스트합니다.
+"""
+
+import sqlite3
+from datetime import date
+
+import pytest
+
+from db_cache_manager import DBCacheManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DBCacheManager(db_path=str(tmp_path / 'stock_data.db'))
+
+
+def _snap(code, price, **extra):
+    return {'code': code, 'name': f'종목{code}', 'sector': '전기전자', 'price': price,
+            'per': 10.0, 'pbr': 1.0, 'roe': 8.0, **extra}
+
+
+class TestSnapshotBulkUpsert:
+    """스냅샷 대량 저장 테스트 클래스"""
+
+    def test_wal_enabled(self, db):
+        """DB는 WAL 모드로 생성"""
+        with db.get_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == 'wal'
+
+    def test_insert_then_update_reports_conflicts(self, db):
+        """두 번째 저장은 기존 행과 충돌 → 갱신으로 보고"""
+        day = date(2025, 10, 1)
+        first = db.bulk_upsert_snapshots([_snap(f'{i:06d}', 1000 + i) for i in range(1000)], snapshot_date=day)
+        assert first['inserted'] == 1000 and first['updated'] == 0
+
+        second = db.bulk_upsert_snapshots([_snap('000001', 5000), _snap('999999', 10)], snapshot_date=day)
+        assert second['inserted'] == 1
+        assert second['conflicts'] == [('000001', '2025-10-01')]
+
+        df = db.get_snapshot_by_date(day)
+        assert len(df) == 1001
+        assert df.loc[df['stock_code'] == '000001', 'close_price'].iloc[0] == 5000
+
+    def test_duplicates_and_rejected_rows(self, db):
+        """입력 내 중복은 마지막 값 적용, 코드 없는 행은 거부"""
+        day = date(2025, 10, 2)
+        result = db.bulk_upsert_snapshots(
+            [_snap('005930', 100), {'name': 'no-code'}, _snap('005930', 200)], snapshot_date=day
+        )
+        assert result['inserted'] == 1
+        assert result['duplicates'] == [('005930', '2025-10-02')]
+        assert result['rejected'] == [(1, 'missing code')]
+        assert db.get_snapshot_by_date(day)['close_price'].iloc[0] == 200
+
+    def test_bad_row_rejected_alone(self, db):
+        """바인딩 불가/저장 실패 행만 거부하고 나머지는 저장 (numpy 값은 변환)"""
+        import numpy as np
+
+        day = date(2025, 10, 3)
+        rows = [_snap(f'{i:06d}', 1000 + i) for i in range(5)]
+        rows[1]['per'] = {'bad': 'type'}         # 트랜잭션 전 거부
+        rows[3]['volume'] = 2 ** 70               # SQLite INTEGER 범위 초과 → 행 단위 재시도에서 거부
+        rows[4]['per'] = np.float32(7.5)
+        result = db.bulk_upsert_snapshots(rows, snapshot_date=day, chunk_size=2)
+
+        assert [idx for idx, _ in result['rejected']] == [1, 3]
+        assert result['inserted'] == 3
+        df = db.get_snapshot_by_date(day)
+        assert sorted(df['stock_code']) == ['000000', '000002', '000004']
+        assert df.loc[df['stock_code'] == '000004', 'per'].iloc[0] == 7.5
+
+    def test_backfill_per_row_dates(self, db):
+        """행별 snapshot_date로 과거 데이터 백필"""
+        rows = [_snap('005930', 100 + d, snapshot_date=date(2025, 9, d)) for d in range(1, 11)]
+        assert db.save_snapshots(rows) == 10
+        assert len(db.get_stock_history('005930', days=30)) == 10
+
+
+class TestConnectionAndSectorStatsCache:
+    """커넥션 재사용 + 섹터 통계 읽기 캐시 테스트 클래스"""
+
+    def test_connection_reused_per_thread(self, db):
+        """같은 스레드는 같은 커넥션, 다른 스레드는 별도 커넥션"""
+        import threading
+
+        with db.get_connection() as first:
+            pass
+        with db.get_connection() as second:
+            pass
+        assert first is second
+
+        other = []
+        t = threading.Thread(target=lambda: other.append(db._thread_connection()))
+        t.start()
+        t.join()
+        assert other[0] is not first
+
+    def test_finished_thread_connections_released(self, db):
+        """종료된 스레드의 커넥션은 다음 커넥션 생성 시 닫히고 목록에서 제거"""
+        import threading
+
+        finished = []
+        for _ in range(5):
+            t = threading.Thread(target=lambda: finished.append(db._thread_connection()))
+            t.start()
+            t.join()
+
+        with db.get_connection():
+            pass
+        assert len(db._connections) == 1  # 현재(메인) 스레드 커넥션만 남음
+        for conn in finished:
+            with pytest.raises(sqlite3.ProgrammingError):
+                conn.execute("SELECT 1")
+
+        db.close()
+        assert db._connections == {}
+
+    def test_sector_stats_cached_until_recompute(self, db, monkeypatch):
+        """섹터 통계는 재계산 전까지 DB를 다시 읽지 않음"""
+        day = date(2025, 10, 3)
+        db.save_snapshots([_snap(f'{i:06d}', 1000 + i, sector_normalized='전기전자') for i in range(10)],
+                          snapshot_date=day)
+        db.compute_sector_stats(snapshot_date=day)
+        assert db.get_sector_stats()['전기전자']['sample_size'] == 10
+
+        loads = []
+        original = db._load_sector_stats
+        monkeypatch.setattr(db, '_load_sector_stats', lambda d: loads.append(d) or original(d))
+        for _ in range(5):
+            db.get_sector_stats()
+        assert loads == []
+
+        db.save_snapshots([_snap(f'{i:06d}', 1000 + i, sector_normalized='전기전자') for i in range(12)],
+                          snapshot_date=day)
+        db.compute_sector_stats(snapshot_date=day)
+        assert db.get_sector_stats()['전기전자']['sample_size'] == 12
+        assert loads == ['2025-10-03']
+
+    def test_extra_sector_metric_adds_column(self, tmp_path):
+        """새 지표 지정 시 sector_stats 컬럼 자동 추가 후 저장/조회"""
+        db = DBCacheManager(db_path=str(tmp_path / 'extra.db'), sector_metrics=('per', 'pbr', 'roe', 'debt_ratio'))
+        day = date(2025, 10, 4)
+        db.save_snapshots([_snap(f'{i:06d}', 1000, sector_normalized='금융', debt_ratio=100.0 + i)
+                           for i in range(6)], snapshot_date=day)
+        computed = db.compute_sector_stats(snapshot_date=day)
+        assert computed['금융']['debt_ratio_percentiles']['p50'] == 102.5
+
+        loaded = db.get_sector_stats(snapshot_date=day)
+        assert loaded['금융']['debt_ratio_percentiles']['max'] == 105.0
+        assert loaded['금융']['per_percentiles']['p50'] == 10.0
+
+    def test_global_distribution_stored_with_sector_stats(self, db):
+        """섹터 통계 계산 시 전시장 정렬 분포도 저장/로드"""
+        day = date(2025, 10, 5)
+        rows = [_snap(f'{i:06d}', 1000, sector_normalized='금융' if i % 2 else '화학') for i in range(20)]
+        for i, row in enumerate(rows):
+            row['per'] = float(i + 1)
+        db.save_snapshots(rows, snapshot_date=day)
+        db.compute_sector_stats(snapshot_date=day)
+
+        dists = db.get_global_distributions()
+        assert dists['per'].size == 20
+        assert dists['per'].percentile(10.0) == pytest.approx(47.5)
+        assert db.get_global_distributions() is dists  # 재조회는 메모리 캐시
+
+    def test_sector_percentile_index_shared(self, db):
+        """섹터 정렬 표본 인덱스는 스냅샷당 1회 구성"""
+        day = date(2025, 10, 6)
+        rows = [_snap(f'{i:06d}', 1000, sector_normalized='금융') for i in range(10)]
+        for i, row in enumerate(rows):
+            row['per'] = float(i + 1)
+        db.save_snapshots(rows, snapshot_date=day)
+        db.compute_sector_stats(snapshot_date=day)
+
+        index = db.get_sector_percentile_index()
+        assert index.percentile('금융', 'per', 10.0) == pytest.approx(95.0)  # p90 너머도 정확
+        assert db.get_sector_percentile_index() is index
+
+
+class TestScreeningResults:
+    """스크리닝 결과 저장 테스트 클래스"""
+
+    def test_legacy_table_migrated(self, tmp_path):
+        """구 screening_results(날짜×종목 키)는 _v1로 보존하고 새 스키마 생성"""
+        path = tmp_path / 'legacy.db'
+        conn = sqlite3.connect(str(path))
+        conn.execute("CREATE TABLE screening_results (id INTEGER PRIMARY KEY, screening_date DATE, "
+                     "stock_code TEXT, UNIQUE(screening_date, stock_code))")
+        conn.execute("INSERT INTO screening_results (screening_date, stock_code) VALUES ('2025-10-01', '005930')")
+        conn.commit()
+        conn.close()
+
+        db = DBCacheManager(db_path=str(path))
+        day = date(2025, 10, 7)
+        rows = [{'symbol': '005930', 'name': '삼성전자', 'value_score': 80.5, 'grade': 'A',
+                 'recommendation': 'BUY', 'sector': '전기전자', 'score_ok': True, 'is_value_stock': False}]
+        assert db.save_screening_run(day, 'h', 'v1', rows, input_hashes={'005930': 'x'}) == 1
+        assert db.get_screening_rows(day, 'h', 'v1') == rows
+        assert db.get_screening_run(day, 'h', 'v1')['scored_count'] == 1
+        assert db.get_latest_screening_inputs('h', 'v1') == {'005930': ('x', rows[0])}
+        assert db.get_latest_screening_inputs('h', 'v1', before=day) == {}
+        with db.get_connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM screening_results_v1").fetchone()[0] == 1
+            assert tuple(conn.execute("SELECT score_ok, is_value_stock FROM screening_results").fetchone()) == (1, 0)
+
+
+class TestInvestorFeatures:
+    """투자자 피처 테이블 테스트 클래스"""
+
+    def test_legacy_table_gets_foreign_trend_columns(self, tmp_path):
+        """구 investor_features에는 외국인 추세 컬럼을 추가 (기존 행 유지, 값은 NULL)"""
+        path = tmp_path / 'legacy.db'
+        conn = sqlite3.connect(str(path))
+        conn.execute("CREATE TABLE investor_features (stock_code TEXT PRIMARY KEY, as_of_date DATE NOT NULL, "
+                     "days INTEGER NOT NULL, foreign_net_qty REAL, investor_score REAL NOT NULL)")
+        conn.execute("INSERT INTO investor_features VALUES ('005930', ?, 20, -1.0, 40.0)", (date.today().isoformat(),))
+        conn.commit()
+        conn.close()
+
+        flows = DBCacheManager(db_path=str(path)).get_foreign_flows()
+        assert flows['005930']['days'] == 20 and flows['005930']['foreign_sell_streak'] is None
+
+    def test_legacy_financial_checks_get_pending_column(self, tmp_path):
+        """구 financial_statement_checks에는 미조회 종류 컬럼 추가 (기존 기록은 전체 조회 완료)"""
+        path = tmp_path / 'legacy.db'
+        conn = sqlite3.connect(str(path))
+        conn.execute("CREATE TABLE financial_statement_checks (stock_code TEXT NOT NULL, period_type TEXT NOT NULL, "
+                     "fiscal_period TEXT NOT NULL, checked_at DATE NOT NULL, PRIMARY KEY (stock_code, period_type))")
+        conn.execute("INSERT INTO financial_statement_checks VALUES ('005930', '0', '202412', '2025-03-01')")
+        conn.commit()
+        conn.close()
+
+        saved = DBCacheManager(db_path=str(path)).get_financial_statements('005930', '0')
+        assert saved['fiscal_period'] == '202412' and saved['pending'] == []
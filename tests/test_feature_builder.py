@@ -0,0 +1,138 @@
+"""
+FeatureBuilder / FeatureScoreTable 단위 테스트
+
+피처 계산, 호출 예산·재개, 점수 테이블 조회를 테스트합니다. (네트워크 미사용)
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+import feature_builder
+from db_cache_manager import DBCacheManager
+from feature_builder import (
+    FeatureBuilder, FeatureScoreTable, build_dividend_features, build_investor_feature,
+    dividend_yield_score, foreign_trend_stats, investor_flow_score,
+)
+
+TODAY = date(2025, 10, 1)
+
+
+def _investor_rows(days: int, foreign: int, institution: int, volume: int = 100000, end: date = TODAY):
+    """end부터 최신 먼저 일별 투자자 매매동향 행"""
+    return [{'stck_bsop_date': (end - timedelta(days=i)).strftime('%Y%m%d'),
+             'frgn_ntby_qty': str(foreign), 'orgn_ntby_qty': str(institution),
+             'prsn_ntby_qty': str(-(foreign + institution)), 'acml_vol': str(volume)}
+            for i in range(days)]
+
+
+class _FakeMCP:
+    """투자자 동향/배당 순위 응답 대체 (호출 기록)"""
+
+    def __init__(self, missing=()):
+        self.investor_calls = []
+        self.dividend_calls = []
+        self.missing = set(missing)
+
+    def get_investor_trend_daily(self, symbol, start_date='', end_date='', use_pagination=True):
+        self.investor_calls.append(symbol)
+        end = date(int(end_date[:4]), int(end_date[4:6]), int(end_date[6:]))
+        return None if symbol in self.missing else _investor_rows(20, 5000, 3000, end=end)
+
+    def get_dividend_ranking(self, limit=100, use_pagination=True, upjong='0001'):
+        self.dividend_calls.append(upjong)
+        return [{'sht_cd': '005930' if upjong == '0001' else '035720', 'divi_rate': '4.0',
+                 'per_sto_divi_amt': '1444', 'record_date': '20241231'}]
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DBCacheManager(db_path=str(tmp_path / 'stock_data.db'))
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(feature_builder.time, 'sleep', lambda seconds: None)
+
+
+class TestFeatureBuilder:
+    """FeatureBuilder 테스트 클래스"""
+
+    def test_scores(self):
+        """점수 함수: 중립 50, 포화점에서 상·하한"""
+        assert investor_flow_score(0.0, 0.5) == 50.0
+        assert investor_flow_score(1.0, 1.0) == 100.0
+        assert investor_flow_score(-1.0, 0.0) == 0.0
+        assert dividend_yield_score(0.0) == 50.0
+        assert dividend_yield_score(10.0) == 100.0
+        assert dividend_yield_score(None) == 50.0
+
+    def test_investor_feature(self):
+        """순매수 합계·비율 집계, 집계 기간 밖 행 제외"""
+        rows = _investor_rows(40, 5000, 3000)
+        feature = build_investor_feature('005930', rows, TODAY, lookback_days=30)
+        assert feature['days'] == 31
+        assert feature['flow_ratio'] == pytest.approx(0.08)
+        assert feature['buy_day_ratio'] == 1.0
+        assert feature['investor_score'] == pytest.approx(50 + 40 * 0.8 + 10)
+        assert build_investor_feature('005930', [], TODAY) is None
+
+    def test_foreign_trend(self, db):
+        """최근 5거래일 외국인 연속/누적 매매 일수 → investor_features → get_foreign_flows"""
+        stats = foreign_trend_stats([-60000, -80000, 10000, 70000, -90000, -90000])
+        assert stats == {'foreign_buy_streak': 0, 'foreign_sell_streak': 2,
+                         'foreign_buy_days': 1, 'foreign_sell_days': 3}
+
+        rows = _investor_rows(3, 60000, 0) + _investor_rows(3, -60000, 0, end=TODAY - timedelta(days=3))
+        feature = build_investor_feature('005930', list(reversed(rows)), TODAY)
+        assert feature['foreign_buy_streak'] == 3 and feature['foreign_sell_days'] == 2
+        db.save_investor_features([{**feature, 'as_of_date': date.today().isoformat()}])
+        assert db.get_foreign_flows()['005930']['foreign_buy_streak'] == 3
+
+    def test_dividend_features(self):
+        """코드 필드 변형 처리, 중복 종목은 첫 행 사용, 기준일 변환"""
+        rows = [{'stk_shrn_cd': '5930', 'divi_rate': '3.0', 'record_date': '20241231'},
+                {'sht_cd': '005930', 'divi_rate': '1.0'},
+                {'sht_cd': '', 'divi_rate': '2.0'}]
+        features = build_dividend_features(rows, TODAY)
+        assert len(features) == 1
+        assert features[0]['stock_code'] == '005930'
+        assert features[0]['dividend_yield'] == 3.0 and features[0]['record_date'] == '2024-12-31'
+
+    def test_budget_and_resume(self, db):
+        """호출 예산에서 중단 → 다음 실행은 남은 종목만, 실패 종목은 재시도"""
+        mcp = _FakeMCP(missing={'000003'})
+        builder = FeatureBuilder(mcp, db=db, batch_size=2)
+        symbols = ['000001', '000002', '000003', '000004', '000005']
+
+        first = builder.build_investor(symbols, today=TODAY, max_calls=3)
+        assert mcp.investor_calls == ['000001', '000002', '000003']
+        assert first['saved'] == 2 and first['failed'] == 1 and first['remaining'] == 2
+
+        second = builder.build_investor(symbols, today=TODAY)
+        assert mcp.investor_calls[3:] == ['000003', '000004', '000005']
+        assert second['skipped'] == 2 and second['saved'] == 2
+
+    def test_score_table_lookup(self, db):
+        """빌더 적재분 O(1) 조회, 없는 종목/오래된 피처는 중립 점수"""
+        FeatureBuilder(_FakeMCP(), db=db).run(['000001'], today=date.today())
+        scores = FeatureScoreTable(db=db)
+        assert scores.investor_score('000001') > 50.0
+        assert scores.dividend_score('005930') == pytest.approx(90.0)
+        assert scores.dividend_score('035720') == pytest.approx(90.0)
+        assert scores.investor_score('999999') == 50.0
+
+        db.save_investor_features([{'stock_code': '000009', 'as_of_date': '2000-01-01', 'days': 1,
+                                    'investor_score': 99.0}])
+        scores.invalidate()
+        assert scores.investor_score('000009') == 50.0
+
+    def test_mcp_scoring_uses_table(self, db):
+        """MCPKISIntegration 점수 함수가 테이블 값을 반환"""
+        from mcp_kis_integration import MCPKISIntegration
+        FeatureBuilder(_FakeMCP(), db=db).run(['000001'], today=date.today())
+        mcp = MCPKISIntegration.__new__(MCPKISIntegration)
+        mcp._feature_scores = FeatureScoreTable(db=db)
+        assert mcp._calculate_investor_score('000001') > 50.0
+        assert mcp._calculate_dividend_score('005930') == pytest.approx(90.0)
+        assert mcp._calculate_dividend_score('000660') == 50.0
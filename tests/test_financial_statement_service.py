@@ -0,0 +1,141 @@
+"""
+FinancialStatementService 단위 테스트
+
+결산기 기반 재조회 판단, 종목당 1회 조회 계획(4개 엔드포인트), DB 영구 캐시
+(매일 재스캔 시 finance 호출 0회), 부분 실패(성공 종류 저장·실패 종류만 재조회), 업무 오류 무자료 처리,
+분석기 4종의 캐시 경유 조회를 테스트합니다.
+(네트워크 미사용)
+"""
+
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+import financial_statement_service
+from db_cache_manager import DBCacheManager
+from financial_ratio_analyzer import FinancialRatioAnalyzer
+from financial_statement_service import (FINANCE_ENDPOINTS, FinancialStatementService,
+                                          get_financial_statement_service, needs_refresh)
+from growth_ratio_analyzer import GrowthRatioAnalyzer
+
+TODAY = date.today()
+LAST_YEAR = f"{TODAY.year - 1}12"
+
+
+class _FakeProvider:
+    """finance 엔드포인트 응답 대체 (호출 기록, 지정 엔드포인트는 실패/업무 오류)"""
+
+    def __init__(self, period=LAST_YEAR, fail=(), business=None):
+        self.period = period
+        self.fail = set(fail)
+        self.business = business  # 업무 오류 응답 msg_cd (None이면 정상 응답)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _send_request(self, path, tr_id, params, max_retries=2, business_errors=False):
+        with self._lock:
+            self.calls.append(path)
+        if any(FINANCE_ENDPOINTS[kind][0] == path for kind in self.fail):
+            return None
+        if self.business is not None:
+            reply = {'rt_cd': '1', 'msg_cd': self.business, 'msg1': '조회할 자료가 없습니다'}
+            return reply if business_errors else None
+        return {'rt_cd': '0', 'output': [{'stac_yymm': self.period, 'roe_val': '12.5', 'lblt_rate': '40',
+                                          'grs': '8.0', 'equt_inrt': '5.0'}]}
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DBCacheManager(db_path=str(tmp_path / 'stock_data.db'))
+
+
+class TestFinancialStatementService:
+    """FinancialStatementService 테스트 클래스"""
+
+    def test_needs_refresh(self):
+        """다음 결산기 종료 전에는 재조회 없음, 종료 후에는 확인 간격마다"""
+        day = date(2025, 10, 1)
+        assert needs_refresh(None, None)
+        assert not needs_refresh('202412', day - timedelta(days=200), '0', today=day)  # 2025-12 결산 전
+        assert not needs_refresh('202506', day - timedelta(days=30), '1', today=day)  # 2025-09 종료 후 7일 미만
+        assert needs_refresh('202506', date(2025, 9, 1), '1', today=date(2025, 10, 8))
+        assert not needs_refresh('', day - timedelta(days=10), today=day)  # 무자료는 30일마다
+        assert needs_refresh('', day - timedelta(days=30), today=day)
+
+    def test_one_plan_and_durable_cache(self, db):
+        """종목당 4개 엔드포인트 1회, 다음 날 재스캔(새 프로세스)은 DB에서 - 호출 0회"""
+        provider = _FakeProvider()
+        service = FinancialStatementService(provider, db=db)
+        threads = [threading.Thread(target=service.get_rows, args=('005930', kind)) for kind in FINANCE_ENDPOINTS]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert sorted(provider.calls) == sorted(path for path, _ in FINANCE_ENDPOINTS.values())
+
+        rescan = _FakeProvider()
+        ratios = FinancialRatioAnalyzer(rescan, statements=FinancialStatementService(rescan, db=db))
+        assert ratios.get_financial_ratios('005930')[0]['roe'] == 12.5
+        assert GrowthRatioAnalyzer(rescan, statements=ratios.statements).get_growth_ratios('005930')[0]['period'] == LAST_YEAR
+        assert rescan.calls == []
+
+    def test_new_period_refetched(self, db):
+        """다음 결산기 종료 후 확인 간격이 지나면 재조회 → 새 결산기로 저장"""
+        old = f"{TODAY.year - 2}12"
+        db.save_financial_statements('005930', '0', old, {'financial': [{'stac_yymm': old}]},
+                                     TODAY - timedelta(days=400))
+        provider = _FakeProvider()
+        statements = FinancialStatementService(provider, db=db).get_statements('005930')
+        assert len(provider.calls) == 4 and statements['financial'][0]['stac_yymm'] == LAST_YEAR
+        assert db.get_financial_statements('005930', '0')['fiscal_period'] == LAST_YEAR
+
+    def test_partial_failure_saves_succeeded_kinds(self, db):
+        """일부 엔드포인트 실패 시 성공한 종류는 저장, 유예 시간 동안 같은 프로세스는 재조회 안 함,
+        다른 프로세스는 실패한 종류만 재조회"""
+        provider = _FakeProvider(fail={'growth'})
+        service = FinancialStatementService(provider, db=db)
+        assert service.get_rows('005930', 'growth') is None
+        assert service.get_rows('005930', 'financial')[0]['roe_val'] == '12.5'
+        assert len(provider.calls) == 4 + 1  # 계획 1회 + 실패 엔드포인트 예약 재시도 1회
+        saved = db.get_financial_statements('005930', '0')
+        assert saved['pending'] == ['growth'] and sorted(saved['statements']) == ['financial', 'profit', 'stability']
+
+        rescan = _FakeProvider()
+        statements = FinancialStatementService(rescan, db=db).get_statements('005930')
+        assert rescan.calls == [FINANCE_ENDPOINTS['growth'][0]]
+        assert sorted(statements) == sorted(FINANCE_ENDPOINTS)
+        assert db.get_financial_statements('005930', '0')['pending'] == []
+
+    def test_business_no_data_cached_as_empty(self, db):
+        """업무 오류(무자료) 응답은 전송 실패가 아닌 무자료로 저장 → 재확인 간격 전에는 호출 0회"""
+        provider = _FakeProvider(business='MCA00124')
+        service = FinancialStatementService(provider, db=db)
+        assert service.get_statements('900110') == {kind: [] for kind in FINANCE_ENDPOINTS}
+        assert len(provider.calls) == 4  # 재시도 없음
+        saved = db.get_financial_statements('900110', '0')
+        assert saved['fiscal_period'] == '' and saved['pending'] == []
+
+        rescan = _FakeProvider(business='MCA00124')
+        FinancialStatementService(rescan, db=db).get_statements('900110')
+        assert rescan.calls == []
+
+    def test_gateway_error_retried(self, db):
+        """게이트웨이 업무 오류(유량 초과 등)는 전송 실패로 보고 재시도, 저장 안 함"""
+        provider = _FakeProvider(business='EGW00201')
+        service = FinancialStatementService(provider, db=db)
+        assert service.get_statements('005930') == {}
+        assert len(provider.calls) == 4 * 2  # 엔드포인트별 예약 재시도 1회
+        assert db.get_financial_statements('005930', '0') is None
+
+    def test_shared_service_released_with_provider(self):
+        """공유 서비스는 공급자를 약한 참조로만 보관 → 공급자가 사라지면 항목 정리"""
+        import gc
+
+        provider = _FakeProvider()
+        service = get_financial_statement_service(provider)
+        assert get_financial_statement_service(provider) is service and service.provider is provider
+        before = len(financial_statement_service._services)
+        del provider
+        gc.collect()
+        assert len(financial_statement_service._services) == before - 1
@@ -0,0 +1,122 @@
+"""
+KIS 프로세스 간 쿼터 공유 백엔드 단위 테스트
+
+파일 백엔드 그리드 공유(여러 인스턴스/여러 프로세스), 백엔드 선택,
+KISGlobalRateLimiter 연동(공유 대기 반영, 실패 시 프로세스 내 제한)을 테스트합니다.
+"""
+
+import multiprocessing
+import time
+
+import pytest
+
+from kis_quota import FileQuotaBackend, create_quota_backend, default_quota_path, quota_key
+from kis_rate_limiter import DEFAULT_MAX_TPS, KISGlobalRateLimiter
+
+
+def _child_calls(path, increment, count, out):
+    backend = FileQuotaBackend(path)
+    for _ in range(count):
+        now = time.time()
+        wait = backend.reserve(increment)
+        out.put(now + wait)  # 예약된 슬롯 시각 (기상 지연과 무관)
+        time.sleep(wait)
+
+
+class _FixedBackend:
+    """항상 같은 대기를 돌려주는 공유 백엔드 대체"""
+
+    name = 'fixed'
+
+    def __init__(self, wait=0.0, fail=False):
+        self.wait = wait
+        self.fail = fail
+        self.increments = []
+
+    def reserve(self, increment):
+        if self.fail:
+            raise ConnectionError('down')
+        self.increments.append(increment)
+        return self.wait
+
+
+class TestFileQuotaBackend:
+    """FileQuotaBackend 테스트 클래스"""
+
+    def test_instances_share_grid(self, tmp_path):
+        """같은 파일을 연 인스턴스(=프로세스)는 하나의 슬롯 그리드를 나눠 씀"""
+        path = str(tmp_path / 'quota.bin')
+        first, second = FileQuotaBackend(path), FileQuotaBackend(path)
+        waits = [first.reserve(1.0), second.reserve(1.0), first.reserve(1.0)]
+        assert waits[0] == pytest.approx(0.0, abs=0.05)
+        assert waits[1] == pytest.approx(1.0, abs=0.05)
+        assert waits[2] == pytest.approx(2.0, abs=0.05)
+        first.close()
+        second.close()
+
+    @pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason="fork 미지원 환경")
+    def test_processes_respect_shared_interval(self, tmp_path):
+        """여러 프로세스가 동시에 호출해도 합계가 공유 간격을 지킴"""
+        path = str(tmp_path / 'quota.bin')
+        FileQuotaBackend(path).close()
+        ctx = multiprocessing.get_context('fork')
+        out = ctx.Queue()
+        interval = 0.02
+        procs = [ctx.Process(target=_child_calls, args=(path, interval, 5, out)) for _ in range(3)]
+        for p in procs:
+            p.start()
+        stamps = sorted(out.get(timeout=10) for _ in range(15))
+        for p in procs:
+            p.join()
+        gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+        assert min(gaps) >= interval * 0.5  # 공유가 없으면 세 프로세스 슬롯이 겹쳐 ~0
+
+    def test_create_backend(self, tmp_path, monkeypatch):
+        """설정 문자열로 백엔드 선택, 공유 안 함/알 수 없는 값은 None"""
+        monkeypatch.delenv('KIS_QUOTA_KEY', raising=False)
+        assert create_quota_backend('local') is None
+        assert create_quota_backend('bogus') is None
+        backend = create_quota_backend(f"file:{tmp_path / 'q.bin'}")
+        assert isinstance(backend, FileQuotaBackend)
+        backend.close()
+        assert quota_key('my-app-key') != quota_key('other-key') != 'my-app-key'
+
+
+class TestSharedLimiter:
+    """KISGlobalRateLimiter 공유 백엔드 연동 테스트 클래스"""
+
+    def setup_method(self):
+        KISGlobalRateLimiter.configure(max_tps=50)
+
+    def teardown_method(self):
+        KISGlobalRateLimiter.set_shared_backend(None)
+        KISGlobalRateLimiter._shared_ready = False
+        KISGlobalRateLimiter._shared_app_key = None
+        KISGlobalRateLimiter.configure(max_tps=DEFAULT_MAX_TPS)
+
+    def test_shared_wait_applied(self):
+        """다른 프로세스가 그리드를 앞서 쓰고 있으면 공유 대기만큼 기다림"""
+        backend = _FixedBackend(wait=0.5)
+        KISGlobalRateLimiter.set_shared_backend(backend)
+        assert KISGlobalRateLimiter.reserve('quotations', cost=2) == pytest.approx(0.5)
+        assert backend.increments == [pytest.approx(2 * KISGlobalRateLimiter.get_interval())]
+
+    def test_backend_failure_falls_back(self):
+        """공유 백엔드 오류 시 프로세스 내 제한만 사용"""
+        KISGlobalRateLimiter.set_shared_backend(_FixedBackend(fail=True))
+        assert KISGlobalRateLimiter.reserve('quotations') is not None
+        assert KISGlobalRateLimiter.get_shared_backend() is None
+
+    def test_provider_sets_quota_key(self, tmp_path, monkeypatch):
+        """configure_for_account 없이 MCP 통합 생성만으로 AppKey별 쿼터 파일 사용"""
+        from types import SimpleNamespace
+        from mcp_kis_integration import MCPKISIntegration
+
+        monkeypatch.delenv('KIS_QUOTA_KEY', raising=False)
+        monkeypatch.setenv('KIS_QUOTA_BACKEND', 'file')
+        monkeypatch.setattr('tempfile.gettempdir', lambda: str(tmp_path))
+        KISGlobalRateLimiter._shared_ready = False
+        MCPKISIntegration(SimpleNamespace(appkey='app-key-a', appsecret='secret'))
+        backend = KISGlobalRateLimiter.get_shared_backend()
+        assert isinstance(backend, FileQuotaBackend)
+        assert backend.path == default_quota_path('app-key-a')
@@ -0,0 +1,105 @@
+"""
+KISGlobalRateLimiter 단위 테스트
+
+레인 분류, 전역 TPS 준수, 레인별 보장 몫을 테스트합니다.
+"""
+
+import threading
+import time
+
+import pytest
+
+from kis_rate_limiter import KISGlobalRateLimiter, lane_for_path, DEFAULT_MAX_TPS
+
+
+class TestKISGlobalRateLimiter:
+    """KISGlobalRateLimiter 테스트 클래스"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        KISGlobalRateLimiter.configure(max_tps=50)
+
+    def teardown_method(self):
+        """기본 설정 복원"""
+        KISGlobalRateLimiter.configure(max_tps=DEFAULT_MAX_TPS)
+
+    def test_lane_for_path(self):
+        """경로 → 레인 분류 테스트"""
+        assert lane_for_path('/uapi/domestic-stock/v1/quotations/inquire-price') == 'quotations'
+        assert lane_for_path('ranking/fluctuation') == 'ranking'
+        assert lane_for_path('quotations/volume-rank') == 'ranking'
+        assert lane_for_path('quotations/inquire-financial-ratio') == 'ranking'  # PER 순위
+        assert lane_for_path('finance/financial-ratio') == 'finance'
+        assert lane_for_path(None) == 'default'
+
+    def test_set_interval_updates_tps(self):
+        """간격 설정 시 TPS 동기화 테스트"""
+        KISGlobalRateLimiter.set_interval(0.25)
+        assert KISGlobalRateLimiter.get_max_tps() == pytest.approx(4.0)
+        assert KISGlobalRateLimiter.get_interval() == pytest.approx(0.25)
+
+    def test_configure_for_account_mock_quota(self, monkeypatch):
+        """모의투자 쿼터 적용 테스트"""
+        monkeypatch.delenv('KIS_MAX_TPS', raising=False)
+        KISGlobalRateLimiter.configure_for_account(is_test=True, utilization=1.0)
+        assert KISGlobalRateLimiter.get_max_tps() == pytest.approx(2.0)
+
+    def test_env_overrides_account_quota(self, monkeypatch):
+        """환경변수 KIS_MAX_TPS 우선 적용 테스트"""
+        monkeypatch.setenv('KIS_MAX_TPS', '7')
+        KISGlobalRateLimiter.configure_for_account(is_test=False, max_tps=3)
+        assert KISGlobalRateLimiter.get_max_tps() == pytest.approx(7.0)
+
+    def test_global_tps_not_exceeded(self):
+        """여러 스레드/레인이 동시에 호출해도 전역 간격 유지"""
+        stamps = []
+        stamps_lock = threading.Lock()
+
+        def worker(lane):
+            done = 0
+            while done < 5:
+                # 측정과 예약을 함께 직렬화해 now가 리미터 내부 시각과 어긋나지 않게 함
+                with stamps_lock:
+                    now = time.monotonic()
+                    wait = KISGlobalRateLimiter.reserve(lane=lane)
+                    if wait is not None:
+                        stamps.append(now + wait)  # 예약된 슬롯 시각 (기상 지연과 무관)
+                if wait is None:
+                    time.sleep(KISGlobalRateLimiter.get_interval())
+                    continue
+                time.sleep(wait)
+                done += 1
+
+        threads = [threading.Thread(target=worker, args=(lane,))
+                   for lane in ('quotations', 'quotations', 'ranking', 'finance')]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        stamps.sort()
+        gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+        assert len(stamps) == 20
+        assert min(gaps) >= KISGlobalRateLimiter.get_interval() * 0.8
+
+    def test_single_lane_uses_full_quota(self):
+        """단일 레인만 사용할 때도 전체 쿼터 사용 (보장 몫에 묶이지 않음)"""
+        start = time.monotonic()
+        threads = [threading.Thread(target=lambda: [KISGlobalRateLimiter.rate_limit(lane='quotations')
+                                                    for _ in range(5)])
+                   for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.monotonic() - start
+        # 20건 @ 50TPS ≈ 0.4초 (레인 몫 50%로 제한되면 0.8초 이상)
+        assert elapsed < 0.7
+
+    def test_slow_interval_costs_more_slots(self):
+        """쿼터보다 느린 interval 지정 시 그만큼 감속"""
+        KISGlobalRateLimiter.rate_limit(lane='quotations')
+        start = time.monotonic()
+        KISGlobalRateLimiter.rate_limit(interval=0.1, lane='quotations')
+        KISGlobalRateLimiter.rate_limit(lane='quotations')
+        assert time.monotonic() - start >= 0.08
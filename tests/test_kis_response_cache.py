@@ -0,0 +1,64 @@
+"""
+ResponseCache 단위 테스트
+
+TTL 준수, 크기 제한, MCPKISIntegration 2차 캐시 연동을 테스트합니다.
+"""
+
+import time
+
+from kis_response_cache import ResponseCache
+from mcp_kis_integration import MCPKISIntegration
+
+
+class _FakeOAuth:
+    appkey = 'test-key'
+    appsecret = 'test-secret'
+
+
+class TestResponseCache:
+    """ResponseCache 테스트 클래스"""
+
+    def test_roundtrip_honours_ttl(self, tmp_path):
+        """저장 시각 기준으로 조회 시점 TTL 적용"""
+        cache = ResponseCache(tmp_path / 'resp.db')
+        cache.put('k', {'output': [1, 2, 3]}, ttl=3600, created_at=time.time() - 120)
+
+        data, created_at = cache.get('k', ttl=3600)
+        assert data == {'output': [1, 2, 3]}
+        assert cache.get('k', ttl=60) is None  # TTL 단축 즉시 반영
+
+    def test_short_ttl_not_persisted(self, tmp_path):
+        """실시간성 응답(TTL < min_ttl)은 디스크에 저장하지 않음"""
+        cache = ResponseCache(tmp_path / 'resp.db', min_ttl=60)
+        cache.put('price', {'stck_prpr': '1000'}, ttl=5)
+        assert not (tmp_path / 'resp.db').exists()
+
+    def test_prune_bounds_size(self, tmp_path):
+        """만료 항목 삭제 후 오래된 순으로 max_entries까지 축소"""
+        cache = ResponseCache(tmp_path / 'resp.db', max_entries=3)
+        now = time.time()
+        cache.put('expired', {}, ttl=60, created_at=now - 3600)
+        for i in range(5):
+            cache.put(f'k{i}', {'i': i}, ttl=3600, created_at=now + i)
+
+        assert cache.prune() == 3
+        assert cache.get('k0', ttl=3600) is None
+        assert cache.get('k4', ttl=3600)[0] == {'i': 4}
+
+    def test_shared_across_integration_instances(self, tmp_path):
+        """새 인스턴스(다른 실행/프로세스)도 네트워크 없이 재무 응답 재사용"""
+        db_path = tmp_path / 'resp.db'
+        first = MCPKISIntegration(_FakeOAuth(), response_cache_path=str(db_path))
+        calls = []
+
+        def fake_send(path, tr_id, params, max_retries=2):
+            calls.append(path)
+            return {'rt_cd': '0', 'output': [{'per': '10'}]}
+
+        first._send_request = fake_send
+        assert first.get_financial_ratios('005930') == {'per': '10'}
+
+        second = MCPKISIntegration(_FakeOAuth(), response_cache_path=str(db_path))
+        second._send_request = fake_send
+        assert second.get_financial_ratios('005930') == {'per': '10'}
+        assert len(calls) == 1
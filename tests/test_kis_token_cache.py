@@ -0,0 +1,89 @@
+"""
+TokenCache 단위 테스트
+
+메모리 캐시 재사용, 외부 갱신 감지, 형식 호환성을 테스트합니다.
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+from kis_token_cache import TokenCache, parse_token_cache
+
+
+class TestTokenCache:
+    """TokenCache 테스트 클래스"""
+
+    def setup_method(self):
+        """테스트 설정"""
+        TokenCache._registry.clear()
+
+    def test_parse_legacy_and_new_formats(self):
+        """기존/신규 캐시 형식 해석 테스트"""
+        expires = datetime.now() + timedelta(hours=5)
+        token, exp = parse_token_cache({'token': 'abc', 'expires_at': expires.isoformat()})
+        assert token == 'abc'
+        assert abs(exp - expires.timestamp()) < 1
+
+        token, exp = parse_token_cache({'access_token': 'xyz', 'issue_time': 1000, 'expires_in': 60})
+        assert token == 'xyz'
+        assert exp == 1060
+
+        assert parse_token_cache({'unknown': 1}) == (None, None)
+
+    def test_store_then_get_uses_memory(self, tmp_path, monkeypatch):
+        """저장 후 조회는 파일을 다시 읽지 않음"""
+        cache = TokenCache.for_path(tmp_path / 'token.json')
+        cache.store('token-1', expires_in=86400)
+
+        def fail_open(*args, **kwargs):
+            raise AssertionError("파일을 다시 읽으면 안 됨")
+
+        monkeypatch.setattr('builtins.open', fail_open)
+        for _ in range(100):
+            assert cache.get() == 'token-1'
+
+    def test_shared_instance_per_path(self, tmp_path):
+        """같은 경로는 같은 인스턴스 공유"""
+        path = tmp_path / 'token.json'
+        assert TokenCache.for_path(path) is TokenCache.for_path(str(path))
+
+    def test_detects_external_rewrite(self, tmp_path):
+        """다른 프로세스가 파일을 갱신하면 새 토큰 로드"""
+        path = tmp_path / 'token.json'
+        cache = TokenCache.for_path(path)
+        cache.stat_interval = 0.0
+        cache.store('old-token', expires_in=86400)
+        assert cache.get() == 'old-token'
+
+        time.sleep(0.01)
+        expires = (datetime.now() + timedelta(hours=10)).isoformat()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'token': 'new-token-from-other-process', 'expires_at': expires}, f)
+
+        assert cache.get() == 'new-token-from-other-process'
+
+    def test_near_expiry_returns_none(self, tmp_path):
+        """만료 임박 토큰은 None (재발급 유도)"""
+        cache = TokenCache.for_path(tmp_path / 'token.json')
+        cache.store('short-token', expires_in=600)
+        assert cache.get() is None          # 기본 1시간 여유
+        assert cache.get(margin=60) == 'short-token'
+
+    def test_invalidate_removes_file(self, tmp_path):
+        """무효화 시 메모리/파일 모두 삭제"""
+        path = tmp_path / 'token.json'
+        cache = TokenCache.for_path(path)
+        cache.store('token', expires_in=86400)
+        cache.invalidate()
+        assert not os.path.exists(path)
+        assert cache.get() is None
+
+    def test_corrupted_file_is_removed(self, tmp_path):
+        """손상된 캐시 파일은 삭제 후 None"""
+        path = tmp_path / 'token.json'
+        path.write_text('{not json', encoding='utf-8')
+        cache = TokenCache.for_path(path)
+        assert cache.get() is None
+        assert not os.path.exists(path)
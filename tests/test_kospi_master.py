@@ -0,0 +1,117 @@
+"""
+kospi_master 단위 테스트
+
+.mst 직접 파싱, 해시 캐시 재사용/무효화, 공유 인덱스를 테스트합니다. (합성 마스터 파일 사용)
+"""
+
+import re
+
+import pytest
+
+import kospi_master
+from kospi_master import (
+    NAME_SECTOR_KEYWORDS, PART2_COLUMNS, PART2_WIDTHS, SECTOR_COLUMN, classify_master_sectors,
+    classify_sector_by_name, load_kospi_master, parse_kospi_mst,
+)
+
+
+def _mst_line(code, name, **fields):
+    """합성 .mst 한 줄 (앞부분 + 고정폭 227자)"""
+    values = {'그룹코드': 'ST', '지수업종대분류': '0000', 'KOSPI200섹터업종': '0', '시가총액': '0'}
+    values.update(fields)
+    part2 = ''.join(str(values.get(col, '0' if width < 3 else '')).rjust(width)[:width]
+                    for col, width in zip(PART2_COLUMNS, PART2_WIDTHS))
+    return f"{code:<9}{'KR7' + code + '003':<12}{name}" + part2
+
+
+def _mst_bytes(lines):
+    return ('\n'.join(lines) + '\n').encode('cp949')
+
+
+SAMPLE = [
+    _mst_line('005930', '삼성전자', KRX반도체='Y', 시가총액='4000000'),
+    _mst_line('105560', 'KB금융', KRX은행='Y', 시가총액='300000'),
+    _mst_line('000720', '현대건설', KOSPI200섹터업종='1', 시가총액='40000'),
+    _mst_line('003550', 'LG', 지수업종대분류='0021', 시가총액='120000'),
+    _mst_line('F70100', 'ETN상품', 시가총액='10'),
+]
+
+
+class TestKospiMaster:
+    """kospi_master 테스트 클래스"""
+
+    def test_parse_fixed_width(self):
+        """앞부분/고정폭 필드 분리, 단축코드 문자열 유지"""
+        df = parse_kospi_mst(_mst_bytes(SAMPLE))
+        assert len(df) == 5
+        assert df.loc[0, '단축코드'] == '005930' and df.loc[0, '한글명'] == '삼성전자'
+        assert df.loc[0, '표준코드'] == 'KR7005930003'
+        assert df.loc[0, 'KRX반도체'] == 'Y' and df.loc[0, '시가총액'] == 4000000
+        assert df.loc[3, '지수업종대분류'] == 21
+
+    def test_indexes(self, tmp_path):
+        """코드→행/종목명/섹터, 종목명→코드 (6자리 숫자 코드만)"""
+        path = tmp_path / 'kospi_code.mst'
+        path.write_bytes(_mst_bytes(SAMPLE))
+        master = load_kospi_master(str(path), cache_dir=None)
+        assert master.code_to_name['005930'] == '삼성전자'
+        assert master.name_to_code['KB금융'] == '105560'
+        assert dict(master.code_to_sector) == {
+            '005930': '전기전자', '105560': '금융', '000720': '건설', '003550': '지주회사'
+        }
+        assert master.row('5930')['한글명'] == '삼성전자'
+        assert 'F70100' not in master.code_to_row
+        with pytest.raises(TypeError):
+            master.code_to_name['005930'] = 'x'  # 읽기 전용
+
+    def test_hash_cache(self, tmp_path, monkeypatch):
+        """같은 내용은 캐시 사용 (재파싱 없음), 내용이 바뀌면 재파싱"""
+        path = tmp_path / 'kospi_code.mst'
+        cache_dir = tmp_path / 'cache'
+        path.write_bytes(_mst_bytes(SAMPLE))
+        first = load_kospi_master(str(path), cache_dir=str(cache_dir))
+
+        calls = []
+        real_parse = kospi_master.parse_kospi_mst
+        monkeypatch.setattr(kospi_master, 'parse_kospi_mst', lambda data: calls.append(1) or real_parse(data))
+
+        cached = load_kospi_master(str(path), cache_dir=str(cache_dir))
+        assert calls == []
+        assert cached.digest == first.digest
+        assert cached.frame.equals(first.frame)
+        assert cached.frame[SECTOR_COLUMN].tolist()[:2] == ['전기전자', '금융']  # 섹터 컬럼도 캐시
+
+        path.write_bytes(_mst_bytes(SAMPLE[:2]))
+        changed = load_kospi_master(str(path), cache_dir=str(cache_dir))
+        assert calls == [1] and len(changed) == 2
+        assert len(list(cache_dir.iterdir())) == 1  # 이전 해시 캐시 정리
+
+    def test_missing_file(self, tmp_path):
+        """파일이 없으면 빈 마스터"""
+        master = load_kospi_master(str(tmp_path / 'none.mst'), cache_dir=None)
+        assert master.empty and not master.code_to_name
+
+    def test_sector_priority(self):
+        """KRX 플래그 → KOSPI200 섹터업종 → 지수업종 대분류 순, 분류 불가는 NaN"""
+        df = parse_kospi_mst(_mst_bytes([
+            _mst_line('000001', 'A', KRX은행='Y', KRX자동차='Y', KOSPI200섹터업종='5'),
+            _mst_line('000002', 'B', KOSPI200섹터업종='A', 지수업종대분류='0021'),
+            _mst_line('000003', 'C', 지수업종대분류='0029'),
+            _mst_line('000004', 'D'),
+        ]))
+        sectors = classify_master_sectors(df)
+        assert sectors[:3].tolist() == ['금융', '바이오/제약', 'IT'] and sectors.isna()[3]
+
+    def test_name_fallback_matches_ordered_search(self):
+        """단일 정규식 결과 == 키워드를 우선순위대로 re.search 한 결과"""
+        def ordered(name):
+            name = name.replace('보통주', '').replace('우선주', '').strip()
+            return next((sec for pattern, sec in NAME_SECTOR_KEYWORDS
+                         if re.search(pattern, name, re.IGNORECASE)), None)
+
+        names = ['KB금융', 'KT', 'KT&G', '케이티앤지', '한국항공우주', 'LG에너지솔루션', '현대모비스',
+                 '대한항공', 'SK홀딩스', '셀트리온', '현대로템', '기아 자동차 금융', 'HMM 보통주', '카카오']
+        for name in names:
+            assert classify_sector_by_name(name) == ordered(name), name
+        assert classify_sector_by_name('부품 홀딩스 은행') == '금융'  # 뒤에 있어도 우선순위 우선
+        assert classify_sector_by_name('') is None
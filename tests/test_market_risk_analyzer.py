@@ -0,0 +1,103 @@
+"""
+MarketRiskAnalyzer 공유 서비스 단위 테스트
+
+시장 공통 상태(종목명 인덱스, 외국인 수급 이력)의 1회 로드·TTL 재로드,
+현재가 응답 재사용(종목별 추가 호출 없음), 외국인 추세의 리스크 반영을 테스트합니다.
+"""
+
+from market_risk_analyzer import MarketRiskAnalyzer, get_market_risk_service
+
+PRICE = {'current_price': 60000, 'w52_high': 80000, 'w52_low': 50000, 'per': 10.0, 'pbr': 1.0,
+         'change_rate': 0.5, 'foreign_net_buy': 0, 'program_net_buy': 0}
+
+
+class _FakeProvider:
+    """현재가 응답 대체 (호출 기록)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_stock_price_info(self, symbol):
+        self.calls.append(symbol)
+        return dict(PRICE)
+
+
+class _FakeFeatureDB:
+    """외국인 수급 이력 대체 (로드 횟수 기록)"""
+
+    def __init__(self, flows):
+        self.flows = flows
+        self.loads = 0
+
+    def get_foreign_flows(self, max_age_days=7):
+        self.loads += 1
+        return self.flows
+
+
+def _analyzer(flows=None, state_ttl=600.0):
+    db = _FakeFeatureDB(flows or {})
+    analyzer = MarketRiskAnalyzer(_FakeProvider(), feature_db=db, state_ttl=state_ttl)
+    analyzer._load_name_index = lambda: {'005930': '삼성전자'}
+    return analyzer, db
+
+
+class TestMarketRiskService:
+    """공유 리스크 분석 서비스 테스트 클래스"""
+
+    def test_market_state_loaded_once(self):
+        """여러 종목을 분석해도 시장 공통 상태는 1회 로드, 현재가를 넘기면 API 호출 없음"""
+        analyzer, db = _analyzer()
+        for symbol in ('005930', '000660', '035720'):
+            analyzer.analyze_stock_risk(symbol, price_info=dict(PRICE))
+        assert db.loads == 1 and analyzer.provider.calls == []
+        assert analyzer.analyze_stock_risk('005930', price_info=dict(PRICE))['stock_name'] == '삼성전자'
+
+        analyzer.analyze_stock_risk('005930')  # 현재가 미전달 시에만 종목별 1회 조회
+        assert analyzer.provider.calls == ['005930']
+
+    def test_ttl_reload(self):
+        """TTL이 지나면 재로드, invalidate 후에도 재로드"""
+        analyzer, db = _analyzer(state_ttl=60.0)
+        analyzer.analyze_stock_risk('005930', price_info=dict(PRICE))
+        analyzer._state_loaded_at -= 61.0
+        analyzer.analyze_stock_risk('005930', price_info=dict(PRICE))
+        assert db.loads == 2
+
+        analyzer, db = _analyzer()
+        analyzer.analyze_stock_risk('005930', price_info=dict(PRICE))
+        analyzer.invalidate_market_state()
+        analyzer.analyze_stock_risk('005930', price_info=dict(PRICE))
+        assert db.loads == 2
+
+    def test_foreign_trend_from_shared_flows(self):
+        """외국인 연속 매도 이력은 리스크 점수를 올리고, 이력 없으면 중립"""
+        flows = {'000660': {'as_of_date': '2025-10-01', 'foreign_sell_streak': 3, 'foreign_buy_streak': 0,
+                            'foreign_sell_days': 4, 'foreign_buy_days': 0}}
+        analyzer, _ = _analyzer(flows)
+        selling = analyzer.analyze_stock_risk('000660', price_info=dict(PRICE))
+        neutral = analyzer.analyze_stock_risk('005930', price_info=dict(PRICE))
+
+        assert selling['foreign_trend']['trend_strength'] == 'strong_selling'
+        assert selling['foreign_trend']['consecutive_selling_days'] == 3
+        assert neutral['foreign_trend']['trend_strength'] == 'neutral'
+        assert selling['risk_score'] == neutral['risk_score'] + 2
+
+    def test_service_shared_per_provider(self):
+        """같은 공급자는 같은 서비스, 다른 공급자는 별도 서비스"""
+        provider = _FakeProvider()
+        assert get_market_risk_service(provider) is get_market_risk_service(provider)
+        assert get_market_risk_service(_FakeProvider()) is not get_market_risk_service(provider)
+
+    def test_service_released_with_provider(self):
+        """서비스가 공급자를 붙잡지 않음 → 공급자가 사라지면 캐시 항목도 정리"""
+        import gc
+        import market_risk_analyzer
+
+        provider = _FakeProvider()
+        service = get_market_risk_service(provider)
+        assert service.provider is provider
+        before = len(market_risk_analyzer._services)
+        del provider
+        gc.collect()
+        assert len(market_risk_analyzer._services) == before - 1
+        assert service.provider is None
@@ -0,0 +1,129 @@
+"""
+AsyncKISClient 단위 테스트
+
+동시 진행 상한, 캐시 공유, 동기 래퍼 동작을 테스트합니다. (네트워크 미사용)
+"""
+
+import asyncio
+import json
+
+from kis_rate_limiter import KISGlobalRateLimiter, DEFAULT_MAX_TPS
+from mcp_kis_async import AsyncKISClient, run_coroutine_sync
+from mcp_kis_integration import MCPKISIntegration
+
+
+class _FakeOAuth:
+    appkey = 'test-key'
+    appsecret = 'test-secret'
+
+
+class _FakeTransport:
+    """_http_get 대체: 호출 수와 최대 동시 진행 수 기록"""
+
+    def __init__(self, delay: float = 0.02):
+        self.delay = delay
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, state, url, headers, params):
+        self.calls.append(params.get('FID_INPUT_ISCD'))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        body = {'rt_cd': '0', 'output': {'stck_prpr': '1000', 'code': params.get('FID_INPUT_ISCD')}}
+        return body, {}, ''
+
+
+class _FakeResponse:
+    """requests.Response 대체 (상태 코드 + JSON 본문)"""
+
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.headers = {'tr_cont': ''}
+        self.text = json.dumps(body or {})
+
+
+class _FakeSession:
+    """requests.Session 대체: 준비된 응답을 순서대로 반환"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, headers=None, params=None, timeout=None):
+        self.calls += 1
+        return self.responses.pop(0)
+
+
+class TestAsyncKISClient:
+    """AsyncKISClient 테스트 클래스"""
+
+    def setup_method(self):
+        """테스트 설정 (빠른 쿼터 + 토큰/전송 대체)"""
+        KISGlobalRateLimiter.configure(max_tps=1000)
+        self.mcp = MCPKISIntegration(_FakeOAuth(), response_cache_path=None)
+        self.mcp._load_cached_token = lambda: 'token'
+        self.transport = _FakeTransport()
+
+    def teardown_method(self):
+        """기본 설정 복원"""
+        KISGlobalRateLimiter.configure(max_tps=DEFAULT_MAX_TPS)
+
+    def _client(self, max_in_flight=4):
+        client = AsyncKISClient(self.mcp, max_in_flight=max_in_flight)
+        client._http_get = self.transport
+        return client
+
+    def test_bulk_prices_bounded_concurrency(self):
+        """대량 조회는 동시에 진행되지만 max_in_flight를 넘지 않음"""
+        client = self._client(max_in_flight=4)
+        symbols = [f"{i:06d}" for i in range(1, 21)]
+
+        prices = asyncio.run(client.get_current_prices(symbols))
+
+        assert set(prices) == set(symbols)
+        assert prices['000001']['stck_prpr'] == '1000'
+        assert 1 < self.transport.max_in_flight <= 4
+
+    def test_shares_sync_cache(self):
+        """동기 클라이언트와 같은 캐시 사용 (두 번째 조회는 네트워크 미호출)"""
+        client = self._client()
+        asyncio.run(client.get_current_prices(['005930', '000660']))
+        asyncio.run(client.get_current_prices(['005930', '000660', '005930']))
+        assert sorted(self.transport.calls) == ['000660', '005930']
+
+    def test_sync_wrapper_inside_running_loop(self):
+        """이벤트 루프 내부에서도 동기 래퍼 사용 가능"""
+        self.mcp._async_client = self._client()
+
+        async def caller():
+            return self.mcp.get_current_prices(['005930'])
+
+        assert '005930' in asyncio.run(caller())
+
+    def test_run_coroutine_sync_propagates_errors(self):
+        """코루틴 예외는 호출자에게 전달"""
+        async def boom():
+            raise ValueError("boom")
+
+        try:
+            run_coroutine_sync(boom())
+        except ValueError as e:
+            assert str(e) == "boom"
+        else:
+            raise AssertionError("예외가 전달되어야 함")
+
+    def test_sync_send_request_uses_async_logic(self):
+        """동기 _send_request도 같은 재시도 로직으로 공유 세션을 통해 전송"""
+        self.mcp.session = _FakeSession([
+            _FakeResponse(503),
+            _FakeResponse(200, {'rt_cd': '0', 'output': {'stck_prpr': '1000'}}),
+        ])
+        self.mcp._retry_backoff = lambda status, attempt, retry_after: 0.0
+
+        data = self.mcp._send_request('/uapi/domestic-stock/v1/quotations/inquire-price', 'FHKST01010100', {})
+
+        assert data['output']['stck_prpr'] == '1000'
+        assert self.mcp.session.calls == 2
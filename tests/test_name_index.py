@@ -0,0 +1,105 @@
+"""
+NameIndex 단위 테스트
+
+정확/정규화/전방/포함 일치, 부분 일치 스코어링, 유사도 매칭과
+DART 기업명 검색 연동을 테스트합니다. (네트워크 미사용)
+"""
+
+from difflib import SequenceMatcher
+
+import pandas as pd
+
+from corpCode import DARTCorpCodeManager
+from name_index import NameIndex, normalize_name
+
+STOCKS = {'삼성전자': '005930', '삼성전자우': '005935', '삼성SDI': '006400',
+          'SK하이닉스': '000660', 'LG': '003550', 'LG화학': '051910'}
+
+
+def _linear_partial(query, names):
+    """기존 search_stock_by_name 부분 일치 (선형 탐색)"""
+    candidates = []
+    for name in names:
+        if query in name:
+            score = (3 if name.startswith(query) else 1) + 1.0 / (1 + abs(len(query) - len(name)))
+        elif name in query:
+            score = (2 if query.startswith(name) else 1) + 1.0 / (1 + abs(len(query) - len(name)))
+        else:
+            continue
+        candidates.append((score, len(name), name))
+    candidates.sort(key=lambda x: (-x[0], x[1]))
+    return candidates[0][2] if candidates else None
+
+
+class TestNameIndex:
+    """NameIndex 테스트 클래스"""
+
+    def test_lookups(self):
+        """정확/정규화/전방/포함 일치"""
+        index = NameIndex(list(STOCKS), values=list(STOCKS.values()))
+        assert index.value(index.get('삼성전자')) == '005930'
+        assert index.get('삼성') is None
+        assert index.names[index.get_normalized(' 삼성 sdi ')] == '삼성SDI'
+        assert [index.names[i] for i in index.prefix('삼성')] == ['삼성SDI', '삼성전자', '삼성전자우']
+        assert [index.names[i] for i in index.contains('sdi')] == ['삼성SDI']
+        assert [index.names[i] for i in index.contains('L')] == ['LG', 'LG화학']
+        assert index.contains('전자', limit=1) == [0]
+        assert normalize_name('(주)삼성 전자') == '삼성전자'
+
+    def test_best_partial_matches_linear(self):
+        """부분 일치 결과 == 기존 선형 스코어링"""
+        names = list(STOCKS)
+        index = NameIndex(names, values=list(STOCKS.values()))
+        for query in ['삼성', '전자', '삼성전자우선', 'SK', 'LG화', 'LG디스플레이', '하이닉스', '없는종목']:
+            best = index.best_partial(query)
+            assert (index.names[best[1]] if best else None) == _linear_partial(query, names), query
+
+    def test_fuzzy_threshold(self):
+        """정규화 이름 유사도 (임계값 이상 최고점), 짧은 이름도 후보"""
+        names = ['삼성전자(주)', '삼성전기', '현대자동차', 'AB']
+        index = NameIndex(names, normalizer=normalize_name)
+        assert index.fuzzy('삼성전자') == [(0, 1.0)]
+        (i, score), = index.fuzzy('현대자동차우', threshold=0.8)
+        assert names[i] == '현대자동차'
+        assert score == SequenceMatcher(None, '현대자동차우', '현대자동차').ratio()
+        assert index.fuzzy('AXB', threshold=0.8) == [(3, 0.8)]  # 2-gram 공유 없음
+        assert index.fuzzy('카카오', threshold=0.8) == []
+
+    def test_mcp_search_uses_index(self, monkeypatch):
+        """search_stock_by_name / _resolve_symbol이 종목명 인덱스로 해석"""
+        from mcp_kis_integration import MCPKISIntegration
+        index = NameIndex([n.upper() for n in STOCKS], values=list(STOCKS.values()))
+        monkeypatch.setattr(MCPKISIntegration, '_name_index', index)
+        mcp = MCPKISIntegration.__new__(MCPKISIntegration)
+        assert mcp.search_stock_by_name('삼성sdi') == '006400'
+        assert mcp.search_stock_by_name('하이닉스') == '000660'
+        assert mcp._resolve_symbol('LG화학') == '051910'
+        assert mcp._resolve_symbol('005930') == '005930'
+
+
+class TestDARTNameSearch:
+    """DARTCorpCodeManager 인덱스 연동 테스트"""
+
+    def _manager(self, tmp_path):
+        manager = DARTCorpCodeManager('test-key', cache_dir=str(tmp_path))
+        manager._corp_codes_df = pd.DataFrame([
+            {'corp_code': '00126380', 'corp_name': '삼성전자', 'stock_code': '005930'},
+            {'corp_code': '00164779', 'corp_name': 'SK하이닉스', 'stock_code': '000660'},
+            {'corp_code': '00999999', 'corp_name': '삼성전자서비스', 'stock_code': ''},
+        ])
+        manager._corp_codes_dict = dict(zip(manager._corp_codes_df['corp_name'],
+                                            manager._corp_codes_df['corp_code']))
+        return manager
+
+    def test_find_and_search(self, tmp_path):
+        """정확/유사도 기업코드 조회, 포함 검색은 원래 행 순서·limit 유지"""
+        manager = self._manager(tmp_path)
+        assert manager.find_corp_code_by_name('삼성전자') == '00126380'
+        assert manager.find_corp_code_by_name('SK하이닉스 주식회사') == '00164779'
+        assert manager.find_corp_code_by_name('카카오') is None
+
+        results = manager.search_companies('삼성', limit=5)
+        assert [r['corp_code'] for r in results] == ['00126380', '00999999']
+        assert manager.search_companies('sk', limit=1) == [
+            {'corp_name': 'SK하이닉스', 'corp_code': '00164779', 'stock_code': '000660'}
+        ]
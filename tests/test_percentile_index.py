@@ -0,0 +1,81 @@
+"""
+EmpiricalDistribution 단위 테스트
+
+mid-rank 퍼센타일, 벡터화 결과 일치, 직렬화, breakpoint 호환성을 테스트합니다.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from percentile_index import EmpiricalDistribution, SectorPercentileIndex
+
+
+class TestEmpiricalDistribution:
+    """EmpiricalDistribution 테스트 클래스"""
+
+    def test_mid_rank_percentile(self):
+        """0/NaN 제외 후 mid-rank 퍼센타일"""
+        dist = EmpiricalDistribution([0, np.nan, 1, 2, 3, 4])
+        assert dist.size == 4
+        assert dist.percentile(2) == pytest.approx(37.5)
+        assert dist.percentile(0.5) == 0.0
+        assert dist.percentile(10) == 100.0
+        assert dist.percentile(float('nan')) is None
+
+    def test_numpy_scalars_accepted(self):
+        """pandas 행에서 오는 numpy 스칼라도 파이썬 수와 같은 결과"""
+        dist = EmpiricalDistribution([1, 2, 3, 4])
+        assert dist.percentile(np.int64(2)) == dist.percentile(2)
+        assert dist.percentile(np.float32(2.0)) == dist.percentile(2.0)
+        assert dist.percentile(np.float64('nan')) is None
+        assert dist.percentile('2') is None
+
+    def test_vectorized_matches_scalar(self):
+        """벡터화 결과와 단일 계산 일치"""
+        rng = np.random.default_rng(1)
+        dist = EmpiricalDistribution(rng.normal(10, 5, 500))
+        x = np.array([-5.0, 3.3, 10.0, np.inf, 22.0])
+        vec = dist.percentiles(x)
+        for value, pct in zip(x, vec):
+            scalar = dist.percentile(float(value))
+            assert (scalar is None and np.isnan(pct)) or scalar == pytest.approx(pct)
+
+    def test_bytes_roundtrip_and_breakpoints(self):
+        """BLOB 왕복 후 동일, breakpoint는 np.percentile과 일치"""
+        values = np.arange(1, 101, dtype=float)
+        dist = EmpiricalDistribution.from_bytes(EmpiricalDistribution(values).to_bytes())
+        assert np.array_equal(dist.values, values)
+        bp = dist.breakpoints()
+        assert bp['p10'] == pytest.approx(np.percentile(values, 10))
+        assert bp['sample_size'] == 100
+
+
+class TestSectorPercentileIndex:
+    """SectorPercentileIndex 테스트 클래스"""
+
+    def _frame(self):
+        rng = np.random.default_rng(2)
+        n = 300
+        return pd.DataFrame({
+            'sector_normalized': rng.choice(['금융', '전기전자', '화학', '소표본'], n, p=[0.4, 0.3, 0.29, 0.01]),
+            'per': rng.uniform(2, 50, n),
+            'roe': rng.normal(8, 6, n),
+        })
+
+    def test_sector_distribution_matches_group(self):
+        """섹터별 분포는 해당 섹터 유효값의 정렬 배열"""
+        df = self._frame()
+        index = SectorPercentileIndex.from_frame(df, metrics=['per', 'roe'])
+        expected = np.sort(df.loc[df['sector_normalized'] == '금융', 'per'].to_numpy())
+        assert np.array_equal(index.get('금융', 'per').values, expected)
+        assert index.get('소표본', 'per') is None  # n < 5
+
+    def test_batch_matches_scalar(self):
+        """후보 전체 벡터화 결과가 종목별 계산과 일치"""
+        df = self._frame()
+        index = SectorPercentileIndex.from_frame(df, metrics=['per'])
+        batch = index.percentiles(df['sector_normalized'], 'per', df['per'])
+        for sector, value, pct in zip(df['sector_normalized'], df['per'], batch):
+            scalar = index.percentile(sector, 'per', value)
+            assert (scalar is None and np.isnan(pct)) or scalar == pytest.approx(pct)
@@ -0,0 +1,280 @@
+"""
+2단계 스크리닝 파이프라인 단위 테스트
+
+조회 단계(순서 유지·오류 집계·배치 백오프), 평가 단계(프로세스 풀 결과 ==
+현재 프로세스 결과), 헤드리스 ScreeningEngine과 결과 저장/증분 재평가를
+테스트합니다. 스트리밍 실행(완료 순서 방출·run과 같은 저장 결과·조기 종료)과 TopN도 포함합니다.
+(네트워크 미사용)
+"""
+
+import contextlib
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import screening_engine
+from db_cache_manager import DBCacheManager
+from screening_engine import (ScreeningEngine, StageErrors, TopN, fetch_stage, process_pool_available,
+                              score_stage)
+
+OPTIONS = {'score_min': 60.0, 'score_min_pct': 50.0, 'percentile_cap': 99.5,
+           'per_max': 15.0, 'pbr_max': 1.5, 'roe_min': 10.0}
+
+
+class _FakeFinder:
+    """조회 결과 대체 (호출 기록, 지정 종목은 예외/None)"""
+
+    def __init__(self, fail=(), missing=()):
+        self.fail = set(fail)
+        self.missing = set(missing)
+        self.calls = []
+        self.scored = []
+        self.per = {}
+
+    def fetch_screening_data(self, symbol, name, options):
+        self.calls.append(symbol)
+        if symbol in self.fail:
+            raise RuntimeError('boom')
+        return None if symbol in self.missing else {'symbol': symbol, 'per': self.per.get(symbol, 10.0)}
+
+    def get_stock_universe(self, max_count):
+        return {f"{i:06d}": {'name': f"종목{i}"} for i in range(10)}
+
+    def score_screening_data(self, symbol, name, stock_data, options):
+        self.scored.append(symbol)
+        score = float(int(symbol))
+        return {'symbol': symbol, 'name': name, 'value_score': score,
+                'recommendation': 'BUY' if score >= 3 else 'HOLD'}
+
+
+def _stock_data(i, rng):
+    return {
+        'symbol': f"{i:06d}", 'name': f"종목{i}", 'sector_name': ['전기전자', '금융', '기타'][i % 3],
+        'per': float(rng.uniform(2, 40)), 'pbr': float(rng.uniform(0.2, 6.0)),
+        'roe': float(rng.uniform(-10, 30)), 'current_price': float(rng.uniform(1000, 100000)),
+        'market_cap': float(rng.uniform(500, 50000)), 'change_rate': float(rng.uniform(-5, 5)),
+        'sector_stats': {}, '_prefetched_momentum': float(rng.uniform(0, 100)),
+    }
+
+
+@pytest.fixture(scope='module')
+def finder():
+    from value_stock_finder import ValueStockFinder
+    finder = ValueStockFinder()
+    del finder.debug_output_dir  # 디버그 JSON 기록 방지
+    finder._get_sector_percentile_index = lambda: None
+    finder._get_global_distributions = lambda: {}
+    return finder
+
+
+class TestScreeningEngine:
+    """screening_engine 테스트 클래스"""
+
+    def test_fetch_order_and_errors(self, monkeypatch):
+        """입력 순서 유지, 예외는 집계·None은 제외, 배치마다 진행률 보고"""
+        sleeps = []
+        monkeypatch.setattr(screening_engine.time, 'sleep', sleeps.append)
+        items = [(f"{i:06d}", f"종목{i}") for i in range(7)]
+        finder = _FakeFinder(fail={'000002'}, missing={'000004'})
+        errors = StageErrors()
+        progress = []
+
+        fetched = fetch_stage(finder, items, OPTIONS, max_workers=3, batch_size=3, base_delay=1.0,
+                              on_progress=lambda done, total: progress.append((done, total)), errors=errors)
+
+        assert [symbol for symbol, _, _ in fetched] == ['000000', '000001', '000003', '000005', '000006']
+        assert errors.counter == {'RuntimeError': 1} and '종목2' in errors.samples[0]
+        assert progress[-1] == (7, 7) and len(progress) == 7
+        assert sleeps == [1.5, pytest.approx(1.25)]  # 오류 배치 후 백오프 증가 → 감소
+
+    def test_prefetched_momentum(self, finder):
+        """조회 단계에서 계산한 모멘텀은 평가 단계에서 재조회하지 않음"""
+        assert finder.compute_momentum_score_lightweight('005930', {'_prefetched_momentum': 77.0}) == 77.0
+
+    @pytest.mark.skipif(not process_pool_available(), reason="fork 미지원 환경")
+    def test_process_pool_matches_in_process(self, finder, monkeypatch):
+        """프로세스 풀 평가 결과 == 현재 프로세스 평가 결과 (순서 포함)"""
+        rng = np.random.default_rng(5)
+        fetched = [(f"{i:06d}", f"종목{i}", _stock_data(i, rng)) for i in range(40)]
+
+        serial = score_stage(finder, fetched, OPTIONS, processes=1)
+        monkeypatch.setattr(screening_engine, 'PROCESS_POOL_MIN_ITEMS', 1)
+        monkeypatch.setattr(screening_engine, 'SCORE_CHUNK_SIZE', 7)
+        progress = []
+        pooled = score_stage(finder, fetched, OPTIONS, processes=2,
+                             on_progress=lambda done, total: progress.append(done))
+
+        assert len(serial) == len(pooled) > 0
+        assert [r['symbol'] for r in pooled] == [r['symbol'] for r in serial]
+        assert [r['value_score'] for r in pooled] == [r['value_score'] for r in serial]
+        assert progress[-1] == 40
+
+    def test_score_stage_uses_batch_scoring(self, finder, monkeypatch):
+        """현재 프로세스 평가는 배치 평가를 사용하고 종목별 평가와 같은 행을 냄"""
+        rng = np.random.default_rng(8)
+        fetched = [(f"{i:06d}", f"종목{i}", _stock_data(i, rng)) for i in range(30)]
+        expected = [row for row in (finder.score_screening_data(symbol, name, dict(data), OPTIONS)
+                                    for symbol, name, data in fetched) if row]
+        monkeypatch.setattr(screening_engine, 'BATCH_SCORE_SIZE', 12)
+        monkeypatch.setattr(finder, 'score_screening_data',
+                            lambda *args: pytest.fail("score_screening_data must not be called"))
+
+        rows = score_stage(finder, [(s, n, dict(d)) for s, n, d in fetched], OPTIONS)
+
+        assert rows == expected and len(rows) > 0
+
+    def test_process_pool_is_opt_in(self, finder, monkeypatch):
+        """processes 미지정(Streamlit 경로)이면 항목이 많아도 fork하지 않음"""
+        rng = np.random.default_rng(6)
+        fetched = [(f"{i:06d}", f"종목{i}", _stock_data(i, rng)) for i in range(10)]
+        monkeypatch.setattr(screening_engine, 'PROCESS_POOL_MIN_ITEMS', 1)
+
+        def _no_pool(*args, **kwargs):
+            raise AssertionError("process pool must be opt-in")
+
+        monkeypatch.setattr(screening_engine.concurrent.futures, 'ProcessPoolExecutor', _no_pool)
+        assert len(score_stage(finder, fetched, OPTIONS)) > 0
+        assert len(score_stage(finder, fetched, OPTIONS, processes=None)) > 0
+        assert screening_engine._WORKER_FINDER is None
+
+    @pytest.mark.parametrize('legacy, expected', [(False, ['engine', 'table']), (True, ['legacy'])])
+    def test_screen_all_stocks_runs_one_path(self, finder, monkeypatch, legacy, expected):
+        """스크리닝 실행은 엔진 결과 표시 후 종료, 기존 상세 분석은 명시 선택 시에만"""
+        import value_stock_finder
+
+        st = value_stock_finder.st
+        calls = []
+        monkeypatch.setattr(st, 'button', lambda *args, **kwargs: True)
+        monkeypatch.setattr(st, 'checkbox', lambda label, *args, **kwargs: legacy and '기존' in label)
+        monkeypatch.setattr(st, 'number_input', lambda *args, **kwargs: 20)
+        monkeypatch.setattr(st, 'columns', lambda n: [contextlib.nullcontext()] * n)
+        monkeypatch.setattr(st, 'dataframe', lambda *args, **kwargs: calls.append('table'))
+        columns = ["symbol", "name", "sector", "current_price", "per", "pbr", "roe", "value_score", "grade",
+                   "recommendation", "per_ok", "pbr_ok", "roe_ok", "score_ok", "pass_dynamic_cut"]
+        monkeypatch.setattr(finder, 'run_universe_screening',
+                            lambda options: calls.append('engine') or pd.DataFrame([dict.fromkeys(columns, 1)]))
+        monkeypatch.setattr(finder, '_screen_all_stocks_legacy', lambda options: calls.append('legacy'))
+        monkeypatch.setattr(finder, 'get_stock_universe',
+                            lambda *args, **kwargs: pytest.fail("legacy universe loading must not run"))
+
+        finder.screen_all_stocks({})
+
+        assert calls == expected
+
+    def test_engine_headless_run(self):
+        """UI 없이 유니버스 → 조회 → 평가, 단계별 진행률과 구조화된 결과"""
+        finder = _FakeFinder(fail={'000001'}, missing={'000002'})
+        progress = []
+        result = ScreeningEngine(finder, persist=False).run({'max_stocks': 5, 'api_strategy': '순차 모드 (안전)'},
+                                             on_progress=lambda *args: progress.append(args))
+
+        assert finder.calls == ['000000', '000001', '000002', '000003', '000004']
+        assert result.universe_size == 5 and result.fetched_count == 3 and len(result) == 3
+        assert result.error_counts == {'RuntimeError': 1}
+        assert result.options['per_max'] == 15.0  # 누락 옵션은 기본값
+        assert progress[-1] == ('score', 3, 3) and ('fetch', 5, 5) in progress
+
+        df = result.to_dataframe()
+        assert list(df['symbol']) == ['000004', '000003', '000000']  # 추천 → 점수 내림차순
+        assert list(df['pass_dynamic_cut']) == [True, True, False]  # 중앙값(3) * 0.9
+        assert result.summary()['scored'] == 3
+
+    def test_engine_empty_universe(self):
+        """유니버스가 비면 조회 없이 빈 결과"""
+        finder = _FakeFinder()
+        result = ScreeningEngine(finder, persist=False).run({'max_stocks': 5}, universe=[])
+        assert result.universe_size == 0 and result.rows == [] and finder.calls == []
+        assert result.to_dataframe().empty
+
+    def test_store_repeat_and_incremental(self, tmp_path):
+        """같은 옵션 재요청은 저장 결과 반환, 재실행은 입력이 바뀐 종목만 재평가"""
+        store = DBCacheManager(db_path=str(tmp_path / 'stock_data.db'))
+        finder = _FakeFinder()
+        options = {'max_stocks': 4, 'api_strategy': '빠른 모드 (병렬 처리)'}
+        first = ScreeningEngine(finder, store=store).run(options)
+        assert len(first) == 4 and first.reused_count == 0 and not first.from_store
+
+        # 전략/CPU 옵션은 결과 키에 영향 없음 → 조회/평가 없이 저장된 결과
+        finder.calls.clear()
+        again = ScreeningEngine(finder, store=store).run({**options, 'api_strategy': '안전 모드 (배치 처리)',
+                                                          'cpu_workers': 2})
+        assert again.from_store and finder.calls == []
+        assert again.rows == first.rows
+
+        # 다른 옵션은 별도 키
+        assert ScreeningEngine(finder, store=store).load_stored({**options, 'per_max': 12.0}) is None
+
+        finder.scored.clear()
+        finder.per['000002'] = 11.0
+        rerun = ScreeningEngine(finder, store=store).run(options, refresh=True)
+        assert finder.scored == ['000002'] and rerun.reused_count == 3
+        assert [r['symbol'] for r in rerun.rows] == ['000000', '000001', '000002', '000003']
+
+        with store.get_connection() as conn:
+            flags = conn.execute("SELECT COUNT(*) FROM screening_results WHERE rating = 'BUY'").fetchone()[0]
+        assert flags == 1
+
+    def test_stream_matches_run_and_persists(self, tmp_path):
+        """스트림은 행을 하나씩 내보내고, 끝까지 돌면 run과 같은 결과를 같은 키로 저장"""
+        store = DBCacheManager(db_path=str(tmp_path / 'stock_data.db'))
+        options = {'max_stocks': 5, 'api_strategy': '순차 모드 (안전)'}
+        finder = _FakeFinder(fail={'000001'}, missing={'000002'})
+        expected = ScreeningEngine(finder, persist=False).run(options)
+
+        seen = []
+        with ScreeningEngine(_FakeFinder(fail={'000001'}, missing={'000002'}), store=store).stream(options) as rows:
+            for row in rows:
+                seen.append(row['symbol'])
+        assert seen == ['000000', '000003', '000004']
+        assert rows.result.rows == expected.rows and not rows.result.stopped_early
+        assert rows.result.error_counts == {'RuntimeError': 1}
+
+        stored = ScreeningEngine(finder, store=store).load_stored(options)
+        assert stored is not None and stored.rows == expected.rows
+
+    def test_cli_run_served_to_stream_with_universe(self, tmp_path):
+        """유니버스 없이 실행한 결과(CLI)를 해석된 유니버스를 넘기는 스트림(Streamlit)이 그대로 사용"""
+        store = DBCacheManager(db_path=str(tmp_path / 'stock_data.db'))
+        options = {'max_stocks': 4, 'api_strategy': '순차 모드 (안전)'}
+        engine = ScreeningEngine(_FakeFinder(), store=store)
+        first = engine.run(options)
+        pairs = engine.resolve_universe(4)
+
+        finder = _FakeFinder()
+        with ScreeningEngine(finder, store=store).stream(options, universe=pairs) as rows:
+            seen = [row['symbol'] for row in rows]
+        assert rows.result.from_store and finder.calls == []
+        assert seen == [r['symbol'] for r in first.rows]
+        assert rows.result.options_hash == first.options_hash
+
+    def test_stream_early_exit(self, tmp_path):
+        """상위 N이 안정되면 중단 → 남은 조회 취소, 부분 결과는 저장 안 함"""
+        store = DBCacheManager(db_path=str(tmp_path / 'stock_data.db'))
+        finder = _FakeFinder()
+        fetch = finder.fetch_screening_data
+        finder.fetch_screening_data = lambda *args: (time.sleep(0.05), fetch(*args))[1]  # API 조회 지연
+        finder.score_screening_data = lambda symbol, name, data, options: {
+            'symbol': symbol, 'value_score': 100.0 - int(symbol), 'recommendation': 'BUY'}
+        top = TopN(2, patience=2)
+        with ScreeningEngine(finder, store=store).stream({'max_stocks': 10, 'api_strategy': '순차 모드 (안전)'}) as rows:
+            for row in rows:
+                top.add(row)
+                if top.stable:
+                    break
+        assert [r['symbol'] for r in top.rows] == ['000000', '000001'] and top.seen == 4
+        assert rows.result.stopped_early and len(rows.result.rows) == 4
+        assert len(finder.calls) < 10
+        assert ScreeningEngine(finder, store=store).load_stored({'max_stocks': 10}) is None
+
+    def test_top_n(self):
+        """점수 내림차순 상위 N 유지, 변경 여부와 안정 판단"""
+        top = TopN(2, patience=2)
+        assert top.add({'symbol': 'A', 'value_score': 50})
+        assert top.add({'symbol': 'B', 'value_score': 70})
+        assert not top.add({'symbol': 'C', 'value_score': 10}) and not top.stable
+        assert not top.add(None) and top.stable
+        assert top.add({'symbol': 'D', 'value_score': 60}) and not top.stable
+        assert [r['symbol'] for r in top.rows] == ['B', 'D']
+        assert list(top.to_dataframe(['symbol', 'missing']).columns) == ['symbol']
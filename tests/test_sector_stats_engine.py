@@ -0,0 +1,64 @@
+"""
+섹터 통계 엔진 단위 테스트
+
+np.percentile 결과 일치, 표본/0값 정책, 추가 지표 처리를 테스트합니다.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from sector_stats_engine import compute_sector_frame, compute_sector_stats, describe_values
+
+
+def _universe(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'sector_normalized': rng.choice(['전기전자', '금융', '화학'], n),
+        'per': rng.uniform(3, 40, n),
+        'pbr': rng.uniform(0.3, 4, n),
+        'roe': rng.normal(8, 5, n),
+        'debt_ratio': rng.uniform(10, 300, n),
+    })
+    df.loc[::9, 'per'] = 0.0       # 적자/미제공
+    df.loc[::13, 'pbr'] = np.nan
+    return df
+
+
+class TestSectorStatsEngine:
+    """섹터 통계 엔진 테스트 클래스"""
+
+    def test_matches_numpy_percentile(self):
+        """섹터별 분위수/요약 통계가 np.percentile/np.std와 일치"""
+        df = _universe()
+        stats = compute_sector_stats(df)
+
+        group = df[df['sector_normalized'] == '금융']
+        per = group['per'][(group['per'] != 0) & group['per'].notna()].to_numpy()
+        got = stats['금융']['per_percentiles']
+        for name, q in (('p10', 10), ('p25', 25), ('p50', 50), ('p75', 75), ('p90', 90)):
+            assert got[name] == pytest.approx(np.percentile(per, q))
+        assert got['std'] == pytest.approx(np.std(per))
+        assert stats['금융']['sample_size'] == len(group)
+
+    def test_min_sample_and_valid_values(self):
+        """n < 5 섹터 제외, 유효값 3개 미만 지표는 빈 통계"""
+        df = pd.DataFrame({
+            'sector_normalized': ['A'] * 6 + ['B'] * 4,
+            'per': [10, 12, 0, 0, 0, np.nan, 5, 6, 7, 8],
+            'pbr': [1, 2, 3, 4, 5, 6, 1, 1, 1, 1],
+        })
+        stats = compute_sector_stats(df, metrics=['per', 'pbr'])
+        assert list(stats) == ['A']
+        assert stats['A']['per_percentiles'] == {}
+        assert stats['A']['pbr_percentiles']['p50'] == pytest.approx(3.5)
+
+    def test_extra_metric_and_describe_values_agree(self):
+        """추가 지표도 컬럼명만으로 계산, 단일 목록 계산과 같은 정책"""
+        df = _universe()
+        frame = compute_sector_frame(df, metrics=['per', 'debt_ratio'])
+        assert 'debt_ratio_p90' in frame.columns
+
+        group = df[df['sector_normalized'] == '화학']
+        expected = describe_values(group['debt_ratio'])
+        assert frame.loc['화학', 'debt_ratio_p50'] == pytest.approx(expected['p50'])
@@ -0,0 +1,182 @@
+"""
+ValueStockFinder.evaluate_value_stocks_batch 단위 테스트
+
+배치(컬럼 단위) 평가가 스칼라 evaluate_value_stock과 같은 결과를 내는지 테스트합니다.
+(네트워크/DB 미사용: 모멘텀과 분포 조회를 고정값으로 대체)
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from percentile_index import EmpiricalDistribution, SectorPercentileIndex
+
+
+SECTORS = ['전기전자', '금융', '제조업', '기타']
+
+
+def _sector_stats(sample_size, rng):
+    """섹터 breakpoint 통계 (표본 크기별 분기 확인용)"""
+    def pcts(center, spread):
+        q = np.sort(rng.normal(center, spread, 5))
+        return dict(zip(('p10', 'p25', 'p50', 'p75', 'p90'), (float(v) for v in q)))
+    return {
+        'sample_size': sample_size,
+        'per_percentiles': pcts(12, 4),
+        'pbr_percentiles': pcts(1.2, 0.4),
+        'roe_percentiles': pcts(9, 4),
+    }
+
+
+def _same(a, b):
+    """값 일치 (NaN끼리는 같음으로 간주)"""
+    return a == b or (a != a and b != b)
+
+
+OPTIONS = {'score_min': 60.0, 'score_min_pct': 45.0, 'per_max': 15.0, 'pbr_max': 1.5, 'roe_min': 8.0,
+           'percentile_cap': 99.5}
+
+
+def _candidates(n=60, seed=7):
+    """다양한 분기(음수 PER, 음수 ROE, 섹터 통계 없음/소표본/대표본)를 포함한 후보"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        sample_size = [0, 6, 15, 25, 45, 120][i % 6]
+        rows.append({
+            'symbol': f"{i + 1:06d}",
+            'name': f"종목{i}",
+            'sector_name': SECTORS[i % len(SECTORS)],
+            'per': float(rng.choice([-3.0, 0.0, rng.uniform(2, 40)])) if i % 7 == 0 else float(rng.uniform(2, 40)),
+            'pbr': float(rng.uniform(0.2, 6.0)),
+            'roe': float(rng.uniform(-10, 30)),
+            'current_price': float(rng.uniform(1000, 100000)),
+            'market_cap': float(rng.uniform(500, 50000)),
+            'change_rate': float(rng.uniform(-5, 5)),
+            'debt_ratio': float(rng.uniform(20, 300)),
+            'current_ratio': float(rng.uniform(50, 250)),
+            'sector_stats': _sector_stats(sample_size, rng) if sample_size else {},
+            'relative_per': float(rng.uniform(0.5, 1.5)) if i % 3 else None,
+            'sector_percentile': float(rng.uniform(0, 100)) if i % 4 else None,
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture(scope='module')
+def finder():
+    from value_stock_finder import ValueStockFinder
+    finder = ValueStockFinder()
+    del finder.debug_output_dir  # 스칼라 경로의 디버그 JSON 기록 방지
+    finder.compute_momentum_score_lightweight = lambda symbol, stock_data: finder._compute_basic_momentum(stock_data)
+    return finder
+
+
+class TestEvaluateValueStocksBatch:
+    """evaluate_value_stocks_batch 테스트 클래스"""
+
+    def _assert_matches_scalar(self, finder, df):
+        batch = finder.evaluate_value_stocks_batch(df)
+        for i, record in enumerate(df.to_dict('records')):
+            scalar = finder.evaluate_value_stock(copy.deepcopy(record))
+            row = batch.iloc[i]
+            if scalar is None:
+                assert not row['evaluated']
+                continue
+            assert row['evaluated']
+            assert row['value_score'] == scalar['value_score']  # 비트 단위 일치
+            assert row['grade'] == scalar['grade']
+            assert row['recommendation'] == scalar['recommendation']
+            details = scalar['details']
+            if 'per_score' not in details:  # HIGH 리스크 즉시 SELL
+                assert row['risk_penalty'] == details['risk_penalty']
+                continue
+            for key in ('per_score', 'pbr_score', 'roe_score', 'mos_score', 'sector_bonus',
+                        'quality_score', 'score_percentage', 'sector_adjustment', 'criteria_met',
+                        'momentum_score', 'safety_margin', 'intrinsic_value', 'confidence',
+                        'relative_per', 'relative_pbr', 'sector_percentile'):
+                assert _same(row[key], details[key]), key
+
+    def test_matches_scalar_with_breakpoints(self, finder, monkeypatch):
+        """DB 분포 없음 (breakpoint 보간 + 기본 글로벌 분포)"""
+        monkeypatch.setattr(finder, '_get_sector_percentile_index', lambda: None)
+        monkeypatch.setattr(finder, '_get_global_distributions', lambda: {})
+        self._assert_matches_scalar(finder, _candidates())
+
+    def test_matches_scalar_with_exact_distributions(self, finder, monkeypatch):
+        """정렬 표본 분포 사용 (섹터 인덱스 + 전시장 분포)"""
+        rng = np.random.default_rng(3)
+        universe = pd.DataFrame({
+            'sector_normalized': rng.choice(SECTORS[:3], 600),
+            'per': rng.uniform(1, 50, 600),
+            'pbr': rng.uniform(0.1, 5, 600),
+            'roe': rng.uniform(-15, 35, 600),
+        })
+        index = SectorPercentileIndex.from_frame(universe)
+        distributions = {m: EmpiricalDistribution(universe[m]) for m in ('per', 'pbr', 'roe')}
+        monkeypatch.setattr(finder, '_get_sector_percentile_index', lambda: index)
+        monkeypatch.setattr(finder, '_get_global_distributions', lambda: distributions)
+        self._assert_matches_scalar(finder, _candidates(seed=11))
+
+    def test_irregular_rows_and_input_untouched(self, finder, monkeypatch):
+        """비정상 행은 스칼라 경로로 처리, 입력 DataFrame은 수정하지 않음"""
+        monkeypatch.setattr(finder, '_get_sector_percentile_index', lambda: None)
+        monkeypatch.setattr(finder, '_get_global_distributions', lambda: {})
+        df = _candidates(n=8)
+        df.loc[2, 'per'] = np.nan
+        df.at[3, 'sector_stats'] = 'broken'
+        before = df.copy()
+        self._assert_matches_scalar(finder, df)
+        assert df['per'].equals(before['per'])
+        assert finder.evaluate_value_stocks_batch(df.iloc[:0]).empty
+
+    def test_screening_batch_rows_match_scalar(self, finder, monkeypatch):
+        """score_screening_batch 행 == score_screening_data 행 (모든 컬럼, 비트 단위)"""
+        monkeypatch.setattr(finder, '_get_sector_percentile_index', lambda: None)
+        monkeypatch.setattr(finder, '_get_global_distributions', lambda: {})
+        records = _candidates(seed=5).to_dict('records')
+        for record in records[::5]:
+            del record['current_price']  # 키 누락 행 (DataFrame NaN과 다른 dict.get 기본값)
+        records[1]['per'] = 'N/A'
+        items = [(r['symbol'], r['name'], r) for r in records]
+
+        rows = finder.score_screening_batch(copy.deepcopy(items), OPTIONS)
+        expected = [finder.score_screening_data(symbol, name, data, OPTIONS)
+                    for symbol, name, data in copy.deepcopy(items)]
+
+        assert any(rows) and len(rows) == len(expected)
+        for row, scalar in zip(rows, expected):
+            if scalar is None:
+                assert row is None
+                continue
+            assert row.keys() == scalar.keys()
+            for key in scalar:
+                assert _same(row[key], scalar[key]), key
+
+    def test_score_stage_uses_batch_percentiles(self, finder, monkeypatch):
+        """평가 단계는 지표 컬럼마다 배치 퍼센타일을 한 번 호출 (종목별 스칼라 조회 없음)"""
+        from screening_engine import score_stage
+
+        rng = np.random.default_rng(13)
+        universe = pd.DataFrame({
+            'sector_normalized': rng.choice(SECTORS[:3], 600),
+            'per': rng.uniform(1, 50, 600),
+            'pbr': rng.uniform(0.1, 5, 600),
+            'roe': rng.uniform(-15, 35, 600),
+        })
+        index = SectorPercentileIndex.from_frame(universe)
+        distributions = {m: EmpiricalDistribution(universe[m]) for m in ('per', 'pbr', 'roe')}
+        calls = []
+        batch_percentiles = index.percentiles
+        monkeypatch.setattr(index, 'percentiles',
+                            lambda sectors, metric, values: calls.append(metric) or batch_percentiles(sectors, metric, values))
+        monkeypatch.setattr(EmpiricalDistribution, 'percentile',
+                            lambda self, value: pytest.fail("scalar percentile lookup"))
+        monkeypatch.setattr(finder, '_get_sector_percentile_index', lambda: index)
+        monkeypatch.setattr(finder, '_get_global_distributions', lambda: distributions)
+        records = _candidates(seed=13).to_dict('records')
+
+        rows = score_stage(finder, [(r['symbol'], r['name'], r) for r in records], OPTIONS)
+
+        assert rows and sorted(calls) == ['pbr', 'per', 'roe']
@@ -26,6 +26,7 @@ APP_VERSION = "v2.3.12"  # ✅ 중복 수집 완전 제거 (버튼 클릭 시에
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime
 import logging
@@ -33,7 +34,7 @@ import concurrent.futures
 import threading
 import time
 from functools import lru_cache
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 import os
 import math
 import statistics
@@ -43,6 +44,9 @@ import json  # ✅ 로깅/디버깅용
 import re  # ✅ 정규식 (ETF 필터, 이름 클린용)
 import unicodedata  # ✅ 이름 정규화용
 
+from kis_rate_limiter import KISGlobalRateLimiter  # ✅ 전역 Rate Limiter (계정 TPS 쿼터)
+from kis_token_cache import TokenCache  # ✅ 프로세스 전역 토큰 캐시
+
 # ✅ 로깅 설정 (임포트 전에 먼저 설정 - NameError 방지)
 LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
 _logger = logging.getLogger(__name__)
@@ -86,6 +90,14 @@ SECTOR_NORMALIZE = {
 # ✅ FIX: 더미 데이터 상수화 (mcp_kis_integration.py와 동기화)
 DUMMY_SENTINEL = 150.0  # 결측값 채움 더미 (debt_ratio, current_ratio 등)
 
+# ✅ 전시장 글로벌 퍼센타일 기본값 (DB global_stats 없을 때만 사용)
+GLOBAL_PERCENTILE_DEFAULTS = {
+    'per': {'p10': 5.0, 'p25': 8.0, 'p50': 12.0, 'p75': 18.0, 'p90': 30.0, 'sample_size': 2000},
+    'pbr': {'p10': 0.5, 'p25': 0.8, 'p50': 1.2, 'p75': 2.0, 'p90': 3.5, 'sample_size': 2000},
+    'roe': {'p10': 3.0, 'p25': 6.0, 'p50': 10.0, 'p75': 15.0, 'p90': 22.0, 'sample_size': 2000},
+}
+GLOBAL_DISTRIBUTION_MIN_SAMPLE = 100  # 실제 분포 사용 최소 표본 (미만이면 기본값)
+
 # ✅ Streamlit ScriptRunContext 경고 숨기기
 logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").setLevel(logging.ERROR)
 
@@ -633,6 +645,10 @@ class ValueStockFinder:
     # 미리보기 샘플 크기 상수
     SAMPLE_PREVIEW_SIZE = 20
     
+    # 스트리밍 상위 N 표 컬럼
+    STREAM_VIEW_COLUMNS = ["symbol", "name", "sector", "current_price", "per", "pbr", "roe",
+                           "value_score", "grade", "recommendation"]
+    
     @staticmethod
     def _resolve_token_cache_path() -> str:
         """✅ FIX: 토큰 캐시 경로 결정 (Streamlit Cloud/컨테이너 대응 강화)"""
@@ -709,41 +725,16 @@ class ValueStockFinder:
                 
             def get_rest_token(self):
                 # ✅ PATCH v2.2: 토큰 캐시 경로를 환경변수로 외부화
-                import json
-                import time
-                import os
-                
                 # ValueStockFinder 클래스 메서드 호출
                 cache_file = ValueStockFinder._resolve_token_cache_path()
                 
-                if not os.path.exists(cache_file):
-                    logger.debug(f"토큰 캐시 파일 없음: {cache_file}")
-                    return None
-                
-                try:
-                    with open(cache_file, 'r', encoding='utf-8') as f:
-                        cache = json.load(f)
-                    token = cache.get('token')
-                    exp = cache.get('expires_at')  # epoch sec
-                    
-                    # 만료 60초 전부터 무효화하여 상위 레이어에서 재발급 트리거
-                    if not token:
-                        logger.debug("캐시에 토큰 없음")
-                        return None
-                    
-                    if exp and time.time() > exp - 60:
-                        remaining = exp - time.time()
-                        logger.info(f"토큰 만료 임박 (남은 시간: {remaining:.0f}초) → 재발급 필요")
-                        return None
-                    
-                    logger.info(f"✅ 캐시된 토큰 재사용 (만료까지: {(exp - time.time()):.0f}초)")
-                    return token
-                except json.JSONDecodeError as e:
-                    logger.warning(f"토큰 캐시 JSON 파싱 실패: {e}")
-                    return None
-                except Exception as e:
-                    logger.warning(f"토큰 캐시 로드 실패: {e}")
+                # ✅ 프로세스 전역 메모리 캐시 (파일은 만료 임박/외부 갱신 시에만 재로드)
+                # 만료 60초 전부터 무효화하여 상위 레이어에서 재발급 트리거
+                token = TokenCache.for_path(cache_file).get(margin=60)
+                if not token:
+                    logger.debug(f"유효한 캐시 토큰 없음: {cache_file}")
                     return None
+                return token
             
             def _refresh_rest_token(self):
                 """토큰 발급 및 캐시 저장"""
@@ -780,28 +771,15 @@ class ValueStockFinder:
                         logger.error("토큰 발급 실패: access_token 없음")
                         return None
                     
-                    # 캐시에 저장
+                    # 캐시에 저장 (메모리 + 파일, 원자적 쓰기 + 0o600 퍼미션)
                     expires_at = time.time() + expires_in - 300  # 5분 여유
-                    cache_data = {
-                        'token': access_token,
-                        'expires_at': expires_at,
-                        'issued_at': time.time()
-                    }
                     
                     # ✅ PATCH v2.2: 환경변수 경로 사용
-                    import os
                     cache_file = ValueStockFinder._resolve_token_cache_path()
-                    with open(cache_file, 'w', encoding='utf-8') as f:
-                        json.dump(cache_data, f, indent=2)
+                    TokenCache.for_path(cache_file).store(access_token, expires_at=expires_at)
                     
                     logger.info(f"💾 토큰 캐시 저장 완료: {cache_file} (만료: {expires_in}초 후)")
                     
-                    # 파일 권한 설정 (보안)
-                    try:
-                        os.chmod(cache_file, 0o600)
-                    except Exception:
-                        pass
-                    
                     logger.info(f"토큰 발급 완료 (만료: {expires_in}초)")
                     return access_token
                     
@@ -839,6 +817,13 @@ class ValueStockFinder:
             is_test=kis_config.get('test_mode', False)
         )
         
+        # ✅ 전역 Rate Limiter에 계정 TPS 쿼터 반영 (실전 20건/초, 모의 2건/초)
+        KISGlobalRateLimiter.configure_for_account(
+            is_test=kis_config.get('test_mode', False),
+            max_tps=kis_config.get('max_tps'),
+            app_key=kis_config.get('app_key')  # ✅ 같은 AppKey 프로세스끼리 공유 쿼터
+        )
+        
         # MCP KIS 통합 초기화 (캐싱으로 중복 방지)
         self.mcp_integration = self._get_mcp_singleton()
         
@@ -1487,31 +1472,84 @@ class ValueStockFinder:
         if value <= p75: return lin(p50,p75,50.0,75.0,value)
         return lin(p75,p90,75.0,90.0,value)
 
-    @lru_cache(maxsize=1)
+    def _get_global_distributions(self) -> Dict[str, Any]:
+        """
+        ✅ 전시장 실제 분포 (stock_snapshots 기반, DB에서 스냅샷 날짜별 1회 로드)
+        
+        Returns:
+            {지표: EmpiricalDistribution} - DB 통계 없으면 빈 dict
+        """
+        try:
+            from db_cache_manager import get_db_cache
+            return get_db_cache().get_global_distributions()
+        except Exception as e:
+            logger.debug(f"글로벌 분포 로드 실패 (기본값 사용): {e}")
+            return {}
+    
     def _get_global_percentiles_cached(self):
         """
-        ✅ v2.2.2: 전시장 글로벌 퍼센타일 (캐시)
+        ✅ v2.2.2: 전시장 글로벌 퍼센타일
         
-        실제로는 전체 KOSPI/KOSDAQ 계산 필요
-        현재: 합리적 기본값 (추후 실데이터로 교체 권장)
+        DB의 최신 전시장 분포(global_stats)에서 p10~p90을 구하고,
+        통계가 없거나 표본이 부족한 지표만 기본값(GLOBAL_PERCENTILE_DEFAULTS)을 사용합니다.
         """
-        return {
-            'per': {
-                'p10': 5.0, 'p25': 8.0, 'p50': 12.0, 
-                'p75': 18.0, 'p90': 30.0, 'sample_size': 2000
-            },
-            'pbr': {
-                'p10': 0.5, 'p25': 0.8, 'p50': 1.2, 
-                'p75': 2.0, 'p90': 3.5, 'sample_size': 2000
-            },
-            'roe': {
-                'p10': 3.0, 'p25': 6.0, 'p50': 10.0, 
-                'p75': 15.0, 'p90': 22.0, 'sample_size': 2000
-            }
-        }
+        distributions = self._get_global_distributions()
+        result = {}
+        for metric, default in GLOBAL_PERCENTILE_DEFAULTS.items():
+            dist = distributions.get(metric)
+            if dist is not None and dist.size >= GLOBAL_DISTRIBUTION_MIN_SAMPLE:
+                result[metric] = dist.breakpoints()
+            else:
+                result[metric] = dict(default)
+        return result
+    
+    def _global_percentile(self, value, metric_name: str) -> Optional[float]:
+        """
+        전시장 분포 기준 퍼센타일 (정렬 배열 searchsorted, O(log n))
+        
+        DB 분포가 없으면 기본 breakpoint 선형 보간으로 대체합니다.
+        """
+        dist = self._get_global_distributions().get(metric_name)
+        if dist is not None and dist.size >= GLOBAL_DISTRIBUTION_MIN_SAMPLE:
+            return dist.percentile(value)
+        return self._percentile_from_breakpoints(value, GLOBAL_PERCENTILE_DEFAULTS[metric_name])
+    
+    def _get_sector_percentile_index(self):
+        """
+        ✅ 섹터별 정렬 표본 인덱스 (DB 스냅샷 기반, 스냅샷당 1회 구성)
+        
+        Returns:
+            SectorPercentileIndex 또는 None (DB 통계 없음)
+        """
+        try:
+            from db_cache_manager import get_db_cache
+            return get_db_cache().get_sector_percentile_index()
+        except Exception as e:
+            logger.debug(f"섹터 퍼센타일 인덱스 로드 실패 (breakpoint 보간 사용): {e}")
+            return None
+    
+    def _sector_percentile(self, value, sector_percentiles, metric_name: str,
+                           sector_name: Optional[str] = None) -> Optional[float]:
+        """
+        섹터 내 퍼센타일 (정확한 표본 분포 우선, 없으면 breakpoint 선형 보간)
+        
+        Args:
+            value: 계산할 값
+            sector_percentiles: 섹터 breakpoint (p10~p90)
+            metric_name: 'per', 'pbr', 'roe' 등
+            sector_name: 정규화된 섹터명 (None이면 보간만 사용)
+        """
+        if sector_name:
+            index = self._get_sector_percentile_index()
+            if index is not None:
+                dist = index.get(self._normalize_sector_key(sector_name), metric_name)
+                if dist is not None:
+                    return dist.percentile(value)
+        return self._percentile_from_breakpoints(value, sector_percentiles)
     
     def _percentile_from_breakpoints_v2(self, value, sector_percentiles, 
-                                         metric_name='per', use_global=True):
+                                         metric_name='per', use_global=True,
+                                         sector_name: Optional[str] = None):
         """
         ✅ v2.2.2: 퍼센타일 계산 (글로벌 대체 지원)
         
@@ -1522,6 +1560,7 @@ class ValueStockFinder:
             sector_percentiles: 섹터 퍼센타일
             metric_name: 'per', 'pbr', 'roe' 중 하나
             use_global: 글로벌 대체 사용 여부
+            sector_name: 정규화된 섹터명 (지정 시 섹터 정렬 표본으로 정확한 퍼센타일 계산)
         
         Returns:
             퍼센타일 (0-100) 또는 None
@@ -1531,8 +1570,7 @@ class ValueStockFinder:
         if not sector_percentiles or not isinstance(sector_percentiles, dict):
             if use_global:
                 logger.debug(f"섹터 퍼센타일 없음 → 글로벌 사용 ({metric_name})")
-                global_pcts = self._get_global_percentiles_cached()[metric_name]
-                return self._percentile_from_breakpoints(value, global_pcts)
+                return self._global_percentile(value, metric_name)
             return None
         
         sample_size = sector_percentiles.get('sample_size', 0)
@@ -1542,17 +1580,15 @@ class ValueStockFinder:
             # 극소 표본 → 글로벌만 사용
             if use_global:
                 logger.debug(f"⚠️ 섹터 표본 부족 (n={sample_size}) → 글로벌 분포 사용 ({metric_name})")
-                global_pcts = self._get_global_percentiles_cached()[metric_name]
-                return self._percentile_from_breakpoints(value, global_pcts)
+                return self._global_percentile(value, metric_name)
             return 50.0  # 중립
         
         elif 10 <= sample_size < 30:
             # 소표본 → 가중 평균 (섹터 + 글로벌)
-            sector_pct = self._percentile_from_breakpoints(value, sector_percentiles)
+            sector_pct = self._sector_percentile(value, sector_percentiles, metric_name, sector_name)
             
             if use_global and sector_pct is not None:
-                global_pcts = self._get_global_percentiles_cached()[metric_name]
-                global_pct = self._percentile_from_breakpoints(value, global_pcts)
+                global_pct = self._global_percentile(value, metric_name)
                 
                 if global_pct is not None:
                     # 가중치: n=10 → 섹터 0%, n=30 → 섹터 100%
@@ -1568,7 +1604,7 @@ class ValueStockFinder:
         
         else:
             # 충분한 표본 → 섹터만 사용
-            sector_pct = self._percentile_from_breakpoints(value, sector_percentiles)
+            sector_pct = self._sector_percentile(value, sector_percentiles, metric_name, sector_name)
             
             # 3. IQR ≈ 0 체크 (추가 안전장치)
             if sector_pct is None and sector_percentiles:
@@ -1579,8 +1615,7 @@ class ValueStockFinder:
                 if iqr < 1e-6:
                     logger.warning(f"⚠️ IQR≈0 감지 (p25={p25}, p75={p75}) → 글로벌 대체 ({metric_name})")
                     if use_global:
-                        global_pcts = self._get_global_percentiles_cached()[metric_name]
-                        return self._percentile_from_breakpoints(value, global_pcts)
+                        return self._global_percentile(value, metric_name)
                     return 50.0
             
             return sector_pct
@@ -1696,7 +1731,7 @@ class ValueStockFinder:
         relative_pbr = self._relative_vs_median(pbr, pbr_p50)
 
 
-        roe_percentile = self._percentile_from_breakpoints(roe, roe_percentiles)
+        roe_percentile = self._sector_percentile(roe, roe_percentiles, 'roe', sector_name)
 
         return {
             'symbol': symbol,
@@ -1744,6 +1779,8 @@ class ValueStockFinder:
         pbr_val = stock_data.get('pbr') or 0.0
         roe_val = stock_data.get('roe') or 0.0
 
+        sector_key = stock_data.get('sector_name')
+        
         # ✅ FIX: 가드 통일 (PER/PBR/ROE 일관성)
         per_pct = None
         pbr_pct = None
@@ -1752,19 +1789,19 @@ class ValueStockFinder:
         # PER: 양수만 계산
         if per_val > 0:
             per_pct = self._percentile_from_breakpoints_v2(
-                per_val, per_percentiles, 'per', use_global=True
+                per_val, per_percentiles, 'per', use_global=True, sector_name=sector_key
             )
         
         # PBR: 양수만 계산
         if pbr_val > 0:
             pbr_pct = self._percentile_from_breakpoints_v2(
-                pbr_val, pbr_percentiles, 'pbr', use_global=True
+                pbr_val, pbr_percentiles, 'pbr', use_global=True, sector_name=sector_key
             )
         
         # ROE: 0이 아닌 값만 계산
         if roe_val != 0:
             roe_pct = self._percentile_from_breakpoints_v2(
-                roe_val, roe_percentiles, 'roe', use_global=True
+                roe_val, roe_percentiles, 'roe', use_global=True, sector_name=sector_key
             )
         
         # 퍼센타일 → 점수 변환 (각 20점 캡)
@@ -1978,13 +2015,25 @@ class ValueStockFinder:
             return None
     
     def analyze_single_stock_parallel(self, symbol_name_pair, options):
-        """단일 종목 분석 (병렬 처리용)"""
+        """단일 종목 분석 (병렬 처리용) - 조회(I/O) 단계 + 평가(CPU) 단계"""
         symbol, name = symbol_name_pair
         
         # 종목명이 없으면 빈 문자열로 (나중에 API에서 채워짐)
         if not name or name == '0':
             name = ''
         
+        stock_data = self.fetch_screening_data(symbol, name, options)
+        if not stock_data:
+            return None
+        return self.score_screening_data(symbol, name, stock_data, options)
+    
+    def fetch_screening_data(self, symbol: str, name: str, options) -> Optional[Dict[str, Any]]:
+        """
+        스크리닝 I/O 단계: 시세/재무 조회 + 섹터 메타데이터 + 모멘텀 (레이트 리미터 적용)
+        
+        Returns:
+            평가 입력 stock_data (모멘텀은 '_prefetched_momentum'에 저장) 또는 None
+        """
         try:
             # ✅ RateLimiter 타임아웃 차등: 빠른 모드에서 early return으로 API 폭주 방지
             timeout = options.get("fast_latency", 0.7) if options.get("fast_mode") else 10.0
@@ -2000,65 +2049,36 @@ class ValueStockFinder:
                 if self.rate_limiter.take(1, timeout=0.3):
                     stock_data = self.get_stock_data(symbol, name)
             
-            if stock_data:
-                # 섹터 메타데이터 확장
-                sector_meta = self._augment_sector_data(symbol, stock_data)
-                stock_data.update(sector_meta)
-
-                # 가치주 평가
-                value_analysis = self.evaluate_value_stock(stock_data, options.get('percentile_cap', 99.5))
-                
-                if value_analysis:
-                    # 가치주 기준 충족 여부 확인 (통일된 로직 사용)
-                    stock_data['value_score'] = value_analysis['value_score']
-                    is_value_stock = self.is_value_stock_unified(stock_data, options)
-                    
-                    # 개별 기준 충족 여부도 계산 (표시용)
-                    sector_name = stock_data.get('sector_name', stock_data.get('sector', ''))
-                    criteria = self.get_sector_specific_criteria(sector_name)
-                    per_ok = stock_data['per'] <= criteria['per_max'] if stock_data['per'] > 0 else False
-                    pbr_ok = stock_data['pbr'] <= criteria['pbr_max'] if stock_data['pbr'] > 0 else False
-                    roe_ok = stock_data['roe'] >= criteria['roe_min'] if stock_data['roe'] > 0 else False
-                    # ✅ FIX: 퍼센트 컷도 반영 (정합성)
-                    score_pct = (value_analysis['value_score'] / 143.0) * 100.0
-                    score_ok = (
-                        (value_analysis['value_score'] >= options['score_min']) or
-                        (score_pct >= options.get('score_min_pct', 50.0))
-                    )
-                    
-                    return {
-                        'symbol': symbol,
-                        'name': name,
-                        'current_price': stock_data['current_price'],
-                        'per': stock_data['per'],
-                        'pbr': stock_data['pbr'],
-                        'roe': stock_data['roe'],
-                        'value_score': value_analysis['value_score'],
-                        'grade': value_analysis['grade'],
-                        'recommendation': value_analysis['recommendation'],
-                        'safety_margin': value_analysis['details'].get('safety_margin', 0),
-                        'intrinsic_value': value_analysis['details'].get('intrinsic_value', 0),
-                        'is_value_stock': is_value_stock,
-                        'per_ok': per_ok,
-                        'pbr_ok': pbr_ok,
-                        'roe_ok': roe_ok,
-                        'score_ok': score_ok,
-                        'sector': stock_data.get('sector_name', stock_data.get('sector', '')),
-                        'relative_per': value_analysis['details'].get('relative_per'),
-                        'relative_pbr': value_analysis['details'].get('relative_pbr'),
-                        'sector_percentile': value_analysis['details'].get('sector_percentile'),
-                        'sector_adjustment': value_analysis['details'].get('sector_adjustment'),
-                        'confidence': value_analysis['details'].get('confidence', 'UNKNOWN'),
-                        # 진단용 컬럼 추가
-                        'per_score': value_analysis['details'].get('per_score', 0),
-                        'pbr_score': value_analysis['details'].get('pbr_score', 0),
-                        'roe_score': value_analysis['details'].get('roe_score', 0),
-                        'momentum_score': value_analysis['details'].get('momentum_score', 0),  # ✅ 모멘텀 점수 추가
-                        'quality_score': value_analysis['details'].get('quality_score', 0),    # ✅ 품질 점수 추가
-                        # ✅ margin_score 제거, mos_score만 사용 (일관성 확보)
-                        'mos_score': value_analysis['details'].get('mos_score', 0),
-                        'sector_bonus': value_analysis['details'].get('sector_bonus', 0)
-                    }
+            if not stock_data:
+                return None
+            
+            # 섹터 메타데이터 확장
+            sector_meta = self._augment_sector_data(symbol, stock_data)
+            stock_data.update(sector_meta)
+            
+            # 모멘텀은 API를 쓰므로 조회 단계에서 미리 계산 (평가 단계는 순수 계산)
+            stock_data['_prefetched_momentum'] = self.compute_momentum_score_lightweight(symbol, stock_data)
+            return stock_data
+            
+        except Exception as e:
+            logger.error(f"병렬 분석 오류: {name} - {e}")
+            return None
+    
+    def score_screening_data(self, symbol: str, name: str, stock_data: Dict[str, Any], options) -> Optional[Dict[str, Any]]:
+        """
+        스크리닝 CPU 단계: 가치주 평가 + 기준 충족 여부 (API 호출 없음, 프로세스 풀에서 실행 가능)
+        
+        점수/추천 규칙을 바꾸면 screening_engine.SCORING_VERSION을 올려 저장된 결과를 무효화하세요.
+        
+        Returns:
+            결과 행 딕셔너리 또는 None
+        """
+        try:
+            # 가치주 평가
+            value_analysis = self.evaluate_value_stock(stock_data, options.get('percentile_cap', 99.5))
+            
+            if value_analysis:
+                return self._screening_row(symbol, name, stock_data, value_analysis, options)
             
             return None
             
@@ -2066,6 +2086,107 @@ class ValueStockFinder:
             logger.error(f"병렬 분석 오류: {name} - {e}")
             return None
     
+    def score_screening_batch(self, items, options) -> List[Optional[Dict[str, Any]]]:
+        """
+        ✅ 스크리닝 CPU 단계 배치 버전 (evaluate_value_stocks_batch로 후보 묶음을 컬럼 단위 평가)
+        
+        행 i의 결과 == score_screening_data(*items[i], options) (같은 행 컬럼/값, 입력 dict 정제도 동일)
+        
+        Args:
+            items: [(종목코드, 종목명, stock_data)]
+            options: 스크리닝 옵션
+        
+        Returns:
+            items 순서의 결과 행 목록 (평가 실패/제외 종목은 None)
+        """
+        if not items:
+            return []
+        records = [self._sanitize_metrics(stock_data) for _, _, stock_data in items]
+        batch = self.evaluate_value_stocks_batch(
+            pd.DataFrame(records), options.get('percentile_cap', 99.5), records=records
+        )
+        rows = []
+        for (symbol, name, stock_data), result in zip(items, batch.to_dict('records')):
+            if not result.pop('evaluated'):
+                rows.append(None)
+                continue
+            try:
+                # HIGH 리스크 즉시 SELL 행은 스칼라 경로처럼 세부 점수 없이 risk_penalty만
+                if self._batch_is_missing(result['per_score']):
+                    details = {'risk_penalty': result['risk_penalty']}
+                else:
+                    details = result
+                value_analysis = {
+                    'value_score': result['value_score'],
+                    'grade': result['grade'],
+                    'recommendation': result['recommendation'],
+                    'details': details,
+                }
+                rows.append(self._screening_row(symbol, name, stock_data, value_analysis, options))
+            except Exception as e:
+                logger.error(f"병렬 분석 오류: {name} - {e}")
+                rows.append(None)
+        return rows
+    
+    @staticmethod
+    def _batch_is_missing(value) -> bool:
+        """배치 결과의 미계산 칸 (None/NaN)"""
+        return value is None or (isinstance(value, float) and math.isnan(value))
+    
+    def _screening_row(self, symbol: str, name: str, stock_data: Dict[str, Any],
+                       value_analysis: Dict[str, Any], options) -> Dict[str, Any]:
+        """평가 결과 → 스크리닝 결과 행 (스칼라/배치 경로 공용)"""
+        # 가치주 기준 충족 여부 확인 (통일된 로직 사용)
+        stock_data['value_score'] = value_analysis['value_score']
+        is_value_stock = self.is_value_stock_unified(stock_data, options)
+        
+        # 개별 기준 충족 여부도 계산 (표시용)
+        sector_name = stock_data.get('sector_name', stock_data.get('sector', ''))
+        criteria = self.get_sector_specific_criteria(sector_name)
+        per_ok = stock_data['per'] <= criteria['per_max'] if stock_data['per'] > 0 else False
+        pbr_ok = stock_data['pbr'] <= criteria['pbr_max'] if stock_data['pbr'] > 0 else False
+        roe_ok = stock_data['roe'] >= criteria['roe_min'] if stock_data['roe'] > 0 else False
+        # ✅ FIX: 퍼센트 컷도 반영 (정합성)
+        score_pct = (value_analysis['value_score'] / 143.0) * 100.0
+        score_ok = (
+            (value_analysis['value_score'] >= options['score_min']) or
+            (score_pct >= options.get('score_min_pct', 50.0))
+        )
+        
+        return {
+            'symbol': symbol,
+            'name': name,
+            'current_price': stock_data['current_price'],
+            'per': stock_data['per'],
+            'pbr': stock_data['pbr'],
+            'roe': stock_data['roe'],
+            'value_score': value_analysis['value_score'],
+            'grade': value_analysis['grade'],
+            'recommendation': value_analysis['recommendation'],
+            'safety_margin': value_analysis['details'].get('safety_margin', 0),
+            'intrinsic_value': value_analysis['details'].get('intrinsic_value', 0),
+            'is_value_stock': is_value_stock,
+            'per_ok': per_ok,
+            'pbr_ok': pbr_ok,
+            'roe_ok': roe_ok,
+            'score_ok': score_ok,
+            'sector': stock_data.get('sector_name', stock_data.get('sector', '')),
+            'relative_per': value_analysis['details'].get('relative_per'),
+            'relative_pbr': value_analysis['details'].get('relative_pbr'),
+            'sector_percentile': value_analysis['details'].get('sector_percentile'),
+            'sector_adjustment': value_analysis['details'].get('sector_adjustment'),
+            'confidence': value_analysis['details'].get('confidence', 'UNKNOWN'),
+            # 진단용 컬럼 추가
+            'per_score': value_analysis['details'].get('per_score', 0),
+            'pbr_score': value_analysis['details'].get('pbr_score', 0),
+            'roe_score': value_analysis['details'].get('roe_score', 0),
+            'momentum_score': value_analysis['details'].get('momentum_score', 0),  # ✅ 모멘텀 점수 추가
+            'quality_score': value_analysis['details'].get('quality_score', 0),    # ✅ 품질 점수 추가
+            # ✅ margin_score 제거, mos_score만 사용 (일관성 확보)
+            'mos_score': value_analysis['details'].get('mos_score', 0),
+            'sector_bonus': value_analysis['details'].get('sector_bonus', 0)
+        }
+    
     def _estimate_analysis_time(self, stock_count: int, api_strategy: str) -> str:
         """분석 예상 소요 시간 계산 (레이트리미터 기반 정확도 향상)"""
         if api_strategy == "빠른 모드 (병렬 처리)":
@@ -2174,6 +2295,11 @@ class ValueStockFinder:
     
     def compute_momentum_score_lightweight(self, symbol: str, stock_data: Dict[str, Any]) -> float:
         """✅ 모멘텀 경량화 점수 계산 (차트 API 500 회피)"""
+        # 스크리닝 조회 단계에서 미리 계산한 값 (평가 단계 API 호출 방지)
+        prefetched = (stock_data or {}).get('_prefetched_momentum')
+        if prefetched is not None:
+            return prefetched
+        
         if not HAS_MOMENTUM_LIGHTWEIGHT:
             return 50.0  # 중립 점수
         
@@ -2839,6 +2965,422 @@ class ValueStockFinder:
             logger.error(f"가치주 평가 오류: {e}")
             return None
     
+    # === 배치(컬럼 단위) 평가 ===
+
+    # 배치 결과 컬럼 (details 키와 같은 이름 사용)
+    BATCH_RESULT_COLUMNS = (
+        'value_score', 'grade', 'recommendation', 'score_percentage',
+        'per_score', 'pbr_score', 'roe_score', 'momentum_score', 'quality_enhanced_score',
+        'quality_score', 'sector_bonus', 'criteria_met', 'mos_score', 'risk_penalty',
+        'sector_adjustment', 'alternative_valuation_used', 'safety_margin', 'intrinsic_value',
+        'confidence', 'relative_per', 'relative_pbr', 'sector_percentile', 'evaluated'
+    )
+
+    @staticmethod
+    def _batch_safe_column(df: pd.DataFrame, records, column: str) -> np.ndarray:
+        """_sanitize_metrics의 safe_float 컬럼 버전 (유한수가 아니면 0.0)"""
+        if column not in df.columns:
+            return np.zeros(len(records))
+        series = df[column]
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy(dtype=np.float64, copy=True)
+        else:
+            def safe_float(x):
+                try:
+                    return float(x) if math.isfinite(float(x)) else 0.0
+                except:
+                    return 0.0
+            values = np.fromiter((safe_float(r.get(column)) for r in records), dtype=np.float64, count=len(records))
+        values[~np.isfinite(values)] = 0.0
+        return values
+
+    @staticmethod
+    def _batch_row_is_regular(record) -> bool:
+        """
+        컬럼 경로로 처리 가능한 행인지 확인
+
+        섹터 통계/섹터명이 비정상 타입인 행은 스칼라 evaluate_value_stock으로 처리합니다.
+        """
+        stats = record.get('sector_stats', {}) or {}
+        if not isinstance(stats, dict):
+            return False
+        sample_size = stats.get('sample_size', 0)
+        if sample_size is not None and not (isinstance(sample_size, (int, float)) and math.isfinite(sample_size)):
+            return False
+        for metric in ('per', 'pbr', 'roe'):
+            percentiles = stats.get(f'{metric}_percentiles', {})
+            if percentiles and not isinstance(percentiles, dict):
+                return False
+        sector_name = record.get('sector_name')
+        return not sector_name or isinstance(sector_name, str)
+
+    def _batch_global_percentiles(self, metric: str, values: np.ndarray) -> np.ndarray:
+        """_global_percentile 컬럼 버전 (None → NaN)"""
+        dist = self._get_global_distributions().get(metric)
+        if dist is not None and dist.size >= GLOBAL_DISTRIBUTION_MIN_SAMPLE:
+            return dist.percentiles(values)
+        defaults = GLOBAL_PERCENTILE_DEFAULTS[metric]
+        pcts = (self._percentile_from_breakpoints(float(v), defaults) for v in values)
+        return np.fromiter((np.nan if p is None else p for p in pcts), dtype=np.float64, count=len(values))
+
+    def _batch_sector_percentiles(self, metric: str, values: np.ndarray, percentiles, sector_keys,
+                                  rows: np.ndarray, index) -> np.ndarray:
+        """_sector_percentile 컬럼 버전 (정렬 표본 searchsorted 우선, 없으면 breakpoint 보간)"""
+        out = np.full(len(rows), np.nan)
+        exact = np.zeros(len(rows), dtype=bool)
+        if index is not None:
+            keys = np.array([self._normalize_sector_key(sector_keys[i]) if sector_keys[i] else None for i in rows],
+                            dtype=object)
+            has_dist = {k: k is not None and index.get(k, metric) is not None for k in set(keys.tolist())}
+            exact = np.fromiter((has_dist[k] for k in keys), dtype=bool, count=len(rows))
+            if exact.any():
+                out[exact] = index.percentiles(keys[exact], metric, values[rows][exact])
+        for j in np.flatnonzero(~exact):
+            i = rows[j]
+            pct = self._percentile_from_breakpoints(float(values[i]), percentiles[i])
+            out[j] = np.nan if pct is None else pct
+        return out
+
+    def _batch_percentiles(self, metric: str, values: np.ndarray, percentiles, sample_sizes: np.ndarray,
+                           sector_keys, mask: np.ndarray, index) -> np.ndarray:
+        """
+        _percentile_from_breakpoints_v2 컬럼 버전 (같은 분기/같은 연산 순서, 미계산은 NaN)
+
+        Args:
+            metric: 'per', 'pbr', 'roe'
+            values: 지표 값 배열
+            percentiles: 행별 섹터 breakpoint dict 목록
+            sample_sizes: 행별 breakpoint 표본 크기
+            sector_keys: 행별 섹터명 (정확 분포 조회용)
+            mask: 계산 대상 행
+            index: SectorPercentileIndex 또는 None
+        """
+        out = np.full(values.shape, np.nan)
+        if not mask.any():
+            return out
+
+        has_pcts = np.fromiter((bool(p) for p in percentiles), dtype=bool, count=len(percentiles))
+        n = sample_sizes
+        global_rows = mask & (~has_pcts | (n < 10))
+        sector_rows = mask & has_pcts & (n >= 10)
+        blend_rows = sector_rows & (n < 30)
+        full_rows = sector_rows & (n >= 30)
+
+        global_pct = np.full(values.shape, np.nan)
+        need_global = global_rows | blend_rows
+        if need_global.any():
+            global_pct[need_global] = self._batch_global_percentiles(metric, values[need_global])
+
+        sector_pct = np.full(values.shape, np.nan)
+        if sector_rows.any():
+            rows = np.flatnonzero(sector_rows)
+            sector_pct[rows] = self._batch_sector_percentiles(metric, values, percentiles, sector_keys, rows, index)
+
+        # 극소 표본 → 글로벌, 소표본 → 가중 평균 (n=10 → 섹터 0%, n=30 → 섹터 100%), 충분 → 섹터
+        out[global_rows] = global_pct[global_rows]
+        weight_sector = (n - 10) / 20
+        weight_global = 1.0 - weight_sector
+        blended = sector_pct * weight_sector + global_pct * weight_global
+        out[blend_rows] = np.where(np.isnan(global_pct), sector_pct, blended)[blend_rows]
+        out[full_rows] = sector_pct[full_rows]
+
+        # IQR≈0 → 글로벌 대체 (섹터 퍼센타일을 못 구한 행만)
+        for i in np.flatnonzero(full_rows & np.isnan(sector_pct)):
+            p = percentiles[i]
+            try:
+                iqr = abs(p.get('p75', 0) - p.get('p25', 0))
+            except TypeError:
+                continue
+            if iqr < 1e-6:
+                logger.warning(f"⚠️ IQR≈0 감지 (p25={p.get('p25', 0)}, p75={p.get('p75', 0)}) → 글로벌 대체 ({metric})")
+                pct = self._global_percentile(float(values[i]), metric)
+                out[i] = np.nan if pct is None else pct
+        return out
+
+    def evaluate_value_stocks_batch(self, df: pd.DataFrame, percentile_cap: float = 99.5,
+                                    records: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+        """
+        ✅ 가치주 배치 평가 (후보 전체를 컬럼 단위로 점수화)
+
+        evaluate_value_stock과 같은 점수를 NumPy 컬럼 연산으로 계산합니다.
+        퍼센타일(정렬 표본 searchsorted), 점수 변환, 섹터 조정, 업종 기준 보너스, 등급/추천/다운그레이드는
+        후보 전체에 한 번에 적용하고, 외부 평가기(리스크, 데이터 가드, 섹터 맥락화, 모멘텀, 품질, 대체 밸류에이션,
+        MoS, 내재가치)만 행별로 호출합니다. 덧셈 순서를 스칼라 경로와 맞춰 점수는 비트 단위로 같습니다.
+
+        - 행 i의 결과 == evaluate_value_stock(df.to_dict('records')[i])
+        - 입력 DataFrame은 수정하지 않음 (스칼라 경로는 입력 dict를 정제/수정함)
+        - 행별 디버그 JSON은 기록하지 않음
+        - 섹터 통계/섹터명이 비정상 타입인 행은 스칼라 경로로 처리
+
+        Args:
+            df: 후보 DataFrame (evaluate_value_stock 입력 dict의 키를 컬럼으로)
+            percentile_cap: 퍼센타일 상한
+            records: 행별 원본 입력 dict (df와 같은 순서, None이면 df.to_dict('records'))
+                     지정 시 행 i의 결과 == evaluate_value_stock(records[i])
+
+        Returns:
+            index=df.index, columns=BATCH_RESULT_COLUMNS 인 DataFrame
+            (평가 제외 행은 evaluated=False, value_score=NaN)
+        """
+        n_rows = len(df)
+        result = pd.DataFrame(index=df.index, columns=list(self.BATCH_RESULT_COLUMNS), dtype=object)
+        result['evaluated'] = False
+        if n_rows == 0:
+            return result
+
+        records = df.to_dict('records') if records is None else [dict(r) for r in records]
+        regular = np.fromiter((self._batch_row_is_regular(r) for r in records), dtype=bool, count=n_rows)
+
+        # ✅ 1. 전역 NaN/Inf 가드 (컬럼 단위)
+        per = self._batch_safe_column(df, records, 'per')
+        pbr = self._batch_safe_column(df, records, 'pbr')
+        roe = self._batch_safe_column(df, records, 'roe')
+        price = self._batch_safe_column(df, records, 'current_price')
+        market_cap = self._batch_safe_column(df, records, 'market_cap')
+        market_cap = np.where(market_cap > 0.0, market_cap, 0.0)
+        for i in np.flatnonzero(regular):
+            records[i].update(per=float(per[i]), pbr=float(pbr[i]), roe=float(roe[i]),
+                              current_price=float(price[i]), market_cap=float(market_cap[i]))
+
+        # ✅ 2. 행별 가드: 더미 데이터 / 리스크 / 회계 이상
+        alive = regular.copy()
+        failed = np.zeros(n_rows, dtype=bool)
+        risk_penalty = np.zeros(n_rows)
+        risk_sell = np.zeros(n_rows, dtype=bool)
+        high_anomaly = np.zeros(n_rows, dtype=bool)
+        for i in np.flatnonzero(alive):
+            record = records[i]
+            try:
+                if self.data_guard and self.data_guard.is_dummy_data(record):
+                    alive[i] = False
+                    continue
+                if self.risk_evaluator:
+                    penalty, _ = self.risk_evaluator.evaluate_all_risks(record)
+                    risk_penalty[i] = penalty
+                    if penalty <= -30:
+                        risk_sell[i] = True
+                        alive[i] = False
+                        continue
+                if self.data_guard:
+                    anomalies = self.data_guard.detect_accounting_anomalies(record)
+                    high_anomaly[i] = bool(anomalies) and any(
+                        v.get('severity') == 'HIGH' for v in anomalies.values()
+                    )
+            except Exception as e:
+                logger.error(f"가치주 평가 오류: {e}")
+                failed[i] = True
+                alive[i] = False
+
+        # ✅ 3. 퍼센타일 → 지표 점수 (컬럼 단위, 각 20점 캡)
+        stats_list = [(r.get('sector_stats', {}) or {}) if regular[i] else {} for i, r in enumerate(records)]
+        stats_n = np.fromiter(((s.get('sample_size', 0) or 0) for s in stats_list), dtype=np.float64, count=n_rows)
+        sector_keys = [r.get('sector_name') if regular[i] else None for i, r in enumerate(records)]
+        index = self._get_sector_percentile_index() if alive.any() else None
+        cap = 20.0
+        raw_scores = {}
+        for metric, values, valid, higher_is_better in (
+            ('per', per, per > 0, False),
+            ('pbr', pbr, pbr > 0, False),
+            ('roe', roe, roe != 0, True),
+        ):
+            percentiles = [s.get(f'{metric}_percentiles', {}) or {} for s in stats_list]
+            sample_sizes = np.fromiter(
+                (n if (p and n > 0) else p.get('sample_size', 0) for p, n in zip(percentiles, stats_n)),
+                dtype=np.float64, count=n_rows
+            )
+            pct = self._batch_percentiles(metric, values, percentiles, sample_sizes, sector_keys, alive & valid, index)
+            pct = np.minimum(percentile_cap, pct)
+            if not higher_is_better:
+                pct = 100.0 - pct
+            raw_scores[metric] = np.where(np.isnan(pct), 0.0, np.clip(cap * (pct / 100.0), 0.0, cap))
+        per_raw, pbr_raw, roe_raw = raw_scores['per'], raw_scores['pbr'], raw_scores['roe']
+        raw_total = per_raw + pbr_raw + roe_raw
+
+        # ✅ 4. 행별 평가기: 섹터 맥락화 / 모멘텀 / 품질 / 대체 밸류에이션 / 품질 지표 / MoS / 내재가치
+        adjusted_total = raw_total.copy()
+        context_applied = np.zeros(n_rows, dtype=bool)
+        momentum = np.zeros(n_rows)
+        quality_enhanced = np.zeros(n_rows)
+        alt_used = np.zeros(n_rows, dtype=bool)
+        alt_score = np.zeros(n_rows)
+        fcf_yield = np.full(n_rows, np.nan)
+        interest_coverage = np.full(n_rows, np.nan)
+        fscore = np.zeros(n_rows)
+        mos = np.zeros(n_rows)
+        safety_margin = np.zeros(n_rows)
+        intrinsic_value = np.zeros(n_rows)
+        confidence = np.full(n_rows, 'UNKNOWN', dtype=object)
+        sector_pct = np.full(n_rows, None, dtype=object)
+        sector_labels = [''] * n_rows
+        for i in np.flatnonzero(alive):
+            record = records[i]
+            try:
+                raw_sector_pct = record.get('sector_percentile')
+                if raw_sector_pct is not None:
+                    sector_pct[i] = min(percentile_cap, raw_sector_pct)
+                sector_data_for_context = {
+                    'sample_size': stats_list[i].get('sample_size', 0),
+                    'average_score': stats_list[i].get('valuation_score', 60.0)
+                }
+                try:
+                    context_result = self.sector_context.apply_sector_contextualization(
+                        record.get('symbol', ''), record.get('sector_name', '기타'),
+                        float(raw_total[i]), sector_data_for_context
+                    )
+                except Exception as exc:
+                    logger.warning(f"섹터 맥락화 실패: {exc}")
+                    context_result = {'contextualization_applied': False}
+                adjusted_total[i] = context_result.get('adjusted_score', raw_total[i])
+                context_applied[i] = bool(context_result.get('contextualization_applied', False))
+
+                symbol = record.get('symbol', record.get('code', ''))
+                sector_labels[i] = record.get('sector_name', record.get('sector', ''))
+                momentum[i] = self.compute_momentum_score_lightweight(symbol, record)
+                quality_enhanced[i] = self.compute_quality_score_enhanced(record, sector_labels[i])
+
+                if per[i] <= 0 and self.alt_valuation:
+                    alt_score[i] = self.alt_valuation.calculate_alternative_score(record, record.get('sector_stats', {}))
+                    alt_used[i] = True
+
+                if self.quality_calculator:
+                    fcf_yield[i] = self.quality_calculator.calculate_fcf_yield(
+                        record.get('fcf', record.get('operating_cash_flow', 0)), record.get('market_cap', 0)
+                    ) or np.nan
+                    interest_coverage[i] = self.quality_calculator.calculate_interest_coverage(
+                        record.get('operating_income', 0), record.get('interest_expense', 0)
+                    ) or np.nan
+                    try:
+                        fscore[i], _ = self.quality_calculator.calculate_piotroski_fscore(record)
+                    except Exception as e:
+                        logger.debug(f"Piotroski F-Score 계산 실패: {e}")
+
+                mos[i] = self.compute_mos_score(record['per'], record['pbr'], record['roe'], sector_labels[i])
+                intrinsic_data = self.calculate_intrinsic_value(record)
+                if intrinsic_data:
+                    safety_margin[i] = intrinsic_data['safety_margin']
+                    intrinsic_value[i] = intrinsic_data['intrinsic_value']
+                    confidence[i] = intrinsic_data.get('confidence', 'UNKNOWN')
+            except Exception as e:
+                logger.error(f"가치주 평가 오류: {e}")
+                failed[i] = True
+                alive[i] = False
+
+        # ✅ 5. 섹터 조정 (합계에 1회, 신뢰 조건에서만 0.9x~1.1x)
+        positive = raw_total > 0
+        safe_raw = np.where(positive, raw_total, 1.0)
+        adjustment = np.where(positive, adjusted_total / safe_raw, 1.0)
+        adjustment = np.where((stats_n < 30) | ~context_applied, 1.0, np.clip(adjustment, 0.9, 1.1))
+        scale = np.where(positive, (raw_total * adjustment) / safe_raw, 1.0)
+        per_score = per_raw * scale
+        pbr_score = pbr_raw * scale
+        roe_score = roe_raw * scale
+
+        # ✅ 6. 품질 지표 점수 (FCF Yield 0-15, 이자보상배율 0-10, Piotroski 0-18)
+        with np.errstate(invalid='ignore'):
+            fcf_points = np.select(
+                [fcf_yield > 10, fcf_yield > 7, fcf_yield > 5, fcf_yield > 3, fcf_yield > 0],
+                [15, 12, 9, 6, 3], default=0
+            )
+            coverage_points = np.select(
+                [interest_coverage > 10, interest_coverage > 5, interest_coverage > 3,
+                 interest_coverage > 2, interest_coverage > 1],
+                [10, 8, 6, 4, 2], default=0
+            )
+        quality_points = fcf_points + coverage_points + fscore * 2
+
+        # ✅ 7. 업종별 기준 충족 보너스 (섹터별 기준 1회 조회)
+        criteria_cache = {}
+        criteria_rows = []
+        for label in sector_labels:
+            if label not in criteria_cache:
+                criteria_cache[label] = self.get_sector_specific_criteria(label)
+            criteria_rows.append(criteria_cache[label])
+        per_max = np.fromiter((c['per_max'] for c in criteria_rows), dtype=np.float64, count=n_rows)
+        pbr_max = np.fromiter((c['pbr_max'] for c in criteria_rows), dtype=np.float64, count=n_rows)
+        roe_min = np.fromiter((c['roe_min'] for c in criteria_rows), dtype=np.float64, count=n_rows)
+        per_pass = (per > 0) & (per <= per_max)
+        pbr_pass = (pbr > 0) & (pbr <= pbr_max)
+        roe_pass = (roe > 0) & (roe >= roe_min)
+        sector_bonus = per_pass * 3 + pbr_pass * 3 + roe_pass * 4
+        criteria_count = per_pass.astype(int) + pbr_pass + roe_pass
+
+        # ✅ 8. 총점 (스칼라 경로와 같은 덧셈 순서)
+        score = per_score + pbr_score + roe_score
+        score = score + momentum * 0.1
+        score = score + quality_enhanced * 0.15
+        score = np.where(alt_used, score - per_score + alt_score, score)
+        score = score + quality_points
+        score = score + sector_bonus
+        score = score + mos
+        score = np.where(risk_penalty < 0, score + risk_penalty, score)
+        score_pct = (score / 143) * 100
+
+        grade = np.select(
+            [score_pct >= 75, score_pct >= 65, score_pct >= 55, score_pct >= 45, score_pct >= 35],
+            ["A+ (매우 우수)", "A (우수)", "B+ (양호)", "B (보통)", "C+ (주의)"], default="C (위험)"
+        )
+
+        # ✅ 9. 추천 (캘리브레이션 커트오프 → 3개 기준 상향 → 가드/패널티 하향)
+        order = np.array(["STRONG_BUY", "BUY", "HOLD", "SELL"], dtype=object)
+        cut = CALIBRATION_CUTOFFS
+        rank = np.select(
+            [score_pct >= cut.get('STRONG_BUY', 67), score_pct >= cut.get('BUY', 40), score_pct >= cut.get('HOLD', 22)],
+            [0, 1, 2], default=3
+        )
+        rank = np.where((criteria_count == 3) & (rank == 1), 0, rank)
+        rank = np.where((roe < 0) & (pbr > 3), np.minimum(rank + 1, 3), rank)
+        rank = np.where(high_anomaly, 2, rank)
+        penalties = ((per <= 0) & ~alt_used).astype(int) + (roe < 0) + ((pbr > 5) & (roe != 0) & (roe < 5))
+        rank = np.minimum(rank + np.minimum(penalties, 2), 3)
+        recommendation = order[rank]
+
+        # ✅ 10. 결과 프레임
+        criteria_names = [
+            [name for name, ok in zip(('PER', 'PBR', 'ROE'), flags) if ok]
+            for flags in zip(per_pass, pbr_pass, roe_pass)
+        ]
+        columns = {
+            'value_score': score, 'grade': grade, 'recommendation': recommendation, 'score_percentage': score_pct,
+            'per_score': np.where(alt_used, alt_score, per_score), 'pbr_score': pbr_score, 'roe_score': roe_score,
+            'momentum_score': momentum, 'quality_enhanced_score': quality_enhanced, 'quality_score': quality_points,
+            'sector_bonus': sector_bonus, 'criteria_met': pd.Series(criteria_names, dtype=object).to_numpy(),
+            'mos_score': mos, 'risk_penalty': risk_penalty, 'sector_adjustment': adjustment,
+            'alternative_valuation_used': alt_used, 'safety_margin': safety_margin,
+            'intrinsic_value': intrinsic_value, 'confidence': confidence,
+            'relative_per': [r.get('relative_per') for r in records],
+            'relative_pbr': [r.get('relative_pbr') for r in records],
+            'sector_percentile': sector_pct,
+        }
+        rows = np.flatnonzero(alive)
+        for column, values in columns.items():
+            result.iloc[rows, result.columns.get_loc(column)] = np.asarray(values, dtype=object)[rows]
+        result.iloc[rows, result.columns.get_loc('evaluated')] = True
+
+        # HIGH 리스크 → 즉시 SELL (평가 생략)
+        sell_rows = np.flatnonzero(risk_sell)
+        if len(sell_rows):
+            result.iloc[sell_rows, result.columns.get_loc('value_score')] = 0
+            result.iloc[sell_rows, result.columns.get_loc('grade')] = 'C (위험)'
+            result.iloc[sell_rows, result.columns.get_loc('recommendation')] = 'SELL'
+            result.iloc[sell_rows, result.columns.get_loc('risk_penalty')] = risk_penalty[sell_rows]
+            result.iloc[sell_rows, result.columns.get_loc('evaluated')] = True
+
+        # 비정상 타입 행 → 스칼라 경로
+        for i in np.flatnonzero(~regular):
+            evaluated = self.evaluate_value_stock(dict(records[i]), percentile_cap)
+            if not evaluated:
+                continue
+            details = evaluated.get('details', {})
+            row = {column: details.get(column) for column in self.BATCH_RESULT_COLUMNS}
+            row.update(value_score=evaluated['value_score'], grade=evaluated['grade'],
+                       recommendation=evaluated['recommendation'], evaluated=True)
+            result.iloc[i] = pd.Series(row)[result.columns].to_numpy(dtype=object)
+
+        result['value_score'] = pd.to_numeric(result['value_score'], errors='coerce')
+        result['evaluated'] = result['evaluated'].astype(bool)
+        logger.info(f"✅ 배치 가치주 평가 완료: {int(result['evaluated'].sum())}/{n_rows}개")
+        return result
+
     def render_header(self):
         """헤더 렌더링"""
         st.title(f"💎 저평가 가치주 발굴 시스템 {APP_VERSION}")
@@ -3261,22 +3803,24 @@ class ValueStockFinder:
     def run_universe_screening(self, options: Dict[str, Any]):
         """
         ✅ 유니버스 수집 → 병렬 분석 → 결과 DataFrame 반환
-        - 동적 진행률 표시
-        - v2.3 동적 컷(중앙값*0.9) 예시 포함
+        - 실행은 헤드리스 ScreeningEngine.stream에 위임 (CLI/배치와 같은 저장 키)
+        - 평가가 끝난 종목부터 상위 N 표를 바로 갱신 (전체 완료를 기다리지 않음)
+        - stop_when_stable 옵션: 상위 N이 안정되면 남은 조회를 취소하고 종료
+        - v2.3 동적 컷(중앙값*0.9) 보조 컬럼은 ScreeningResult.to_dataframe()
         """
+        from screening_engine import STREAM_TOP_N, ScreeningEngine, TopN
+
+        options = QuickPatches.merge_options(options)
         max_stocks = int(options.get("max_stocks", 15))
-        api_strategy = options.get("api_strategy", "안전 모드 (배치 처리)")
+        api_strategy = options["api_strategy"]
+        engine = ScreeningEngine(self)
 
-        # 1) 유니버스
-        uni = self.get_stock_universe(max_stocks)  # ✅ FIX: 세션 캐시 활용으로 중복 호출 방지
-        if not uni:
+        # 1) 유니버스 (세션 캐시 활용으로 중복 호출 방지) → 시총 상위 max_stocks만 선별
+        pairs = engine.resolve_universe(max_stocks)
+        if not pairs:
             st.error("유니버스를 불러오지 못했습니다. API 설정을 확인하세요.")
             return pd.DataFrame()
 
-        # 2) 시총 상위 max_stocks만 선별 (이미 정렬되어 있음)
-        pairs = [(c, uni[c].get("name", "")) for c in list(uni.keys())[:max_stocks]]
-
-        # 3) 병렬 분석
         st.info(f"대상 {len(pairs)}개 • 전략: {api_strategy} • 예상 {self._estimate_analysis_time(len(pairs), api_strategy)}")
         
         # ✅ 진행상태 초기화 방지: 세션 상태로 관리
@@ -3289,37 +3833,42 @@ class ValueStockFinder:
         status_txt = st.empty()
         status_txt.text(st.session_state.analysis_status)
 
-        results = []
         total = len(pairs)
         last_ui = 0.0
+        stage_labels = {'fetch': ("분석 중…", 0.0, 1.0)}  # 스트리밍: 종목마다 조회 직후 평가
 
-        # 워커 수 튜닝 (빠른 모드일수록 워커↑)
-        if api_strategy == "빠른 모드 (병렬 처리)":
-            max_workers = min(12, max(4, int(self.rate_limiter.capacity // 2)))
-        elif api_strategy == "안전 모드 (배치 처리)":
-            max_workers = 5
-        else:  # 순차
-            max_workers = 1
+        def _on_progress(stage, done, stage_total):
+            nonlocal last_ui
+            label, offset, weight = stage_labels[stage]
+            progress_val = offset + weight * done / max(stage_total, 1)
+            status_msg = f"{label} {self._fmt_prog(done, stage_total)}"
+            st.session_state.analysis_progress = progress_val
+            st.session_state.analysis_status = status_msg
+            self._safe_progress(progress, progress_val, status_msg)
+            last_ui = self._maybe_update(status_txt, f"완료: {done}/{stage_total}", last_ui, self._get_ui_update_interval(total))
 
+        # 2) 조회 → 평가 스트림 (같은 날 같은 옵션이면 저장된 결과, 재실행 시 바뀐 종목만 재평가)
+        top = TopN(int(options.get("stream_top_n") or STREAM_TOP_N))
+        live_caption = st.empty()
+        live_table = st.empty()
+        last_table = 0.0
+        stream = engine.stream(options, universe=pairs, on_progress=_on_progress,
+                               refresh=bool(options.get("refresh_results")))
         try:
-            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as ex:
-                futs = [ex.submit(self.analyze_single_stock_parallel, pair, options) for pair in pairs]
-                for i, fut in enumerate(concurrent.futures.as_completed(futs), 1):
-                    try:
-                        r = fut.result()
-                        if r:
-                            results.append(r)
-                    except Exception as e:
-                        logger.error(f"워커 에러: {e}")
-
-                    # 진행률 - 세션 상태 업데이트
-                    progress_val = i / total
-                    status_msg = f"분석 중… {self._fmt_prog(i, total)}"
-                    st.session_state.analysis_progress = progress_val
-                    st.session_state.analysis_status = status_msg
-                    
-                    self._safe_progress(progress, progress_val, status_msg)
-                    last_ui = self._maybe_update(status_txt, f"완료: {i}/{total}", last_ui, self._get_ui_update_interval(total))
+            with stream:
+                for row in stream:
+                    top.add(row)
+                    now = time.time()
+                    # 첫 결과는 바로, 이후는 대용량 디바운스 간격으로 표 갱신
+                    if now - last_table > self._get_ui_update_interval(total):
+                        live_caption.caption(f"⏱️ 실시간 상위 {top.n}개 (평가 완료 {top.seen}개)")
+                        live_table.dataframe(top.to_dataframe(self.STREAM_VIEW_COLUMNS),
+                                             use_container_width=True, hide_index=True)
+                        last_table = now
+                    if options.get("stop_when_stable") and top.stable:
+                        logger.info(f"✅ 상위 {top.n}개 안정 ({top.patience}개 연속 변동 없음) → 조기 종료")
+                        break
+            result = stream.result
         except Exception as e:
             logger.error(f"분석 중 예외 발생: {e}")
             # 예외 발생 시에도 진행률을 현재 상태로 유지
@@ -3329,7 +3878,10 @@ class ValueStockFinder:
             st.error(f"분석 중 오류가 발생했습니다: {e}")
             return pd.DataFrame()
 
-        if not results:
+        live_caption.empty()
+        live_table.empty()
+
+        if not result.rows:
             st.warning("조건을 만족하는 결과가 없습니다.")
             # ✅ 분석 완료 시 진행률을 100%로 설정 (초기화하지 않음)
             st.session_state.analysis_progress = 1.0
@@ -3341,22 +3893,15 @@ class ValueStockFinder:
         st.session_state.analysis_progress = 1.0
         st.session_state.analysis_status = "분석 완료"
         self._safe_progress(progress, 1.0, "분석 완료")
-            
-        # 4) DataFrame 정리
-        df = pd.DataFrame(results)
-
-        # v2.3: 동적 컷 예시(중앙값*0.9)로 추천 플래그 보조컬럼
-        try:
-            p50 = df["value_score"].median()
-            dyn_cut = p50 * 0.9
-            df["pass_dynamic_cut"] = df["value_score"] >= dyn_cut
-        except Exception:
-            df["pass_dynamic_cut"] = False
-
-        # 보기 좋게 정렬
-        df = df.sort_values(["recommendation", "value_score"], ascending=[True, False]).reset_index(drop=True)
+        if result.stopped_early:
+            st.caption(f"⏹️ 상위 {top.n}개 안정으로 조기 종료: {top.seen}/{total}개 평가 (결과 저장 안 함)")
+        if result.from_store:
+            st.caption(f"💾 저장된 스크리닝 결과 사용 ({result.snapshot_date}, {result.code_version})")
+        elif result.reused_count:
+            st.caption(f"💾 입력 변화 없는 {result.reused_count}개 종목은 직전 결과 재사용")
 
-        return df
+        # 3) DataFrame 정리 (동적 컷 + 정렬)
+        return result.to_dataframe()
     
     def _get_fallback_stock_list_old(self):
         """레거시 폴백 리스트 (사용 안 함 - 참고용)"""
@@ -3451,25 +3996,55 @@ class ValueStockFinder:
         # ✅ v2.1: 옵션 스키마 가드 (사이드바 변경 시 키 누락 방지)
         options = QuickPatches.merge_options(options)
         
-        max_stocks = options['max_stocks']  # ✅ v2.2.3: 변수 정의를 위로 이동
-        
         # ✅ FIX: 중복 수집 방지 - 버튼 클릭 시에만 실행
-        if st.button("🔍 스크리닝 실행", type="primary"):
-            df = self.run_universe_screening(options)
-            if not df.empty:
-                st.dataframe(df[[
-                    "symbol","name","sector","current_price",
-                    "per","pbr","roe",
-                    "value_score","grade","recommendation",
-                    "per_ok","pbr_ok","roe_ok","score_ok","pass_dynamic_cut"
-                ]], use_container_width=True)
-            else:
-                st.warning("조건을 만족하는 결과가 없습니다.")
-        else:
+        options['refresh_results'] = st.checkbox(
+            "저장된 결과 무시 (다시 계산)", value=False, key="refresh_screening_results",
+            help="같은 날 같은 옵션의 스크리닝 결과는 DB에 저장된 값을 바로 사용합니다"
+        )
+        col_top, col_stop = st.columns(2)
+        with col_top:
+            options['stream_top_n'] = int(st.number_input(
+                "실시간 상위 N", min_value=5, max_value=100, value=20, step=5, key="stream_top_n",
+                help="평가가 끝난 종목부터 점수 상위 N개 표를 바로 갱신합니다"
+            ))
+        with col_stop:
+            options['stop_when_stable'] = st.checkbox(
+                "상위 N 안정 시 조기 종료", value=False, key="stop_when_stable",
+                help="상위 N이 충분히 오래 바뀌지 않으면 남은 종목 조회를 취소합니다 (결과는 저장하지 않음)"
+            )
+        legacy = st.checkbox(
+            "기존 상세 분석 방식 사용", value=False, key="legacy_screening",
+            help="섹터 캐시 점검 → 전략별(안전/빠른/순차) 분석 → 상세 결과 화면 (결과 저장/실시간 상위 N 없음)"
+        )
+        if not st.button("🔍 스크리닝 실행", type="primary"):
             # 버튼 클릭 전에는 기본 정보만 표시
             st.info("🔍 위의 '스크리닝 실행' 버튼을 클릭하여 분석을 시작하세요.")
             return
         
+        # ✅ 한 번 클릭에 한 경로만 실행 (엔진 스트림 또는 기존 상세 분석)
+        if legacy:
+            self._screen_all_stocks_legacy(options)
+            return
+        
+        df = self.run_universe_screening(options)
+        if not df.empty:
+            st.dataframe(df[[
+                "symbol","name","sector","current_price",
+                "per","pbr","roe",
+                "value_score","grade","recommendation",
+                "per_ok","pbr_ok","roe_ok","score_ok","pass_dynamic_cut"
+            ]], use_container_width=True)
+        else:
+            st.warning("조건을 만족하는 결과가 없습니다.")
+    
+    def _screen_all_stocks_legacy(self, options):
+        """
+        기존 상세 스크리닝 ('기존 상세 분석 방식 사용' 선택 시에만 실행)
+        
+        섹터 캐시 점검 → 유니버스 로딩 → 전략별(안전/빠른/순차) 분석 → 캘리브레이션 기록 + 상세 결과 표시
+        """
+        max_stocks = options['max_stocks']
+        
         # ✅ v2.2.3: 섹터 캐시 상태 확인 및 알림
         sector_cache = _load_sector_cache()  # @st.cache_resource (전역)
         
@@ -3680,45 +4255,34 @@ class ValueStockFinder:
             
             status_text.text(f"🛡️ 안전 모드 시작: {len(stock_universe)}개 종목, 배치 크기: {batch_size}")
             
-            # 동적 백오프 변수
-            backoff = 1.0
+            # ✅ 2단계 파이프라인: 조회(I/O 스레드, 배치+백오프) → 평가(CPU 프로세스 풀)
+            from screening_engine import StageErrors, fetch_stage, score_stage
+            stage_errors = StageErrors()
+            fetch_weight = 0.8  # 진행률 중 조회 단계 비중
             
-            # ✅ v2.1.3: ThreadPoolExecutor 한 번만 생성 후 재사용 (성능 최적화)
-            max_workers = min(3, batch_size)  # 배치 크기에 맞춘 워커 수
+            def _report(stage_label, offset, weight):
+                def _cb(done, total):
+                    nonlocal last_ui_update
+                    progress = offset + weight * done / max(total, 1)
+                    status_msg = f"{stage_label} {done}/{total} • {progress*100:.1f}%"
+                    # ✅ 세션 상태 업데이트
+                    st.session_state.detailed_analysis_progress = progress
+                    st.session_state.detailed_analysis_status = status_msg
+                    current_time = time.time()
+                    if done == total or current_time - last_ui_update > self._get_ui_update_interval(len(stock_items)):
+                        self._safe_progress(progress_bar, progress, status_msg)
+                        last_ui_update = current_time
+                return _cb
             
-            # 배치별로 처리
             try:
-                with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-                    for batch_start in range(0, len(stock_items), batch_size):
-                        batch_end = min(batch_start + batch_size, len(stock_items))
-                        batch = stock_items[batch_start:batch_end]
-                        
-                        current_time = time.time()
-                        if current_time - last_ui_update > self._get_ui_update_interval(len(stock_items)):
-                            status_text.text(f"📊 배치 {batch_start//batch_size + 1} 처리 중: {len(batch)}개 종목")
-                            last_ui_update = current_time
-                        
-                        # 현재 배치 병렬 처리
-                        batch_error = False
-                        future_to_stock = {
-                            executor.submit(self.analyze_single_stock_parallel, (symbol, name), options): (symbol, name)
-                            for symbol, name in batch
-                        }
-                        
-                        for future in concurrent.futures.as_completed(future_to_stock):
-                            symbol, name = future_to_stock[future]
-                            try:
-                                result = future.result()
-                                if result:
-                                    results.append(result)
-                            except Exception as e:
-                                msg = f"{name} 분석 오류: {e}"
-                                logger.error(msg)
-                                if len(error_samples) < 3:
-                                    # ✅ 메시지 길이 제한 (사용자 권장 - UI 깔끔화)
-                                    error_samples.append(textwrap.shorten(msg, width=120, placeholder="..."))
-                                err_counter[type(e).__name__] += 1
-                                batch_error = True
+                # ✅ v2.1.3: 조회 스레드 수는 배치 크기에 맞춤 (최대 3)
+                fetched = fetch_stage(self, stock_items, options, max_workers=min(3, batch_size),
+                                      batch_size=batch_size, base_delay=base_delay,
+                                      on_progress=_report("📡 조회", 0.0, fetch_weight), errors=stage_errors)
+                status_text.text(f"🧮 평가 단계: {len(fetched)}개 종목")
+                results = score_stage(self, fetched, options, processes=options.get('cpu_workers'),
+                                      on_progress=_report("🧮 평가", fetch_weight, 1.0 - fetch_weight),
+                                      errors=stage_errors)
             except Exception as e:
                 logger.error(f"안전 모드 분석 중 예외 발생: {e}")
                 # 예외 발생 시에도 진행률을 현재 상태로 유지
@@ -3727,44 +4291,9 @@ class ValueStockFinder:
                     self._safe_progress(progress_bar, st.session_state.detailed_analysis_progress, st.session_state.detailed_analysis_status)
                 st.error(f"안전 모드 분석 중 오류가 발생했습니다: {e}")
                 return
-                
-                # 진행률 업데이트
-                completed_count = batch_end
-                progress = completed_count / len(stock_items)
-                status_msg = f"{completed_count}/{len(stock_items)} • {progress*100:.1f}%"
-                
-                # ✅ 세션 상태 업데이트
-                st.session_state.detailed_analysis_progress = progress
-                st.session_state.detailed_analysis_status = status_msg
-                
-                # ✅ 진행률 텍스트 합치기 (rerender 최적화) + 버전 호환
-                self._safe_progress(progress_bar, progress, status_msg)
-                
-                current_time = time.time()
-                if current_time - last_ui_update > self._get_ui_update_interval(len(stock_items)):
-                    status_text.text(f"📊 배치 완료: {completed_count}/{len(stock_items)} 완료 ({progress*100:.1f}%)")
-                    last_ui_update = current_time
-                
-                # 실시간 결과 미리보기
-                value_stocks = [r for r in results if r['is_value_stock']]
-                if value_stocks:
-                    results_container.info(f"🎯 현재까지 발견된 가치주: {len(value_stocks)}개")
-                
-                # 동적 백오프 적용
-                if batch_end < len(stock_items):
-                    if batch_error:
-                        backoff = min(backoff * 1.5, 4.0)  # 최대 4배
-                        logger.warning(f"배치 오류 감지, 백오프 증가: {backoff:.1f}x")
-                    else:
-                        backoff = max(backoff / 1.2, 1.0)  # 점진적 감소
-                    
-                    # ✅ PATCH v2.2: 블로킹 sleep 최소화 (UI 프리즈 방지)
-                    delay = base_delay * backoff
-                    t0 = time.time()
-                    while time.time() - t0 < delay:
-                        time.sleep(0.05)  # 50ms 단위로 쪼개서 UI 반응성 유지
-                        # Streamlit은 이 짧은 슬립 동안 이벤트를 처리할 수 있음
             
+            err_counter.update(stage_errors.counter)
+            error_samples.extend(stage_errors.samples)
             status_text.text("✅ 안전 모드 분석 완료!")
             
         elif api_strategy == "빠른 모드 (병렬 처리)":